@@ -10,12 +10,16 @@ from core.system_state_management import ServiceState
 # Vision System core modules
 from modules.VisionSystem.brightness_manager import BrightnessManager
 from modules.VisionSystem.camera_initialization import CameraInitializer
+from modules.VisionSystem.camera_supervisor import CameraSupervisor, CameraHealth
 from modules.VisionSystem.data_loading import DataManager
+from modules.VisionSystem.frame_change_detector import FrameChangeDetector
 from modules.VisionSystem.message_publisher import MessagePublisher
+from modules.VisionSystem.scene_stability import SceneStabilityTracker
 from modules.VisionSystem.settings_manager import SettingsManager
 from modules.VisionSystem.state_manager import StateManager
 from modules.VisionSystem.subscribtion_manager import SubscriptionManager
 from modules.VisionSystem.QRcodeScanner import detect_and_decode_barcode
+from modules.shared.utils import metrics
 
 # Vision System handlers
 from modules.VisionSystem.handlers.aruco_detection_handler import detect_aruco_markers
@@ -24,9 +28,7 @@ from modules.VisionSystem.handlers.camera_calibration_handler import (
     capture_calibration_image
 )
 from modules.VisionSystem.handlers.contour_detection_handler import handle_contour_detection
-
-# External or domain-specific image processing
-from libs.plvision.PLVision import ImageProcessing
+from modules.VisionSystem.handlers.image_correction_handler import correct_image
 
 # Conditional logging import
 from src.backend.system.utils.custom_logging import (
@@ -36,11 +38,15 @@ from src.backend.system.utils.custom_logging import (
 ENABLE_LOGGING = True  # Enable or disable logging
 vision_system_logger = setup_logger("VisionSystem") if ENABLE_LOGGING else None
 
+_CAPTURE_TIME = metrics.histogram("vision.capture")
+_BRIGHTNESS_TIME = metrics.histogram("vision.brightness")
+_FRAMES = metrics.counter("vision.frames")
+
 
 class VisionSystem:
-    def __init__(self, configFilePath=None, camera_settings=None):
+    def __init__(self, configFilePath=None, camera_settings=None, calibration_store=None):
         self.logger_context = LoggerContext(ENABLE_LOGGING, vision_system_logger)
-        self.data_manager = DataManager(self, ENABLE_LOGGING, vision_system_logger)
+        self.data_manager = DataManager(self, ENABLE_LOGGING, vision_system_logger, store=calibration_store)
         self.settings_manager = SettingsManager()
         self.service_id = "vision_system"
         self.message_publisher = MessagePublisher()
@@ -77,14 +83,20 @@ class VisionSystem:
         self.brightnessManager = BrightnessManager(self)
         self.subscription_manager = SubscriptionManager(self).subscribe_all()
 
-        # Initialize camera with retry logic for intermittent issues
-        camera_index = self.camera_settings.get_camera_index()
+        # The camera is opened, and reopened when it drops, on a background thread
         camera_initializer = CameraInitializer(log_enabled=ENABLE_LOGGING,
                                                logger=vision_system_logger,
                                                width=self.camera_settings.get_camera_width(),
                                                height=self.camera_settings.get_camera_height())
-        self.camera,camera_index = camera_initializer.initializeCameraWithRetry(camera_index)
-        self.camera_settings.set_camera_index(camera_index)
+        self.frame_stale = False
+        self.camera = CameraSupervisor(self.camera_settings.get_camera_index(),
+                                       self.camera_settings.get_camera_width(),
+                                       self.camera_settings.get_camera_height(),
+                                       find_camera=camera_initializer.findCameraIndex,
+                                       on_health_change=self.on_camera_health_change,
+                                       log_enabled=ENABLE_LOGGING,
+                                       logger=vision_system_logger)
+        self.camera.start()
 
 
         # Load camera calibration data
@@ -109,16 +121,15 @@ class VisionSystem:
                                  message=f"System calibrated without perspective correction")
 
 
-        # Extract camera matrix and distortion coefficients
-        if self.isSystemCalibrated:
-            self.cameraMatrix = self.data_manager.get_camera_matrix()
-            self.cameraDist = self.data_manager.get_distortion_coefficients()
-
         # Initialize image variables
         self.image = None
         self.rawImage = None
         self.correctedImage = None
         self.rawMode = False
+        # Reuses the last contours while the scene does not change
+        self.change_detector = FrameChangeDetector()
+        # Signals when brightness and contours have settled, see wait_for_stable_scene()
+        self.scene_stability = SceneStabilityTracker()
 
         # Initialize skip frames counter
         self.current_skip_frames = 0
@@ -159,6 +170,14 @@ class VisionSystem:
     def perspectiveMatrix(self):
         return self.data_manager.perspectiveMatrix
 
+    @property
+    def cameraMatrix(self):
+        return self.data_manager.get_camera_matrix()
+
+    @property
+    def cameraDist(self):
+        return self.data_manager.get_distortion_coefficients()
+
     @property
     def stateTopic(self):
         return self.message_publisher.stateTopic
@@ -168,8 +187,18 @@ class VisionSystem:
                                          log_enabled=ENABLE_LOGGING,
                                          logger=vision_system_logger)
 
+    def on_camera_health_change(self, health):
+        if health == CameraHealth.HEALTHY:
+            # The supervisor may have switched to another camera
+            self.camera_settings.set_camera_index(self.camera.camera_index)
+        self.message_publisher.publish_camera_health({"id": self.service_id, "health": health.value,
+                                                      "camera_index": self.camera.camera_index})
+
     def run(self):
-        self.image = self.camera.capture()
+        with _CAPTURE_TIME.time():
+            self.image = self.camera.capture()
+        # The last good frame served again while the camera reconnects
+        self.frame_stale = self.camera.frame_stale
 
         # Handle frame skipping
         if self.current_skip_frames < self.camera_settings.get_skip_frames():
@@ -179,46 +208,48 @@ class VisionSystem:
         if self.image is None:
             return None, None, None
 
-        self.state_manager.update_state(ServiceState.IDLE)
+        if not self.frame_stale:
+            _FRAMES.inc()
+            self.state_manager.update_state(ServiceState.IDLE)
         self.rawImage = self.image.copy()
 
         # Handle brightness adjustment if enabled
+        brightness_error = None
         if self.camera_settings.get_brightness_auto():
-            self.brightnessManager.adjust_brightness()
+            with _BRIGHTNESS_TIME.time():
+                self.brightnessManager.adjust_brightness()
+            brightness_error = self.brightnessManager.brightness_error
 
         if self.rawMode:
             return None, self.rawImage, None
 
         if self.camera_settings.get_contour_detection():
-            return handle_contour_detection(self)
+            contours, image, extra = handle_contour_detection(self)
+            if not self.frame_stale:
+                self.scene_stability.update(contours, brightness_error)
+            return contours, image, extra
 
         self.correctedImage = self.correctImage(self.image)
+        if not self.frame_stale:
+            self.scene_stability.update(None, brightness_error)
 
         return None, self.correctedImage, None
 
+    def wait_for_stable_scene(self, timeout=None):
+        """
+        Wait until auto-brightness has converged and the contours stay the same for a
+        few frames, counting only frames processed after the call.
+
+        Returns:
+            bool: True if the scene settled, False if the timeout expired first.
+        """
+        return self.scene_stability.wait_until_stable(timeout)
+
     def correctImage(self, imageParam):
         """
         Undistorts and applies perspective correction to the given image.
         """
-        # First, undistort the image using camera calibration parameters
-        imageParam = ImageProcessing.undistortImage(
-            imageParam,
-            self.cameraMatrix,
-            self.cameraDist,
-            self.camera_settings.get_camera_width(),
-            self.camera_settings.get_camera_height(),
-            crop=False
-        )
-
-        # Apply perspective transformation if available (only for single-image calibrations with ArUco markers)
-        if self.perspectiveMatrix is not None:
-            imageParam = cv2.warpPerspective(
-                imageParam,
-                self.perspectiveMatrix,
-                (self.camera_settings.get_camera_width(), self.camera_settings.get_camera_height())
-            )
-
-        return imageParam
+        return correct_image(self, imageParam)
 
     def on_threshold_update(self,message):
         # message format {"region": "pickup"})
@@ -330,10 +361,6 @@ class VisionSystem:
 
     """PRIVATE METHODS SECTION"""
 
-    @perspectiveMatrix.setter
-    def perspectiveMatrix(self, value):
-        self._perspectiveMatrix = value
-
     def start_system_thread(self):
         self.cameraThread = threading.Thread(target=self.run, daemon=True)
         self.cameraThread.start()
@@ -7,6 +7,7 @@ class BrightnessManager:
     def __init__(self, vision_system):
         self.brightnessAdjustment = 0
         self.adjustment = None
+        self.brightness_error = None  # Target minus measured brightness of the last adjusted frame
         self.vision_system = vision_system
         self.brightnessController = BrightnessController(
             Kp=self.vision_system.camera_settings.get_brightness_kp(),
@@ -59,6 +60,7 @@ class BrightnessManager:
         area = np.array([area_p1, area_p2, area_p3, area_p4], dtype=np.float32)
         adjusted_frame = self.brightnessController.adjustBrightness(self.vision_system.image, self.brightnessAdjustment,area)
         current_brightness = self.brightnessController.calculateBrightness(adjusted_frame,area)
+        self.brightness_error = self.brightnessController.target - current_brightness
         self.brightnessAdjustment = self.brightnessController.compute(current_brightness)
         adjusted_frame = self.brightnessController.adjustBrightness(self.vision_system.image, self.brightnessAdjustment)
         self.vision_system.image = adjusted_frame
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from modules.shared.MessageBroker import MessageBroker
 
 import cv2
@@ -6,6 +7,7 @@ import numpy as np
 from libs.plvision.PLVision import ImageProcessing
 from libs.plvision.PLVision.Calibration import CameraCalibrator
 import cv2.aruco as aruco
+from modules.VisionSystem.calibration.cameraCalibration.chessboard_detection import detect_chessboards
 
 
 class CameraCalibrationService:
@@ -222,37 +224,14 @@ class CameraCalibrationService:
         self.publish(message)
         print(message)
 
-        valid_images = 0
-        for idx, img in enumerate(self.calibrationImages):
-            if img is None:
-                continue
-
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-            # Find the chessboard corners
-            ret, corners = cv2.findChessboardCorners(gray, chessboard_size, None)
-
-            if ret:
-                objpoints.append(objp)
-
-                # Refine corner positions
-                corners2 = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1),
-                                            criteria=(cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001))
-                imgpoints.append(corners2)
-
-                # Draw and save the corners for visualization
-                cv2.drawChessboardCorners(img, chessboard_size, corners2, ret)
-                output_path = os.path.join(self.STORAGE_PATH, f'calib_result_{idx:03d}.png')
-                cv2.imwrite(output_path, img)
-
-                valid_images += 1
-                print(f"✅ Chessboard detected in image {idx}")
-                message = f"✅ Chessboard detected in image {idx} - saved to {output_path}"
-                self.publish(message)
-            else:
-                print(f"❌ No chessboard found in image {idx}")
-                message = f"❌ No chessboard found in image {idx}"
-                self.publish(message)
+        # The corners are found on a process pool (see chessboard_detection); the
+        # annotated debug images are written by a background thread meanwhile
+        debug_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="calibration-debug") if debug else None
+        try:
+            valid_images, image_size = self._detect_corners(chessboard_size, objp, objpoints, imgpoints, debug_writer)
+        finally:
+            if debug_writer is not None:
+                debug_writer.shutdown(wait=True)
 
         if valid_images < 1:  # Need at least 1 good images for calibration
             message = f"Insufficient valid images for calibration. Found {valid_images}, need at least 1."
@@ -267,7 +246,7 @@ class CameraCalibrationService:
 
         try:
             ret, camera_matrix, dist_coeffs, rvecs, tvecs = cv2.calibrateCamera(
-                objpoints, imgpoints, gray.shape[::-1], None, None
+                objpoints, imgpoints, image_size, None, None
             )
 
             if ret:
@@ -322,6 +301,47 @@ class CameraCalibrationService:
             print(f"❌ {message}")
             return False, None, None, message
 
+    def _detect_corners(self, chessboard_size, objp, objpoints, imgpoints, debug_writer=None):
+        """
+        Finds the chessboard in every calibration image, appending the object and image
+        points of each image where it is found.
+
+        Returns (number of images with a chessboard, (width, height) of the last of them).
+        """
+        valid_images = 0
+        image_size = None
+        for idx, (img, corners) in enumerate(zip(self.calibrationImages,
+                                                 detect_chessboards(self.calibrationImages, chessboard_size))):
+            if img is None:
+                continue
+
+            if corners is not None:
+                objpoints.append(objp)
+                imgpoints.append(corners)
+                image_size = (img.shape[1], img.shape[0])
+                valid_images += 1
+                print(f"✅ Chessboard detected in image {idx}")
+                message = f"✅ Chessboard detected in image {idx}"
+
+                if debug_writer is not None:
+                    # Draw and save the corners for visualization
+                    output_path = os.path.join(self.STORAGE_PATH, f'calib_result_{idx:03d}.png')
+                    debug_writer.submit(self._write_debug_image, output_path, img, chessboard_size, corners)
+                    message += f" - saved to {output_path}"
+                self.publish(message)
+            else:
+                print(f"❌ No chessboard found in image {idx}")
+                message = f"❌ No chessboard found in image {idx}"
+                self.publish(message)
+        return valid_images, image_size
+
+    @staticmethod
+    def _write_debug_image(output_path, img, chessboard_size, corners):
+        annotated = img.copy()
+        cv2.drawChessboardCorners(annotated, chessboard_size, corners, True)
+        if not cv2.imwrite(output_path, annotated):
+            print(f"⚠️ Could not save {output_path}")
+
     def publish(self,message):
         if self.message_publisher is None:
             return
@@ -0,0 +1,125 @@
+"""
+Chessboard corner detection for camera calibration.
+
+cv2.findChessboardCorners is by far the most expensive step of a calibration, and its
+cost grows with the image size. The corners are therefore searched for in a downscaled
+copy of the image. The corners found there are scaled back and refined with
+cornerSubPix on the full-resolution image; cornerSubPix only looks at a window around
+each corner, and the window (11x11, as before) is large enough for the error of the
+coarse corners. A board too small to be found in the downscaled image is looked for at
+full resolution.
+
+The search gets slow and unreliable once the squares are only a few pixels wide, so the
+image is only downscaled as far as the squares of a board spanning half the image stay
+MIN_SQUARE_PX wide, and not at all when that would save little (a fine board on a
+low-resolution camera, e.g. the default 32x20 board at 1280x720).
+
+An image without a chessboard is the slowest case: findChessboardCorners tries every
+threshold and dilation before giving up, seconds per image on a cluttered table, and its
+CALIB_CB_FAST_CHECK flag did not reject those images when combined with the adaptive
+threshold. cv2.checkChessboard (the check behind that flag) is therefore run on the grey
+image first, which rejects them in tens of milliseconds. It also rejects some boards
+with small squares (below ~18 px), so an image it rejects is searched once more with
+findChessboardCornersSB, which finds those boards and gives up on an empty image within
+a fraction of a second.
+
+detect_chessboards runs the detection of many images on a process pool. Its workers are
+spawned: forking the calibration process would copy the locks held by its camera, broker
+and Qt threads into children that can deadlock on them.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+DETECTION_WIDTH = 640  # px, smallest width of the image the corners are searched in
+MIN_SQUARE_PX = 16  # px, size of the squares at the detection resolution for a board spanning half the image
+MAX_DETECTION_SCALE = 2 / 3  # Downscale only if it makes the image at least this much smaller
+DETECTION_FLAGS = cv2.CALIB_CB_ADAPTIVE_THRESH + cv2.CALIB_CB_NORMALIZE_IMAGE  # findChessboardCorners' default
+SUBPIX_WINDOW = (11, 11)
+SUBPIX_CRITERIA = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+MAX_WORKERS = 8
+POOL_START_METHOD = "spawn"
+
+
+def detection_width(image_width, chessboard_size):
+    """Width to search the corners at, None for the full resolution."""
+    width = max(DETECTION_WIDTH, 2 * MIN_SQUARE_PX * (max(chessboard_size) + 1))
+    return width if width <= MAX_DETECTION_SCALE * image_width else None
+
+
+def _find_corners(gray, chessboard_size):
+    if not cv2.checkChessboard(gray, chessboard_size):
+        return False, None
+    return cv2.findChessboardCorners(gray, chessboard_size, DETECTION_FLAGS)
+
+
+def find_chessboard(gray, chessboard_size, downscale=True):
+    """
+    Find and refine the inner corners of a chessboard.
+
+    Args:
+        gray (np.ndarray): Grayscale image.
+        chessboard_size (tuple): Inner corners per row and column.
+        downscale (bool): Search in a downscaled image (see detection_width); False
+            searches at full resolution.
+
+    Returns:
+        np.ndarray: The (N, 1, 2) float32 corners, refined at full resolution, or None if
+        no chessboard was found.
+    """
+    height, width = gray.shape[:2]
+    scale = 1.0
+    small_width = detection_width(width, chessboard_size) if downscale else None
+    if small_width:
+        scale = small_width / width
+        small = cv2.resize(gray, (small_width, round(height * scale)), interpolation=cv2.INTER_AREA)
+        found, corners = _find_corners(small, chessboard_size)
+        if found:
+            # Pixel centres: x_full + 0.5 = (x_small + 0.5) / scale
+            corners = ((corners + 0.5) / scale - 0.5).astype(np.float32)
+        else:
+            scale = 1.0
+    if scale == 1.0:
+        found, corners = _find_corners(gray, chessboard_size)
+    if not found:
+        found, corners = cv2.findChessboardCornersSB(gray, chessboard_size, 0)
+        if not found:
+            return None
+    return cv2.cornerSubPix(gray, corners, SUBPIX_WINDOW, (-1, -1), SUBPIX_CRITERIA)
+
+
+def _find_chessboard_in_image(image, chessboard_size, downscale):
+    if image is None:
+        return None
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    return find_chessboard(gray, chessboard_size, downscale)
+
+
+def detect_chessboards(images, chessboard_size, workers=None, downscale=True):
+    """
+    Find the chessboard corners of every image, on a process pool (or inline for one worker).
+
+    Args:
+        images (list): BGR or grayscale images; None entries are skipped.
+        chessboard_size (tuple): Inner corners per row and column.
+        workers (int): Worker processes, defaults to the CPU count capped at MAX_WORKERS.
+        downscale (bool): See find_chessboard.
+
+    Returns:
+        Iterator over the corners of each image (None where there is no chessboard), in
+        the order of ``images`` and as they become available.
+    """
+    if workers is None:
+        workers = min(os.cpu_count() or 1, MAX_WORKERS)
+    workers = min(workers, len(images))
+    arguments = ([chessboard_size] * len(images), [downscale] * len(images))
+    if workers <= 1:
+        yield from map(_find_chessboard_in_image, images, *arguments)
+        return
+    # The worker function is defined at module level, so spawned workers can import it
+    context = multiprocessing.get_context(POOL_START_METHOD)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        yield from executor.map(_find_chessboard_in_image, images, *arguments)
@@ -0,0 +1,206 @@
+"""
+Versioned store of the camera calibration artifacts.
+
+Every artifact (camera matrix and distortion coefficients, perspective matrix,
+camera-to-robot homography, work/pickup/spray area points) is read from disk once, on
+first use, and handed out as a read-only array, so the vision loop, the services and
+the calibration routines share one copy instead of loading their own.
+
+Each change to an item (reload from disk, save, or an in-memory set) bumps the store
+version and notifies the subscribers with the names that changed. Values computed from
+the items, such as undistortion maps, area masks and the inverse homography, are cached
+with derived() and dropped whenever one of the items they were built from changes, so
+they are rebuilt on the next request instead of on every frame.
+"""
+import os
+import threading
+import time
+from types import MappingProxyType
+
+import numpy as np
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(__file__), 'calibration', 'cameraCalibration', 'storage',
+                                 'calibration_result')
+
+CAMERA_CALIBRATION = "camera_calibration"
+PERSPECTIVE_MATRIX = "perspective_matrix"
+CAMERA_TO_ROBOT_MATRIX = "camera_to_robot_matrix"
+WORK_AREA_POINTS = "work_area_points"
+PICKUP_AREA_POINTS = "pickup_area_points"
+SPRAY_AREA_POINTS = "spray_area_points"
+
+FILE_NAMES = {
+    CAMERA_CALIBRATION: 'camera_calibration.npz',
+    PERSPECTIVE_MATRIX: 'perspectiveTransform.npy',
+    CAMERA_TO_ROBOT_MATRIX: 'cameraToRobotMatrix_camera_center.npy',
+    WORK_AREA_POINTS: 'workAreaPoints.npy',
+    PICKUP_AREA_POINTS: 'pickupAreaPoints.npy',
+    SPRAY_AREA_POINTS: 'sprayAreaPoints.npy',
+}
+
+
+def default_path(name):
+    """Path of an item in the default calibration directory."""
+    return os.path.join(DEFAULT_DIRECTORY, FILE_NAMES[name])
+
+
+def _frozen(value):
+    """Read-only copy of an array, or of every array in a mapping (the .npz items)."""
+    if value is None:
+        return None
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({key: _frozen(array) for key, array in value.items()})
+    array = np.array(value, copy=True)
+    array.flags.writeable = False
+    return array
+
+
+class CalibrationStore:
+    """
+    Calibration items loaded once and shared, with change notification.
+
+    Items missing on disk are cached as None until they are saved or reloaded. Callers
+    get read-only arrays; to change an item, save() it (or set() it for an in-memory
+    value), which notifies the subscribers.
+
+    Attributes:
+        directory (str): Directory the item files are read from and saved to.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._values = {}
+        self._loaded_at = {}
+        self._item_versions = {}
+        self._derived = {}
+        self._subscribers = []
+        self._version = 0
+
+    @property
+    def version(self):
+        """Number of changes since the store was created."""
+        return self._version
+
+    def path(self, name):
+        return os.path.join(self.directory, FILE_NAMES[name])
+
+    def get(self, name):
+        """
+        The item's value, read from disk on first use.
+
+        Returns:
+            np.ndarray or Mapping: Read-only value, a mapping of arrays for the camera
+            calibration (.npz), or None if the file does not exist.
+        """
+        with self._lock:
+            if name not in self._values:
+                self._load(name)
+            return self._values[name]
+
+    def reload(self, *names):
+        """Re-read items from disk (all of them by default) and notify the subscribers."""
+        names = names or tuple(FILE_NAMES)
+        with self._lock:
+            for name in names:
+                self._load(name)
+        self._changed(names)
+
+    def set(self, name, value):
+        """Replace an item in memory only and notify the subscribers."""
+        with self._lock:
+            self._values[name] = _frozen(value)
+            self._loaded_at[name] = time.time()
+        self._changed((name,))
+
+    def save(self, name, value):
+        """Write an item to disk, keep it as the current value and notify the subscribers."""
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(value, (dict, MappingProxyType)):
+            np.savez(path, **value)
+        else:
+            np.save(path, value)
+        self.set(name, value)
+
+    def derived(self, key, build, depends_on):
+        """
+        Cached value computed from items.
+
+        Args:
+            key: Hashable cache key; include any parameters of the build, e.g. an image size.
+            build (callable): Called with the values of ``depends_on``, in order.
+            depends_on (tuple): Item names the value is computed from.
+
+        Returns:
+            The cached value, built again after any of ``depends_on`` changed.
+        """
+        with self._lock:
+            entry = self._derived.get(key)
+            if entry is None:
+                entry = (frozenset(depends_on), build(*(self.get(name) for name in depends_on)))
+                self._derived[key] = entry
+            return entry[1]
+
+    def subscribe(self, callback):
+        """Call ``callback(names, version)`` after items change."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def describe(self):
+        """Path, presence, version and load time of every item, for diagnostics."""
+        with self._lock:
+            return {name: {"path": self.path(name),
+                           "loaded": name in self._values,
+                           "present": self._values.get(name) is not None,
+                           "version": self._item_versions.get(name, 0),
+                           "loaded_at": self._loaded_at.get(name)}
+                    for name in FILE_NAMES}
+
+    def _load(self, name):
+        path = self.path(name)
+        try:
+            if path.endswith('.npz'):
+                with np.load(path) as data:
+                    value = {key: data[key] for key in data.files}
+            else:
+                value = np.load(path)
+        except FileNotFoundError:
+            value = None
+        self._values[name] = _frozen(value)
+        self._loaded_at[name] = time.time()
+
+    def _changed(self, names):
+        changed = set(names)
+        with self._lock:
+            self._version += 1
+            version = self._version
+            for name in changed:
+                self._item_versions[name] = version
+            self._derived = {key: entry for key, entry in self._derived.items() if not entry[0] & changed}
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(tuple(names), version)
+            except Exception as e:
+                print(f"CalibrationStore: subscriber {callback} failed: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_calibration_store():
+    """The process-wide store over DEFAULT_DIRECTORY."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CalibrationStore()
+    return _store
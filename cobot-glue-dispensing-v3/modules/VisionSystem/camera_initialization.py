@@ -29,38 +29,14 @@ class CameraInitializer:
                 if attempt > 0:
                     time.sleep(retry_delay)
     
-                # Create camera instance
-                test_camera = Camera(
-                    camera_index,
-                    self.width,
-                    self.height
-                )
-    
-                # Test if camera opens
-                if test_camera.cap.isOpened():
-                    # Test if we can actually capture a frame
-                    ret, frame = test_camera.cap.read()
-                    if ret and frame is not None:
-                        log_if_enabled(enabled=self.log_enabled,
-                                       logger=self.logger,
-                                       level=LoggingLevel.INFO,
-                                       message=f"Camera successfully initialized at index {camera_index} on attempt {attempt + 1}",
-                                       broadcast_to_ui=False)
-                        return test_camera,camera_index
-                    else:
-                        log_if_enabled(enabled=self.log_enabled,
-                                       logger=self.logger,
-                                       level=LoggingLevel.INFO,
-                                       message=f"Camera {camera_index} opened but cannot capture frames",
-                                       broadcast_to_ui=False)
-    
-                        test_camera.cap.release()
-                else:
+                test_camera = self._openWorkingCamera(camera_index)
+                if test_camera is not None:
                     log_if_enabled(enabled=self.log_enabled,
                                    logger=self.logger,
                                    level=LoggingLevel.INFO,
-                                   message=f"Camera {camera_index} failed to open on attempt {attempt + 1}",
+                                   message=f"Camera successfully initialized at index {camera_index} on attempt {attempt + 1}",
                                    broadcast_to_ui=False)
+                    return test_camera,camera_index
     
             except Exception as e:
                 log_if_enabled(enabled=self.log_enabled,
@@ -87,97 +63,119 @@ class CameraInitializer:
         """
         Find and initialize the first available camera.
         """
+        test_camera, cam_id = self._probeCameras()
+        if test_camera is not None:
+            return test_camera,cam_id
+    
+        # Create a dummy camera as fallback
+        log_if_enabled(enabled=self.log_enabled,
+                       logger=self.logger,
+                       level=LoggingLevel.INFO,
+                       message="No working cameras found - creating dummy camera",
+                       broadcast_to_ui=False)
+        return Camera(0, self.width, self.height)
+    
+    
+    def findCameraIndex(self, exclude=None):
+        """
+        Find a camera, other than ``exclude``, that opens and delivers a frame.
+
+        Returns:
+            int or None: Its index, None if there is none.
+        """
+        test_camera, cam_id = self._probeCameras(exclude=exclude)
+        if test_camera is None:
+            return None
+        test_camera.stopCapture()
+        return cam_id
+
+    def _probeCameras(self, exclude=None):
+        """
+        Find the first camera, other than ``exclude``, that opens and delivers a frame.
+
+        The common indices are tried first, then on Linux the video devices found by
+        find_first_available_camera.
+
+        Returns:
+            tuple: (Camera, index) with the camera open, (None, None) if there is none.
+        """
         log_if_enabled(enabled=self.log_enabled,
                        logger=self.logger,
                        level=LoggingLevel.INFO,
                        message="Searching for available cameras...",
                        broadcast_to_ui=False)
-        # Try common camera indices first
-        for cam_id in range(0, 10):
+        tested = set()
+        for cam_id in self._candidateIndices():
+            if cam_id == exclude or cam_id in tested:
+                continue
+            tested.add(cam_id)
             try:
                 log_if_enabled(enabled=self.log_enabled,
                                logger=self.logger,
                                level=LoggingLevel.INFO,
                                message=f"Testing camera index {cam_id}...",
                                broadcast_to_ui=False)
-                test_camera = Camera(
-                    cam_id,
-                    self.width,
-                    self.height
-                )
-    
-                if test_camera.cap.isOpened():
-                    # Test if we can actually capture a frame
-                    ret, frame = test_camera.cap.read()
-                    if ret and frame is not None:
-                        log_if_enabled(enabled=self.log_enabled,
-                                       logger=self.logger,
-                                       level=LoggingLevel.INFO,
-                                       message=f"Found working camera at index {cam_id}",
-                                       broadcast_to_ui=False)
-
-                        return test_camera,cam_id
-                    else:
-                        test_camera.cap.release()
-                        log_if_enabled(enabled=self.log_enabled,
-                                       logger=self.logger,
-                                       level=LoggingLevel.INFO,
-                                       message=f"Camera {cam_id} opened but cannot capture frames",
-                                       broadcast_to_ui=False)
-                else:
+                test_camera = self._openWorkingCamera(cam_id)
+                if test_camera is not None:
                     log_if_enabled(enabled=self.log_enabled,
                                    logger=self.logger,
                                    level=LoggingLevel.INFO,
-                                   message=f"Camera {cam_id} failed to open",
+                                   message=f"Found working camera at index {cam_id}",
                                    broadcast_to_ui=False)
-    
+                    return test_camera,cam_id
             except Exception as e:
                 log_if_enabled(enabled=self.log_enabled,
                                logger=self.logger,
                                level=LoggingLevel.INFO,
                                message=f"Error testing camera {cam_id}: {e}",
                                broadcast_to_ui=False)
-    
-        # If no camera found in basic search, try Linux-specific detection
+        return None, None
+
+    def _candidateIndices(self):
+        # Try common camera indices first; the Linux detection opens devices, so only if none of them works
+        yield from range(0, 10)
         if platform.system().lower() == "linux":
             try:
-                available_cameras = self.find_first_available_camera()
-                for cam_id in available_cameras:
-                    try:
-                        test_camera = Camera(
-                            cam_id,
-                            self.width,
-                            self.height
-                        )
-                        if test_camera.cap.isOpened():
-                            log_if_enabled(enabled=self.log_enabled,
-                                           logger=self.logger,
-                                           level=LoggingLevel.INFO,
-                                           message=f"Found working camera at index {cam_id} (via Linux detection)",
-                                           broadcast_to_ui=False)
-                            return test_camera,cam_id
-                    except Exception as e:
-                        log_if_enabled(enabled=self.log_enabled,
-                                       logger=self.logger,
-                                       level=LoggingLevel.INFO,
-                                       message=f"Error with camera {cam_id}: {e}",
-                                       broadcast_to_ui=False)
+                yield from self.find_first_available_camera()
             except Exception as e:
                 log_if_enabled(enabled=self.log_enabled,
                                logger=self.logger,
                                level=LoggingLevel.INFO,
                                message=f"Linux camera detection failed: {e}",
                                broadcast_to_ui=False)
-    
-        # Create a dummy camera as fallback
+
+    def _openWorkingCamera(self, cam_id):
+        """
+        Open camera ``cam_id`` and test that it delivers a frame.
+
+        Returns:
+            Camera or None: The open camera, None (released) if it did not open or deliver a frame.
+        """
+        test_camera = Camera(
+            cam_id,
+            self.width,
+            self.height
+        )
+        if not test_camera.cap.isOpened():
+            log_if_enabled(enabled=self.log_enabled,
+                           logger=self.logger,
+                           level=LoggingLevel.INFO,
+                           message=f"Camera {cam_id} failed to open",
+                           broadcast_to_ui=False)
+            return None
+
+        # Test if we can actually capture a frame
+        ret, frame = test_camera.cap.read()
+        if ret and frame is not None:
+            return test_camera
+        test_camera.stopCapture()
         log_if_enabled(enabled=self.log_enabled,
                        logger=self.logger,
                        level=LoggingLevel.INFO,
-                       message="No working cameras found - creating dummy camera",
+                       message=f"Camera {cam_id} opened but cannot capture frames",
                        broadcast_to_ui=False)
-        return Camera(0, self.width, self.height)
-    
-    
+        return None
+
     def find_first_available_camera(self, max_devices=10):
         """
         Find the first available camera on Linux systems.
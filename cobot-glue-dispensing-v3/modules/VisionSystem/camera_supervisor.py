@@ -0,0 +1,265 @@
+"""
+Keeps the camera open in the background and the vision loop supplied with frames.
+
+A CameraSupervisor owns the capture device on a grab thread of its own. The thread
+opens the device, sets the resolution and frame rate once, and reads frames for as long
+as the device delivers them. When reads keep failing (e.g. the USB camera dropped), it
+releases the device and opens it again, waiting between attempts with an exponential
+backoff: quick retries for a short glitch, without hammering the USB bus during a long
+outage. Nothing of this runs on the caller's thread.
+
+capture() hands the vision loop the newest frame. When no new frame arrives within
+``stale_after`` seconds it returns the last good frame again, with ``frame_stale`` set,
+so the pipeline keeps serving an image while the camera is away and never spins on
+None. The camera's health (CameraHealth) is reported through ``on_health_change``
+whenever it changes.
+"""
+import threading
+import time
+from enum import Enum
+
+import cv2
+
+from backend.system.utils.custom_logging import log_if_enabled, LoggingLevel
+from libs.plvision.PLVision.Camera import Camera
+
+DEFAULT_FPS = 30
+DEFAULT_STALE_AFTER = 0.25  # s without a new frame before the last one is served as stale
+DEFAULT_MAX_READ_FAILURES = 5  # failed reads in a row before the device is reopened
+DEFAULT_INITIAL_BACKOFF = 0.05  # s
+DEFAULT_MAX_BACKOFF = 0.5  # s; opening a missing device fails at once, so retries stay cheap
+DEFAULT_SEARCH_AFTER = 10  # failed opens of a camera never seen before looking for another one
+
+
+class CameraHealth(Enum):
+    CONNECTING = "connecting"  # no frame read yet
+    HEALTHY = "healthy"
+    RECONNECTING = "reconnecting"  # the device was lost; the last good frame is served as stale
+    STOPPED = "stopped"
+
+
+def open_camera(camera_index, width, height, fps):
+    """
+    Open a camera with the given resolution and frame rate.
+
+    Returns:
+        cv2.VideoCapture or None: The open capture, None if the device did not open.
+    """
+    camera = Camera(camera_index, width, height)
+    if not camera.cap.isOpened():
+        camera.stopCapture()
+        return None
+    camera.cap.set(cv2.CAP_PROP_FPS, fps)
+    return camera.cap
+
+
+class CameraSupervisor:
+    """
+    Opens and reopens a camera on a background thread and serves its frames.
+
+    capture() is meant for a single consumer, the vision loop.
+
+    Attributes:
+        camera_index (int): Index of the device currently used.
+        width (int), height (int), fps (int): Applied each time the device is opened.
+        health (CameraHealth): Current camera health.
+        frame_stale (bool): Whether the frame last returned by capture() had been returned before.
+        open_attempts (int): Times the device was opened or tried to (for diagnostics).
+    """
+
+    def __init__(self, camera_index, width, height, fps=DEFAULT_FPS, open_capture=open_camera, find_camera=None,
+                 on_health_change=None, stale_after=DEFAULT_STALE_AFTER, max_read_failures=DEFAULT_MAX_READ_FAILURES,
+                 initial_backoff=DEFAULT_INITIAL_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF,
+                 search_after=DEFAULT_SEARCH_AFTER, log_enabled=False, logger=None):
+        """
+        Args:
+            open_capture: Called as open_capture(camera_index, width, height, fps); returns an
+                object with read() and release(), like cv2.VideoCapture, or None.
+            find_camera: Called as find_camera(exclude=camera_index) when a camera that never
+                delivered a frame failed ``search_after`` opens; returns another index or None.
+            on_health_change: Called with the new CameraHealth, on the grab thread.
+        """
+        self.camera_index = camera_index
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.open_capture = open_capture
+        self.find_camera = find_camera
+        self.on_health_change = on_health_change
+        self.stale_after = stale_after
+        self.max_read_failures = max_read_failures
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.search_after = search_after
+        self.log_enabled = log_enabled
+        self.logger = logger
+
+        self.health = CameraHealth.CONNECTING
+        self.frame_stale = False
+        self.open_attempts = 0
+        self._frame = None
+        self._frame_time = None
+        self._seq = 0
+        self._served_seq = 0
+        self._capture = None
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._reopen = threading.Event()
+        self._wake = threading.Event()  # cuts a backoff wait short, on stop or reconfigure
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="camera-supervisor", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def frame_age(self):
+        """Seconds since the newest frame was read, None before the first one."""
+        with self._condition:
+            return None if self._frame_time is None else time.perf_counter() - self._frame_time
+
+    def capture(self):
+        """
+        Return the newest frame, waiting up to ``stale_after`` seconds for one not returned yet.
+
+        Returns:
+            np.ndarray or None: A new frame, or a copy of the last good frame with
+            ``frame_stale`` set; None until the camera delivered its first frame.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._seq != self._served_seq or self._stopped.is_set(),
+                                     timeout=self.stale_after)
+            if self._frame is None:
+                return None
+            self.frame_stale = self._seq == self._served_seq
+            self._served_seq = self._seq
+            # The consumer may draw on it; a stale frame is handed out again and must stay clean
+            return self._frame.copy() if self.frame_stale else self._frame
+
+    def wait_until_healthy(self, timeout=None):
+        """Block until the camera delivers frames; False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.health == CameraHealth.HEALTHY, timeout=timeout)
+
+    def reconfigure(self, camera_index=None, width=None, height=None, fps=None):
+        """Change the device or its settings; the grab thread reopens the device with them."""
+        if camera_index is not None:
+            self.camera_index = camera_index
+        if width is not None:
+            self.width = width
+        if height is not None:
+            self.height = height
+        if fps is not None:
+            self.fps = fps
+        self._reopen.set()
+        self._wake.set()
+
+    def stopCapture(self):
+        self._stopped.set()
+        self._wake.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._release()
+        self._set_health(CameraHealth.STOPPED)
+
+    def _run(self):
+        backoff = self.initial_backoff
+        failed_opens = 0
+        read_failures = 0
+        while not self._stopped.is_set():
+            if self._reopen.is_set():
+                self._reopen.clear()
+                self._release()
+                backoff = self.initial_backoff
+
+            if self._capture is None:
+                self._capture = self._open()
+                if self._capture is None:
+                    failed_opens += 1
+                    if self._frame is None and self.find_camera is not None and failed_opens >= self.search_after:
+                        failed_opens = 0
+                        self._search_camera()
+                    self._set_health(CameraHealth.CONNECTING if self._frame is None else CameraHealth.RECONNECTING)
+                    self._wake.wait(backoff)
+                    self._wake.clear()
+                    backoff = min(backoff * 2, self.max_backoff)
+                    continue
+                failed_opens = 0
+                read_failures = 0
+
+            ok, frame = self._read()
+            if ok and frame is not None:
+                read_failures = 0
+                backoff = self.initial_backoff
+                with self._condition:
+                    self._frame = frame
+                    self._frame_time = time.perf_counter()
+                    self._seq += 1
+                    self._condition.notify_all()
+                self._set_health(CameraHealth.HEALTHY)
+                continue
+
+            read_failures += 1
+            if read_failures >= self.max_read_failures:
+                self._log(f"Camera {self.camera_index} stopped delivering frames, reopening")
+                self._release()
+                self._set_health(CameraHealth.RECONNECTING)
+
+    def _open(self):
+        self.open_attempts += 1
+        try:
+            capture = self.open_capture(self.camera_index, self.width, self.height, self.fps)
+        except Exception as e:
+            self._log(f"Error opening camera {self.camera_index}: {e}")
+            return None
+        if capture is not None:
+            self._log(f"Camera {self.camera_index} opened at {self.width}x{self.height}, {self.fps} fps")
+        return capture
+
+    def _read(self):
+        try:
+            return self._capture.read()
+        except Exception as e:
+            self._log(f"Error reading camera {self.camera_index}: {e}")
+            return False, None
+
+    def _release(self):
+        capture, self._capture = self._capture, None
+        if capture is not None:
+            try:
+                capture.release()
+            except Exception as e:
+                self._log(f"Error releasing camera {self.camera_index}: {e}")
+
+    def _search_camera(self):
+        try:
+            camera_index = self.find_camera(exclude=self.camera_index)
+        except Exception as e:
+            self._log(f"Camera search failed: {e}")
+            return
+        if camera_index is not None and camera_index != self.camera_index:
+            self._log(f"Camera {self.camera_index} not available, switching to camera {camera_index}")
+            self.camera_index = camera_index
+
+    def _set_health(self, health):
+        with self._condition:
+            if self.health == health:
+                return
+            self.health = health
+            self._condition.notify_all()
+        self._log(f"Camera {self.camera_index} is {health.value}")
+        if self.on_health_change is not None:
+            try:
+                self.on_health_change(health)
+            except Exception as e:
+                self._log(f"Error publishing camera health: {e}")
+
+    def _log(self, message):
+        log_if_enabled(enabled=self.log_enabled,
+                       logger=self.logger,
+                       level=LoggingLevel.INFO,
+                       message=message,
+                       broadcast_to_ui=False)
@@ -1,143 +1,188 @@
 import json
 import os
 
+import cv2
 import numpy as np
 
+from backend.system.utils.contours import PolygonMask
 from backend.system.utils.custom_logging import log_if_enabled, LoggingLevel
+from modules.VisionSystem.calibration_store import (get_calibration_store, default_path, CAMERA_CALIBRATION,
+                                                    PERSPECTIVE_MATRIX, CAMERA_TO_ROBOT_MATRIX, WORK_AREA_POINTS,
+                                                    PICKUP_AREA_POINTS, SPRAY_AREA_POINTS)
 
 
 # Paths to camera calibration data
-CAMERA_DATA_PATH = os.path.join(os.path.dirname(__file__), 'calibration', 'cameraCalibration', 'storage',
-                                'calibration_result', 'camera_calibration.npz')
+CAMERA_DATA_PATH = default_path(CAMERA_CALIBRATION)
 
-PERSPECTIVE_MATRIX_PATH = os.path.join(os.path.dirname(__file__), 'calibration', 'cameraCalibration', 'storage',
-                                       'calibration_result', 'perspectiveTransform.npy')
+PERSPECTIVE_MATRIX_PATH = default_path(PERSPECTIVE_MATRIX)
 
-CAMERA_TO_ROBOT_MATRIX_PATH = os.path.join(os.path.dirname(__file__), 'calibration', 'cameraCalibration', 'storage',
-                                           'calibration_result', 'cameraToRobotMatrix_camera_center.npy')
+CAMERA_TO_ROBOT_MATRIX_PATH = default_path(CAMERA_TO_ROBOT_MATRIX)
 
-WORK_AREA_POINTS_PATH = os.path.join(os.path.dirname(__file__), 'calibration', 'cameraCalibration', 'storage',
-                                        'calibration_result', 'workAreaPoints.npy')
+WORK_AREA_POINTS_PATH = default_path(WORK_AREA_POINTS)
 
 # Separate paths for pickup and spray areas
-PICKUP_AREA_POINTS_PATH = os.path.join(os.path.dirname(__file__), 'calibration', 'cameraCalibration', 'storage',
-                                       'calibration_result', 'pickupAreaPoints.npy')
+PICKUP_AREA_POINTS_PATH = default_path(PICKUP_AREA_POINTS)
 
-SPRAY_AREA_POINTS_PATH = os.path.join(os.path.dirname(__file__), 'calibration', 'cameraCalibration', 'storage',
-                                      'calibration_result', 'sprayAreaPoints.npy')
+SPRAY_AREA_POINTS_PATH = default_path(SPRAY_AREA_POINTS)
 
 
+def _store_item(name, doc):
+    """DataManager attribute backed by a calibration store item; assigning sets it in memory."""
+    return property(lambda self: self.store.get(name),
+                    lambda self, value: self.store.set(name, value),
+                    doc=doc)
+
 
 class DataManager:
-    def __init__(self,vision_system,logging_enabled,logger):
+    """
+    Calibration data of the vision system.
+
+    The arrays live in a CalibrationStore, which reads each file once and shares the
+    read-only arrays with every other user of the store. The load methods only report
+    what the store has; the values derived from them (undistortion maps, the spray area
+    mask, the inverse homography) are cached in the store and rebuilt when calibration
+    changes.
+    """
+
+    cameraData = _store_item(CAMERA_CALIBRATION, "Camera matrix ('mtx') and distortion ('dist') mapping.")
+    perspectiveMatrix = _store_item(PERSPECTIVE_MATRIX, "Optional 3x3 perspective correction.")
+    cameraToRobotMatrix = _store_item(CAMERA_TO_ROBOT_MATRIX, "3x3 camera-to-robot homography.")
+    workAreaPoints = _store_item(WORK_AREA_POINTS, "Legacy work area corners.")
+    pickupAreaPoints = _store_item(PICKUP_AREA_POINTS, "Pickup area corners.")
+    sprayAreaPoints = _store_item(SPRAY_AREA_POINTS, "Spray area corners.")
+
+    def __init__(self,vision_system,logging_enabled,logger,store=None):
         self.vision_system = vision_system
         self.ENABLE_LOGGING = logging_enabled
         self.logger = logger
-        self.workAreaPoints = None
-        self.work_area_polygon = None
-        self.pickupAreaPoints = None
-        self.sprayAreaPoints = None
-        self.cameraToRobotMatrix = None
-        self.cameraData = None
-        self.perspectiveMatrix = None
+        self.store = store if store is not None else get_calibration_store()
         self.isSystemCalibrated = False
 
+    @property
+    def work_area_polygon(self):
+        return self.store.derived("work_area_polygon", _work_area_polygon, (WORK_AREA_POINTS,))
+
+    @property
+    def robotToCameraMatrix(self):
+        """Inverse of the camera-to-robot homography, computed once per calibration."""
+        return self.store.derived("robot_to_camera_matrix", _inverse, (CAMERA_TO_ROBOT_MATRIX,))
+
+    def get_spray_area_mask(self):
+        """PolygonMask of the spray area, rasterized once per saved spray area."""
+        return self.store.derived("spray_area_mask", _polygon_mask, (SPRAY_AREA_POINTS,))
+
+    def get_correction_maps(self, width, height, image_size=None):
+        """
+        Remap tables that undistort a frame and apply the perspective matrix in one pass.
+
+        The undistortion is the one ImageProcessing.undistortImage does; the perspective
+        warp is folded into the same tables, so a frame is interpolated once instead of
+        by cv2.undistort and then cv2.warpPerspective.
+
+        Args:
+            width (int): Configured camera width, the size of the corrected image.
+            height (int): Configured camera height.
+            image_size (tuple): (width, height) of the frames, if different.
+
+        Returns:
+            tuple: (map1, map2) for cv2.remap, built once per calibration and size.
+        """
+        size = (width, height)
+        image_size = tuple(image_size or size)
+        return self.store.derived(("correction_maps", size, image_size),
+                                  lambda camera_data, perspective: _correction_maps(camera_data, perspective,
+                                                                                    size, image_size),
+                                  (CAMERA_CALIBRATION, PERSPECTIVE_MATRIX))
+
+    def reloadCalibration(self):
+        """Re-read the calibration files after a calibration run wrote them."""
+        self.store.reload(CAMERA_CALIBRATION, PERSPECTIVE_MATRIX, CAMERA_TO_ROBOT_MATRIX)
+        self.loadCameraCalibrationData()
+        self.loadPerspectiveMatrix()
+        self.loadCameraToRobotMatrix()
 
     def loadWorkAreaPoints(self):
-        try:
-            self.workAreaPoints = np.load(WORK_AREA_POINTS_PATH)
-            self.work_area_polygon = np.array(self.workAreaPoints, dtype=np.int32).reshape((-1, 1, 2))
+        if self.workAreaPoints is not None:
             self.isSystemCalibrated = True
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.INFO,
-                           message=f"Work area points loaded from: {WORK_AREA_POINTS_PATH}",
+                           message=f"Work area points loaded from: {self.store.path(WORK_AREA_POINTS)}",
                            broadcast_to_ui=False)
 
-        except FileNotFoundError:
-            self.workAreaPoints = None
+        else:
             self.isSystemCalibrated = False
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.ERROR,
-                           message=f"Work area points file not found at {WORK_AREA_POINTS_PATH}",
+                           message=f"Work area points file not found at {self.store.path(WORK_AREA_POINTS)}",
                            broadcast_to_ui=False)
 
         # Load pickup area points
-        try:
-            self.pickupAreaPoints = np.load(PICKUP_AREA_POINTS_PATH)
+        if self.pickupAreaPoints is not None:
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.INFO,
-                           message=f"Pickup area points loaded successfully from: {PICKUP_AREA_POINTS_PATH}",
+                           message=f"Pickup area points loaded successfully from: {self.store.path(PICKUP_AREA_POINTS)}",
                            broadcast_to_ui=False)
-        except FileNotFoundError:
-            self.pickupAreaPoints = None
+        else:
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.ERROR,
-                           message=f"Pickup area points file not found in {PICKUP_AREA_POINTS_PATH}- will be created when first saved",
+                           message=f"Pickup area points file not found in {self.store.path(PICKUP_AREA_POINTS)}- will be created when first saved",
                            broadcast_to_ui=False)
         # Load spray area points
-        try:
-            self.sprayAreaPoints = np.load(SPRAY_AREA_POINTS_PATH)
+        if self.sprayAreaPoints is not None:
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.INFO,
-                           message=f"Spray area points loaded successfully from: {SPRAY_AREA_POINTS_PATH}",
+                           message=f"Spray area points loaded successfully from: {self.store.path(SPRAY_AREA_POINTS)}",
                            broadcast_to_ui=False)
-        except FileNotFoundError:
-            self.sprayAreaPoints = None
+        else:
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.ERROR,
-                           message=f"Spray area points file not found in {SPRAY_AREA_POINTS_PATH} - will be created when first saved",
+                           message=f"Spray area points file not found in {self.store.path(SPRAY_AREA_POINTS)} - will be created when first saved",
                            broadcast_to_ui=False)
 
 
     def loadCameraToRobotMatrix(self):
-        try:
-            self.cameraToRobotMatrix = np.load(CAMERA_TO_ROBOT_MATRIX_PATH)
+        if self.cameraToRobotMatrix is not None:
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.INFO,
-                           message=f"Camera to Robot matrix loaded from: {CAMERA_TO_ROBOT_MATRIX_PATH}",
+                           message=f"Camera to Robot matrix loaded from: {self.store.path(CAMERA_TO_ROBOT_MATRIX)}",
                            broadcast_to_ui=False)
-        except FileNotFoundError:
-            self.cameraToRobotMatrix = None
+        else:
             self.isSystemCalibrated = True
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.ERROR,
-                           message=f"File not found: {CAMERA_TO_ROBOT_MATRIX_PATH}",
+                           message=f"File not found: {self.store.path(CAMERA_TO_ROBOT_MATRIX)}",
                            broadcast_to_ui=False)
             raise ValueError()
 
 
     def loadCameraCalibrationData(self):
-        try:
-            self.cameraData = np.load(CAMERA_DATA_PATH)
+        if self.cameraData is not None:
             self.isSystemCalibrated = True
-        except FileNotFoundError:
-            self.cameraData = None
+        else:
             self.isSystemCalibrated = False
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.ERROR,
-                           message=f"Camera calibration data file not found at {CAMERA_DATA_PATH}",
+                           message=f"Camera calibration data file not found at {self.store.path(CAMERA_CALIBRATION)}",
                            broadcast_to_ui=False)
 
 
     def loadPerspectiveMatrix(self):
-        try:
-            self.perspectiveMatrix = np.load(PERSPECTIVE_MATRIX_PATH)
-            print(f"✅ Perspective matrix loaded from: {PERSPECTIVE_MATRIX_PATH}")
-        except FileNotFoundError:
-            self.perspectiveMatrix = None
+        if self.perspectiveMatrix is not None:
+            print(f"✅ Perspective matrix loaded from: {self.store.path(PERSPECTIVE_MATRIX)}")
+        else:
             log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                            level=LoggingLevel.INFO,
-                           message=f"No perspective matrix found at: {PERSPECTIVE_MATRIX_PATH}",
+                           message=f"No perspective matrix found at: {self.store.path(PERSPECTIVE_MATRIX)}",
                            broadcast_to_ui=False)
 
 
@@ -170,33 +215,29 @@ class DataManager:
 
                 # Save to area-specific file
                 if area_type == 'pickup':
-                    np.save(PICKUP_AREA_POINTS_PATH, points_array)
-                    self.pickupAreaPoints = points_array
+                    self.store.save(PICKUP_AREA_POINTS, points_array)
                     message = f"Pickup area points saved successfully"
                     log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                                    level=LoggingLevel.INFO,
-                                   message=f"Saved pickup area points to {PICKUP_AREA_POINTS_PATH}",
+                                   message=f"Saved pickup area points to {self.store.path(PICKUP_AREA_POINTS)}",
                                    broadcast_to_ui=False)
                 else:  # spray
-                    np.save(SPRAY_AREA_POINTS_PATH, points_array)
+                    self.store.save(SPRAY_AREA_POINTS, points_array)
                     log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                                    level=LoggingLevel.INFO,
-                                   message=f"Saved spray area points to {PICKUP_AREA_POINTS_PATH}",
+                                   message=f"Saved spray area points to {self.store.path(SPRAY_AREA_POINTS)}",
                                    broadcast_to_ui=False)
-                    self.sprayAreaPoints = points_array
                     message = f"Spray area points saved successfully"
 
                 # Also save to legacy path for backward compatibility if this is the first area saved
-                if not hasattr(self, 'workAreaPoints') or self.workAreaPoints is None:
-                    np.save(WORK_AREA_POINTS_PATH, points_array)
-                    self.workAreaPoints = points_array
-                    self.work_area_polygon = np.array(self.workAreaPoints, dtype=np.int32).reshape((-1, 1, 2))
+                if self.workAreaPoints is None:
+                    self.store.save(WORK_AREA_POINTS, points_array)
                     log_if_enabled(enabled=self.ENABLE_LOGGING,
                                     logger=self.logger,
                                    level=LoggingLevel.INFO,
-                                   message=f"Also saved to legacy work area points at {WORK_AREA_POINTS_PATH}",
+                                   message=f"Also saved to legacy work area points at {self.store.path(WORK_AREA_POINTS)}",
                                    broadcast_to_ui=False)
 
                 return True, message
@@ -205,9 +246,7 @@ class DataManager:
             else:
                 points = data
                 points_array = np.array(points, dtype=np.float32)
-                np.save(WORK_AREA_POINTS_PATH, points_array)
-                self.workAreaPoints = points_array
-                self.work_area_polygon = np.array(self.workAreaPoints, dtype=np.int32).reshape((-1, 1, 2))
+                self.store.save(WORK_AREA_POINTS, points_array)
                 log_if_enabled(enabled=self.ENABLE_LOGGING,
                            logger=self.logger,
                                level=LoggingLevel.INFO,
@@ -247,4 +286,35 @@ class DataManager:
             print(f"Approx focal length: {f_mm:.2f} mm")
 
     def get_distortion_coefficients(self):
-        return self.cameraData['dist'] if self.cameraData is not None else None
\ No newline at end of file
+        return self.cameraData['dist'] if self.cameraData is not None else None
+
+
+def _work_area_polygon(points):
+    return None if points is None else np.array(points, dtype=np.int32).reshape((-1, 1, 2))
+
+
+def _inverse(matrix):
+    if matrix is None:
+        return None
+    inverse = np.linalg.inv(matrix)
+    inverse.flags.writeable = False
+    return inverse
+
+
+def _polygon_mask(points):
+    return PolygonMask(np.asarray(points, dtype=np.float32))
+
+
+def _correction_maps(camera_data, perspective, size, image_size):
+    if camera_data is None:
+        raise ValueError("No camera calibration data to undistort with")
+    mtx, dist = camera_data['mtx'], camera_data['dist']
+    # Same new camera matrix as ImageProcessing.undistortImage
+    new_camera_matrix, _ = cv2.getOptimalNewCameraMatrix(mtx, dist, size, 0.5, size)
+    map_x, map_y = cv2.initUndistortRectifyMap(mtx, dist, None, new_camera_matrix, image_size, cv2.CV_32FC1)
+    if perspective is not None:
+        # Output pixel p comes from undistorted pixel H^-1 p, which is how warpPerspective samples;
+        # -1 marks pixels from outside the frame, which remap leaves black
+        map_x = cv2.warpPerspective(map_x, perspective, size, flags=cv2.INTER_LINEAR, borderValue=-1)
+        map_y = cv2.warpPerspective(map_y, perspective, size, flags=cv2.INTER_LINEAR, borderValue=-1)
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
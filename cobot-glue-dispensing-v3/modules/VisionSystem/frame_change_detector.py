@@ -0,0 +1,88 @@
+"""
+Tells whether a camera frame shows the same scene as the last one that was processed.
+
+Frames are compared as small grayscale copies: area averaging over blocks of about 20x20
+pixels cancels most of the sensor noise, while a part entering, leaving or moving still
+changes at least one block by many grey levels. The comparison is against the frame of
+the last full detection rather than the previous frame, so slow drifts (lighting,
+exposure) add up until they trigger a new detection instead of being missed one small
+step at a time.
+
+The detector also keeps the result of that detection, together with a key describing
+everything else the result depends on (thresholds, calibration version, ...): the result
+is reused only while both the scene and the key are unchanged, and at most
+``max_reuse`` frames in a row.
+"""
+import cv2
+
+DEFAULT_SIZE = (64, 36)  # 20x20 pixel blocks at 1280x720
+DEFAULT_PIXEL_THRESHOLD = 8  # grey levels
+DEFAULT_MAX_REUSE = 50  # frames; a full detection at least every ~2 s at 25 fps
+
+
+class FrameChangeDetector:
+    """
+    Change detector with the result of the last full processing of a frame.
+
+    Attributes:
+        size (tuple): (width, height) of the grayscale copies that are compared.
+        pixel_threshold (int): Largest per-block difference, in grey levels, still
+            considered noise.
+        max_reuse (int): Frames in a row the result may be reused before a full
+            processing is required again.
+        result: What update() stored for the reference frame.
+    """
+
+    def __init__(self, size=DEFAULT_SIZE, pixel_threshold=DEFAULT_PIXEL_THRESHOLD, max_reuse=DEFAULT_MAX_REUSE):
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.max_reuse = max_reuse
+        self.result = None
+        self._reference = None
+        self._key = None
+        self._current = None
+        self._reused = 0
+
+    def _signature(self, image):
+        small = cv2.resize(image, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def is_unchanged(self, image, key=None):
+        """
+        Whether ``result`` can be used for ``image``.
+
+        Args:
+            image (np.ndarray): The new frame, BGR or grayscale.
+            key: Hashable description of the other inputs of the result; a different key
+                than at the last update() means the result is out of date.
+
+        Returns:
+            bool: True if the frame matches the reference frame, the key is the same and
+            the result was reused fewer than max_reuse times; the caller then uses
+            ``result``. Otherwise the caller processes the frame and calls update().
+        """
+        self._current = self._signature(image)
+        if self._reference is None or key != self._key or self._reused >= self.max_reuse:
+            return False
+        if self._current.shape != self._reference.shape:
+            return False
+        difference = cv2.absdiff(self._current, self._reference)
+        if int(difference.max()) > self.pixel_threshold:
+            return False
+        self._reused += 1
+        return True
+
+    def update(self, result, key=None):
+        """Makes the frame of the last is_unchanged() call the reference, with its result."""
+        self._reference = self._current
+        self._key = key
+        self.result = result
+        self._reused = 0
+
+    def reset(self):
+        """Forgets the reference frame, so the next frame is processed in full."""
+        self._reference = None
+        self.result = None
+        self._reused = 0
@@ -0,0 +1,220 @@
+"""
+Frame transport over shared memory, one copy in and one checked copy out.
+
+A SharedFrameChannel is a ring of frame slots in one ``multiprocessing.shared_memory``
+block. The vision loop writes each frame into the next slot and publishes only a small
+notification, {"channel": name, "seq": seq}, through the MessageBroker. Consumers in
+this process or in another process map the same block and read the newest frame from
+it, as a numpy view of the slot or as a checked copy.
+
+Each slot carries a sequence number, used as a seqlock. The writer makes it odd while
+it writes and sets it to the frame's (even) sequence number when done. A reader holding
+a view can call ``is_current`` afterwards: if the writer has started to reuse the slot,
+the read was torn and should be dropped. With three slots, a view stays valid for two
+further frames (about 66 ms at 30 fps), which is plenty for a resize or QImage upload.
+
+Layout: a header [magic, slots, slot_bytes, latest_seq], then per slot
+[seq, height, width, channels], then the slot data.
+"""
+
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+MAGIC = 0x46524D43  # "FRMC"
+HEADER_FIELDS = 4
+SLOT_FIELDS = 4
+DEFAULT_SLOTS = 3
+DEFAULT_CAPACITY = 1920 * 1080 * 3
+
+_open_channels = {}
+_open_lock = threading.Lock()
+
+
+class SharedFrameChannel:
+    """
+    Single-writer, multi-reader ring buffer of uint8 frames in shared memory.
+
+    Attributes:
+        name (str): Shared memory block name; readers attach with it.
+        slots (int): Number of frame slots (2 = double, 3 = triple buffering).
+        capacity (int): Bytes per slot, the largest frame the channel accepts.
+        copies (int): Frames copied into the channel by ``write`` (for benchmarking).
+    """
+
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self._owner = owner
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        if header[0] != MAGIC:
+            raise ValueError(f"Shared memory block {shm.name} is not a frame channel")
+        self._header = header
+        self.name = shm.name
+        self.slots = int(header[1])
+        self.capacity = int(header[2])
+        self._meta = np.ndarray((self.slots, SLOT_FIELDS), dtype=np.int64, buffer=shm.buf,
+                                offset=HEADER_FIELDS * 8)
+        data_offset = (HEADER_FIELDS + self.slots * SLOT_FIELDS) * 8
+        self._data = np.ndarray((self.slots, self.capacity), dtype=np.uint8, buffer=shm.buf, offset=data_offset)
+        self.copies = 0
+
+    @classmethod
+    def create(cls, name=None, capacity=DEFAULT_CAPACITY, slots=DEFAULT_SLOTS):
+        """Allocate a new channel; the creating process is the only writer."""
+        if slots < 2:
+            raise ValueError("A frame channel needs at least two slots")
+        size = (HEADER_FIELDS + slots * SLOT_FIELDS) * 8 + slots * capacity
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = (MAGIC, slots, capacity, 0)
+        np.ndarray((slots, SLOT_FIELDS), dtype=np.int64, buffer=shm.buf, offset=HEADER_FIELDS * 8)[:] = 0
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Map an existing channel for reading."""
+        if sys.version_info >= (3, 13):
+            return cls(shared_memory.SharedMemory(name=name, track=False), owner=False)
+        # Before Python 3.13 attaching registers the block with the resource tracker, which
+        # would unlink it when the reader exits and pull it from under the writer. A reader
+        # spawned by the writer shares its tracker, which then logs a KeyError when the
+        # writer unlinks the block; the block is removed all the same
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    # --- Writer ---
+    def write(self, frame):
+        """
+        Copy a frame into the next slot and return its sequence number.
+
+        This is the only copy a frame goes through; readers use views of the slot.
+        """
+        frame = np.ascontiguousarray(frame, dtype=np.uint8)
+        if frame.nbytes > self.capacity:
+            raise ValueError(f"Frame of {frame.nbytes} bytes exceeds channel capacity {self.capacity}")
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+
+        seq = int(self._header[3]) + 2
+        slot = (seq // 2) % self.slots
+        meta = self._meta[slot]
+        meta[0] = seq - 1  # odd: write in progress
+        self._data[slot, :frame.nbytes] = frame.reshape(-1)
+        meta[1:] = (height, width, channels)
+        meta[0] = seq
+        self._header[3] = seq
+        self.copies += 1
+        return seq
+
+    # --- Readers ---
+    @property
+    def latest_seq(self):
+        return int(self._header[3])
+
+    def read(self, seq=None):
+        """
+        Return (seq, view) of the newest frame, or of ``seq`` if that slot still holds it.
+
+        The view is read-only and aliases the shared slot; copy it to keep it longer than
+        a couple of frames. Returns (0, None) when no frame is available.
+        """
+        if seq is None:
+            seq = self.latest_seq
+        if seq <= 0:
+            return 0, None
+        slot = (seq // 2) % self.slots
+        meta = self._meta[slot]
+        if int(meta[0]) != seq:
+            return 0, None
+        height, width, channels = (int(v) for v in meta[1:])
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        view = self._data[slot, :height * width * channels].reshape(shape)
+        view.flags.writeable = False
+        return seq, view
+
+    def is_current(self, seq):
+        """True while the slot of ``seq`` has not been reused, i.e. a view read from it is intact."""
+        return seq > 0 and int(self._meta[(seq // 2) % self.slots][0]) == seq
+
+    def read_copy(self, seq=None):
+        """Copy of the newest frame, retried until the copy is not torn."""
+        while True:
+            seq_read, view = self.read(seq)
+            if view is None:
+                return 0, None
+            frame = view.copy()
+            if self.is_current(seq_read):
+                return seq_read, frame
+            if seq is not None:
+                return 0, None
+
+    def notification(self, seq):
+        """Broker payload announcing a frame."""
+        return {"channel": self.name, "seq": seq}
+
+    @property
+    def closed(self):
+        return self._data is None
+
+    def close(self):
+        """Unmap the channel; the writer also removes the shared memory block."""
+        if self.closed:
+            return
+        with _open_lock:
+            if _open_channels.get(self.name) is self:
+                del _open_channels[self.name]
+        self._header = self._meta = self._data = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # A reader still holds a view; the mapping goes away with the last view
+            pass
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def register_channel(channel):
+    """Make a channel created in this process resolvable by name (writers register themselves)."""
+    with _open_lock:
+        _open_channels[channel.name] = channel
+
+
+def open_channel(name):
+    """Return the channel called ``name``, attaching to it once per process."""
+    with _open_lock:
+        channel = _open_channels.get(name)
+        if channel is None:
+            channel = SharedFrameChannel.attach(name)
+            _open_channels[name] = channel
+        return channel
+
+
+def frame_from_message(message):
+    """
+    Resolve a broker image message to a frame.
+
+    Accepts a frame notification, the legacy {"image": frame} payload or a bare array.
+
+    Returns:
+        np.ndarray or None: A copy of the notified frame, or None when the writer reused its
+        slot before the copy was done (a newer notification follows); the given array for
+        the other payloads.
+    """
+    if message is None:
+        return None
+    if isinstance(message, np.ndarray):
+        return message
+    if "channel" in message:
+        try:
+            _, frame = open_channel(message["channel"]).read_copy(message.get("seq"))
+        except (FileNotFoundError, ValueError):
+            # The writer has replaced or closed the channel since the notification
+            return None
+        return frame
+    return message.get("image")
@@ -11,6 +11,14 @@ def capture_calibration_image(vision_system,log_enabled,logger):
                        broadcast_to_ui=False)
         return False, "No rawImage image captured for calibration"
 
+    if vision_system.frame_stale:
+        log_if_enabled(enabled=log_enabled,
+                       logger=logger,
+                       level=LoggingLevel.WARNING,
+                       message=f"Camera is reconnecting, not capturing a stale image for calibration",
+                       broadcast_to_ui=False)
+        return False, "Camera is reconnecting, try again when it is back"
+
     vision_system.calibrationImages.append(vision_system.rawImage)
     vision_system.message_publisher.publish_latest_image(vision_system.rawImage)
     log_if_enabled(enabled=log_enabled,
@@ -49,14 +57,9 @@ def calibrate_camera(vision_system,log_enabled,logger) -> tuple[bool, str]:
                    broadcast_to_ui=False)
 
     if result:
-        vision_system.cameraMatrix = calibrationData[1]
-        vision_system.cameraDist = calibrationData[0]
-        vision_system.perspectiveMatrix = perspectiveMatrix
-
-        # Reload calibration data to ensure we're using the latest files
-        vision_system.data_manager.loadCameraCalibrationData()
-        vision_system.data_manager.loadPerspectiveMatrix()
-        vision_system.data_manager.loadCameraToRobotMatrix()
+        # Reload calibration data to ensure we're using the latest files; the camera
+        # matrix, distortion and derived remap tables follow the calibration store
+        vision_system.data_manager.reloadCalibration()
 
         # Update system calibration status
         if vision_system.data_manager.cameraData is not None and vision_system.data_manager.cameraToRobotMatrix is not None:
@@ -1,12 +1,23 @@
 import cv2
-import numpy as np
 
-from libs.plvision.PLVision import Contouring
+from backend.system.utils.path_sequencing import sequence_contours
+from modules.shared.utils import metrics
 
+_FILTER_TIME = metrics.histogram("vision.filter_contours")
+_SPRAY_AREA_TIME = metrics.histogram("vision.spray_area_check")
+_PUBLISH_TIME = metrics.histogram("vision.publish")
+_CONTOURS = metrics.gauge("vision.contours")
+_REUSED_FRAMES = metrics.counter("vision.unchanged_frames")
 
-def findContours(vision_system, imageParam):
+
+@metrics.timed("vision.find_contours")
+def findContours(vision_system, imageParam, mode=cv2.RETR_EXTERNAL):
     """
     Converts an image to grayscale, applies thresholding, performs dilation and erosion, and finds contours.
+
+    Only the outer contours are retrieved by default: the detection treats every contour
+    as a separate part, so holes must not be reported. Pass mode=cv2.RETR_TREE (or
+    RETR_CCOMP) to get the inner contours as well.
     """
     gray = cv2.cvtColor(imageParam, cv2.COLOR_BGR2GRAY)
     # print("applied gray")
@@ -38,8 +49,6 @@ def findContours(vision_system, imageParam):
     # print(f"Using threshold {thresh_type} for area {self.threshold_by_area}")
     # print(f"Threshold = {threshold}")
     _, thresh = cv2.threshold(blur, threshold, 255, thresh_type)
-    unique_vals = np.unique(thresh)
-    # print("Unique pixel values in thresh:", unique_vals)
 
     vision_system.message_publisher.publish_thresh_image(thresh)
     # Apply dilation if enabled
@@ -59,8 +68,7 @@ def findContours(vision_system, imageParam):
     # Find contours on the processed image
     # cv2.imwrite("debug_thresh.png", thresh)
 
-    # contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    contours, hierarchy = cv2.findContours(thresh, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    contours, _ = cv2.findContours(thresh, mode, cv2.CHAIN_APPROX_SIMPLE)
     # print("Found contours:", len(contours))
 
     return contours
@@ -87,41 +95,63 @@ def filter_contours_by_area(vision_system, contours):
                         cv2.contourArea(cnt) < vision_system.camera_settings.get_max_contour_area()]
     return filteredContours
 
-# Squared distance function
-def sq_dist(p1, p2):
-    return (p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2
-
 def all_inside_spray_area(vision_system, contour):
-    for pt in contour:
-        if cv2.pointPolygonTest(
-            vision_system.data_manager.sprayAreaPoints.astype(np.float32),
-            (float(pt[0][0]), float(pt[0][1])),
-            False
-        ) < 0:
-            return False
-    return True
+    # The spray area mask is cached in the calibration store until the spray area changes
+    return vision_system.data_manager.get_spray_area_mask().contains_all(contour)
 
 def sort_contours_by_proximity(contours, start_point):
-    sorted_contours = []
-    current_point = start_point
-    remaining_contours = contours.copy()
-
-    while remaining_contours:
-        # Find the contour with the closest centroid to the current point
-        next_contour = min(
-            remaining_contours,
-            key=lambda cnt: sq_dist(Contouring.calculateCentroid(cnt), current_point)
-        )
-        sorted_contours.append(next_contour)
-        current_point = Contouring.calculateCentroid(next_contour)
-        remaining_contours.remove(next_contour)
+    """
+    Order contours to shorten travel between their centroids, starting at start_point.
 
+    Nearest neighbour on a KD-tree, refined by 2-opt within path_sequencing's time budget.
+    """
+    sorted_contours, _ = sequence_contours(contours, start_point=start_point)
     return sorted_contours
 
+def _detection_key(vision_system, sort):
+    """Every input of the detection besides the frame, for the change detector."""
+    settings = vision_system.camera_settings
+    store = getattr(vision_system.data_manager, "store", None)
+    area = vision_system.threshold_by_area
+    return (sort, vision_system.isSystemCalibrated, store.version if store is not None else None,
+            area, vision_system.get_thresh_by_area(area), settings.get_threshold_type(),
+            settings.get_gaussian_blur(), settings.get_blur_kernel_size(),
+            settings.get_dilate_enabled(), settings.get_dilate_kernel_size(), settings.get_dilate_iterations(),
+            settings.get_erode_enabled(), settings.get_erode_kernel_size(), settings.get_erode_iterations(),
+            settings.get_epsilon(), settings.get_min_contour_area(), settings.get_max_contour_area())
+
+def detect_contours(vision_system, sort=False):
+    """
+    Find the contours in the corrected image, filter them and keep those inside the spray area.
+    Returns the list of contours, sorted by proximity if sort is True.
+    """
+    contours = findContours(vision_system, vision_system.correctedImage)
+    with _FILTER_TIME.time():
+        approx_contours = approxContours(vision_system, contours)
+        filtered_contours = filter_contours_by_area(vision_system, approx_contours)
+
+    contours_inside_spray_area = []
+    with _SPRAY_AREA_TIME.time():
+        for cnt in filtered_contours:
+
+            if all_inside_spray_area(vision_system, cnt):
+                contours_inside_spray_area.append(cnt)
+
+    if sort is True and contours_inside_spray_area:
+        # --- Sort contours by proximity (using helper) ---
+        top_left = (0, 0)
+        return sort_contours_by_proximity(contours_inside_spray_area, start_point=top_left)
+    return contours_inside_spray_area
+
+@metrics.timed("vision.contour_detection")
 def handle_contour_detection(vision_system,sort=False):
     """
     Detect, filter, and sort contours in the image.
     Returns (sorted_contours, corrected_image, None)
+
+    If the vision system has a change_detector and the frame shows the same scene as the
+    last detected one, with the same settings, the contours of that detection are
+    returned again (as copies) and the threshold image is not published again.
     """
     # --- Step 1: Calibration handling ---
     if vision_system.isSystemCalibrated:
@@ -138,35 +168,28 @@ def handle_contour_detection(vision_system,sort=False):
         )
         vision_system.correctedImage = vision_system.image
 
-    # --- Step 2: Find and filter contours ---
-    contours = findContours(vision_system, vision_system.correctedImage)
-    approx_contours = approxContours(vision_system, contours)
-    filtered_contours = filter_contours_by_area(vision_system, approx_contours)
-
-    contours_inside_spray_area = []
-    for cnt in filtered_contours:
-
-        if all_inside_spray_area(vision_system, cnt):
-            contours_inside_spray_area.append(cnt)
+    # --- Step 2: Find, filter and sort contours, unless the scene has not changed ---
+    detector = getattr(vision_system, "change_detector", None)
+    key = _detection_key(vision_system, sort) if detector is not None else None
+    if detector is not None and detector.is_unchanged(vision_system.image, key):
+        _REUSED_FRAMES.inc()
+        final_contours = [cnt.copy() for cnt in detector.result]
+    else:
+        final_contours = detect_contours(vision_system, sort)
+        if detector is not None:
+            detector.update([cnt.copy() for cnt in final_contours], key)
 
-    if not contours_inside_spray_area:
+    _CONTOURS.set(len(final_contours))
+    if not final_contours:
         return None, vision_system.correctedImage, None
 
-    final_contours = None
-    if sort is True:
-        # --- Step 3: Sort contours by proximity (using helper) ---
-        top_left = (0, 0)
-        contours_sorted = sort_contours_by_proximity(contours_inside_spray_area, start_point=top_left)
-        final_contours = contours_sorted
-    else:
-        final_contours = contours_inside_spray_area
-
     # --- Step 4: Optional visualization ---
     if vision_system.camera_settings.get_draw_contours():
         cv2.drawContours(vision_system.correctedImage, final_contours, -1, (0, 255, 0), 1)
 
     # --- Step 5: Publish latest image ---
-    vision_system.message_publisher.publish_latest_image(vision_system.correctedImage)
+    with _PUBLISH_TIME.time():
+        vision_system.message_publisher.publish_latest_image(vision_system.correctedImage)
 
     return final_contours, vision_system.correctedImage, None
 
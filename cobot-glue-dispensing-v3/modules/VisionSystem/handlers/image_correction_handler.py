@@ -0,0 +1,18 @@
+import cv2
+
+from modules.shared.utils import metrics
+
+
+@metrics.timed("vision.correct_image")
+def correct_image(vision_system, image):
+    """
+    Undistorts and applies perspective correction to the given image.
+
+    Both are one cv2.remap with tables the data manager builds once per calibration and
+    frame size, instead of cv2.undistort computing the undistortion for every frame and
+    cv2.warpPerspective interpolating the result a second time.
+    """
+    width = vision_system.camera_settings.get_camera_width()
+    height = vision_system.camera_settings.get_camera_height()
+    map1, map2 = vision_system.data_manager.get_correction_maps(width, height, (image.shape[1], image.shape[0]))
+    return cv2.remap(image, map1, map2, cv2.INTER_LINEAR)
@@ -1,5 +1,9 @@
+import atexit
+import os
+
 from communication_layer.api.v1.topics import VisionTopics
 from modules.shared.MessageBroker import MessageBroker
+from modules.VisionSystem.frame_channel import SharedFrameChannel, register_channel
 class MessagePublisher:
     def __init__(self):
         self.broker= MessageBroker()
@@ -7,20 +11,48 @@ class MessagePublisher:
         self.calibration_image_captured_topic = VisionTopics.CALIBRATION_IMAGE_CAPTURED
         self.thresh_image_topic = VisionTopics.THRESHOLD_IMAGE
         self.stateTopic = VisionTopics.SERVICE_STATE
+        self.camera_health_topic = VisionTopics.CAMERA_HEALTH
         self.topic = VisionTopics.CALIBRATION_FEEDBACK
+        # Frames go through shared memory channels; the broker only carries {"channel", "seq"}
+        self.frame_channels = {}
+
+    def _channel_for(self, key, frame):
+        """Shared memory channel for a frame stream, (re)allocated when a frame outgrows it."""
+        channel = self.frame_channels.get(key)
+        if channel is not None and channel.capacity >= frame.nbytes:
+            return channel
+        generation = 0 if channel is None else int(channel.name.rsplit("_", 1)[1]) + 1
+        if channel is not None:
+            channel.close()
+        channel = SharedFrameChannel.create(name=f"cobot_{key}_{os.getpid()}_{generation}", capacity=frame.nbytes)
+        register_channel(channel)
+        atexit.register(channel.close)
+        self.frame_channels[key] = channel
+        return channel
+
+    def _publish_frame(self, topic, key, frame):
+        if frame is None:
+            self.broker.publish(topic, {"image": None})
+            return
+        channel = self._channel_for(key, frame)
+        seq = channel.write(frame)
+        self.broker.publish(topic, channel.notification(seq))
 
     def publish_latest_image(self,image):
-        self.broker.publish(self.latest_image_topic, {"image": image})
+        self._publish_frame(self.latest_image_topic, "latest", image)
 
     def publish_calibration_image_captured(self,calibration_images):
         self.broker.publish(self.calibration_image_captured_topic, calibration_images)
 
     def publish_thresh_image(self,thresh_image):
-        self.broker.publish(self.thresh_image_topic, thresh_image)
+        self._publish_frame(self.thresh_image_topic, "threshold", thresh_image)
 
     def publish_state(self,state):
         # print("[VisionMessagePublisher] Publishing vision service state:", state)
         self.broker.publish(self.stateTopic, state)
 
+    def publish_camera_health(self,health):
+        self.broker.publish(self.camera_health_topic, health)
+
     def publish_calibration_feedback(self,feedback):
-        self.broker.publish(self.topic, feedback)
\ No newline at end of file
+        self.broker.publish(self.topic, feedback)
@@ -0,0 +1,105 @@
+"""
+Tells when the camera scene has settled, so callers can read the contours as soon as
+they are trustworthy instead of sleeping for a fixed time after moving the robot or
+switching the brightness region.
+
+A frame counts as settled when auto-brightness (if enabled) is within a few grey levels
+of its target and the detected contours match those of the previous frame (same number,
+bounding boxes within a few pixels). The scene is stable once ``stable_frames`` settled
+frames follow each other; any other frame starts the count again.
+
+The vision thread calls update() for every processed frame. A caller calls reset() after
+changing the scene (or lets wait_until_stable() do it) and then blocks on the "scene
+stable" event, with a timeout for scenes that never settle.
+"""
+import threading
+
+import cv2
+
+DEFAULT_STABLE_FRAMES = 5  # ~0.2 s at 25 fps
+DEFAULT_BRIGHTNESS_TOLERANCE = 3.0  # grey levels from the target brightness
+DEFAULT_CONTOUR_TOLERANCE = 3  # pixels, per bounding box coordinate
+
+
+class SceneStabilityTracker:
+    """
+    Counts consecutive settled frames and signals when the scene is stable.
+
+    Attributes:
+        stable_frames (int): Settled frames in a row needed for a stable scene.
+        brightness_tolerance (float): Largest brightness error, in grey levels, of a settled frame.
+        contour_tolerance (int): Largest bounding box change, in pixels, of a settled frame.
+        settled_frames (int): Settled frames in a row so far.
+    """
+
+    def __init__(self, stable_frames=DEFAULT_STABLE_FRAMES, brightness_tolerance=DEFAULT_BRIGHTNESS_TOLERANCE,
+                 contour_tolerance=DEFAULT_CONTOUR_TOLERANCE):
+        self.stable_frames = stable_frames
+        self.brightness_tolerance = brightness_tolerance
+        self.contour_tolerance = contour_tolerance
+        self.settled_frames = 0
+        self._previous_boxes = None
+        self._lock = threading.Lock()
+        self._stable = threading.Event()
+
+    def _boxes(self, contours):
+        return sorted(cv2.boundingRect(contour) for contour in contours or [])
+
+    def _same_contours(self, boxes):
+        previous = self._previous_boxes
+        if previous is None or len(previous) != len(boxes):
+            return False
+        return all(abs(a - b) <= self.contour_tolerance
+                   for box, previous_box in zip(boxes, previous) for a, b in zip(box, previous_box))
+
+    def update(self, contours, brightness_error=None):
+        """
+        Account for one processed frame.
+
+        Args:
+            contours (list): The contours detected in the frame (None or [] for none).
+            brightness_error (float): Target minus measured brightness, None when
+                auto-brightness is off.
+
+        Returns:
+            bool: Whether the scene is stable.
+        """
+        boxes = self._boxes(contours)
+        with self._lock:
+            brightness_settled = brightness_error is None or abs(brightness_error) <= self.brightness_tolerance
+            if brightness_settled and self._same_contours(boxes):
+                self.settled_frames += 1
+            else:
+                self.settled_frames = 0
+            self._previous_boxes = boxes
+            if self.settled_frames >= self.stable_frames:
+                self._stable.set()
+            else:
+                self._stable.clear()
+            return self._stable.is_set()
+
+    def reset(self):
+        """Forget the frames seen so far: only frames after this call count."""
+        with self._lock:
+            self.settled_frames = 0
+            self._previous_boxes = None
+            self._stable.clear()
+
+    def is_stable(self):
+        return self._stable.is_set()
+
+    def wait_until_stable(self, timeout=None, reset=True):
+        """
+        Block until the scene is stable.
+
+        Args:
+            timeout (float): Seconds to wait at most; None waits indefinitely.
+            reset (bool): Start counting from the next frame, for a scene that was just
+                changed. False accepts a scene that is already stable.
+
+        Returns:
+            bool: True if the scene became stable, False on timeout.
+        """
+        if reset:
+            self.reset()
+        return self._stable.wait(timeout)
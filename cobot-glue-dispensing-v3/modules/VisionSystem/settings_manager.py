@@ -3,7 +3,6 @@ import os
 
 from backend.system.settings.enums.CameraSettingKey import CameraSettingKey
 from backend.system.utils.custom_logging import log_if_enabled, LoggingLevel
-from libs.plvision.PLVision.Camera import Camera
 
 CONFIG_FILE_PATH = os.path.join(os.path.dirname(__file__), 'config.json') # this is just a default path if not path provided
 
@@ -39,11 +38,11 @@ class SettingsManager:
             if (CameraSettingKey.WIDTH.value in settings or
                     CameraSettingKey.HEIGHT.value in settings or
                     CameraSettingKey.INDEX.value in settings):
-                # Reinitialize camera with new settings
-                vision_system.camera = Camera(
-                    vision_system.camera_settings.get_camera_index(),
-                    vision_system.camera_settings.get_camera_width(),
-                    vision_system.camera_settings.get_camera_height()
+                # Reopen the camera with the new settings
+                vision_system.camera.reconfigure(
+                    camera_index=vision_system.camera_settings.get_camera_index(),
+                    width=vision_system.camera_settings.get_camera_width(),
+                    height=vision_system.camera_settings.get_camera_height()
                 )
 
             log_if_enabled(enabled=logging_enabled,
@@ -5,6 +5,10 @@ import logging
 from applications.glue_dispensing_application.services.glueSprayService.motorControl.errorCodes import \
     ModbusExceptionType
 from modules.modbusCommunication.modbus_lock import modbus_lock
+from modules.shared.utils import metrics
+
+# Failed transaction attempts, retried or not; the timings include the retries
+_FAILED_ATTEMPTS = metrics.counter("modbus.failed_attempts")
 
 class ModbusClient:
     """
@@ -34,6 +38,7 @@ class ModbusClient:
         self.client.serial.timeout = timeout
         self.client.serial.parity = parity
 
+    @metrics.timed("modbus.write_register")
     def writeRegister(self, register, value, signed=False):
         maxAttempts = 30
         attempts = 0
@@ -44,6 +49,7 @@ class ModbusClient:
                     print(f"ModbusClient.writeRegister - > Wrote {value} to register {register}")
                     return None  # Success
                 except Exception as e:
+                    _FAILED_ATTEMPTS.inc()
                     modbus_error = ModbusExceptionType.from_exception(e)
                     print(f"ModbusClient.writeRegister -> Error writing register {register}: {e} - {modbus_error.name}: {modbus_error.description()}")
                     # if modbus_error == ModbusExceptionType.CHECKSUM_ERROR:
@@ -58,6 +64,7 @@ class ModbusClient:
         
         return ModbusExceptionType.MODBUS_EXCEPTION  # Fallback
 
+    @metrics.timed("modbus.write_registers")
     def writeRegisters(self, start_register, values):
         maxAttempts = 30
         attempts = 0
@@ -70,6 +77,7 @@ class ModbusClient:
                     # print("Written registers successfully")
                     return None  # Success
                 except Exception as e:
+                    _FAILED_ATTEMPTS.inc()
                     modbus_error = ModbusExceptionType.from_exception(e)
 
                     # if modbus_error != ModbusExceptionType.CHECKSUM_ERROR:
@@ -84,6 +92,7 @@ class ModbusClient:
 
         return ModbusExceptionType.MODBUS_EXCEPTION  # Fallback
 
+    @metrics.timed("modbus.read_registers")
     def readRegisters(self, start_register, count):
         maxAttempts = 30
         attempts = 0
@@ -94,6 +103,7 @@ class ModbusClient:
                     values = self.client.read_registers(start_register, count)
                     return values, None  # Success - return values and no error
                 except Exception as e:
+                    _FAILED_ATTEMPTS.inc()
                     print(f"ModbusClient.readRegisters -> Error reading registers: {e}")
                     modbus_error = ModbusExceptionType.from_exception(e)
                     
@@ -106,6 +116,7 @@ class ModbusClient:
         
         return None, ModbusExceptionType.MODBUS_EXCEPTION  # Fallback
 
+    @metrics.timed("modbus.read_register")
     def read(self, register):
         maxAttempts = 30
         attempts = 0
@@ -116,6 +127,7 @@ class ModbusClient:
                     # print(f"Read value: {value} from register: {register}")
                     return value, None  # Success - return value and no error
                 except Exception as e:
+                    _FAILED_ATTEMPTS.inc()
                     modbus_error = ModbusExceptionType.from_exception(e)
                     
                     if modbus_error == ModbusExceptionType.CHECKSUM_ERROR:
@@ -127,10 +139,12 @@ class ModbusClient:
         
         return None, ModbusExceptionType.MODBUS_EXCEPTION  # Fallback
 
+    @metrics.timed("modbus.read_bit")
     def readBit(self,address,functioncode=1):
         with modbus_lock:
             return self.client.read_bit(address,functioncode=functioncode)
 
+    @metrics.timed("modbus.write_bit")
     def writeBit(self,address,value):
         maxAttempts = 30
         attempts = 0
@@ -140,6 +154,7 @@ class ModbusClient:
                     self.client.write_bit(address, value)
                     break
                 except minimalmodbus.ModbusException as e:
+                    _FAILED_ATTEMPTS.inc()
                     if "Checksum error in rtu mode" in str(e):
                         import traceback
                         traceback.print_exc()
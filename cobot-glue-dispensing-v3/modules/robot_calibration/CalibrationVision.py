@@ -23,6 +23,17 @@ class FindRequiredMarkersResult:
     found:bool
     frame:np.ndarray
 
+ROI_MARGIN = 1.5  # Margin around a predicted marker position, in marker sizes
+MAX_ROI_FRACTION = 0.5  # Detect in the full frame when the predicted region would be larger than this
+
+
+def marker_index(ids):
+    """Marker id -> its index in the corners of a detection, built once per detection."""
+    if ids is None:
+        return {}
+    return {int(marker_id): i for i, marker_id in enumerate(np.asarray(ids).reshape(-1))}
+
+
 class CalibrationVision:
     def __init__(self, system, chessboard_size, square_size_mm,required_ids, logger_context,debug_draw,debug):
         self.bottom_left_chessboard_corner_px = None
@@ -38,7 +49,10 @@ class CalibrationVision:
         self.detected_ids = set()
         self.marker_top_left_corners = {}
         self.marker_top_left_corners_mm = {}
+        self.marker_corners_px = {}  # Last seen corners of each marker, to predict where to look for it
         self.PPM = None
+        self._last_ids = None
+        self._last_index = {}
 
 
     def find_chessboard_and_compute_ppm(self, frame) -> ChessboardDetectionResult:
@@ -126,26 +140,12 @@ class CalibrationVision:
     def __compute_ppm_from_corners(self, corners_refined):
         """Compute pixels-per-mm from chessboard corners"""
         cols, rows = self.chessboard_size
-        horiz, vert = [], []
-        # corners_refined has shape (n_corners, 1, 2), so we need to access [i, 0]
-        for r in range(rows):  # horizontal neighbors
-            base = r * cols
-            for c in range(cols - 1):
-                i1 = base + c
-                i2 = base + c + 1
-                pt1 = corners_refined[i1, 0]  # Extract (x, y) coordinates
-                pt2 = corners_refined[i2, 0]  # Extract (x, y) coordinates
-                horiz.append(np.linalg.norm(pt2 - pt1))
-
-        for r in range(rows - 1):  # vertical neighbors
-            for c in range(cols):
-                i1 = r * cols + c
-                i2 = (r + 1) * cols + c
-                pt1 = corners_refined[i1, 0]  # Extract (x, y) coordinates
-                pt2 = corners_refined[i2, 0]  # Extract (x, y) coordinates
-                vert.append(np.linalg.norm(pt2 - pt1))
-
-        all_d = np.array(horiz + vert, dtype=np.float32)
+        # corners_refined has shape (n_corners, 1, 2), row by row
+        grid = corners_refined.reshape(rows, cols, 2)
+        horiz = np.linalg.norm(np.diff(grid, axis=1), axis=-1)  # horizontal neighbors
+        vert = np.linalg.norm(np.diff(grid, axis=0), axis=-1)  # vertical neighbors
+
+        all_d = np.concatenate([horiz.ravel(), vert.ravel()]).astype(np.float32)
         if all_d.size == 0:
             return None
 
@@ -164,9 +164,10 @@ class CalibrationVision:
             log_debug_message(self.logger_context, f"Detected {len(arucoIds)} ArUco markers")
             log_debug_message(self.logger_context, f"Marker IDs: {arucoIds.flatten()}")
 
-            for i, marker_id in enumerate(arucoIds.flatten()):
+            for marker_id, i in marker_index(arucoIds).items():
                 if marker_id in self.required_ids:
                     self.detected_ids.add(marker_id)
+                    self.marker_corners_px[marker_id] = arucoCorners[i][0]
                     # Get top-left corner (first corner) of the ArUco marker
                     top_left_corner = tuple(arucoCorners[i][0][0].astype(int))
                     self.marker_top_left_corners[marker_id] = top_left_corner
@@ -185,19 +186,21 @@ class CalibrationVision:
         return FindRequiredMarkersResult(found=False, frame=frame)
 
     def update_marker_top_left_corners(self, marker_id, corners, ids):
-        for i, iter_marker_id in enumerate(ids.flatten()):
-            if iter_marker_id != marker_id:
-                continue
-            # update marker top-left corner in pixels
-            top_left_corner_px = tuple(corners[i][0][0].astype(int))
-            self.marker_top_left_corners[marker_id] = top_left_corner_px
-
-            # Convert to mm relative to bottom-left of chessboard, keep Y downwards!
-            x_mm = (top_left_corner_px[0] - self.bottom_left_chessboard_corner_px[0]) / self.PPM
-            y_mm = (top_left_corner_px[1] - self.bottom_left_chessboard_corner_px[1]) / self.PPM  # <-- image-space mm
-
-            # update marker top-left corner in mm
-            self.marker_top_left_corners_mm[marker_id] = (x_mm, y_mm)
+        # The index of the last detection is reused when these are its ids
+        index = self._last_index if ids is self._last_ids else marker_index(ids)
+        i = index.get(int(marker_id))
+        if i is None:
+            return
+        # update marker top-left corner in pixels
+        top_left_corner_px = tuple(corners[i][0][0].astype(int))
+        self.marker_top_left_corners[marker_id] = top_left_corner_px
+
+        # Convert to mm relative to bottom-left of chessboard, keep Y downwards!
+        x_mm = (top_left_corner_px[0] - self.bottom_left_chessboard_corner_px[0]) / self.PPM
+        y_mm = (top_left_corner_px[1] - self.bottom_left_chessboard_corner_px[1]) / self.PPM  # <-- image-space mm
+
+        # update marker top-left corner in mm
+        self.marker_top_left_corners_mm[marker_id] = (x_mm, y_mm)
 
     # def update_marker_top_left_corners(self, marker_id, corners, ids):
     #     for i, iter_marker_id in enumerate(ids.flatten()):
@@ -214,12 +217,51 @@ class CalibrationVision:
     #         # update marker top-left corner in mm
     #         self.marker_top_left_corners_mm[marker_id] = (x_mm, y_mm)
 
+    def predict_marker_roi(self, marker_id, frame_shape):
+        """
+        Region of the frame to look for a known marker in, as (x0, y0, x1, y1), or None to
+        use the whole frame.
+
+        The region covers where the marker was last seen and where the alignment moves it
+        (its top-left corner to the image center), plus a margin of ROI_MARGIN marker sizes.
+        """
+        corners = self.marker_corners_px.get(int(marker_id))
+        if corners is None:
+            return None
+        height, width = frame_shape[:2]
+        corners = np.asarray(corners, dtype=np.float32).reshape(-1, 2)
+        target = corners - corners[0] + (width // 2, height // 2)
+        points = np.vstack([corners, target])
+        margin = ROI_MARGIN * float(np.ptp(corners, axis=0).max())
+        x0, y0 = np.maximum(np.floor(points.min(axis=0) - margin), 0).astype(int)
+        x1, y1 = np.minimum(np.ceil(points.max(axis=0) + margin), (width, height)).astype(int)
+        if (x1 - x0) * (y1 - y0) > MAX_ROI_FRACTION * width * height:
+            return None
+        return x0, y0, x1, y1
+
     def detect_specific_marker(self, frame, marker_id) -> SpecificMarkerDetectionResult :
-        marker_found = False
-        arucoCorners, arucoIds, image = self.system.detectArucoMarkers(image=frame)
         log_debug_message(self.logger_context, f"Detection loop for specific marker {marker_id}")
-        if arucoIds is not None and marker_id in arucoIds:
-            marker_found = True
+        arucoIds = None
+        roi = self.predict_marker_roi(marker_id, frame.shape)
+        if roi is not None:
+            # Look where the marker is expected first; the corners are shifted back to frame coordinates
+            x0, y0, x1, y1 = roi
+            arucoCorners, arucoIds, image = self.system.detectArucoMarkers(image=frame[y0:y1, x0:x1])
+            index = marker_index(arucoIds)
+            if int(marker_id) in index:
+                offset = np.array([x0, y0], dtype=np.float32)
+                arucoCorners = tuple(corners + offset for corners in arucoCorners)
+            else:
+                log_debug_message(self.logger_context, f"Marker {marker_id} not in its predicted region {roi}")
+                arucoIds = None
+        if arucoIds is None:
+            arucoCorners, arucoIds, image = self.system.detectArucoMarkers(image=frame)
+            index = marker_index(arucoIds)
+
+        marker_found = int(marker_id) in index
+        if marker_found:
+            self.marker_corners_px[int(marker_id)] = arucoCorners[index[int(marker_id)]][0]
+        self._last_ids, self._last_index = arucoIds, index
         return SpecificMarkerDetectionResult(found=marker_found,
                                              aruco_corners=arucoCorners,
                                              aruco_ids=arucoIds,
@@ -5,6 +5,7 @@ import cv2
 import numpy as np
 
 from backend.system.utils.custom_logging import log_warning_message
+from modules.VisionSystem.calibration_store import get_calibration_store, CAMERA_TO_ROBOT_MATRIX
 from modules.VisionSystem.data_loading import CAMERA_TO_ROBOT_MATRIX_PATH
 from modules.robot_calibration import metrics, visualizer
 from modules.robot_calibration.CalibrationVision import CalibrationVision
@@ -635,7 +636,8 @@ class RobotCalibrationPipeline:
         )
 
         if average_error_camera_center <= 1:
-            np.save(CAMERA_TO_ROBOT_MATRIX_PATH, H_camera_center)
+            # Through the calibration store, so the vision system picks up the new homography
+            get_calibration_store().save(CAMERA_TO_ROBOT_MATRIX, H_camera_center)
             log_info_message(self.logger_context, message=f"Saved homography matrix to {CAMERA_TO_ROBOT_MATRIX_PATH}")
         else:
             log_warning_message(self.logger_context, message="High reprojection error — recalibration suggested")
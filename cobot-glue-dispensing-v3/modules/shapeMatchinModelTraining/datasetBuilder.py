@@ -0,0 +1,242 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from modules.shapeMatchinModelTraining.featuresExtraction import compute_contour_descriptor, \
+    compute_features_from_descriptors, get_descriptor_layout, get_feature_extraction_metadata
+
+# ======================================================
+# 🏭 Sharded Feature Dataset Building
+# ======================================================
+# Building a training set used to mean computing compute_enhanced_features for every
+# pair, so a contour's Harris corners, curvature histogram, moments, ... were
+# recomputed for every pair it appeared in, and the features were kept in Python lists.
+#
+# build_feature_dataset runs as a process-pool job over an output directory:
+#   contour_points.npy / contour_offsets.npy   all contours, concatenated
+#   pairs.npy                                  (i, j, label) contour indices per pair
+#   descriptors/chunk_*.npy                    per-contour descriptors, computed once
+#   features/chunk_*.npy                       float32 pair features, one file per shard
+#   manifest.json                              parameters, checked when resuming
+#
+# Each shard is written to a temporary file and renamed when complete, so an
+# interrupted build resumes by skipping the chunks that already exist.
+
+FEATURE_DTYPE = np.float32
+MANIFEST_FILE = "manifest.json"
+
+
+def generate_balanced_pair_indices(object_ids, n_pairs=None, seed=0):
+    """
+    Balanced positive / negative pairs as contour indices, like generate_balanced_pairs.
+
+    Positives are all same-object combinations; negatives are sampled from the
+    different-object pairs instead of being enumerated, which is quadratic in the
+    number of contours.
+
+    Args:
+        object_ids: Object id of every contour.
+        n_pairs: Total number of pairs, half positive; defaults to twice the positives.
+        seed: Random seed, so a resumed build regenerates the same pairs.
+
+    Returns:
+        np.ndarray: (N, 3) int32 array of (first contour, second contour, label), shuffled.
+    """
+    rng = np.random.default_rng(seed)
+    object_ids = np.asarray(object_ids)
+    _, groups = np.unique(object_ids, return_inverse=True)
+
+    positives = []
+    for group in np.unique(groups):
+        members = np.flatnonzero(groups == group)
+        first, second = np.triu_indices(len(members), k=1)
+        positives.append(np.column_stack([members[first], members[second]]))
+    positives = np.vstack(positives) if positives else np.zeros((0, 2), dtype=np.int64)
+
+    n_half = len(positives) if n_pairs is None else n_pairs // 2
+    if n_half > len(positives):
+        raise ValueError(f"Requested {n_half:,} positive pairs but the dataset only has {len(positives):,}")
+    positives = positives[rng.choice(len(positives), n_half, replace=False)]
+
+    group_sizes = np.bincount(groups)
+    available = (len(object_ids) ** 2 - int((group_sizes ** 2).sum())) // 2
+    if n_half > available:
+        raise ValueError(f"Requested {n_half:,} negative pairs but the dataset only has {available:,}")
+    negatives = np.zeros((0, 2), dtype=np.int64)
+    while len(negatives) < n_half:
+        candidates = rng.integers(0, len(object_ids), size=(2 * (n_half - len(negatives)) + 16, 2))
+        candidates = candidates[groups[candidates[:, 0]] != groups[candidates[:, 1]]]
+        candidates.sort(axis=1)
+        negatives = np.unique(np.vstack([negatives, candidates]), axis=0)
+    negatives = negatives[rng.permutation(len(negatives))[:n_half]]
+
+    pairs = np.vstack([np.column_stack([positives, np.ones(n_half, dtype=np.int64)]),
+                       np.column_stack([negatives, np.zeros(n_half, dtype=np.int64)])])
+    return pairs[rng.permutation(len(pairs))].astype(np.int32)
+
+
+def _save_atomic(path, array):
+    tmp_path = f"{path}.tmp.npy"
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+def _chunk_path(output_dir, kind, index):
+    return os.path.join(output_dir, kind, f"chunk_{index:05d}.npy")
+
+
+# Worker state, loaded once per process by _init_worker
+_worker = {}
+
+
+def _init_worker(output_dir, n_curv_bins):
+    _worker["points"] = np.load(os.path.join(output_dir, "contour_points.npy"), mmap_mode="r")
+    _worker["offsets"] = np.load(os.path.join(output_dir, "contour_offsets.npy"))
+    _worker["output_dir"] = output_dir
+    _worker["n_curv_bins"] = n_curv_bins
+    _worker["descriptors"] = None
+
+
+def _contour(index):
+    offsets = _worker["offsets"]
+    return np.array(_worker["points"][offsets[index]:offsets[index + 1]]).reshape(-1, 1, 2)
+
+
+def _descriptor_shard(shard):
+    index, start, stop = shard
+    descriptors = np.stack([compute_contour_descriptor(_contour(i), _worker["n_curv_bins"])
+                            for i in range(start, stop)])
+    _save_atomic(_chunk_path(_worker["output_dir"], "descriptors", index), descriptors)
+    return index
+
+
+def _feature_shard(shard):
+    index, pairs = shard
+    if _worker["descriptors"] is None:
+        _worker["descriptors"] = load_chunks(_worker["output_dir"], "descriptors")
+    descriptors = _worker["descriptors"]
+    features = np.stack([
+        compute_features_from_descriptors(_contour(i), _contour(j), descriptors[i], descriptors[j],
+                                          _worker["n_curv_bins"])
+        for i, j, _ in pairs
+    ]).astype(FEATURE_DTYPE)
+    _save_atomic(_chunk_path(_worker["output_dir"], "features", index), features)
+    return index
+
+
+def _run_shards(function, shards, workers, output_dir, n_curv_bins, label):
+    """Run the shards on a process pool (or inline for one worker), reporting progress"""
+    if not shards:
+        return
+    print(f"🔄 {label}: {len(shards):,} shards on {workers} worker(s)...")
+    if workers <= 1:
+        _init_worker(output_dir, n_curv_bins)
+        results = map(function, shards)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(output_dir, n_curv_bins))
+        results = executor.map(function, shards)
+    try:
+        for done, _ in enumerate(results, 1):
+            if done % 10 == 0 or done == len(shards):
+                print(f"   📈 {label}: {done:,}/{len(shards):,} shards ({done / len(shards) * 100:.1f}%)")
+    finally:
+        if workers > 1:
+            executor.shutdown()
+
+
+def load_chunks(output_dir, kind):
+    """Concatenate the chunk files of one kind ("descriptors" or "features") in order"""
+    folder = os.path.join(output_dir, kind)
+    files = sorted(f for f in os.listdir(folder) if f.startswith("chunk_") and not f.endswith(".tmp.npy"))
+    return np.concatenate([np.load(os.path.join(folder, f)) for f in files])
+
+
+def build_feature_dataset(dataset, output_dir, n_pairs=None, shard_size=2000, workers=None, n_curv_bins=16,
+                          seed=0):
+    """
+    Compute training features for balanced contour pairs, resumably, on a process pool.
+
+    Args:
+        dataset: SyntheticContour samples (anything with .contour and .object_id).
+        output_dir: Directory for the chunks; an existing build there is resumed.
+        n_pairs: Total number of pairs (half positive); defaults to all positive pairs
+            plus as many negatives.
+        shard_size: Pairs (or contours) per shard and chunk file.
+        workers: Worker processes, defaults to the CPU count capped at 8.
+        n_curv_bins: Curvature histogram bins.
+        seed: Seed of the pair sampling.
+
+    Returns:
+        dict: Build statistics (pairs, contours, seconds per stage, pairs per second).
+    """
+    workers = workers or min(os.cpu_count() or 1, 8)
+    os.makedirs(os.path.join(output_dir, "descriptors"), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, "features"), exist_ok=True)
+    manifest = {
+        'n_contours': len(dataset),
+        'n_pairs': n_pairs,
+        'shard_size': shard_size,
+        'n_curv_bins': n_curv_bins,
+        'seed': seed,
+        'descriptor_size': get_descriptor_layout(n_curv_bins)[1],
+        'feature_extraction': get_feature_extraction_metadata(n_curv_bins),
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            existing = json.load(f)
+        if existing != json.loads(json.dumps(manifest)):
+            raise ValueError(f"{output_dir} holds a dataset built with other parameters; use a new directory")
+        print(f"📂 Resuming dataset build in {output_dir}")
+    else:
+        contours = [np.asarray(s.contour, dtype=np.float32).reshape(-1, 2) for s in dataset]
+        offsets = np.concatenate([[0], np.cumsum([len(c) for c in contours])]).astype(np.int64)
+        _save_atomic(os.path.join(output_dir, "contour_points.npy"), np.concatenate(contours))
+        _save_atomic(os.path.join(output_dir, "contour_offsets.npy"), offsets)
+        pairs = generate_balanced_pair_indices([s.object_id for s in dataset], n_pairs, seed)
+        _save_atomic(os.path.join(output_dir, "pairs.npy"), pairs)
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+    pairs = np.load(os.path.join(output_dir, "pairs.npy"))
+
+    stats = {'pairs': len(pairs), 'contours': len(dataset), 'workers': workers}
+
+    start = time.perf_counter()
+    shards = [(index, begin, min(begin + shard_size, len(dataset)))
+              for index, begin in enumerate(range(0, len(dataset), shard_size))
+              if not os.path.exists(_chunk_path(output_dir, "descriptors", index))]
+    _run_shards(_descriptor_shard, shards, workers, output_dir, n_curv_bins, "Contour descriptors")
+    stats['descriptor_seconds'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    shards = [(index, pairs[begin:begin + shard_size])
+              for index, begin in enumerate(range(0, len(pairs), shard_size))
+              if not os.path.exists(_chunk_path(output_dir, "features", index))]
+    stats['computed_pairs'] = sum(len(shard[1]) for shard in shards)
+    _run_shards(_feature_shard, shards, workers, output_dir, n_curv_bins, "Pair features")
+    stats['feature_seconds'] = time.perf_counter() - start
+
+    total = stats['descriptor_seconds'] + stats['feature_seconds']
+    stats['pairs_per_second'] = stats['computed_pairs'] / total if total > 0 else 0.0
+    print(f"✅ Dataset ready in {output_dir}: {len(pairs):,} pairs, "
+          f"{stats['pairs_per_second']:,.0f} pairs/s on {workers} worker(s)")
+    return stats
+
+
+def load_feature_dataset(output_dir):
+    """
+    Load a built dataset.
+
+    Returns:
+        tuple: (X float32 array of pair features, y int array of labels)
+    """
+    pairs = np.load(os.path.join(output_dir, "pairs.npy"))
+    features = load_chunks(output_dir, "features")
+    if len(features) != len(pairs):
+        raise ValueError(f"Dataset in {output_dir} is incomplete ({len(features):,}/{len(pairs):,} pairs); "
+                         f"run build_feature_dataset again to finish it")
+    return features, pairs[:, 2].astype(int)
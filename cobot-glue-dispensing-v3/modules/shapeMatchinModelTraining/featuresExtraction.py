@@ -1,6 +1,6 @@
 import cv2
 import numpy as np
-from scipy.spatial.distance import directed_hausdorff
+from scipy.spatial.distance import cdist, directed_hausdorff
 
 # ===== AREA FEATURES =====
 
@@ -153,10 +153,17 @@ def compute_curvature_features(contour, n_bins=20):
     return hist.tolist()
 
 
+HAUSDORFF_DENSE_LIMIT = 250_000  # point pairs; above this the distance matrix gets too large
+
 def hausdorff_distance(c1, c2):
     """Compute simple Hausdorff distance manually."""
     pts1 = c1.reshape(-1, 2)
     pts2 = c2.reshape(-1, 2)
+    if len(pts1) * len(pts2) <= HAUSDORFF_DENSE_LIMIT:
+        # Simplified contours have tens of points: one distance matrix is much cheaper
+        # than directed_hausdorff's randomized early-exit search, and exact as well
+        distances = cdist(pts1, pts2)
+        return max(distances.min(axis=1).max(), distances.min(axis=0).max())
     return max(
         directed_hausdorff(pts1, pts2)[0],
         directed_hausdorff(pts2, pts1)[0]
@@ -456,6 +463,123 @@ def get_corner_features(c1, c2):
         # Return zero differences on error (shapes treated as similar in corner aspect)
         return [0.0, 0.0, 0.0, 0.0, 0.0]
 
+# ===== PER-CONTOUR DESCRIPTORS =====
+# Most pair features are differences of quantities of each contour on its own. A
+# contour appears in many training pairs, so these quantities (Harris corners, the
+# curvature histogram, Hu moments, ...) are computed once per contour and stored as a
+# flat float vector. Only matchShapes and the Hausdorff distance need both contours.
+
+def get_descriptor_layout(n_curv_bins=16):
+    """Slices of the per-contour descriptor vector, and its total length"""
+    sizes = [
+        ('area', 1), ('perimeter', 1), ('hull_area', 1), ('extent', 1), ('aspect_ratio', 1),
+        ('hu', 7), ('fourier', 8), ('perimeter_features', 2), ('curvature', n_curv_bins),
+        ('defects', 1), ('corners', 5), ('corners_ok', 1),
+    ]
+    layout = {}
+    offset = 0
+    for name, size in sizes:
+        layout[name] = slice(offset, offset + size)
+        offset += size
+    return layout, offset
+
+def compute_contour_descriptor(contour, n_curv_bins=16):
+    """Compute everything compute_enhanced_features needs from a single contour"""
+    layout, size = get_descriptor_layout(n_curv_bins)
+    descriptor = np.zeros(size, dtype=np.float64)
+
+    hull = cv2.convexHull(contour)
+    x, y, w, h = cv2.boundingRect(contour)
+    descriptor[layout['area']] = cv2.contourArea(contour)
+    descriptor[layout['perimeter']] = cv2.arcLength(contour, True)
+    descriptor[layout['hull_area']] = cv2.contourArea(hull)
+    descriptor[layout['extent']] = extent(contour)
+    descriptor[layout['aspect_ratio']] = aspect_ratio(contour)
+    try:
+        descriptor[layout['hu']] = hu_moments_features(contour)
+        descriptor[layout['fourier']] = fourier_descriptors(contour, 8)
+    except Exception as e:
+        raise RuntimeError(f"Global feature extraction failed: {str(e)}. Contour shape: {contour.shape}")
+    descriptor[layout['perimeter_features']] = perimeter_features(contour)
+    descriptor[layout['curvature']] = compute_curvature_features(contour, n_bins=n_curv_bins)
+    descriptor[layout['defects']] = convexity_defects_count(contour)
+    try:
+        corners = detect_harris_corners(contour)
+        descriptor[layout['corners']] = [corners['corner_count'], corners['corner_density'],
+                                         corners['response_mean'], corners['response_max'], corners['response_var']]
+        descriptor[layout['corners_ok']] = 1
+    except Exception:
+        # Same as get_corner_features: a failed detection zeroes the pair's corner features
+        descriptor[layout['corners_ok']] = 0
+    return descriptor
+
+def compute_features_from_descriptors(c1, c2, d1, d2, n_curv_bins=16):
+    """
+    Same features as compute_enhanced_features(c1, c2), from precomputed descriptors.
+
+    Args:
+        c1, c2: The contours, still needed for matchShapes and the Hausdorff distance.
+        d1, d2: Their compute_contour_descriptor vectors.
+
+    Returns:
+        np.ndarray: Feature vector of 35 + n_curv_bins values.
+    """
+    layout, _ = get_descriptor_layout(n_curv_bins)
+    area1, area2 = float(d1[layout['area']][0]), float(d2[layout['area']][0])
+    if area1 <= 0 or area2 <= 0:
+        raise ValueError(f"Invalid contour areas: c1_area={area1}, c2_area={area2}. Contours must have positive area.")
+    perimeter1, perimeter2 = float(d1[layout['perimeter']][0]), float(d2[layout['perimeter']][0])
+    hull_area1, hull_area2 = float(d1[layout['hull_area']][0]), float(d2[layout['hull_area']][0])
+    solidity1 = area1 / hull_area1 if hull_area1 != 0 else 0
+    solidity2 = area2 / hull_area2 if hull_area2 != 0 else 0
+
+    def diff(name):
+        return np.abs(d1[layout[name]] - d2[layout[name]])
+
+    features = []
+
+    # 1. Area features (5 features)
+    features.extend([abs(area1 - area2), abs(perimeter1 - perimeter2), scale_band_categorical(area1, area2),
+                     abs(np.sqrt(4 * area1 / np.pi) - np.sqrt(4 * area2 / np.pi)),
+                     abs(area1 - area2) / max(area1, area2)])
+
+    # 2. Shape similarity features (3 features)
+    m = cv2.matchShapes(c1, c2, cv2.CONTOURS_MATCH_I1, 0.0)
+    if np.isnan(m) or np.isinf(m):
+        raise ValueError(f"cv2.matchShapes returned invalid value: {m}. Check contour validity.")
+    hausdorff = hausdorff_distance(c1, c2)
+    if np.isnan(hausdorff) or np.isinf(hausdorff):
+        raise ValueError(f"Hausdorff distance calculation returned invalid value: {hausdorff}. Check contour point validity.")
+    hausdorff_normalized = hausdorff / ((perimeter1 + perimeter2) / 2) if (perimeter1 + perimeter2) > 0 else 0
+    features.extend([m, abs(solidity1 - solidity2), hausdorff_normalized])
+
+    # 3. Geometric features (3 features)
+    features.extend([abs(solidity1 - solidity2), float(diff('extent')[0]), float(diff('aspect_ratio')[0])])
+
+    # 4. Global features (15 features: 7 Hu + 8 Fourier)
+    features.extend(diff('hu').tolist())
+    features.extend(diff('fourier').tolist())
+
+    # 5. Perimeter features (2 features)
+    features.extend(diff('perimeter_features').tolist())
+
+    # 6. Local features (n_curv_bins features)
+    features.extend(diff('curvature').tolist())
+
+    # 7. Convexity features (2 features)
+    features.extend([abs((1 - area1 / hull_area1) - (1 - area2 / hull_area2)), float(diff('defects')[0])])
+
+    # 8. Corner features (5 features)
+    if d1[layout['corners_ok']][0] and d2[layout['corners_ok']][0]:
+        features.extend(diff('corners').tolist())
+    else:
+        features.extend([0.0] * 5)
+
+    features_arr = np.array(features)
+    if np.any(np.isnan(features_arr)) or np.any(np.isinf(features_arr)):
+        raise ValueError(f"Feature extraction produced invalid values (nan/inf): {features_arr}")
+    return features_arr
+
 # ===== UTILITY FUNCTIONS =====
 
 def get_feature_extraction_metadata(n_curv_bins=16):
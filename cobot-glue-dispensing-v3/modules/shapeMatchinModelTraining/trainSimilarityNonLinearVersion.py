@@ -4,6 +4,7 @@ from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 # Import data loading module
 from dataLoader import get_or_generate_pairs, load_dataset_for_testing
+from datasetBuilder import build_feature_dataset, load_feature_dataset
 from featuresExtraction import compute_features_parallel, compute_enhanced_features
 # Import model management module
 from modelManager import save_model
@@ -51,8 +52,10 @@ def train_nonlinear_models(pairs, labels):
         print(f"   📈 Progress: {completed:,}/{total_pairs:,} pairs processed ({progress:.1f}%)")
     
     print(f"✅ Feature computation complete! Generated {len(X[0])} features per pair")
-    y = np.array(labels)
+    return train_models_on_features(X, np.array(labels))
 
+
+def train_models_on_features(X, y):
     print("🔄 Splitting data for training and testing...")
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
     print(f"📊 Training set: {len(X_train):,} samples, Test set: {len(X_test):,} samples")
@@ -118,6 +121,9 @@ if __name__ == "__main__":
     ENABLE_VISUALIZATIONS = True  # Set to False for faster training
     GENERATE_NEW_PAIRS = True  # Set to False to load existing pairs instead of generating new ones
     PAIRS_FILE = None  # Path to specific pairs file (None = use most recent)
+    # Build features as a sharded process-pool job (resumable; contour features computed once)
+    USE_FEATURE_DATASET = True
+    FEATURE_DATASET_DIR = "saved_datasets/features_22x6x6x6"
     
     # Generate dataset (only needed if generating new pairs)
     dataset = None
@@ -128,12 +134,18 @@ if __name__ == "__main__":
                                            n_noisy=6,
                                            include_hard_negatives=True)  # Enable robust training
     
-    # Get training pairs (either generate new or load existing)
-    pairs, labels = get_or_generate_pairs(dataset, 
-                                          generate_new_pairs=GENERATE_NEW_PAIRS, 
-                                          pairs_file=PAIRS_FILE)
-    
-    results, best_model_name = train_nonlinear_models(pairs, labels)
+    if USE_FEATURE_DATASET and GENERATE_NEW_PAIRS:
+        build_feature_dataset(dataset, FEATURE_DATASET_DIR)
+        X, labels = load_feature_dataset(FEATURE_DATASET_DIR)
+        pairs = X
+        results, best_model_name = train_models_on_features(X, labels)
+    else:
+        # Get training pairs (either generate new or load existing)
+        pairs, labels = get_or_generate_pairs(dataset,
+                                              generate_new_pairs=GENERATE_NEW_PAIRS,
+                                              pairs_file=PAIRS_FILE)
+
+        results, best_model_name = train_nonlinear_models(pairs, labels)
     
     # Save the best model with dataset information
     best_model = results[best_model_name]['model']
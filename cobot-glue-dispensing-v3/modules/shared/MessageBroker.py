@@ -1,15 +1,28 @@
 import logging
+import threading
+import time
 import weakref
 from typing import Dict, List, Any, Callable
 
+from modules.shared.utils import metrics
+
+_DELIVERY_TIME = metrics.histogram("broker.delivery")
+_MESSAGES = metrics.counter("broker.messages")
+_SUBSCRIBER_ERRORS = metrics.counter("broker.subscriber_errors")
+
 
 class MessageBroker:
     _instance = None
+    _instance_lock = threading.Lock()
 
     def __new__(cls):
+        # Services are created on parallel startup threads; a second instance would lose subscriptions
         if cls._instance is None:
-            cls._instance = super(MessageBroker, cls).__new__(cls)
-            cls._instance._init()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(MessageBroker, cls).__new__(cls)
+                    instance._init()
+                    cls._instance = instance
         return cls._instance
 
     def _init(self):
@@ -18,8 +31,7 @@ class MessageBroker:
 
     def subscribe(self, topic: str, callback: Callable):
         """Subscribe to a topic with automatic cleanup of dead references"""
-        if topic not in self.subscribers:
-            self.subscribers[topic] = []
+        subscribers = self.subscribers.setdefault(topic, [])
 
         # Create weak reference to avoid keeping objects alive
         if hasattr(callback, '__self__'):
@@ -29,7 +41,7 @@ class MessageBroker:
             # It's a function - use regular weak reference
             weak_callback = weakref.ref(callback, self._cleanup_callback(topic, callback))
 
-        self.subscribers[topic].append(weak_callback)
+        subscribers.append(weak_callback)
         print(f"Subscribed to topic '{topic}' with callback {callback.__name__ if hasattr(callback, '__name__') else str(callback)}")
         self.logger.debug(f"Subscribed to topic '{topic}'. Total subscribers: {len(self.subscribers[topic])}")
 
@@ -100,6 +112,8 @@ class MessageBroker:
         # Call all live callbacks
         successful_calls = 0
         failed_calls = 0
+        _MESSAGES.inc()
+        start = time.perf_counter()
 
         for callback in live_callbacks:
             try:
@@ -115,6 +129,10 @@ class MessageBroker:
                 self.logger.error(f"Error calling subscriber for topic '{topic}': {e} [Callback: {callback_info}]")
                 # Don't break - continue with other subscribers
 
+        _DELIVERY_TIME.observe(time.perf_counter() - start)
+        if failed_calls:
+            _SUBSCRIBER_ERRORS.inc(failed_calls)
+
         if successful_calls > 0:
             self.logger.debug(f"Successfully published to {successful_calls} subscribers for topic '{topic}'")
         if failed_calls > 0:
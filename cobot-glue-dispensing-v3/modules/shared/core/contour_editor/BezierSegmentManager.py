@@ -7,6 +7,9 @@ from PyQt6.QtCore import QPointF
 import copy
 
 from frontend.contour_editor.widgets import SegmentSettingsWidget
+from modules.shared.core.contour_editor.bezier_flattening import (
+    DEFAULT_CHORD_TOLERANCE_MM, flatten_segments)
+from modules.shared.core.contour_editor.spatial_index import SegmentSpatialIndex
 
 
 class Segment:
@@ -86,6 +89,12 @@ class BezierSegmentManager:
         self.contour_layer = Layer("Contour", False, True)
         self.fill_layer = Layer("Fill", False, True)
         self.segments: list[Segment] = [Segment(layer=self.contour_layer)]
+        self._spatial_index = SegmentSpatialIndex()
+
+    def _synced_spatial_index(self):
+        """Return the hit-test index after re-indexing any segments that changed shape."""
+        self._spatial_index.sync(self.segments)
+        return self._spatial_index
 
     def undo(self):
         if not self.undo_stack:
@@ -218,60 +227,35 @@ class BezierSegmentManager:
     def get_segments(self):
         return self.segments
 
-    def to_wp_data(self, samples_per_segment=5):
+    def to_wp_data(self, samples_per_segment=None, chord_tolerance_mm=DEFAULT_CHORD_TOLERANCE_MM,
+                   px_per_mm=None):
+        """
+        Export the segments as OpenCV contours grouped by layer.
+
+        By default curved segments are flattened adaptively so that no point of the exported
+        polyline is further than ``chord_tolerance_mm`` from the Bezier curve; straight runs
+        keep only their anchors. Passing ``samples_per_segment`` restores the previous fixed
+        sampling of every curved segment.
+        """
         path_points = {
             "Workpiece": [],
             "Contour": [],
             "Fill": []
         }
 
-        def is_cp_effective(p0, cp, p1, threshold=1.0):
-            dx, dy = p1.x() - p0.x(), p1.y() - p0.y()
-            if dx == dy == 0:
-                return False
-            distance = abs(dy * cp.x() - dx * cp.y() + p1.x() * p0.y() - p1.y() * p0.x()) / ((dx ** 2 + dy ** 2) ** 0.5)
-            return distance > threshold
-
-        def to_opencv_contour(path):
-            """Convert list of [x, y] points to OpenCV-style contour array"""
-            if not path or not all(isinstance(pt, (list, tuple)) and len(pt) == 2 for pt in path):
-                print("⚠️ Skipping invalid path:", path)
-                return None
-            return np.array(path, dtype=np.float32).reshape(-1, 1, 2)
-
-        # Process each segment individually
-        for segment in self.segments:
-            print("Processing segment with layer name:", segment.layer.name)
-            raw_path = []
-            points = segment.points
-            controls = segment.controls
-
-            # Add the first point
-            if points:
-                raw_path.append([points[0].x(), points[0].y()])
+        if samples_per_segment is None:
+            contours = flatten_segments(self.segments, chord_tolerance_mm, px_per_mm)
+        else:
+            contours = [self._sample_segment_fixed(segment, samples_per_segment) for segment in self.segments]
 
-            # Build the path for this segment
-            for i in range(1, len(points)):
-                p0, p1 = points[i - 1], points[i]
-                if i - 1 < len(controls) and controls[i - 1] is not None and is_cp_effective(p0, controls[i - 1], p1):
-                    # For Bezier curves, skip t=0 (which is p0, already added) and include t=1 (which is p1)
-                    for t in [j / samples_per_segment for j in range(1, samples_per_segment + 1)]:
-                        x = (1 - t) ** 2 * p0.x() + 2 * (1 - t) * t * controls[i - 1].x() + t ** 2 * p1.x()
-                        y = (1 - t) ** 2 * p0.y() + 2 * (1 - t) * t * controls[i - 1].y() + t ** 2 * p1.y()
-                        raw_path.append([x, y])
-                else:
-                    # For straight lines, only add p1 (p0 is already in the path)
-                    raw_path.append([p1.x(), p1.y()])
-            print(f"    BezierSegmentManager: to_opencv_contour: raw_path = {raw_path}")
-            # Convert to OpenCV contour format
-            contour = to_opencv_contour(raw_path)
-            print(f"    BezierSegmentManager: to_opencv_contour: to_opencv_contour result = {contour}")
-            if contour is not None:
-                # Append a new contour-settings pair for this segment
-                path_points[segment.layer.name].append({
-                    "contour": contour,
-                    "settings": dict(segment.settings)
-                })
+        for segment, contour in zip(self.segments, contours):
+            if len(contour) == 0:
+                continue
+            # Append a new contour-settings pair for this segment
+            path_points[segment.layer.name].append({
+                "contour": contour,
+                "settings": dict(segment.settings)
+            })
 
         # Add placeholders for layers that have no segments
         for layer_name in ["Workpiece", "Contour", "Fill"]:
@@ -281,9 +265,42 @@ class BezierSegmentManager:
                     "settings": {}
                 })
 
-        print("path_points in to_wp_data:", path_points)
         return path_points
 
+    @staticmethod
+    def _sample_segment_fixed(segment, samples_per_segment):
+        """Sample every effective curved segment at ``samples_per_segment`` uniform steps."""
+
+        def is_cp_effective(p0, cp, p1, threshold=1.0):
+            dx, dy = p1.x() - p0.x(), p1.y() - p0.y()
+            if dx == dy == 0:
+                return False
+            distance = abs(dy * cp.x() - dx * cp.y() + p1.x() * p0.y() - p1.y() * p0.x()) / ((dx ** 2 + dy ** 2) ** 0.5)
+            return distance > threshold
+
+        raw_path = []
+        points = segment.points
+        controls = segment.controls
+
+        # Add the first point
+        if points:
+            raw_path.append([points[0].x(), points[0].y()])
+
+        # Build the path for this segment
+        for i in range(1, len(points)):
+            p0, p1 = points[i - 1], points[i]
+            if i - 1 < len(controls) and controls[i - 1] is not None and is_cp_effective(p0, controls[i - 1], p1):
+                # For Bezier curves, skip t=0 (which is p0, already added) and include t=1 (which is p1)
+                for t in [j / samples_per_segment for j in range(1, samples_per_segment + 1)]:
+                    x = (1 - t) ** 2 * p0.x() + 2 * (1 - t) * t * controls[i - 1].x() + t ** 2 * p1.x()
+                    y = (1 - t) ** 2 * p0.y() + 2 * (1 - t) * t * controls[i - 1].y() + t ** 2 * p1.y()
+                    raw_path.append([x, y])
+            else:
+                # For straight lines, only add p1 (p0 is already in the path)
+                raw_path.append([p1.x(), p1.y()])
+
+        return np.array(raw_path, dtype=np.float32).reshape(-1, 1, 2)
+
     # Example implementation for BezierSegmentManager
     def get_active_segment(self):
         if self.active_segment_index is not None and 0 <= self.active_segment_index < len(self.segments):
@@ -475,22 +492,20 @@ class BezierSegmentManager:
 
     def find_all_drag_targets(self, pos, threshold=5.0):
         """Return all points under the cursor, using Euclidean distance for better accuracy."""
+        index = self._synced_spatial_index()
+        seg_positions = {id(segment): seg_idx for seg_idx, segment in enumerate(self.segments)}
+
         targets = []
-        for seg_idx, segment in enumerate(self.segments):
-            for idx, pt in enumerate(segment.points):
-                dx = pt.x() - pos.x()
-                dy = pt.y() - pos.y()
-                distance = math.hypot(dx, dy)
-                if distance <= threshold:
-                    targets.append(("anchor", seg_idx, idx))
-            for idx, ctrl in enumerate(segment.controls):
-                if ctrl is None:
-                    continue
-                dx = ctrl.x() - pos.x()
-                dy = ctrl.y() - pos.y()
-                distance = math.hypot(dx, dy)
-                if distance <= threshold:
-                    targets.append(("control", seg_idx, idx))
+        for segment, role, idx in index.query_points(pos.x(), pos.y(), threshold):
+            pts = segment.points if role == "anchor" else segment.controls
+            if idx >= len(pts) or pts[idx] is None:
+                continue
+            pt = pts[idx]
+            if math.hypot(pt.x() - pos.x(), pt.y() - pos.y()) <= threshold:
+                targets.append((role, seg_positions[id(segment)], idx))
+
+        # Same order as a full scan: by segment, anchors before controls, then by index
+        targets.sort(key=lambda target: (target[1], target[0] != "anchor", target[2]))
         return targets
 
     def find_drag_target(self, pos, threshold=10):
@@ -525,6 +540,7 @@ class BezierSegmentManager:
         # Sanity check
         if 0 <= ctrl_idx < len(segment.controls) and ctrl_idx < len(segment.points):
             segment.controls[ctrl_idx] = QPointF(segment.points[ctrl_idx])
+            self._spatial_index.update_point(segment, 'control', ctrl_idx)
 
     def move_point(self, role, seg_index, idx, new_pos, suppress_save=False):
         if not suppress_save:
@@ -557,8 +573,13 @@ class BezierSegmentManager:
                 if self.is_on_line(old_pos, ctrl, p1):
                     controls[idx] = (new_pos + p1) / 2
 
+            self._spatial_index.update_point(segment, 'anchor', idx)
+            self._spatial_index.update_point(segment, 'control', idx - 1)
+            self._spatial_index.update_point(segment, 'control', idx)
+
         elif role == 'control':
             controls[idx] = new_pos
+            self._spatial_index.update_point(segment, 'control', idx)
 
     def remove_control_point_at(self, pos, threshold=10):
         self.save_state()
@@ -659,6 +680,7 @@ class BezierSegmentManager:
         print(f"Segment layer locked: ", segment.layer.locked)
         if line_index < len(segment.controls):
             segment.controls[line_index] = midpoint
+            self._spatial_index.update_point(segment, 'control', line_index)
         else:
             # Ensure the controls list matches the number of line segments
             while len(segment.controls) < line_index:
@@ -765,16 +787,21 @@ class BezierSegmentManager:
         return True
 
     def find_segment_at(self, pos, threshold=10):
-        for seg_index, segment in enumerate(self.segments):
-            points = segment.points
-            for i in range(1, len(points)):
-                p0 = points[i - 1]
-                p1 = points[i]
+        index = self._synced_spatial_index()
+        seg_positions = {id(segment): seg_index for seg_index, segment in enumerate(self.segments)}
 
-                if self.is_on_segment(p0, pos, p1, threshold):
-                    return seg_index, i - 1
+        best = None
+        for segment, line_index in index.query_lines(pos.x(), pos.y(), threshold):
+            points = segment.points
+            if line_index + 1 >= len(points):
+                continue
+            if self.is_on_segment(points[line_index], pos, points[line_index + 1], threshold):
+                hit = (seg_positions[id(segment)], line_index)
+                # Keep the first hit in segment/line order, as a full scan would
+                if best is None or hit < best:
+                    best = hit
 
-        return None
+        return best
 
     @staticmethod
     def is_on_segment(p0, test_pt, p1, threshold=5.0):
@@ -0,0 +1,111 @@
+import numpy as np
+
+from frontend.contour_editor import constants
+
+DEFAULT_CHORD_TOLERANCE_MM = 0.1
+# A control point closer than this (px) to its chord is treated as a straight line, as in to_wp_data
+CONTROL_EFFECT_THRESHOLD_PX = 1.0
+
+
+def segment_to_arrays(segment):
+    """
+    Convert an editor Segment into numpy arrays.
+
+    Returns:
+        tuple: (points (N, 2) float64, controls (N-1, 2) float64 with NaN rows for missing controls)
+    """
+    points = np.array([[p.x(), p.y()] for p in segment.points], dtype=np.float64).reshape(-1, 2)
+    n_lines = max(len(points) - 1, 0)
+    controls = np.full((n_lines, 2), np.nan, dtype=np.float64)
+    for i, ctrl in enumerate(segment.controls[:n_lines]):
+        if ctrl is not None:
+            controls[i] = (ctrl.x(), ctrl.y())
+    return points, controls
+
+
+def flatten_quadratic_paths(paths, tolerance_px, control_threshold_px=CONTROL_EFFECT_THRESHOLD_PX):
+    """
+    Flatten piecewise quadratic Bezier paths so the chord error stays below ``tolerance_px``.
+
+    A quadratic Bezier has a constant second derivative 2 * (P0 - 2C + P1), so a chord spanning
+    a parameter interval h deviates from the curve by exactly |P0 - 2C + P1| * h^2 / 4. The number
+    of uniform steps per segment therefore follows in closed form and all segments of all paths
+    are evaluated in a single vectorized pass. Straight segments (no control, or a control within
+    ``control_threshold_px`` of the chord) contribute only their end point.
+
+    Args:
+        paths (list[tuple[np.ndarray, np.ndarray]]): (points (N, 2), controls (N-1, 2) with NaN rows).
+        tolerance_px (float): Maximum allowed distance between the curve and the polyline.
+        control_threshold_px (float): Control offsets below this are ignored.
+
+    Returns:
+        list[np.ndarray]: One (M, 2) float64 polyline per input path.
+    """
+    if tolerance_px <= 0:
+        raise ValueError("tolerance_px must be positive")
+
+    starts, p0s, cps, p1s, line_counts = [], [], [], [], []
+    for points, controls in paths:
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n_lines = max(len(points) - 1, 0)
+        controls = np.asarray(controls, dtype=np.float64).reshape(-1, 2)[:n_lines]
+        if len(controls) < n_lines:
+            pad = np.full((n_lines - len(controls), 2), np.nan)
+            controls = np.vstack([controls, pad])
+        starts.append(points[:1])
+        p0s.append(points[:-1])
+        p1s.append(points[1:])
+        cps.append(controls)
+        line_counts.append(n_lines)
+
+    if not paths:
+        return []
+
+    p0 = np.concatenate(p0s)
+    p1 = np.concatenate(p1s)
+    cp = np.concatenate(cps)
+
+    chord = p1 - p0
+    chord_len = np.hypot(chord[:, 0], chord[:, 1])
+    has_cp = ~np.isnan(cp[:, 0])
+    cp = np.where(has_cp[:, None], cp, p0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        offset = np.abs(chord[:, 1] * cp[:, 0] - chord[:, 0] * cp[:, 1]
+                        + p1[:, 0] * p0[:, 1] - p1[:, 1] * p0[:, 0]) / chord_len
+    curved = has_cp & (chord_len > 0) & (offset > control_threshold_px)
+
+    bend = p0 - 2.0 * cp + p1
+    bend_len = np.hypot(bend[:, 0], bend[:, 1])
+    steps = np.where(curved, np.ceil(np.sqrt(bend_len / (4.0 * tolerance_px))), 1.0)
+    steps = np.maximum(steps, 1).astype(np.int64)
+
+    # Straight segments evaluate t=1 with the control collapsed onto p0, which yields p1 exactly
+    line_of_sample = np.repeat(np.arange(len(steps)), steps)
+    first_sample = np.cumsum(steps) - steps
+    j = np.arange(steps.sum()) - np.repeat(first_sample, steps) + 1
+    t = (j / steps[line_of_sample])[:, None]
+    samples = ((1 - t) ** 2 * p0[line_of_sample]
+               + 2 * (1 - t) * t * cp[line_of_sample]
+               + t ** 2 * p1[line_of_sample])
+
+    sample_bounds = np.concatenate([[0], np.cumsum(steps)])
+    line_bounds = np.cumsum([0] + line_counts)
+    return [np.vstack([start, samples[sample_bounds[line_bounds[k]]:sample_bounds[line_bounds[k + 1]]]])
+            for k, start in enumerate(starts)]
+
+
+def flatten_segments(segments, tolerance_mm=DEFAULT_CHORD_TOLERANCE_MM, px_per_mm=None):
+    """
+    Flatten editor Segments to OpenCV-style float32 contours (N, 1, 2) within ``tolerance_mm``.
+
+    ``px_per_mm`` defaults to the editor's PIXELS_PER_MM, read at call time since it can be
+    changed in the editor settings.
+
+    Returns:
+        list[np.ndarray]: One contour per segment; empty segments give a (0, 1, 2) array.
+    """
+    if px_per_mm is None:
+        px_per_mm = constants.PIXELS_PER_MM
+    paths = [segment_to_arrays(segment) for segment in segments]
+    polylines = flatten_quadratic_paths(paths, tolerance_mm * px_per_mm)
+    return [polyline.astype(np.float32).reshape(-1, 1, 2) for polyline in polylines]
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import math
+
+
+class SegmentSpatialIndex:
+    """
+    Uniform grid over the anchor points, control points and line bounding boxes
+    of the editor segments.
+
+    Entries are keyed by the segment object (not its list index), so inserting
+    or deleting whole segments does not invalidate the entries of the others.
+    Lookups only return candidates; the caller still performs the exact
+    distance check against the live geometry, which also filters out entries
+    that became stale through direct mutation of a segment.
+    """
+
+    # Lines whose bounding box covers more cells than this are kept in a
+    # separate list that is checked on every query instead of being smeared
+    # over a large part of the grid.
+    MAX_CELLS_PER_LINE = 64
+
+    def __init__(self, cell_size=32.0):
+        self.cell_size = float(cell_size)
+        self._segments = {}        # seg_id -> Segment
+        self._signatures = {}      # seg_id -> (len(points), len(controls))
+        self._point_cells = {}     # cell -> set[(seg_id, role, idx)]
+        self._point_keys = {}      # seg_id -> {(role, idx): cell}
+        self._line_cells = {}      # cell -> set[(seg_id, line_idx)]
+        self._line_keys = {}       # seg_id -> {line_idx: list[cell]} (empty list for oversized lines)
+        self._oversized_lines = set()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def clear(self):
+        self._segments.clear()
+        self._signatures.clear()
+        self._point_cells.clear()
+        self._point_keys.clear()
+        self._line_cells.clear()
+        self._line_keys.clear()
+        self._oversized_lines.clear()
+
+    def sync(self, segments):
+        """
+        Bring the index in line with ``segments``.
+
+        Only segments that were added, removed or whose point/control count
+        changed are re-indexed, so the cost is proportional to the number of
+        segments plus the size of the segments that actually changed.
+        """
+        current = {id(seg): seg for seg in segments}
+
+        for seg_id in list(self._segments):
+            if seg_id not in current or self._segments[seg_id] is not current[seg_id]:
+                self._remove_segment_id(seg_id)
+
+        for seg_id, seg in current.items():
+            signature = (len(seg.points), len(seg.controls))
+            if self._signatures.get(seg_id) != signature:
+                self.reindex_segment(seg)
+
+    def reindex_segment(self, segment):
+        seg_id = id(segment)
+        self._remove_segment_id(seg_id)
+        self._segments[seg_id] = segment
+        self._signatures[seg_id] = (len(segment.points), len(segment.controls))
+        self._point_keys[seg_id] = {}
+        self._line_keys[seg_id] = {}
+
+        for idx, pt in enumerate(segment.points):
+            self._insert_point(seg_id, "anchor", idx, pt)
+        for idx, ctrl in enumerate(segment.controls):
+            if ctrl is not None:
+                self._insert_point(seg_id, "control", idx, ctrl)
+        for line_idx in range(len(segment.points) - 1):
+            self._insert_line(seg_id, line_idx, segment.points[line_idx], segment.points[line_idx + 1])
+
+    def remove_segment(self, segment):
+        self._remove_segment_id(id(segment))
+
+    def update_point(self, segment, role, idx):
+        """Re-bucket a single moved point and, for anchors, its two adjacent lines."""
+        seg_id = id(segment)
+        if seg_id not in self._segments:
+            self.reindex_segment(segment)
+            return
+
+        self._remove_point(seg_id, role, idx)
+        if role == "anchor":
+            if 0 <= idx < len(segment.points):
+                self._insert_point(seg_id, role, idx, segment.points[idx])
+            for line_idx in (idx - 1, idx):
+                self._remove_line(seg_id, line_idx)
+                if 0 <= line_idx < len(segment.points) - 1:
+                    self._insert_line(seg_id, line_idx, segment.points[line_idx], segment.points[line_idx + 1])
+        elif 0 <= idx < len(segment.controls) and segment.controls[idx] is not None:
+            self._insert_point(seg_id, role, idx, segment.controls[idx])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def query_points(self, x, y, radius):
+        """Return (segment, role, idx) candidates whose cell intersects the query box."""
+        seen = set()
+        for cell in self._cells_in_box(x - radius, y - radius, x + radius, y + radius):
+            seen.update(self._point_cells.get(cell, ()))
+        return [(self._segments[seg_id], role, idx) for seg_id, role, idx in seen]
+
+    def query_lines(self, x, y, radius):
+        """Return (segment, line_idx) candidates whose bounding box may lie within ``radius``."""
+        seen = set(self._oversized_lines)
+        for cell in self._cells_in_box(x - radius, y - radius, x + radius, y + radius):
+            seen.update(self._line_cells.get(cell, ()))
+        return [(self._segments[seg_id], line_idx) for seg_id, line_idx in seen]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _cells_in_box(self, x0, y0, x1, y1):
+        cx0, cy0 = self._cell(x0, y0)
+        cx1, cy1 = self._cell(x1, y1)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                yield cx, cy
+
+    def _insert_point(self, seg_id, role, idx, pt):
+        cell = self._cell(pt.x(), pt.y())
+        self._point_cells.setdefault(cell, set()).add((seg_id, role, idx))
+        self._point_keys[seg_id][(role, idx)] = cell
+
+    def _remove_point(self, seg_id, role, idx):
+        cell = self._point_keys[seg_id].pop((role, idx), None)
+        if cell is None:
+            return
+        bucket = self._point_cells.get(cell)
+        if bucket is not None:
+            bucket.discard((seg_id, role, idx))
+            if not bucket:
+                del self._point_cells[cell]
+
+    def _insert_line(self, seg_id, line_idx, p0, p1):
+        key = (seg_id, line_idx)
+        cx0, cy0 = self._cell(min(p0.x(), p1.x()), min(p0.y(), p1.y()))
+        cx1, cy1 = self._cell(max(p0.x(), p1.x()), max(p0.y(), p1.y()))
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > self.MAX_CELLS_PER_LINE:
+            self._oversized_lines.add(key)
+            self._line_keys[seg_id][line_idx] = []
+            return
+
+        cells = [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+        for cell in cells:
+            self._line_cells.setdefault(cell, set()).add(key)
+        self._line_keys[seg_id][line_idx] = cells
+
+    def _remove_line(self, seg_id, line_idx):
+        cells = self._line_keys[seg_id].pop(line_idx, None)
+        if cells is None:
+            return
+        key = (seg_id, line_idx)
+        self._oversized_lines.discard(key)
+        for cell in cells:
+            bucket = self._line_cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._line_cells[cell]
+
+    def _remove_segment_id(self, seg_id):
+        if seg_id not in self._segments:
+            return
+        for role, idx in list(self._point_keys[seg_id]):
+            self._remove_point(seg_id, role, idx)
+        for line_idx in list(self._line_keys[seg_id]):
+            self._remove_line(seg_id, line_idx)
+        del self._point_keys[seg_id]
+        del self._line_keys[seg_id]
+        del self._segments[seg_id]
+        del self._signatures[seg_id]
@@ -1,12 +1,46 @@
+import hashlib
+import math
+import os
+from collections import OrderedDict
+
 import ezdxf
 from ezdxf import bbox
 import numpy as np
 from ezdxf.entities import Spline
 import matplotlib.pyplot as plt
-import math
-import numpy as np
 
 from modules.shared.core.dxf.DXFCoordinateConverter import DXFCoordinateConverter
+from modules.shared.core.dxf.curve_sampling import arc_points, bulge_polyline_points
+from modules.shared.core.dxf.nurbs import flatten_nurbs
+
+# Parsed paths keyed by file content hash and extraction settings, most recent last
+_PARSE_CACHE = OrderedDict()
+PARSE_CACHE_SIZE = 32
+# Content hash per file path, reused while the modification time and size are unchanged
+_DIGEST_CACHE = {}
+
+
+def _file_digest(filename):
+    """SHA-1 of the file contents, only re-read when the file's mtime or size changed."""
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    cached = _DIGEST_CACHE.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    _DIGEST_CACHE[path] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def _copy_paths(groups):
+    """Copy the path lists; the point tuples themselves are immutable and shared."""
+    return tuple([list(path) for path in paths] for paths in groups)
+
+
+def clear_parse_cache():
+    _PARSE_CACHE.clear()
+    _DIGEST_CACHE.clear()
 
 # SCALE_X = 1280 / 900 # 1.422
 # SCALE_Y = 720 / 600 # 1.2
@@ -23,11 +57,13 @@ class DXFPathExtractor:
         contour_layer (str): Layer name for spray/contour paths.
         fill_layer (str): Layer name for fill paths.
         target_size (tuple): Size of the border rectangle (width, height).
+        tolerance (float): Maximum chord error (drawing units) when flattening curves.
         wpCnt (list): List of extracted workpieces contours.
         contourCnt (list): List of extracted contour/spray paths.
         fillCnt (list): List of extracted fill paths.
     """
-    def __init__(self, filename, wp_layer="External", contour_layer="Contour",fillLayer = "Fill", target_size=(900, 600)):
+    def __init__(self, filename, wp_layer="External", contour_layer="Contour",fillLayer = "Fill", target_size=(900, 600),
+                 tolerance=0.05):
 
         """
         Initializes the DXFPathExtractor.
@@ -38,6 +74,10 @@ class DXFPathExtractor:
             contour_layer (str): Name of the layer containing contour/spray lines.
             fillLayer (str): Name of the layer containing fill geometry.
             target_size (tuple): Width and height of the added border rectangle.
+            tolerance (float): Maximum chord error when flattening arcs, ellipses and splines.
+
+        Re-importing a file with unchanged contents reuses the cached paths; the DXF document
+        itself is then only loaded when ``doc`` or ``msp`` is accessed.
         """
         self.filename = filename
         self.wp_layer = wp_layer
@@ -45,20 +85,43 @@ class DXFPathExtractor:
         self.fill_layer = fillLayer
         self.target_layers = [wp_layer, contour_layer,fillLayer]
         self.target_size = target_size
+        self.tolerance = tolerance
         self.wpCnt = []
         self.contourCnt = []
         self.fillCnt = []
+        self._doc = None
+
+        cache_key = (_file_digest(filename), wp_layer, contour_layer, fillLayer, tolerance)
+        cached = _PARSE_CACHE.get(cache_key)
+        if cached is not None:
+            _PARSE_CACHE.move_to_end(cache_key)
+            self.wpCnt, self.contourCnt, self.fillCnt = _copy_paths(cached)
+            return
 
         self._load_dxf()
         self._add_border()
         self._extract_paths()
 
+        _PARSE_CACHE[cache_key] = _copy_paths((self.wpCnt, self.contourCnt, self.fillCnt))
+        if len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+            _PARSE_CACHE.popitem(last=False)
+
+    @property
+    def doc(self):
+        if self._doc is None:
+            self._load_dxf()
+            self._add_border()
+        return self._doc
+
+    @property
+    def msp(self):
+        return self.doc.modelspace()
+
     def _load_dxf(self):
         """
            Loads the DXF file and retrieves the modelspace (drawing canvas).
            """
-        self.doc = ezdxf.readfile(self.filename)
-        self.msp = self.doc.modelspace()
+        self._doc = ezdxf.readfile(self.filename)
 
     def _add_border(self):
         """
@@ -71,16 +134,23 @@ class DXFPathExtractor:
             cy = (first_bbox.extmin.y + first_bbox.extmax.y) / 2
             self._draw_rectangle(cx, cy, self.target_size[0], self.target_size[1])
 
-    def _spline_to_points(self, spline, segments=100):
-        """Convert a spline to a series of points by sampling at regular intervals."""
+    def _spline_to_points(self, spline):
+        """
+        Convert a spline to points by evaluating its NURBS definition within ``self.tolerance``.
+
+        Splines defined only by fit points are converted to their control point form by ezdxf
+        first, so both kinds keep their shape.
+        """
         if not isinstance(spline, Spline):
             return []
 
-        # Use fit_points to get the spline's points
-        points = spline.fit_points  # This returns the points used to fit the spline
-
-        # If you want to sample additional points in between, you might use the 'get_points' method if it's available or manually interpolate along the spline
-        return [(pt[0], pt[1]) for pt in points]
+        bspline = spline.construction_tool()
+        control_points = np.array([(p.x, p.y) for p in bspline.control_points])
+        if len(control_points) < 2:
+            return []
+        weights = np.asarray(bspline.weights()) if bspline.is_rational else None
+        points, _ = flatten_nurbs(control_points, bspline.knots(), bspline.degree, self.tolerance, weights)
+        return [tuple(pt) for pt in points.tolist()]
 
 
 
@@ -107,28 +177,23 @@ class DXFPathExtractor:
             dxfattribs={'layer': 'border'}
         )
 
-    def _circle_to_points(self, center, radius, segments=36):
-        return [
-            (
-                center[0] + radius * math.cos(2 * math.pi * i / segments),
-                center[1] + radius * math.sin(2 * math.pi * i / segments),
-            )
-            for i in range(segments)
-        ]
-
-    def _arc_to_points(self, center, radius, start_angle, end_angle, segments=36):
-        """Convert an arc to a series of points."""
+    def _circle_to_points(self, center, radius):
+        """Sample a circle within ``self.tolerance`` (closing point not repeated)."""
+        points = arc_points(center, radius, 0.0, 2 * math.pi, self.tolerance)[:-1]
+        return [tuple(pt) for pt in points.tolist()]
+
+    def _arc_to_points(self, center, radius, start_angle, end_angle):
+        """Convert an arc (angles in degrees) to points within ``self.tolerance``."""
         if start_angle > end_angle:
             end_angle += 360  # Handle arcs that cross the 0-degree line
 
-        angles = np.linspace(math.radians(start_angle), math.radians(end_angle), segments)
-        return [
-            (
-                center[0] + radius * math.cos(angle),
-                center[1] + radius * math.sin(angle),
-            )
-            for angle in angles
-        ]
+        sweep = math.radians(end_angle - start_angle)
+        points = arc_points(center, radius, math.radians(start_angle), sweep, self.tolerance)
+        return [tuple(pt) for pt in points.tolist()]
+
+    def _ellipse_to_points(self, ellipse):
+        """Sample an ellipse (or elliptic arc) within ``self.tolerance``."""
+        return [(v.x, v.y) for v in ellipse.construction_tool().flattening(self.tolerance)]
 
     def _extract_paths(self):
         for entity in self.msp:
@@ -155,12 +220,9 @@ class DXFPathExtractor:
                 current_list.append([(start.x, start.y), (end.x, end.y)])
 
             elif entity.dxftype() == 'LWPOLYLINE':
-                points = [(pt[0], pt[1]) for pt in entity.get_points()]
-                closed = entity.closed
-                print("Should be closed?", closed)
-                if closed:
-                    points.append(points[0])  # Close the polyline if it is closed
-                current_list.append(points)  # Add the closed polyline as a separate shape
+                # Bulged vertices become arcs; a closed polyline ends on its first point
+                points = bulge_polyline_points(entity.get_points('xyb'), entity.closed, self.tolerance)
+                current_list.append([tuple(pt) for pt in points.tolist()])
 
             elif entity.dxftype() == 'CIRCLE':
                 center = (entity.dxf.center.x, entity.dxf.center.y)
@@ -179,10 +241,12 @@ class DXFPathExtractor:
 
             # For other types (POLYLINE, ELLIPSE, SPLINE), you can extend further
             elif entity.dxftype() == "POLYLINE":
-                print("POLYLINE not implemented")
+                vertices = [(v.dxf.location.x, v.dxf.location.y, v.dxf.get("bulge", 0)) for v in entity.vertices]
+                points = bulge_polyline_points(vertices, entity.is_closed, self.tolerance)
+                current_list.append([tuple(pt) for pt in points.tolist()])
 
             elif entity.dxftype() == "ELLIPSE":
-                print("ELLIPSE not implemented")
+                current_list.append(self._ellipse_to_points(entity))
 
             elif entity.dxftype() == "SPLINE":
 
@@ -0,0 +1,57 @@
+"""
+Tolerance-driven sampling of the curved DXF primitives (arcs, circles, bulged polylines).
+"""
+
+import math
+
+import numpy as np
+
+
+def arc_points(center, radius, start_angle, sweep, tolerance):
+    """
+    Sample a circular arc so that no chord deviates more than ``tolerance`` from it.
+
+    Args:
+        center (tuple): Arc centre.
+        radius (float): Arc radius.
+        start_angle (float): Start angle in radians.
+        sweep (float): Signed sweep in radians (positive is counter-clockwise).
+        tolerance (float): Maximum chord error.
+
+    Returns:
+        np.ndarray: (N, 2) points including both arc ends.
+    """
+    if radius <= tolerance:
+        max_step = math.pi / 2
+    else:
+        max_step = 2 * math.acos(1 - tolerance / radius)
+    steps = max(1, math.ceil(abs(sweep) / max_step))
+    angles = start_angle + sweep * np.arange(steps + 1) / steps
+    return np.column_stack([center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)])
+
+
+def bulge_polyline_points(vertices, closed, tolerance):
+    """
+    Flatten a polyline given as (x, y, bulge) vertices; bulge = tan(sweep / 4) of the arc to the next vertex.
+    """
+    vertices = [(float(x), float(y), float(b)) for x, y, b in vertices]
+    if closed and len(vertices) > 1:
+        vertices = vertices + [vertices[0]]
+    if not vertices:
+        return np.empty((0, 2))
+
+    parts = [np.array([vertices[0][:2]])]
+    for (x0, y0, bulge), (x1, y1, _) in zip(vertices[:-1], vertices[1:]):
+        chord = math.hypot(x1 - x0, y1 - y0)
+        if bulge == 0 or chord == 0:
+            parts.append(np.array([[x1, y1]]))
+            continue
+        sweep = 4 * math.atan(bulge)
+        radius = chord / (2 * abs(math.sin(sweep / 2)))
+        # Centre sits on the chord normal; the signed tangent puts it left of the chord for CCW arcs
+        offset = (chord / 2) / math.tan(sweep / 2)
+        nx, ny = -(y1 - y0) / chord, (x1 - x0) / chord
+        cx, cy = (x0 + x1) / 2 + nx * offset, (y0 + y1) / 2 + ny * offset
+        start_angle = math.atan2(y0 - cy, x0 - cx)
+        parts.append(arc_points((cx, cy), radius, start_angle, sweep, tolerance)[1:])
+    return np.concatenate(parts)
@@ -0,0 +1,301 @@
+"""
+In-process metrics: counters, gauges and latency histograms.
+
+Metrics are created on first use by name and live in a process-wide registry, so any
+module can record without wiring:
+
+    from modules.shared.utils import metrics
+
+    FRAME_TIME = metrics.histogram("vision.frame")
+
+    with FRAME_TIME.time():
+        ...
+    metrics.counter("vision.frames").inc()
+
+    @metrics.timed("matching.match")
+    def match(...):
+        ...
+
+Recording is a lock, a bisect and an addition, so it is cheap enough for every frame,
+Modbus transaction and broker message. Histograms keep counts in fixed, logarithmically
+spaced buckets (about 9% wide) instead of the samples, so memory stays constant and
+percentiles are read from the buckets.
+
+snapshot() returns a JSON-ready dict of everything recorded; the API gateway serves it
+at stats/metrics.
+"""
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+
+METRICS_ENABLED = True
+
+# Histogram bucket upper bounds: 1 µs to ~1.5 h in seconds, eight buckets per doubling
+_BUCKET_BOUNDS = tuple(1e-6 * 2 ** (i / 8) for i in range(8 * 33))
+
+
+class Counter:
+    """Monotonic count of events."""
+
+    def __init__(self, name):
+        self.name = name
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self):
+        return self._value
+
+    def reset(self):
+        with self._lock:
+            self._value = 0
+
+    def snapshot(self):
+        return {"type": "counter", "value": self._value}
+
+
+class Gauge:
+    """Last value of something that goes up and down (queue depth, contours in view, ...)."""
+
+    def __init__(self, name):
+        self.name = name
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        if METRICS_ENABLED:
+            self._value = value
+
+    def inc(self, amount=1):
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    @property
+    def value(self):
+        return self._value
+
+    def reset(self):
+        self._value = 0.0
+
+    def snapshot(self):
+        return {"type": "gauge", "value": self._value}
+
+
+class _Timer:
+    """Context manager and decorator recording elapsed seconds into a histogram."""
+
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+    def __call__(self, function):
+        histogram = self.histogram
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return wrapper
+
+
+class Histogram:
+    """
+    Distribution of observed values, in seconds for timings.
+
+    Attributes:
+        name (str): Metric name.
+        count (int): Number of observations.
+        total (float): Sum of the observations.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._buckets = [0] * (len(_BUCKET_BOUNDS) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.min = math.inf
+            self.max = 0.0
+
+    def observe(self, value):
+        if not METRICS_ENABLED:
+            return
+        index = bisect_left(_BUCKET_BOUNDS, value)
+        with self._lock:
+            self._buckets[index] += 1
+            self.count += 1
+            self.total += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def time(self):
+        """Time a block: ``with histogram.time(): ...``"""
+        return _Timer(self)
+
+    def percentile(self, q):
+        """
+        Approximate q-th percentile (0-100), interpolated inside the bucket it falls in.
+
+        Returns:
+            float: The percentile, or 0.0 without observations.
+        """
+        with self._lock:
+            buckets, count, low, high = list(self._buckets), self.count, self.min, self.max
+        if count == 0:
+            return 0.0
+        rank = q / 100 * count
+        seen = 0
+        for index, n in enumerate(buckets):
+            if n and seen + n >= rank:
+                lower = _BUCKET_BOUNDS[index - 1] if index > 0 else 0.0
+                upper = _BUCKET_BOUNDS[index] if index < len(_BUCKET_BOUNDS) else high
+                value = lower + (upper - lower) * (rank - seen) / n
+                return min(max(value, low), high)
+            seen += n
+        return high
+
+    def snapshot(self):
+        count = self.count
+        return {
+            "type": "histogram",
+            "count": count,
+            "sum": self.total,
+            "mean": self.total / count if count else 0.0,
+            "min": self.min if count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+        }
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name, kind):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, kind(name))
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric '{name}' is a {type(metric).__name__}, not a {kind.__name__}")
+        return metric
+
+    def counter(self, name) -> Counter:
+        return self._get(name, Counter)
+
+    def gauge(self, name) -> Gauge:
+        return self._get(name, Gauge)
+
+    def histogram(self, name) -> Histogram:
+        return self._get(name, Histogram)
+
+    def timed(self, name) -> _Timer:
+        """Time a block or a function into the histogram ``name``."""
+        return _Timer(self.histogram(name))
+
+    def snapshot(self, prefix=None):
+        """
+        All metrics as a dict, sorted by name.
+
+        Args:
+            prefix (str): Only metrics whose name starts with it.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return {name: metric.snapshot() for name, metric in metrics if not prefix or name.startswith(prefix)}
+
+    def reset(self):
+        """Zero every metric; the metrics themselves stay registered."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+class TimedProxy:
+    """
+    Wraps an object so every method call is timed into ``<prefix>.<method>``.
+
+    Used for the robot's XML-RPC client, where each method is one round trip.
+    """
+
+    def __init__(self, target, prefix, registry=None):
+        self._target = target
+        self._prefix = prefix
+        self._registry = registry or _registry
+        self._wrappers = {}
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            histogram = self._registry.histogram(f"{self._prefix}.{name}")
+            errors = self._registry.counter(f"{self._prefix}.errors")
+            target = self._target
+
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return getattr(target, name)(*args, **kwargs)
+                except Exception:
+                    errors.inc()
+                    raise
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+
+            self._wrappers[name] = wrapper
+        return wrapper
+
+
+_registry = MetricsRegistry()
+
+counter = _registry.counter
+gauge = _registry.gauge
+histogram = _registry.histogram
+timed = _registry.timed
+snapshot = _registry.snapshot
+reset = _registry.reset
+
+
+def get_registry():
+    return _registry
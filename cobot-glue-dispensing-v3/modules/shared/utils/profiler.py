@@ -0,0 +1,104 @@
+"""
+On-demand sampling profiler for a running process.
+
+sample() reads every thread's current stack with sys._current_frames() at a fixed
+interval and aggregates where the threads were: the functions they were in (self) and
+the functions on their stacks (cumulative). Nothing is installed in the other threads,
+so it can be triggered on the live system (the API gateway serves it at stats/profile)
+and costs nothing when not running.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+MAX_DURATION = 30.0
+MIN_INTERVAL = 0.001
+
+_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a snapshot is requested while another one is still sampling."""
+
+
+def _frame_key(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample(duration=2.0, interval=0.005, top=25):
+    """
+    Sample all threads' stacks for ``duration`` seconds.
+
+    Args:
+        duration (float): Sampling time in seconds, capped at MAX_DURATION.
+        interval (float): Seconds between samples.
+        top (int): Number of functions and stacks to report.
+
+    Returns:
+        dict: duration, samples, samples per thread, top functions by self and
+        cumulative samples (with the share of all samples), and the most frequent
+        stacks in collapsed form ("outer;...;inner").
+
+    Raises:
+        ProfilerBusyError: If a snapshot is already being taken.
+    """
+    duration = min(max(float(duration), 0.0), MAX_DURATION)
+    interval = max(float(interval), MIN_INTERVAL)
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profiling snapshot is already running")
+    try:
+        own_id = threading.get_ident()
+        own_self = Counter()
+        cumulative = Counter()
+        stacks = Counter()
+        per_thread = Counter()
+        samples = 0
+
+        start = time.perf_counter()
+        deadline = start + duration
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_key(frame))
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                per_thread[names.get(thread_id, str(thread_id))] += 1
+                own_self[stack[0]] += 1
+                cumulative.update(set(stack))
+                stacks[";".join(reversed(stack))] += 1
+            samples += 1
+            if time.perf_counter() >= deadline:
+                break
+            time.sleep(interval)
+
+        total = sum(per_thread.values()) or 1
+        return {
+            'duration': time.perf_counter() - start,
+            'interval': interval,
+            'samples': samples,
+            'threads': dict(per_thread.most_common()),
+            'self': [{'function': f, 'samples': n, 'share': n / total} for f, n in own_self.most_common(top)],
+            'cumulative': [{'function': f, 'samples': n, 'share': n / total} for f, n in cumulative.most_common(top)],
+            'stacks': [{'stack': s, 'samples': n} for s, n in stacks.most_common(top)],
+        }
+    finally:
+        _lock.release()
+
+
+def format_report(report, limit=15):
+    """Human-readable text of a sample() report."""
+    lines = [f"{report['samples']} samples over {report['duration']:.2f} s "
+             f"(interval {report['interval'] * 1000:.1f} ms)", "", "Threads:"]
+    lines += [f"  {n:>6}  {name}" for name, n in report['threads'].items()]
+    for kind in ('self', 'cumulative'):
+        lines += ["", f"Top functions ({kind}):"]
+        lines += [f"  {row['share'] * 100:5.1f}%  {row['function']}" for row in report[kind][:limit]]
+    return "\n".join(lines)
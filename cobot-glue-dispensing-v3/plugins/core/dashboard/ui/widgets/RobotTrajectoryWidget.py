@@ -2,6 +2,7 @@ import os
 import time
 import threading
 from collections import deque
+from itertools import islice
 
 import cv2
 import numpy as np
@@ -11,6 +12,7 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QFrame, Q
 
 from frontend.core.utils.IconLoader import LOGO
 from frontend.core.utils.IconLoader import CAMERA_PREVIEW_PLACEHOLDER
+from modules.VisionSystem.frame_channel import frame_from_message
 
 
 class CompactTimeMetric(QWidget):
@@ -46,18 +48,23 @@ class CompactTimeMetric(QWidget):
 
 class TrajectoryManager:
     def __init__(self):
-        self.trajectory_points = deque()
-        self.current_position = None
-        self.last_position = None
-        self._lock = threading.Lock()  # Add thread lock for thread safety
-        
         # Trail settings
-        self.trail_length = 100
+        self.trail_length = 1000  # Points kept; the drawn trail stays on the TrailRenderer layer
         self.trail_thickness = 2
         self.trail_fade = False
         self.show_current_point = True
         self.interpolate_motion = True
 
+        self.trajectory_points = deque(maxlen=self.trail_length)
+        self.current_position = None
+        self.last_position = None
+        self._lock = threading.Lock()  # Add thread lock for thread safety
+
+        # Points appended since the last clear, and the number of clears, so the
+        # renderer can ask for the points it has not drawn yet
+        self.points_added = 0
+        self.generation = 0
+
         # Colors (BGR) - Material Design colors
         self.trail_color = (156, 39, 176)  # Purple 500
         self.current_point_color = (0, 0, 128)  # Navy Blue
@@ -70,7 +77,10 @@ class TrajectoryManager:
         # Trajectory break tracking
         self.trajectory_break_pending = False
 
-
+    def _append(self, point):
+        """Append a point; the caller holds the lock."""
+        self.trajectory_points.append(point)
+        self.points_added += 1
 
     def add_interpolated_points(self, start_pos, end_pos, num_interpolated=3):
         start_x, start_y = start_pos
@@ -85,9 +95,9 @@ class TrajectoryManager:
                     t = i / (num_interpolated + 1)
                     interp_x = int(start_x + t * (end_x - start_x))
                     interp_y = int(start_y + t * (end_y - start_y))
-                    self.trajectory_points.append((interp_x, interp_y, current_time, False))  # False = not a break
+                    self._append((interp_x, interp_y, current_time, False))  # False = not a break
 
-            self.trajectory_points.append((end_x, end_y, current_time, False))  # False = not a break
+            self._append((end_x, end_y, current_time, False))  # False = not a break
 
     def update_position(self, position):
         # If a trajectory break is pending, reset last position to avoid connecting
@@ -105,7 +115,7 @@ class TrajectoryManager:
         else:
             with self._lock:
                 is_break_start = self.last_position is None  # True if this is the start of a new segment
-                self.trajectory_points.append((*position, time.time(), is_break_start))
+                self._append((*position, time.time(), is_break_start))
     
     def break_trajectory(self):
         """Signal that the next position update should start a new trajectory segment"""
@@ -117,13 +127,125 @@ class TrajectoryManager:
             self.trajectory_points.clear()
             self.current_position = None
             self.last_position = None
+            self.points_added = 0
+            self.generation += 1
     
     def get_trajectory_copy(self):
         """Thread-safe method to get a copy of trajectory points"""
         with self._lock:
             return list(self.trajectory_points)
 
+    def get_points_since(self, generation, count):
+        """
+        Thread-safe method to get the points appended after the first ``count`` points of ``generation``.
 
+        Returns (generation, points_added, new points). After a clear (another generation)
+        every kept point is new; points that already left the bounded history are skipped.
+        """
+        with self._lock:
+            if generation != self.generation:
+                count = 0
+            new = min(self.points_added - count, len(self.trajectory_points))
+            points = list(islice(reversed(self.trajectory_points), new))
+            points.reverse()
+            return self.generation, self.points_added, points
+
+
+class TrailRenderer:
+    """
+    Draws the trajectory trail incrementally onto a persistent layer.
+
+    The layer is the RGB conversion of the base frame with every trail segment drawn so
+    far, so each display tick only smooths and draws the points added since the previous
+    tick, then overlays the highlight of the most recent points. The base frame is
+    converted to RGB once when it changes rather than on every tick.
+
+    Points are smoothed with the same 3-point moving average per segment as before, kept
+    as a running window; a trajectory break starts a new segment and leaves the highlight
+    of the finished one on the layer.
+    """
+
+    SMOOTHING_WINDOW = 3
+    RECENT_POINTS = 5
+
+    def __init__(self, color=(156, 39, 176), thickness=2):
+        self.color = tuple(reversed(color))  # BGR setting, RGB layer
+        self.thickness = thickness
+        self.base_rgb = None
+        self.layer = None
+        self.generation = None
+        self.drawn = 0
+        self._reset_segment()
+
+    def _reset_segment(self):
+        self._window = deque(maxlen=self.SMOOTHING_WINDOW)
+        self._recent = deque(maxlen=self.RECENT_POINTS)
+        self._segment_length = 0
+
+    def set_base(self, frame):
+        """Convert a new BGR base frame and start an empty layer on it."""
+        self.base_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        self.clear()
+
+    def clear(self):
+        if self.base_rgb is not None:
+            self.layer = self.base_rgb.copy()
+        self.drawn = 0
+        self._reset_segment()
+
+    def sync(self, trajectory_manager):
+        """Draw the points the manager received since the last call; returns whether the layer changed."""
+        generation, total, points = trajectory_manager.get_points_since(self.generation, self.drawn)
+        changed = generation != self.generation
+        if changed:
+            self.clear()
+            self.generation = generation
+        if self.layer is not None:
+            for point in points:
+                self._add_point(point)
+        self.drawn = total
+        return changed or bool(points)
+
+    def _inside(self, p):
+        return 0 <= p[0] < self.layer.shape[1] and 0 <= p[1] < self.layer.shape[0]
+
+    def _add_point(self, point_data):
+        x, y = point_data[:2]
+        if len(point_data) >= 4 and point_data[3] and self._segment_length:
+            self._finish_segment()
+        self._window.append((x, y))
+        smoothed = (int(sum(p[0] for p in self._window) / len(self._window)),
+                    int(sum(p[1] for p in self._window) / len(self._window)))
+        if self._recent:
+            previous = self._recent[-1]
+            if self._inside(previous) and self._inside(smoothed):
+                cv2.line(self.layer, previous, smoothed, self.color, self.thickness, lineType=cv2.LINE_AA)
+        self._recent.append(smoothed)
+        self._segment_length += 1
+
+    def _finish_segment(self):
+        self._draw_recent(self.layer)
+        self._reset_segment()
+
+    def _draw_recent(self, image):
+        # Highlight recent points of segments longer than the highlight itself
+        if self._segment_length <= self.RECENT_POINTS:
+            return
+        recent_points = list(self._recent)
+        for p1, p2 in zip(recent_points, recent_points[1:]):
+            if self._inside(p1) and self._inside(p2):
+                cv2.line(image, p1, p2, (255, 200, 255), 6, lineType=cv2.LINE_AA)
+                cv2.line(image, p1, p2, (255, 100, 255), 2, lineType=cv2.LINE_AA)
+
+    def render(self, drawing_enabled=True):
+        """The RGB frame to display: the layer with the current highlight, or the bare base frame."""
+        if not drawing_enabled or self.layer is None:
+            return self.base_rgb
+        if self._segment_length <= self.RECENT_POINTS:
+            return self.layer
+        frame = self.layer.copy()
+        self._draw_recent(frame)
+        return frame
 
 
 def draw_icon_at_position(icon, image, position):
@@ -160,102 +282,6 @@ def draw_icon_at_position(icon, image, position):
         pass
         # print(f"Warning: Icon position out of bounds: ({x1}, {y1}) to ({x2}, {y2})")
 
-def draw_smooth_trail(image, trajectory_points_with_breaks):
-    """Draw trajectory trail respecting break markers"""
-    if len(trajectory_points_with_breaks) < 2:
-        return
-
-    image_width = image.shape[1]
-    image_height = image.shape[0]
-    
-    # Split trajectory into separate segments based on break markers
-    segments = []
-    current_segment = []
-    
-    for point_data in trajectory_points_with_breaks:
-        if len(point_data) >= 4:  # New format: (x, y, time, is_break)
-            x, y, timestamp, is_break = point_data[:4]
-            if is_break and current_segment:
-                # Start of new segment - save current segment and start fresh
-                if len(current_segment) > 1:
-                    segments.append(current_segment)
-                current_segment = [(x, y)]
-            else:
-                current_segment.append((x, y))
-        else:  # Old format: (x, y, time) - treat as continuous
-            x, y = point_data[:2]
-            current_segment.append((x, y))
-    
-    # Add the last segment
-    if len(current_segment) > 1:
-        segments.append(current_segment)
-    
-    # print(f"🎨 TRAJECTORY: Drawing {len(segments)} separate trajectory segments")
-    
-    # Draw each segment separately
-    for segment_idx, segment in enumerate(segments):
-        if len(segment) < 2:
-            continue
-            
-        # Convert to numpy array for processing
-        segment_points = np.array(segment, dtype=np.float32)
-        
-        # Apply smoothing to this segment
-        smoothed_points = []
-        kernel_size = 3  # Reduced for better responsiveness
-        
-        for i in range(len(segment_points)):
-            start = max(0, i - kernel_size + 1)
-            avg_x = np.mean(segment_points[start:i + 1, 0])
-            avg_y = np.mean(segment_points[start:i + 1, 1])
-            smoothed_points.append((int(avg_x), int(avg_y)))
-        
-        # Draw lines within this segment only
-        total = len(smoothed_points)
-        
-        for i in range(total - 1):
-            progress = (i + 1) / total
-            if progress < 0.3:
-                fade_factor = progress / 0.3
-                color = (
-                    int(200 * fade_factor),
-                    int(100 * fade_factor),
-                    int(50 * fade_factor)
-                )
-            elif progress < 0.7:
-                fade_factor = (progress - 0.3) / 0.4
-                color = (
-                    int(156 + (100 * fade_factor)),
-                    int(39 + (50 * fade_factor)),
-                    int(176 + (79 * fade_factor))
-                )
-            else:
-                fade_factor = (progress - 0.7) / 0.3
-                color = (
-                    int(255 * fade_factor),
-                    int(89 * fade_factor),
-                    int(255 * fade_factor)
-                )
-
-            thickness = max(1, int(2 + (progress * 4)))
-            p1 = smoothed_points[i]
-            p2 = smoothed_points[i + 1]
-
-            if (0 <= p1[0] < image_width and 0 <= p1[1] < image_height and
-                    0 <= p2[0] < image_width and 0 <= p2[1] < image_height):
-                cv2.line(image, p1, p2, color, thickness, lineType=cv2.LINE_AA)
-
-        # Highlight recent points within this segment
-        if len(smoothed_points) > 5:
-            recent_points = smoothed_points[-5:]
-            for i in range(len(recent_points) - 1):
-                p1 = recent_points[i]
-                p2 = recent_points[i + 1]
-                if (0 <= p1[0] < image_width and 0 <= p1[1] < image_height and
-                        0 <= p2[0] < image_width and 0 <= p2[1] < image_height):
-                    cv2.line(image, p1, p2, (255, 200, 255), 6, lineType=cv2.LINE_AA)
-                    cv2.line(image, p1, p2, (255, 100, 255), 2, lineType=cv2.LINE_AA)
-
 def load_logo_icon():
     """Load logo icon with error handling"""
     if not os.path.exists(LOGO):
@@ -286,8 +312,13 @@ class RobotTrajectoryWidget(QWidget):
 
         # Frame and trajectory storage
         self.base_frame = None
-        self.current_frame = None
+        self.current_frame = None  # RGB frame shown in the label
         self.trajectory_manager = TrajectoryManager()
+        self.trail_renderer = TrailRenderer(self.trajectory_manager.trail_color,
+                                            self.trajectory_manager.trail_thickness)
+        self._base_frame_changed = False
+        self._shown_drawing_enabled = None
+        self.drawing_enabled = False
 
         self.init_ui()
 
@@ -296,11 +327,11 @@ class RobotTrajectoryWidget(QWidget):
 
         # Load placeholder image after UI is initialized
         self.load_placeholder_image()
-        self.drawing_enabled = False
-        # Timer to refresh display
+        # Timer to refresh display; a tick only redraws when the image or the trail changed
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_display)
         self.timer.start(30)  # 30 FPS
+        self.update_display()
 
 
 
@@ -367,9 +398,8 @@ class RobotTrajectoryWidget(QWidget):
         try:
             placeholder_image = cv2.imread(CAMERA_PREVIEW_PLACEHOLDER)
             placeholder_image = cv2.resize(placeholder_image, (self.image_width, self.image_height))
-            self.base_frame = placeholder_image.copy()
-            self.current_frame = placeholder_image.copy()
-            self._update_label_from_frame()
+            self.base_frame = placeholder_image
+            self._base_frame_changed = True
         except Exception as e:
             raise ValueError(f"Error loading placeholder image: {e}")
 
@@ -393,25 +423,28 @@ class RobotTrajectoryWidget(QWidget):
         if self.base_frame is None:
             return
 
-        self.current_frame = self.base_frame.copy()
+        changed = False
+        if self._base_frame_changed:
+            # Clear the flag before reading the frame, so a frame set meanwhile is shown next tick
+            self._base_frame_changed = False
+            self.trail_renderer.set_base(self.base_frame)
+            changed = True
 
-        # Use the thread-safe method to get trajectory points
-        trajectory_points_copy = self.trajectory_manager.get_trajectory_copy()
+        if self.drawing_enabled:
+            # Draws only the points received since the previous tick
+            changed = self.trail_renderer.sync(self.trajectory_manager) or changed
 
-        if self.drawing_enabled == True:
-            if trajectory_points_copy:
-                try:
-                    # Pass the trajectory points with break information directly
-                    draw_smooth_trail(image=self.current_frame, trajectory_points_with_breaks=trajectory_points_copy)
-                except (IndexError, ValueError):
-                    # Handle any remaining issues with point extraction
-                    pass
+        if self.drawing_enabled != self._shown_drawing_enabled:
+            self._shown_drawing_enabled = self.drawing_enabled
+            changed = True
 
         # if self.trajectory_manager.current_position is not None and self.trajectory_manager.show_current_point:
         #     draw_icon_at_position(self.logo_icon, self.current_frame,
         #                           self.trajectory_manager.current_position)
 
-        self._update_label_from_frame()
+        if changed:
+            self.current_frame = self.trail_renderer.render(self.drawing_enabled)
+            self._update_label_from_frame()
         self.trajectory_manager.update_count += 1
 
         # Update time displays
@@ -422,7 +455,7 @@ class RobotTrajectoryWidget(QWidget):
         if self.current_frame is None:
             return
 
-        rgb_image = cv2.cvtColor(self.current_frame, cv2.COLOR_BGR2RGB)
+        rgb_image = self.current_frame
         h, w, ch = rgb_image.shape
         q_image = QImage(rgb_image.data, w, h, ch * w, QImage.Format.Format_RGB888)
 
@@ -441,17 +474,19 @@ class RobotTrajectoryWidget(QWidget):
     def set_image(self, message=None):
         # print("Updating image from external source")
         """Receive an external image from outside."""
-        if message is None or "image" not in message:
+        if message is None or ("image" not in message and "channel" not in message):
             return
 
-        frame = message.get("image")
+        # Vision frames arrive as a shared memory notification, trajectory images inline
+        frame = frame_from_message(message)
         if frame is None:
-            self.load_placeholder_image()
+            if "image" in message:
+                self.load_placeholder_image()
             return
 
         try:
-            frame = cv2.resize(frame, (self.image_width, self.image_height))
-            self.base_frame = frame.copy()
+            self.base_frame = cv2.resize(frame, (self.image_width, self.image_height))
+            self._base_frame_changed = True
             self.trajectory_manager.clear_trail()
         except Exception as e:
             print(f"Error setting image: {e}")
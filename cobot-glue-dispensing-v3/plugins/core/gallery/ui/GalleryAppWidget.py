@@ -20,7 +20,11 @@ class GalleryAppWidget(AppWidget):
         super().setup_ui()  # Get the basic layout with back button
 
         try:
-            workpieces = self.controller.handle(workpiece_endpoints.WORKPIECE_GET_ALL)
+            # The index lists the workpieces with their pre-rendered thumbnails, without contours
+            entries = self.controller.handle(workpiece_endpoints.WORKPIECE_GET_INDEX)
+            workpieces = None
+            if entries is None:
+                workpieces = self.controller.handle(workpiece_endpoints.WORKPIECE_GET_ALL)
 
             def onApply(filename):
                 if not filename:
@@ -37,7 +41,7 @@ class GalleryAppWidget(AppWidget):
             if self.onApplyCallback is None:
                 self.onApplyCallback = onApply
 
-            content_widget = GalleryContent(workpieces=workpieces, thumbnails=self.thumbnails,
+            content_widget = GalleryContent(workpieces=workpieces, entries=entries, thumbnails=self.thumbnails,
                                             onApplyCallback=self.onApplyCallback,controller=self.controller)
             content_widget.edit_requested.connect(lambda workpiece_id: self.edit_requested.emit(workpiece_id))
 
@@ -13,11 +13,14 @@ from plugins.core.gallery.ui.gallery import utils
 from plugins.core.gallery.ui.gallery.WorkpieceVisualizationDialog import WorkpieceVisualizationDialog
 from plugins.core.gallery.ui.gallery.FilterPanel import FilterPanel  # Import our new filter panel
 from plugins.core.gallery.ui.gallery.SelectionActionBar import SelectionActionBar
-from plugins.core.gallery.ui.gallery.ThumbnailWidget import ThumbnailWidget
+from plugins.core.gallery.ui.gallery.ThumbnailWidget import ThumbnailWidget, STYLE_SHEET as thumbnail_style_sheet
+from plugins.core.gallery.ui.gallery.thumbnail_loader import ThumbnailLoader
 from frontend.core.utils.IconLoader import GALLERY_PLACEHOLDER_ICON, GALLERY_APPLY_BUTTON_ICON, GALLERY_REMOVE_BUTTON_ICON, \
     GALLERY_SELECT_BUTTON_ICON
 import random
 import time
+from collections import deque
+from functools import partial
 
 from PyQt6.QtCore import Qt
 
@@ -31,25 +34,41 @@ APPLY_BUTTON_ICON_PATH = GALLERY_APPLY_BUTTON_ICON
 SELECT_BUTTON_ICON_PATH = GALLERY_SELECT_BUTTON_ICON
 REMOVE_BUTTON_ICON_PATH = GALLERY_REMOVE_BUTTON_ICON
 
+THUMBNAIL_COLUMNS = 4
+THUMBNAIL_BATCH_SIZE = 4 * THUMBNAIL_COLUMNS  # Thumbnail widgets created at a time, about a screen
+THUMBNAIL_PREFETCH_SCREENS = 2  # Keep this many screens of thumbnails created below the visible ones
+
 
 class GalleryContent(QFrame, TranslatableMixin):
     edit_requested = pyqtSignal(str)
-    def __init__(self, thumbnails=None, workpieces=None, onApplyCallback=None,controller = None):
+    def __init__(self, thumbnails=None, workpieces=None, onApplyCallback=None,controller = None, entries=None):
         QFrame.__init__(self)
         TranslatableMixin.__init_translation__(self)
         
         self.thumbnails = thumbnails
         self.controller = controller
+        # Widget factories for the thumbnails not created yet: the widgets are created in
+        # batches as the grid is scrolled towards its end, and their images are produced
+        # by the loader's workers once they are painted
+        self.pending_thumbnails = deque()
+        self.thumbnail_loader = None
         if self.thumbnails is None:
             self.thumbnails = []
-            if workpieces is not None and len(workpieces) != 0:
-                self.thumbnails = []
-                for wp in workpieces:
-                    thumbnail = utils.create_thumbnail_widget_from_workpiece(wp, wp.workpieceId, "default")
-                    self.thumbnails.append(thumbnail)
-                print("thumbnails", len(self.thumbnails))
+            if entries:
+                # Workpiece index entries: thumbnails are read from disk as they scroll into view
+                self.pending_thumbnails.extend(partial(utils.create_thumbnail_widget_from_entry, entry)
+                                               for entry in entries)
+                print("thumbnails", len(self.pending_thumbnails))
+            elif workpieces is not None and len(workpieces) != 0:
+                self.pending_thumbnails.extend(
+                    partial(utils.create_thumbnail_widget_from_workpiece, wp, wp.workpieceId, "default")
+                    for wp in workpieces)
+                print("thumbnails", len(self.pending_thumbnails))
             else:
                 print("Workpieces is None or Empty")
+            if self.pending_thumbnails:
+                self.thumbnail_loader = ThumbnailLoader(parent=self)
+                self.destroyed.connect(self.thumbnail_loader.shutdown)
 
         self.workpieces = workpieces
         self.onApplyCallback = onApplyCallback
@@ -227,6 +246,13 @@ class GalleryContent(QFrame, TranslatableMixin):
         self.placeholder_pixmap.load(PLACEHOLDER_IMAGE_PATH)
 
         self.thumbnail_size = (120, 120)  # Initial thumbnail size (width, height)
+        # Shown by thumbnails until their image is loaded
+        tile_placeholder = QPixmap(PLACEHOLDER_IMAGE_PATH)
+        if tile_placeholder.isNull():
+            tile_placeholder = QPixmap(*self.thumbnail_size)
+            tile_placeholder.fill(QColor("#eeeeee"))
+        self.tile_placeholder = tile_placeholder.scaled(
+            *self.thumbnail_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
 
         if self.thumbnails is None:
             # Add sample thumbnails (This can be dynamic in a real use case)
@@ -234,19 +260,8 @@ class GalleryContent(QFrame, TranslatableMixin):
             self.add_placeholders()
         else:
             print("Add self.thumbnails")
-            for i, t in enumerate(self.thumbnails):
-                # Connect the clicked signal to your preview function
-                t.clicked.connect(
-                    lambda t=t, i=i, timestamp=t.timestamp, filename=t.filename: self.on_thumbnail_clicked(t, i, timestamp, filename))
-
-                # Connect the long press signal
-                t.long_pressed.connect(
-                    lambda i=i, timestamp=t.timestamp, filename=t.filename: self.on_thumbnail_long_press(i, timestamp, filename))
-
-                # Add the thumbnail widget directly to the grid layout
-                self.thumbnail_layout.addWidget(t, i // 4, i % 4)  # 4 columns grid
-                self.all_thumbnails.append(t)
-                self.visible_thumbnails.append(t)
+            self.add_thumbnails(list(self.thumbnails))
+            self.create_next_thumbnails((1 + THUMBNAIL_PREFETCH_SCREENS) * THUMBNAIL_BATCH_SIZE)
 
         # Scrollable Area for Thumbnails with only vertical scroll enabled
         self.scroll_area = QScrollArea(self)
@@ -280,6 +295,9 @@ class GalleryContent(QFrame, TranslatableMixin):
         self.scroll_area.setHorizontalScrollBarPolicy(
             Qt.ScrollBarPolicy.ScrollBarAlwaysOff)  # Disable horizontal scrollbar
         self.scroll_area.setWidget(self.create_thumbnail_widget())
+        # Create more thumbnail widgets when the end of the grid comes near
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.create_thumbnails_near_end)
+        self.scroll_area.verticalScrollBar().rangeChanged.connect(self.create_thumbnails_near_end)
 
         # Enable scrolling by pixel
         QScroller.grabGesture(self.scroll_area.viewport(), QScroller.ScrollerGestureType.LeftMouseButtonGesture)
@@ -451,6 +469,9 @@ class GalleryContent(QFrame, TranslatableMixin):
         area_filter = area_filter.lower().strip()
         filename_filter = filename_filter.lower().strip()
 
+        # Filters apply to every workpiece, not only to the thumbnails scrolled to so far
+        self.create_all_thumbnails()
+
         # Clear current layout
         self.clear_thumbnail_layout()
 
@@ -481,6 +502,7 @@ class GalleryContent(QFrame, TranslatableMixin):
 
     def clear_filters(self):
         """Clear all filters and show all thumbnails"""
+        self.create_all_thumbnails()
         # Show all thumbnails
         self.visible_thumbnails = self.all_thumbnails.copy()
         self.update_thumbnail_layout()
@@ -590,9 +612,50 @@ class GalleryContent(QFrame, TranslatableMixin):
             self.all_thumbnails.append(thumbnail_widget)
             self.visible_thumbnails.append(thumbnail_widget)
 
+    def add_thumbnails(self, thumbnails):
+        """Connects the thumbnails' signals and appends them to the grid."""
+        for t in thumbnails:
+            i = len(self.all_thumbnails)
+            # Connect the clicked signal to your preview function
+            t.clicked.connect(
+                lambda t=t, i=i, timestamp=t.timestamp, filename=t.filename: self.on_thumbnail_clicked(t, i, timestamp, filename))
+
+            # Connect the long press signal
+            t.long_pressed.connect(
+                lambda i=i, timestamp=t.timestamp, filename=t.filename: self.on_thumbnail_long_press(i, timestamp, filename))
+
+            # Add the thumbnail widget directly to the grid layout
+            position = len(self.visible_thumbnails)
+            self.thumbnail_layout.addWidget(t, position // THUMBNAIL_COLUMNS, position % THUMBNAIL_COLUMNS)
+            self.all_thumbnails.append(t)
+            self.visible_thumbnails.append(t)
+
+    def create_next_thumbnails(self, count=THUMBNAIL_BATCH_SIZE):
+        """Creates up to ``count`` of the pending thumbnail widgets and adds them to the grid."""
+        batch = []
+        while self.pending_thumbnails and len(batch) < count:
+            create = self.pending_thumbnails.popleft()
+            batch.append(create(loader=self.thumbnail_loader, placeholder=self.tile_placeholder, style_sheet=False))
+        self.thumbnails.extend(batch)
+        self.add_thumbnails(batch)
+
+    def create_all_thumbnails(self):
+        """Creates every pending thumbnail widget, for operations on all workpieces."""
+        if self.pending_thumbnails:
+            self.create_next_thumbnails(len(self.pending_thumbnails))
+
+    def create_thumbnails_near_end(self, *args):
+        """Creates the next batch once the grid is scrolled near its end (or does not fill the view)."""
+        if not self.pending_thumbnails:
+            return
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if scroll_bar.value() >= scroll_bar.maximum() - THUMBNAIL_PREFETCH_SCREENS * scroll_bar.pageStep():
+            self.create_next_thumbnails()
+
     def create_thumbnail_widget(self):
         """Creates and returns the widget that holds the thumbnails"""
         thumbnail_widget = QWidget(self)
+        thumbnail_widget.setStyleSheet(thumbnail_style_sheet)  # Shared by all thumbnails
         thumbnail_widget.setLayout(self.thumbnail_layout)
         self.thumbnail_layout.setAlignment(Qt.AlignmentFlag.AlignTop)  # Align thumbnails to the top
         return thumbnail_widget
@@ -615,7 +678,10 @@ class GalleryContent(QFrame, TranslatableMixin):
             print(f"File Name: {file_name}")  # Debugging statement
 
             # Get the pixmap of the clicked thumbnail
-            pixmap = getattr(thumbnail_widget, "original_pixmap", None)
+            if hasattr(thumbnail_widget, "load_preview"):
+                pixmap = thumbnail_widget.load_preview()
+            else:
+                pixmap = getattr(thumbnail_widget, "original_pixmap", None)
             if pixmap:
                 self.update_preview_image(pixmap)
 
@@ -671,6 +737,12 @@ class GalleryContent(QFrame, TranslatableMixin):
                 if hasattr(wp, 'workpieceId') and str(wp.workpieceId) == str(workpiece_id):
                     workpiece = wp
                     break
+
+        # Listed from the workpiece index: load the full workpiece only now
+        if workpiece is None and workpiece_id and hasattr(self.controller, "getWorkpieceById"):
+            result, loaded = self.controller.getWorkpieceById(workpiece_id)
+            if result:
+                workpiece = loaded
         
         if workpiece:
             # Show visual workpiece dialog
@@ -1197,6 +1269,7 @@ Spray Pattern: {len(workpiece.sprayPattern.get('Contour', [])) if hasattr(workpi
 
     def select_all_thumbnails(self):
         """Select all visible thumbnails"""
+        self.create_all_thumbnails()
         self.selected_thumbnails.clear()
         for thumbnail in self.visible_thumbnails:
             self.selected_thumbnails.add(thumbnail)
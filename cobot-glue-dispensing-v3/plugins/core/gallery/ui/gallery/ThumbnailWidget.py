@@ -2,14 +2,55 @@ from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QPixmap, QFont
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
 
+from applications.glue_dispensing_application.repositories.workpiece.workpiece_thumbnails import \
+    PREVIEW_SIZE, THUMBNAIL_SIZE, render_workpiece_thumbnail
+from plugins.core.gallery.ui.gallery.thumbnail_loader import image_from_bgr
+
+# The look of a thumbnail and its labels. A gallery sets it once on the widget holding its
+# thumbnails (much cheaper than a style sheet per thumbnail when creating many of them)
+STYLE_SHEET = """
+    ThumbnailWidget {
+        border: 1px solid #ccc;
+        border-radius: 5px;
+        background-color: white;
+        margin: 2px;
+    }
+    ThumbnailWidget:hover {
+        border: 2px solid #0078d4;
+        background-color: #f5f5f5;
+    }
+    QLabel#thumbnailImage {
+        border: 1px solid #ddd;
+        background-color: #f9f9f9;
+    }
+    QLabel#thumbnailName {
+        font-weight: bold;
+        color: #333;
+    }
+    QLabel#thumbnailDate {
+        color: #666;
+    }
+"""
+
+
 class ThumbnailWidget(QWidget):
-    """Custom widget to display a thumbnail image, file name, and last modified date."""
+    """
+    Custom widget to display a thumbnail image, file name, and last modified date.
+
+    The image is either given as a pixmap, or as the path of a thumbnail file or a
+    workpiece to render; those are only loaded when the widget is first painted, i.e. when
+    it is scrolled into view, so a gallery of many workpieces opens without decoding or
+    drawing images nobody looks at. With a ThumbnailLoader the image is produced in a
+    worker thread and a placeholder is shown meanwhile; without one it is loaded in the
+    paint event. A larger preview image, if there is one, is read only when it is asked for.
+    """
 
     # Add signal definitions
     clicked = pyqtSignal()
     long_pressed = pyqtSignal()  # New signal for long press
 
-    def __init__(self, filename, pixmap, timestamp, parent=None, workpieceId=None):
+    def __init__(self, filename, pixmap, timestamp, parent=None, workpieceId=None, thumbnail_path=None,
+                 preview_path=None, workpiece=None, loader=None, placeholder=None, style_sheet=True):
         super().__init__(parent)
 
         # Store data for potential use in signal handlers
@@ -17,6 +58,11 @@ class ThumbnailWidget(QWidget):
         self.timestamp = timestamp
         self.original_pixmap = pixmap
         self.workpieceId = workpieceId  # Store workpiece ID for deletion
+        self.thumbnail_path = thumbnail_path  # Loaded on first paint when no pixmap is given
+        self.preview_path = preview_path
+        self.workpiece = workpiece  # Rendered on first paint when there is no thumbnail file
+        self.loader = loader
+        self.load_requested = False
 
         # Long press timer setup
         self.long_press_timer = QTimer()
@@ -29,18 +75,8 @@ class ThumbnailWidget(QWidget):
 
         # Set fixed size for consistent layout
         self.setFixedSize(140, 180)
-        self.setStyleSheet("""
-            ThumbnailWidget {
-                border: 1px solid #ccc;
-                border-radius: 5px;
-                background-color: white;
-                margin: 2px;
-            }
-            ThumbnailWidget:hover {
-                border: 2px solid #0078d4;
-                background-color: #f5f5f5;
-            }
-        """)
+        if style_sheet:  # False when a parent applies STYLE_SHEET to all its thumbnails
+            self.setStyleSheet(STYLE_SHEET)
 
         layout = QVBoxLayout()
         layout.setContentsMargins(5, 5, 5, 5)  # Small margins inside the widget
@@ -48,20 +84,22 @@ class ThumbnailWidget(QWidget):
         self.setLayout(layout)
 
         # Add thumbnail image with fixed size
-        image_label = QLabel()
-        image_label.setFixedSize(120, 120)
-        image_label.setPixmap(
-            pixmap.scaled(120, 120, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
-        image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        image_label.setStyleSheet("border: 1px solid #ddd; background-color: #f9f9f9;")
-        layout.addWidget(image_label)
+        self.image_label = QLabel()
+        self.image_label.setObjectName("thumbnailImage")
+        self.image_label.setFixedSize(120, 120)
+        if pixmap is not None:
+            self._set_image(pixmap)
+        elif placeholder is not None:
+            self.image_label.setPixmap(placeholder)
+        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.image_label)
 
         # Add file name (truncate if too long)
         filename_display = filename if len(filename) <= 20 else filename[:17] + "..."
         filename_label = QLabel(filename_display)
         filename_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         filename_label.setWordWrap(True)
-        filename_label.setStyleSheet("font-weight: bold; color: #333;")
+        filename_label.setObjectName("thumbnailName")
         layout.addWidget(filename_label)
 
         # Add last modified date
@@ -71,9 +109,62 @@ class ThumbnailWidget(QWidget):
         font = QFont()
         font.setPointSize(8)
         date_label.setFont(font)
-        date_label.setStyleSheet("color: #666;")
+        date_label.setObjectName("thumbnailDate")
         # layout.addWidget(date_label)
 
+    def _set_image(self, pixmap):
+        if (pixmap.width(), pixmap.height()) != THUMBNAIL_SIZE:  # Saved thumbnails already have the label size
+            pixmap = pixmap.scaled(120, 120, Qt.AspectRatioMode.KeepAspectRatio,
+                                   Qt.TransformationMode.SmoothTransformation)
+        self.image_label.setPixmap(pixmap)
+
+    def _needs_image(self):
+        return (self.original_pixmap is None and not self.load_requested and
+                (self.thumbnail_path or self.workpiece is not None))
+
+    def load_pixmap(self):
+        """Returns the thumbnail pixmap, reading ``thumbnail_path`` or rendering the workpiece the first time."""
+        if self.original_pixmap is None and self.thumbnail_path:
+            pixmap = QPixmap(self.thumbnail_path)
+            self.thumbnail_path = None  # Don't retry a missing or broken file on every paint
+            if not pixmap.isNull():
+                self.original_pixmap = pixmap
+                self._set_image(pixmap)
+        if self.original_pixmap is None and self.workpiece is not None and not self.load_requested:
+            self.load_requested = True  # Don't render it again on every paint if it fails
+            self.on_image_loaded(image_from_bgr(render_workpiece_thumbnail(self.workpiece, THUMBNAIL_SIZE)))
+        return self.original_pixmap
+
+    def on_image_loaded(self, image):
+        """Shows the thumbnail image produced by the loader (called on the UI thread)."""
+        self.thumbnail_path = None
+        if image.isNull():
+            return
+        self.original_pixmap = QPixmap.fromImage(image)
+        self._set_image(self.original_pixmap)
+
+    def load_preview(self):
+        """Returns the preview image if there is one, else the thumbnail pixmap."""
+        if self.preview_path:
+            pixmap = QPixmap(self.preview_path)
+            if not pixmap.isNull():
+                return pixmap
+        if self.workpiece is not None:
+            # A single selected workpiece: render it at the preview size right away
+            return QPixmap.fromImage(image_from_bgr(render_workpiece_thumbnail(self.workpiece, PREVIEW_SIZE)))
+        return self.load_pixmap()
+
+    def paintEvent(self, event):
+        """Loads the thumbnail when the widget becomes visible in the scroll area."""
+        if self._needs_image():
+            if self.loader is None:
+                self.load_pixmap()
+            else:
+                self.load_requested = True
+                self.loader.request(self.workpieceId or self.thumbnail_path, self.on_image_loaded,
+                                    thumbnail_path=self.thumbnail_path, workpiece=self.workpiece)
+        super().paintEvent(event)
+
     def mousePressEvent(self, event):
         """Handle mouse press events for both click and long press."""
         if event.button() == Qt.MouseButton.LeftButton:
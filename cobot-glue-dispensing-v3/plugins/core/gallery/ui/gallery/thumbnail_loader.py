@@ -0,0 +1,142 @@
+"""
+Loads the gallery thumbnails in a small worker pool, off the UI thread.
+
+A ThumbnailWidget shows a placeholder until its image arrives. When it is first painted
+(scrolled into view) it asks the loader for its image, and a worker produces it as a
+QImage at the tile size:
+
+  - a thumbnail file written by the workpiece repository is decoded;
+  - a workpiece without one is rendered with render_workpiece_thumbnail, and the result
+    is cached on disk as ``<workpiece id>_<content hash>.png``, so later galleries only
+    decode it. A changed workpiece has another hash and is rendered again; its older
+    cached image is removed.
+
+The image reaches the UI thread through the ``loaded`` signal (queued, since it is emitted
+by a worker), where the requester's callback turns it into a QPixmap: QPixmaps are only
+created on the UI thread.
+"""
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import cv2
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from applications.glue_dispensing_application.repositories.workpiece.workpiece_thumbnails import \
+    THUMBNAIL_SIZE, render_workpiece_thumbnail, workpiece_content_hash
+from backend.system.utils.PathResolver import PathType, get_path_str
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+CACHE_DIRECTORY_NAME = "gallery_thumbnails"
+
+
+def default_cache_directory():
+    return get_path_str(PathType.STORAGE_ROOT, CACHE_DIRECTORY_NAME)
+
+
+def image_from_bgr(image):
+    """QImage owning a copy of a BGR array."""
+    rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    height, width, channels = rgb.shape
+    return QImage(rgb.data, width, height, channels * width, QImage.Format.Format_RGB888).copy()
+
+
+class ThumbnailLoader(QObject):
+    """
+    Produces thumbnail images in worker threads and hands them to callbacks on the UI thread.
+
+    Attributes:
+        cache_directory (str): Where rendered thumbnails are cached; resolved on first use.
+        rendered (int): Thumbnails rendered so far (not read from a file or the cache).
+    """
+
+    loaded = pyqtSignal(object, object)  # request key, QImage (null if it could not be produced)
+
+    def __init__(self, cache_directory=None, workers=DEFAULT_WORKERS, parent=None):
+        super().__init__(parent)
+        self.cache_directory = cache_directory
+        self.rendered = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnails")
+        self._callbacks = {}
+        self._futures = set()
+        self.loaded.connect(self._deliver)
+
+    def request(self, key, callback, thumbnail_path=None, workpiece=None):
+        """
+        Produce the thumbnail for ``key`` in a worker; ``callback(QImage)`` is then called on the UI thread.
+
+        Requests for a key that is already being loaded only add their callback.
+
+        Args:
+            key: Identifies the thumbnail, e.g. the workpiece id.
+            callback: Called with the image, a null QImage if it could not be produced.
+            thumbnail_path (str): Saved thumbnail to decode, if there is one.
+            workpiece: Workpiece to render (and cache) if there is no usable thumbnail file.
+        """
+        callbacks = self._callbacks.setdefault(key, [])
+        callbacks.append(callback)
+        if len(callbacks) > 1:
+            return
+        future = self._executor.submit(self._load, key, thumbnail_path, workpiece)
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+
+    def wait_idle(self, timeout=None):
+        """Block until the submitted thumbnails are produced; their callbacks run with the next events."""
+        wait(list(self._futures), timeout)
+
+    def shutdown(self):
+        """Drop the thumbnails that have not started; a running one finishes without a callback."""
+        self._callbacks.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, key, thumbnail_path, workpiece):
+        image = QImage()
+        try:
+            if thumbnail_path:
+                image = QImage(thumbnail_path)
+            if image.isNull() and workpiece is not None:
+                image = self._render_cached(workpiece)
+        except Exception as e:
+            print(f"ThumbnailLoader: error loading thumbnail {key}: {e}")
+            image = QImage()
+        try:
+            self.loaded.emit(key, image)
+        except RuntimeError:
+            pass  # The gallery was closed meanwhile
+
+    def _render_cached(self, workpiece):
+        if self.cache_directory is None:
+            self.cache_directory = default_cache_directory()
+        workpiece_id = str(getattr(workpiece, "workpieceId", "workpiece"))
+        file_name = f"{workpiece_id}_{workpiece_content_hash(workpiece)}.png"
+        path = os.path.join(self.cache_directory, file_name)
+        if os.path.exists(path):
+            image = QImage(path)
+            if not image.isNull():
+                return image
+
+        rendered = render_workpiece_thumbnail(workpiece, THUMBNAIL_SIZE)
+        self.rendered += 1
+        try:
+            os.makedirs(self.cache_directory, exist_ok=True)
+            temporary_path = path + ".tmp.png"
+            if cv2.imwrite(temporary_path, rendered):
+                os.replace(temporary_path, path)
+                # Images of earlier versions of this workpiece
+                pattern = os.path.join(glob.escape(self.cache_directory),
+                                       glob.escape(workpiece_id) + "_" + "[0-9a-f]" * 16 + ".png")
+                for stale_path in glob.glob(pattern):
+                    if os.path.basename(stale_path) != file_name:
+                        os.remove(stale_path)
+        except OSError as e:
+            print(f"ThumbnailLoader: could not cache the thumbnail of workpiece {workpiece_id}: {e}")
+        return image_from_bgr(rendered)
+
+    def _deliver(self, key, image):
+        for callback in self._callbacks.pop(key, []):
+            try:
+                callback(image)
+            except RuntimeError:
+                pass  # The widget was deleted while its thumbnail was loading
@@ -213,14 +213,22 @@ def generate_pixmap_from_contour_and_spray(contour, spray_pattern, pickup_point=
     painter.end()
     return QPixmap.fromImage(image)
 
-def create_thumbnail_widget_from_workpiece(workpiece, filename="Untitled", timestamp=None):
+def create_thumbnail_widget_from_workpiece(workpiece, filename="Untitled", timestamp=None, loader=None,
+                                           placeholder=None, style_sheet=True):
     """
     Creates a ThumbnailWidget from a given Workpiece instance.
 
+    The workpiece is drawn at the tile size once the widget is scrolled into view, by
+    ``loader`` in a worker thread (cached on disk by workpiece id and content hash), or in
+    the paint event without a loader.
+
     Args:
         workpiece (Workpiece): The Workpiece instance with contour and sprayPattern.
         filename (str): Display name (e.g. file name or workpiece name).
         timestamp (str): Last modified timestamp. If None, uses current time.
+        loader (ThumbnailLoader): Produces the thumbnail off the UI thread.
+        placeholder (QPixmap): Shown until the thumbnail is ready.
+        style_sheet (bool): False if the parent applies the thumbnail style sheet.
 
     Returns:
         ThumbnailWidget: A ready-to-use thumbnail widget.
@@ -228,40 +236,28 @@ def create_thumbnail_widget_from_workpiece(workpiece, filename="Untitled", times
     if timestamp is None:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
 
-    # Extract the main contour data using the workpiece's own method
-    contour = None
-    if hasattr(workpiece, 'get_main_contour'):
-        try:
-            contour = workpiece.get_main_contour()
-        except Exception as e:
-            print(f"Error getting main contour: {e}")
-            contour = None
-    elif hasattr(workpiece, 'contour') and workpiece.contour is not None:
-        if isinstance(workpiece.contour, dict) and "contour" in workpiece.contour:
-            contour = workpiece.contour["contour"]
-        else:
-            contour = workpiece.contour
+    return ThumbnailWidget(filename=filename, pixmap=None, timestamp=timestamp, workpieceId=workpiece.workpieceId,
+                           workpiece=workpiece, loader=loader, placeholder=placeholder, style_sheet=style_sheet)
 
-    # Extract spray pattern - it should be a dict with keys like "Contour", "Fill"
-    spray_pattern = None
-    if hasattr(workpiece, 'sprayPattern') and workpiece.sprayPattern is not None:
-        if isinstance(workpiece.sprayPattern, dict):
-            spray_pattern = workpiece.sprayPattern
-        else:
-            # Handle legacy format
-            spray_pattern = {"Contour": workpiece.sprayPattern}
+def create_thumbnail_widget_from_entry(entry, loader=None, placeholder=None, style_sheet=True):
+    """
+    Creates a ThumbnailWidget from a workpiece index entry.
 
-    # Extract pickup point
-    pickup_point = None
-    if hasattr(workpiece, 'pickupPoint') and workpiece.pickupPoint is not None:
-        pickup_point = workpiece.pickupPoint
+    The thumbnail was rendered when the workpiece was saved; the widget reads it from
+    disk only once it is scrolled into view, in a worker thread of ``loader`` if given.
 
-    # Generate the pixmap using all available data
-    pixmap = generate_pixmap_from_contour_and_spray(
-        contour=contour, 
-        spray_pattern=spray_pattern, 
-        pickup_point=pickup_point,
-        size=(800, 800)
-    )
+    Args:
+        entry (dict): Index entry with at least "workpieceId", and "thumbnail", "preview"
+            and "modified" when available.
+        loader (ThumbnailLoader): Decodes the thumbnail off the UI thread.
+        placeholder (QPixmap): Shown until the thumbnail is ready.
+        style_sheet (bool): False if the parent applies the thumbnail style sheet.
 
-    return ThumbnailWidget(filename=filename, pixmap=pixmap, timestamp=timestamp, workpieceId=workpiece.workpieceId)
\ No newline at end of file
+    Returns:
+        ThumbnailWidget: A thumbnail widget showing the placeholder (or a blank tile) until it is painted.
+    """
+    workpiece_id = entry["workpieceId"]
+    return ThumbnailWidget(filename=workpiece_id, pixmap=None, timestamp=entry.get("modified", "default"),
+                           workpieceId=workpiece_id, thumbnail_path=entry.get("thumbnail"),
+                           preview_path=entry.get("preview"), loader=loader, placeholder=placeholder,
+                           style_sheet=style_sheet)
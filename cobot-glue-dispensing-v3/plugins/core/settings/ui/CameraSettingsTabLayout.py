@@ -13,8 +13,10 @@ from backend.system.settings.enums.CameraSettingKey import CameraSettingKey
 from frontend.widgets.SwitchButton import QToggle
 from frontend.widgets.ToastWidget import ToastWidget
 from modules.shared.MessageBroker import MessageBroker
+from modules.VisionSystem.frame_channel import frame_from_message
 from plugins.core.settings.ui.BaseSettingsTabLayout import BaseSettingsTabLayout
 import cv2
+import numpy as np
 from frontend.core.utils.localization import TranslationKeys, get_app_translator
 
 class CameraSettingsTabLayout(BaseSettingsTabLayout, QVBoxLayout):
@@ -254,23 +256,27 @@ class CameraSettingsTabLayout(BaseSettingsTabLayout, QVBoxLayout):
             pixmap = QPixmap.fromImage(q_image)
             self.update_camera_preview(pixmap)
 
-    def update_threshold_preview_from_cv2(self, cv2_threshold_image):
-        """Update the threshold preview with a threshold image"""
+    def update_threshold_preview_from_cv2(self, message):
+        """Update the threshold preview with a threshold image (or a shared frame notification)"""
         if not self._is_widget_valid('threshold_preview_label'):
             return
-            
+        cv2_threshold_image = frame_from_message(message)
+        if cv2_threshold_image is None:
+            return
+
         try:
             # Convert to RGB if needed
             if len(cv2_threshold_image.shape) == 3:
-                rgb_image = cv2_threshold_image[:, :, ::-1]  # BGR to RGB
+                rgb_image = cv2.cvtColor(cv2_threshold_image, cv2.COLOR_BGR2RGB)
                 height, width = rgb_image.shape[:2]
                 bytes_per_line = 3 * width
-                q_image = QImage(rgb_image.tobytes(), width, height, bytes_per_line, QImage.Format.Format_RGB888)
+                q_image = QImage(rgb_image.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
             else:
-                # Grayscale threshold image
+                # Grayscale threshold image, wrapped in place
+                cv2_threshold_image = np.ascontiguousarray(cv2_threshold_image)
                 height, width = cv2_threshold_image.shape[:2]
                 bytes_per_line = width
-                q_image = QImage(cv2_threshold_image.tobytes(), width, height, bytes_per_line, QImage.Format.Format_Grayscale8)
+                q_image = QImage(cv2_threshold_image.data, width, height, bytes_per_line, QImage.Format.Format_Grayscale8)
 
             pixmap = QPixmap.fromImage(q_image)
             self.update_threshold_preview(pixmap)
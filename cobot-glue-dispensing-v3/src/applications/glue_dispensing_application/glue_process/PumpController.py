@@ -23,9 +23,12 @@ class PumpController:
             settings=effective_settings,
         )
 
-    def pump_off(self, service, robot_service, glue_type, settings=None):
+    def pump_off(self, service, robot_service, glue_type, settings=None, wait=True):
         """
         Turn off the pump motor using either segment-specific or global settings.
+
+        With ``wait`` False the pump reverses in the background and a failure is only
+        logged; the next pump_on waits for the stop to finish.
         """
         effective_settings = settings if self.use_segment_settings else None
         self.__pump_off(
@@ -33,6 +36,7 @@ class PumpController:
             robot_service=robot_service,
             glue_type=glue_type,
             settings=effective_settings,
+            wait=wait,
         )
 
     def __pump_on(self, service, robot_service, glue_type, settings=None):
@@ -45,12 +49,13 @@ class PumpController:
         try:
             if settings is None:
                 # Using global settings
-                result = service.motorOn(
+                result = service.startPump(
                     motorAddress=glue_type,
                     speed=self.glue_settings.get_motor_speed() if self.glue_settings else 10000,
                     ramp_steps=self.glue_settings.get_forward_ramp_steps() if self.glue_settings else 1,
                     initial_ramp_speed=self.glue_settings.get_initial_ramp_speed() if self.glue_settings else 5000,
                     initial_ramp_speed_duration=self.glue_settings.get_initial_ramp_speed_duration() if self.glue_settings else 1,
+                    on_failure=self.__pump_failed,
                 )
                 log_debug_message(
                     self.logger_context,
@@ -58,7 +63,7 @@ class PumpController:
                 )
             else:
                 # Using segment settings
-                result = service.motorOn(
+                result = service.startPump(
                     motorAddress=glue_type,
                     speed=float(settings.get(GlueSettingKey.MOTOR_SPEED.value, 0)),
                     ramp_steps=int(float(settings.get(GlueSettingKey.FORWARD_RAMP_STEPS.value, 0))),
@@ -66,6 +71,7 @@ class PumpController:
                     initial_ramp_speed_duration=float(
                         settings.get(GlueSettingKey.INITIAL_RAMP_SPEED_DURATION.value, 0)
                     ),
+                    on_failure=self.__pump_failed,
                 )
                 log_debug_message(
                     self.logger_context,
@@ -78,7 +84,7 @@ class PumpController:
             log_error_message(self.logger_context, message=f"Pump ON failed: {e}")
             return False
 
-    def __pump_off(self, service, robot_service, glue_type, settings=None):
+    def __pump_off(self, service, robot_service, glue_type, settings=None, wait=True):
         """
         Internal method to handle motorOff using either global or segment settings.
         """
@@ -87,11 +93,12 @@ class PumpController:
         try:
             if settings is None:
                 # Using global settings
-                service.motorOff(
+                timeline = service.schedulePumpStop(
                     motorAddress=glue_type,
                     speedReverse=self.glue_settings.get_speed_reverse() if self.glue_settings else 1000,
                     reverse_time=self.glue_settings.get_steps_reverse() if self.glue_settings else 1,
                     ramp_steps=self.glue_settings.get_reverse_ramp_steps() if self.glue_settings else 1,
+                    on_failure=self.__pump_failed,
                 )
                 log_debug_message(
                     self.logger_context,
@@ -99,16 +106,24 @@ class PumpController:
                 )
             else:
                 # Using segment settings
-                service.motorOff(
+                timeline = service.schedulePumpStop(
                     motorAddress=glue_type,
                     speedReverse=float(settings.get(GlueSettingKey.SPEED_REVERSE.value, 0)),
                     reverse_time=float(settings.get(GlueSettingKey.REVERSE_DURATION.value, 0)),
                     ramp_steps=int(float(settings.get(GlueSettingKey.REVERSE_RAMP_STEPS.value, 0))),
+                    on_failure=self.__pump_failed,
                 )
                 log_debug_message(
                     self.logger_context,
                     message=f"Pump OFF (segment): {settings}",
                 )
 
+            if wait:
+                timeline.wait()
+
         except Exception as e:
             log_error_message(self.logger_context, message=f"Pump OFF failed: {e}")
+
+    def __pump_failed(self, timeline, e):
+        """Reports a pump command that failed on its timeline, e.g. a stop left running in the background."""
+        log_error_message(self.logger_context, message=f"Pump {timeline.name} failed: {e}")
@@ -7,6 +7,8 @@ from backend.system.utils.custom_logging import log_debug_message
 from backend.system.utils.files import write_to_debug_file
 from backend.system.utils.robot_utils import calculate_distance_between_points
 
+SAMPLE_TIMEOUT = 0.5  # s; upper bound on waiting for a robot monitor sample before re-checking the state
+
 
 # State Management Functions
 def is_point_reached(currentPos, targetPoint, threshold):
@@ -198,7 +200,7 @@ def adjustPumpSpeedDynamically(
         # Get current position
         current_pos = robotService.get_current_position()
         if current_pos is None:
-            time.sleep(robotService.robot_state_manager_cycle_time)
+            robotService.wait_for_next_sample(timeout=SAMPLE_TIMEOUT)
             continue
 
         # Check if first point is reached
@@ -206,7 +208,7 @@ def adjustPumpSpeedDynamically(
             current_pos, first_point, threshold, robotService, start_point_index, first_point_reached
         )
         if not should_continue:
-            time.sleep(robotService.robot_state_manager_cycle_time)
+            robotService.wait_for_next_sample(timeout=SAMPLE_TIMEOUT)
             continue
 
         # Check if final point is reached
@@ -242,16 +244,27 @@ def adjustPumpSpeedDynamically(
     return True, final_progress
 
 class PumpThreadWithResult(threading.Thread):
-    """Thread wrapper that stores the result from the pump adjustment function"""
-    def __init__(self, *args, **kwargs):
+    """
+    Thread wrapper that stores the result from the pump adjustment function.
+
+    ``finished`` is set once ``result`` is available, and ``on_finished`` (if given) is
+    called right after, so a waiting state handler is woken instead of polling is_alive().
+    """
+    def __init__(self, *args, on_finished=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.result = None
+        self.finished = threading.Event()
+        self.on_finished = on_finished
     
     def run(self):
         try:
             self.result = self._target(*self._args, **self._kwargs)
         except Exception as e:
             self.result = (False, 0, e)
+        finally:
+            self.finished.set()
+            if self.on_finished is not None:
+                self.on_finished()
 
 def start_dynamic_pump_speed_adjustment_thread(service,
                                                robotService,
@@ -260,9 +273,11 @@ def start_dynamic_pump_speed_adjustment_thread(service,
                                                path,
                                                reach_end_threshold,
                                                pump_ready_event,
-                                               start_point_index=0):
+                                               start_point_index=0,
+                                               on_finished=None):
 
     pump_thread = PumpThreadWithResult(
+        on_finished=on_finished,
         target=adjustPumpSpeedDynamically,
         args=(
             service,  # glueSprayService
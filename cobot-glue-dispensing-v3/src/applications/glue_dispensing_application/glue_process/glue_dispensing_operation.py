@@ -139,7 +139,7 @@ class GlueDispensingOperation(IOperation):
                     self.execution_context.state_machine.transition(GlueProcessState.STARTING)
 
             # Start execution loop (non-blocking if needed, blocking here)
-            self.execution_context.state_machine.start_execution(delay=0.2)
+            self.execution_context.state_machine.start_execution()
 
             return OperationResult(True, "Execution completed")
 
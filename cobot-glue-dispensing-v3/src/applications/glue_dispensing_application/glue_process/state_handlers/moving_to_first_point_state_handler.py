@@ -1,3 +1,4 @@
+import threading
 from collections import namedtuple
 
 from applications.glue_dispensing_application.settings.enums import GlueSettingKey
@@ -40,30 +41,28 @@ def handle_moving_to_first_point_state(context, resume):
     )
 
     cancellation_token = CancellationToken()
-
-    # Monitor state machine and cancel if needed
-    def monitor_state_machine():
-        import threading
-        import time
-        def check_state():
-            while not cancellation_token.is_cancelled():
-                if context.state_machine.state in [GlueProcessState.PAUSED, GlueProcessState.STOPPED]:
-                    reason = f"State changed to {context.state_machine.state.value}"
-                    cancellation_token.cancel(reason)
-                    break
-                time.sleep(0.01)  # Check every 10ms
-
-        monitor_thread = threading.Thread(target=check_state, daemon=True)
-        monitor_thread.start()
-
-    monitor_state_machine()
-    reached = context.robot_service._waitForRobotToReachPosition(
-        context.current_path[0],
-        reach_start_threshold,
-        delay=0,
-        timeout=30,
-        cancellation_token=cancellation_token
-    )
+    move_finished = threading.Event()
+
+    # Cancel the move if the state machine is paused or stopped meanwhile
+    def cancel_on_pause_or_stop():
+        state_machine = context.state_machine
+        state_machine.wait_until(lambda: move_finished.is_set() or
+                                 state_machine.state in [GlueProcessState.PAUSED, GlueProcessState.STOPPED])
+        if not move_finished.is_set():
+            cancellation_token.cancel(f"State changed to {state_machine.state.name}")
+
+    threading.Thread(target=cancel_on_pause_or_stop, daemon=True).start()
+    try:
+        reached = context.robot_service._waitForRobotToReachPosition(
+            context.current_path[0],
+            reach_start_threshold,
+            delay=0,
+            timeout=30,
+            cancellation_token=cancellation_token
+        )
+    finally:
+        move_finished.set()
+        context.state_machine.notify()
 
     # --- Check if movement was cancelled ---
     if cancellation_token.is_cancelled():
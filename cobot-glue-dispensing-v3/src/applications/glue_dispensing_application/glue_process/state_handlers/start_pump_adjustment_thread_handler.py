@@ -30,6 +30,7 @@ def handle_start_pump_adjustment_thread(context):
                 reach_end_threshold=float(context.current_settings.get(GlueSettingKey.REACH_END_THRESHOLD.value, 1.0)),
                 pump_ready_event=pump_ready_event,
                 start_point_index=context.current_point_index,
+                on_finished=context.state_machine.notify,
             )
             log_debug_message(glue_dispensing_logger_context, message="Pump adjustment thread started.")
         except Exception as e:
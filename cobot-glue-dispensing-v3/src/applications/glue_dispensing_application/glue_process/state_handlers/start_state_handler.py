@@ -62,16 +62,11 @@ def move_to_first_point(context,path):
 
             return MoveResult(True, GlueProcessState.MOVING_TO_FIRST_POINT, generator_needed)
 
-        except Exception as e:
+        except Exception:
             import traceback
             traceback.print_exc()
-
-            if "Request-sent" in str(e):
-                time.sleep(0.2)
-                continue
-            else:
-                # Unexpected failure
-                return MoveResult(False, GlueProcessState.ERROR, False)
+            # Transport errors were already retried by the robot's RetryPolicy
+            return MoveResult(False, GlueProcessState.ERROR, False)
 
     # If we somehow exit the loop without success
     return MoveResult(False, GlueProcessState.ERROR, False)
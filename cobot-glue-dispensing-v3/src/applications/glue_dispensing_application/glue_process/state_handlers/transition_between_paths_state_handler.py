@@ -34,9 +34,11 @@ def handle_transition_between_paths(context):
         if context.motor_started and context.spray_on:
             try:
                 log_debug_message(glue_dispensing_logger_context, message="Turning off motor between paths...")
-                context.pump_controller.pump_off(context.service,context.robot_service,context.glue_type,context.current_settings)
+                # The pump reverses while the robot travels to the next path; its pump_on waits for the stop
+                context.pump_controller.pump_off(context.service,context.robot_service,context.glue_type,context.current_settings,
+                                                 wait=False)
                 context.motor_started = False
-                log_debug_message(glue_dispensing_logger_context, message="Motor stopped successfully.")
+                log_debug_message(glue_dispensing_logger_context, message="Motor stop scheduled.")
             except Exception as e:
                 log_error_message(glue_dispensing_logger_context, message=f"Error stopping motor: {e}")
 
@@ -1,5 +1,4 @@
 from collections import namedtuple
-import time
 from applications.glue_dispensing_application.glue_process.state_machine.GlueProcessState import GlueProcessState
 from backend.system.utils.custom_logging import log_debug_message, log_error_message
 from applications.glue_dispensing_application.glue_process.glue_dispensing_operation import glue_dispensing_logger_context
@@ -37,10 +36,12 @@ def handle_wait_for_path_completion(context):
         update_context_from_handler_result(context, result)
         return result.next_state
     try:
-        # Wait indefinitely for the pump thread to finish.
+        # Wait indefinitely for the pump thread to finish, woken when it does (on_finished)
+        # or when the state machine is paused or stopped.
         # You can add a soft timeout if you ever need to handle unexpected hangs.
-        while pump_thread.is_alive():
-            state = context.state_machine.state
+        state_machine = context.state_machine
+        while not pump_thread.finished.is_set():
+            state = state_machine.state
 
             if state == GlueProcessState.PAUSED:
                 log_debug_message(glue_dispensing_logger_context, message="[WAIT] Paused while waiting for pump thread - waiting for thread to finish and capture progress")
@@ -68,7 +69,7 @@ def handle_wait_for_path_completion(context):
                 result = HandlerResult(True, False, GlueProcessState.STOPPED, path_index, context.current_point_index, path, settings)
                 update_context_from_handler_result(context, result)
                 return result.next_state
-            time.sleep(0.1)
+            state_machine.wait_until(lambda: pump_thread.finished.is_set() or state_machine.state != state)
 
         # Get the pump thread result to capture final progress
         final_point_index = len(path) - 1  # Default to last point
@@ -1,6 +1,7 @@
 from abc import ABC
 from enum import Enum
 from typing import Dict, Callable, TypeVar, Generic, Optional
+import threading
 import time
 
 from applications.glue_dispensing_application.glue_process.ExecutionContext import Context
@@ -8,6 +9,7 @@ from applications.glue_dispensing_application.glue_process.state_machine.GluePro
     GlueProcessTransitionRules, GlueProcessState
 from communication_layer.api.v1.topics import GlueTopics
 from modules.shared.MessageBroker import MessageBroker
+from modules.shared.utils import metrics
 from backend.system.utils.custom_logging import log_if_enabled, LoggingLevel, setup_logger
 
 TState = TypeVar("TState")  # Generic state type
@@ -63,6 +65,13 @@ class StateRegistry:
 class ExecutableStateMachine(Generic[TState]):
     """
     Generic state machine fully integrated with StateRegistry.
+
+    start_execution() runs the current state's handler and moves to the state it
+    returns right away. When a handler returns no state, or its own state (IDLE,
+    PAUSED, ERROR, COMPLETED), the loop sleeps until another thread transitions the
+    machine (pause, resume, stop) or stop_execution() is called, instead of
+    re-running the handler on a timer. Handlers that wait for something else use
+    wait_until(), which is woken by every transition and by notify().
     """
 
     def __init__(
@@ -80,7 +89,9 @@ class ExecutableStateMachine(Generic[TState]):
         self.broker: MessageBroker = broker or MessageBroker()
         self.context: Context = context or Context()
         self._stop_requested = False
+        self._state_changed = threading.Condition()
         self.state_topic = state_topic or "STATE MACHINE"
+        self._transitions = metrics.counter("state_machine.transitions")
 
         log_if_enabled(
             ENABLE_STATE_MACHINE_LOGGING,
@@ -100,14 +111,17 @@ class ExecutableStateMachine(Generic[TState]):
 
     def transition(self, to_state: TState):
         """Perform transition and call exit/enter handlers with context"""
-        if not self.can_transition(to_state):
-            self.on_invalid_transition_attempt(to_state)
-            return False
-
-        old_state = self.current_state
-        self._call_handler(old_state, "on_exit")
-        self.current_state = to_state
-        self._call_handler(to_state, "on_enter")
+        with self._state_changed:
+            if not self.can_transition(to_state):
+                self.on_invalid_transition_attempt(to_state)
+                return False
+
+            old_state = self.current_state
+            self._call_handler(old_state, "on_exit")
+            self.current_state = to_state
+            self._call_handler(to_state, "on_enter")
+            self._state_changed.notify_all()
+        self._transitions.inc()
         self.on_transition_success(to_state)
         return True
 
@@ -141,20 +155,48 @@ class ExecutableStateMachine(Generic[TState]):
             f"Invalid transition attempt: {self.current_state} -> {attempted_state}"
         )
 
-    def start_execution(self, delay: float = 0.1):
+    # ------------------ Waiting ------------------
+    def wait_until(self, predicate: Callable[[], bool], timeout: Optional[float] = None) -> bool:
+        """
+        Block until predicate() is true.
+
+        The predicate is re-checked on every transition, notify() and
+        stop_execution(), so it should only depend on those (the state, or an
+        event whose setter calls notify()).
+
+        Returns:
+            bool: The last value of predicate(); False if the timeout expired first.
+        """
+        with self._state_changed:
+            return self._state_changed.wait_for(predicate, timeout)
+
+    def notify(self):
+        """Wake wait_until() callers to re-check their predicate."""
+        with self._state_changed:
+            self._state_changed.notify_all()
+
+    # ------------------ Execution ------------------
+    def start_execution(self):
+        """Run state handlers until stop_execution() is called."""
         self._stop_requested = False
         while not self._stop_requested:
-            state_obj = self.state_registry.get(self.current_state)
+            current_state = self.current_state
+            next_state = None
+            state_obj = self.state_registry.get(current_state)
             if state_obj:
-                next_state = state_obj.execute(self.context)  # <-- get next state from handler
-                if next_state:
-                    self.transition(next_state)  # <-- automatic transition
-            time.sleep(delay)
+                # Handler time per state, e.g. state_machine.SENDING_PATH_POINTS
+                state_name = getattr(current_state, "name", str(current_state))
+                with metrics.timed(f"state_machine.{state_name}"):
+                    next_state = state_obj.execute(self.context)  # <-- get next state from handler
+            if next_state and next_state != current_state and self.transition(next_state):
+                continue  # <-- automatic transition, run the next state at once
+            # Nothing to do in this state: wait for another thread to move the machine on
+            self.wait_until(lambda: self.current_state != current_state or self._stop_requested)
 
     def stop_execution(self):
         """Stop the execution loop"""
         self._stop_requested = True
-
+        self.notify()
 
 from typing import Optional, Dict, Set
 
@@ -270,7 +312,7 @@ if __name__ == "__main__":
 
     # Start execution loop
     try:
-        current_state_machine.start_execution(delay=0.2)
+        current_state_machine.start_execution()
     except KeyboardInterrupt:
         print("Execution stopped by user")
         current_state_machine.stop_execution()
@@ -1,7 +1,7 @@
-import time
-
 from core.operation_state_management import OperationResult
 
+CAMERA_STABILIZATION_TIMEOUT = 2  # s; longest wait for the scene to settle, the former fixed sleep
+
 
 def handle_contour_matching_mode(application,nesting,debug)->OperationResult:
 
@@ -15,7 +15,9 @@ def handle_contour_matching_mode(application,nesting,debug)->OperationResult:
     application.message_publisher.publish_brightness_region(region="spray")
 
     workpieces = application.get_workpieces()
-    time.sleep(2)  # wait for camera to stabilize
+    # wait for camera to stabilize: brightness converged and contours unchanged
+    if not application.visionService.wait_for_stable_scene(timeout=CAMERA_STABILIZATION_TIMEOUT):
+        print(f"Camera scene not stable after {CAMERA_STABILIZATION_TIMEOUT}s, using the latest contours")
     new_contours = application.visionService.contours
     result,matches = application.workpiece_matcher.perform_matching(workpieces,new_contours,debug)
     print(f"perform_matching result: {result} matches: {matches}")
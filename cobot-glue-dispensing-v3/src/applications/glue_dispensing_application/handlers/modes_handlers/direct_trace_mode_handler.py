@@ -1,5 +1,5 @@
-import time
-
+from applications.glue_dispensing_application.handlers.modes_handlers.contour_matching_mode_handler import \
+    CAMERA_STABILIZATION_TIMEOUT
 from applications.glue_dispensing_application.handlers.spraying_handler import publish_robot_trajectory, \
     start_path_execution
 from core.operation_state_management import OperationResult
@@ -13,7 +13,8 @@ def handle_direct_tracing_mode(application):
     application.move_to_spray_capture_position()
     application.message_publisher.publish_brightness_region(region="spray")
     # ✅ Direct contour tracing without matching
-    time.sleep(2)
+    if not application.visionService.wait_for_stable_scene(timeout=CAMERA_STABILIZATION_TIMEOUT):
+        print(f"Camera scene not stable after {CAMERA_STABILIZATION_TIMEOUT}s, using the latest contours")
 
     newContours = application.visionService.contours
     if newContours is None:
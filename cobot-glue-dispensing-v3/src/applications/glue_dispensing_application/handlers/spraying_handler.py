@@ -1,6 +1,7 @@
 import cv2
 import time
 
+from backend.system.utils.path_sequencing import sequence_polylines
 from core.operation_state_management import OperationResult
 
 
@@ -26,7 +27,27 @@ def publish_robot_trajectory(application):
     application.message_publisher.publish_trajectory_start()
 
 
+def sequence_spray_paths(paths, start_point):
+    """
+    Order (robot_path, settings) pairs to shorten the travel between them, from start_point.
+
+    Open paths may be sprayed from their last point, in which case their points come back
+    reversed. Empty paths are kept, after the others.
+    """
+    sprayable = [(path, settings) for path, settings in paths if len(path) > 0]
+    empty = [(path, settings) for path, settings in paths if len(path) == 0]
+    if len(sprayable) < 2:
+        return sprayable + empty
+    ordered, sequence = sequence_polylines([path for path, _ in sprayable], start_point=start_point)
+    print(f"Sequenced {len(ordered)} paths: travel {sequence.travel_distance:.0f} mm "
+          f"(greedy {sequence.greedy_distance:.0f} mm), {sum(sequence.reversed)} reversed")
+    return [(path, sprayable[k][1]) for path, k in zip(ordered, sequence.order)] + empty
+
+
 def start_path_execution(application, paths) -> OperationResult:
+    # The robot starts from the spray capture position
+    start_point = application.robot_service.robot_config.getCalibrationPositionParsed()[:2]
+    paths = sequence_spray_paths(paths, start_point)
     print(f"In spraying handler, paths to spray: {len(paths)}")
     print(f"Spray on: {application.get_glue_settings().get_spray_on()}")
     return application.glue_dispensing_operation.start(paths,
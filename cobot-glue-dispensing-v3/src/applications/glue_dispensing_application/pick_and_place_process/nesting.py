@@ -18,6 +18,7 @@ import numpy as np
 from modules.shared.core.ContourStandartized import Contour
 from backend.system.contour_matching import CompareContours
 from applications.glue_dispensing_application.pick_and_place_process.Plane import Plane
+from applications.glue_dispensing_application.pick_and_place_process.nesting_engine import RasterNester
 from backend.system.utils import utils
 from modules.shared.MessageBroker import MessageBroker
 
@@ -43,6 +44,9 @@ SINGLE_GRIPPER_Z_OFFSET = 19  # mm, between transducer and gripper tip
 RZ_ORIENTATION = 90  # degrees
 ROTATION_OFFSET_BETWEEN_PICKUP_AND_DROP_PLACE = 90  # degrees
 DELAY_BETWEEN_CAPTURING_NEW_IMAGE = 1  # seconds ensuring robot is stationary and camera is stable
+NESTING_RESOLUTION = 2.0  # mm, occupancy grid cell of the nesting engine
+NESTING_ROTATIONS = (0, 90, 180, 270)  # degrees, drop-off rotation candidates
+NESTING_TIME_BUDGET = 0.5  # seconds of planning per capture cycle
 
 # Initialize logger if enabled
 if ENABLE_LOGGING:
@@ -55,128 +59,90 @@ class NestingResult:
     success: bool
     message: str
 
-def calculate_drop_off_position(match, centroid, orientation, plane, pickup_height,gripper):
+def get_pickup_point(match):
     """
-    Calculate the drop-off position for a workpiece on the placement plane.
-
-    Args:
-        match: The matched workpiece object
-        centroid: Original centroid coordinates
-        orientation: Object orientation in degrees
-        plane: Plane object for placement calculations
-        pickup_height: Height at which the workpiece was picked up
-
-    Returns:
-        tuple: (drop_off_position, width, height, plane_updated)
+    Return the camera point the workpiece is picked at: its configured pickup point or,
+    when none is set or it cannot be parsed, the contour centroid.
     """
+    if match.pickupPoint is None:
+        centroid = Contour(match.get_main_contour()).getCentroid()
+        log_if_enabled(ENABLE_LOGGING, nesting_logger, LoggingLevel.INFO, f"Using centroid: {centroid}")
+        return centroid
 
-    # === LOGGING ===
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"Starting drop-off calculation for orientation: {orientation:.2f}°")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG, f"Input: centroid={centroid}, pickup_height={pickup_height}mm")
-
-    # === FUNCTIONALITY ===
-    # Get and rotate contour
-    cnt = match.get_main_contour()
-    cntObject = Contour(cnt)
-    cntObject.rotate(-orientation, centroid)  # Align with X-axis
-
-    # Calculate workpiece dimensions
-    minRect = cntObject.getMinAreaRect()
-    bboxCenter = (minRect[0][0], minRect[0][1])
-    width = minRect[1][0]
-    height = minRect[1][1]
-    if width < height:
-        width, height = height, width
-
-    # === LOGGING ===
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG, f"Rotating contour by {-orientation:.2f}° to align with X-axis")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG,
-                   "Swapped width/height to ensure width >= height" if width != minRect[1][0] else "")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"WORKPIECE DIMENSIONS:")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Width:  {width:.2f} mm")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Height: {height:.2f} mm")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  └─ Bbox center: ({bboxCenter[0]:.2f}, {bboxCenter[1]:.2f})")
-
-    # === FUNCTIONALITY ===
-    # Update the tallest contour for row spacing
-    previous_tallest = plane.tallestContour
-    if height > plane.tallestContour:
-        plane.tallestContour = height
+    # Parse pickup point string "x,y" and convert to tuple (x, y)
+    if isinstance(match.pickupPoint, str):
+        try:
+            x_str, y_str = match.pickupPoint.split(',')
+            centroid = (int(float(x_str)), int(float(y_str)))
+        except (ValueError, AttributeError) as e:
+            log_if_enabled(ENABLE_LOGGING, nesting_logger, LoggingLevel.WARNING, f"Invalid pickup point format '{match.pickupPoint}', using centroid instead: {e}")
+            return Contour(match.get_main_contour()).getCentroid()
+    else:
+        # Assume it's already in correct format (tuple/list)
+        centroid = match.pickupPoint
+    log_if_enabled(ENABLE_LOGGING, nesting_logger, LoggingLevel.INFO, f"Using pickup point: {centroid}")
+    return centroid
 
-    # Calculate target placement position
-    targetPointX = plane.xOffset + plane.xMin + (width / 2)
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG, f"Calculated target X position: {targetPointX:.1f} = {plane.xOffset} + {plane.xMin}+{width/2} mm")
-    targetPointY = plane.yMax - plane.yOffset - (height / 2)
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG, f"Calculated target Y position: {targetPointY:.1f} = {plane.yOffset} + {plane.yMax}+{height/2} mm")
 
-    # === LOGGING ===
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG,
-                   f"Updated tallest contour: {previous_tallest:.1f} → {height:.1f} mm" if height > previous_tallest else "")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"PLACEMENT CALCULATION:")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Current offset: ({plane.xOffset:.1f}, {plane.yOffset:.1f}) mm")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Target point:  ({targetPointX:.1f}, {targetPointY:.1f}) mm")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  └─ Plane bounds:  ({plane.xMin}-{plane.xMax}, {plane.yMin}-{plane.yMax}) mm")
+def plan_drop_off_positions(nester, matches, orientations):
+    """
+    Plan the drop-off of every matched workpiece before any of them is picked.
 
-    # === FUNCTIONALITY ===
-    # Handle row overflow - move to next row if needed
-    if targetPointX + (width / 2) > plane.xMax:
-        # === LOGGING ===
-        log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.WARNING, f"⚠️  Width exceeded, moving to next row")
-        log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG, f"Exceeded by: {(targetPointX + width / 2) - plane.xMax:.1f} mm")
+    Each contour is aligned with the X-axis about its pickup point, and the whole
+    batch is handed to the nesting engine.
 
-        # === FUNCTIONALITY ===
-        plane.rowCount += 1
-        plane.xOffset = 0
-        plane.yOffset += plane.tallestContour + 50
-        targetPointX = plane.xMin + (width / 2)
-        targetPointY = plane.yMax - plane.yOffset
-        plane.tallestContour = height  # Reset for new row
+    Args:
+        nester: RasterNester that owns the placement plane
+        matches: Matched workpiece objects
+        orientations: Orientation in degrees of every match
 
-        # === LOGGING ===
-        log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"NEW ROW {plane.rowCount}:")
-        log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Reset to: ({targetPointX:.1f}, {targetPointY:.1f}) mm")
-        log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  └─ Row spacing: {plane.tallestContour + 50:.1f} mm")
+    Returns:
+        tuple: (NestingPlan, pickup points per match)
+    """
+    pickup_points = []
+    aligned_contours = []
+    for match, orientation in zip(matches, orientations):
+        centroid = get_pickup_point(match)
+        cntObject = Contour(match.get_main_contour())
+        cntObject.rotate(-orientation, centroid)  # Align with X-axis
+        pickup_points.append(centroid)
+        aligned_contours.append(cntObject.get())
 
-        # === FUNCTIONALITY ===
-        # Check vertical bounds
-        if targetPointY - (height / 2) < plane.yMin:
-            # === LOGGING ===
-            log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.ERROR, "❌ PLANE FULL: Cannot fit more workpieces vertically")
-            log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG, f"Needed: {targetPointY - height / 2:.1f}, Available: {plane.yMin}")
+    plan = nester.plan(aligned_contours, pickup_points)
 
-            # === FUNCTIONALITY ===
-            plane.isFull = True
-            return None, width, height, plane
+    # === LOGGING ===
+    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"NESTING PLAN:")
+    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Planned:  {len(plan.placements)}/{len(matches)} workpieces in {plan.planning_time * 1000:.1f} ms")
+    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ No room:  {len(plan.unplaced)}")
+    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Deferred: {len(plan.deferred)} (time budget {nester.time_budget}s)")
+    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  └─ Fill ratio: {nester.fill_ratio:.1%}")
+    return plan, pickup_points
 
-    # === FUNCTIONALITY ===
-    # Position the contour at target location
-    translation_x = targetPointX - bboxCenter[0]
-    translation_y = targetPointY - bboxCenter[1]
-    cntObject.translate(translation_x, translation_y)
-    newCentroid = cntObject.getCentroid()
 
-    # Calculate final drop-off position
-    if gripper == Gripper.DOUBLE:
-        drop_off_rz = -90
-    else:
+def calculate_planned_drop_off_position(placement, plane, pickup_height, gripper):
+    """
+    Turn a planned placement into drop-off poses.
 
-        drop_off_rz = 0
-    drop_off_position1 = [newCentroid[0], newCentroid[1], pickup_height + 50, 180, 0, drop_off_rz]
-    drop_off_position2 = [newCentroid[0], newCentroid[1], pickup_height + 20, 180, 0, drop_off_rz]
+    The extra rotation of the placement is applied by the robot at drop-off: the contour
+    is rotated by -orientation when the tool turns to rz - orientation at pickup, so a
+    contour rotation of +rotation is a drop-off rz of base - rotation.
 
-    # Update offset for next contour
-    plane.xOffset += width + plane.spacing
+    Returns:
+        tuple: (drop_off_position1, drop_off_position2, width, height, plane, placed_contour)
+    """
+    base_rz = -90 if gripper == Gripper.DOUBLE else 0
+    drop_off_rz = ((base_rz - placement.rotation + 180) % 360) - 180
+    x, y = placement.drop_point
+    drop_off_position1 = [x, y, pickup_height + 50, 180, 0, drop_off_rz]
+    drop_off_position2 = [x, y, pickup_height + 20, 180, 0, drop_off_rz]
 
     # === LOGGING ===
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG, f"Translating contour by: ({translation_x:.2f}, {translation_y:.2f}) mm")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"FINAL DROP-OFF:")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Translated centroid: ({newCentroid[0]:.2f}, {newCentroid[1]:.2f}) mm")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Drop height: {pickup_height + 10} mm")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO,
-                   f"  └─ Rotation: {drop_off_rz}° ({RZ_ORIENTATION}° - {ROTATION_OFFSET_BETWEEN_PICKUP_AND_DROP_PLACE}°)")
-    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG, f"Updated X offset for next piece: {plane.xOffset:.1f} mm")
+    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"PLANNED DROP-OFF:")
+    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Pickup point lands at: ({x:.2f}, {y:.2f}) mm")
+    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  ├─ Extra rotation: {placement.rotation}°")
+    log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"  └─ Rotation: {drop_off_rz}°")
 
-    return drop_off_position1,drop_off_position2, width, height, plane, cntObject.get()
+    return drop_off_position1, drop_off_position2, placement.width, placement.height, plane, placement.contour
 
 
 def calculate_pickup_positions(flat_centroid, match_height, robotService, orientation,gripper):
@@ -271,6 +237,8 @@ def start_nesting(application,visionService, robotService,preselected_workpiece,
     workpieces = preselected_workpiece
 
     plane = Plane()
+    nester = RasterNester(plane, resolution=NESTING_RESOLUTION, rotations=NESTING_ROTATIONS,
+                          time_budget=NESTING_TIME_BUDGET)
     count = 0
     workpiece_found = False
     placed_contours = []  # Track placed contours for debug plotting
@@ -413,35 +381,26 @@ def start_nesting(application,visionService, robotService,preselected_workpiece,
         log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"✅ MATCHING: Found {len(matches)} workpiece matches")
 
         # === FUNCTIONALITY ===
-        # Process each matched workpiece
-        for match_i, match in enumerate(matches):
+        # Plan the drop-off of the whole batch before picking; parts are picked in plan order
+        plan, pickup_points = plan_drop_off_positions(nester, matches, orientations)
+        if plan.unplaced:
+            # === LOGGING ===
+            log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.WARNING, f"⚠️  PLANE FULL: No room for {len(plan.unplaced)} workpieces")
+            # === FUNCTIONALITY ===
+            plane.isFull = True
+
+        # Process each planned workpiece
+        for pick_i, placement in enumerate(plan.placements):
+            match_i = placement.index
+            match = matches[match_i]
             ret = application.move_to_nesting_capture_position(z_offset = Z_OFFSET_FOR_CALIBRATION_PATTERN)
             # === LOGGING ===
-            log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"\n🎯 PROCESSING MATCH {match_i + 1}/{len(matches)}")
+            log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.INFO, f"\n🎯 PROCESSING MATCH {match_i + 1}/{len(matches)} (pick {pick_i + 1}/{len(plan.placements)})")
 
             # === FUNCTIONALITY ===
-            contour = match.get_main_contour()
-            cnt_obj = Contour(contour)
             match_height = 3
             gripper = match.gripperID
-
-            if match.pickupPoint is not None:
-                # Parse pickup point string "x,y" and convert to tuple (x, y)
-                if isinstance(match.pickupPoint, str):
-                    try:
-                        x_str, y_str = match.pickupPoint.split(',')
-                        centroid = (int(float(x_str)), int(float(y_str)))
-                        log_if_enabled(ENABLE_LOGGING, nesting_logger, LoggingLevel.INFO, f"Using pickup point: {centroid}")
-                    except (ValueError, AttributeError) as e:
-                        log_if_enabled(ENABLE_LOGGING, nesting_logger, LoggingLevel.WARNING, f"Invalid pickup point format '{match.pickupPoint}', using centroid instead: {e}")
-                        centroid = cnt_obj.getCentroid()
-                else:
-                    # Assume it's already in correct format (tuple/list)
-                    centroid = match.pickupPoint
-                    log_if_enabled(ENABLE_LOGGING, nesting_logger, LoggingLevel.INFO, f"Using pickup point: {centroid}")
-            else:
-                centroid = cnt_obj.getCentroid()
-                log_if_enabled(ENABLE_LOGGING, nesting_logger, LoggingLevel.INFO, f"Using centroid: {centroid}")
+            centroid = pickup_points[match_i]
 
             # Apply homography transformation
             transformed_centroid = utils.applyTransformation(visionService.cameraToRobotMatrix, [centroid])
@@ -463,37 +422,17 @@ def start_nesting(application,visionService, robotService,preselected_workpiece,
             # Calculate pickup and drop-off positions
             pickup_positions,height_measure_position, pickup_height = calculate_pickup_positions(flat_centroid, match_height, robotService,
                                                                          orientations[match_i],gripper)
-            drop_off_result = calculate_drop_off_position(match, centroid, orientations[match_i], plane, pickup_height,gripper)
-
-
-            # === LOGGING ===
-            log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.DEBUG, "Calculating drop-off position...")
-
-            # === FUNCTIONALITY ===
-            if drop_off_result[0] is None:  # Plane is full
-                # === LOGGING ===
-                log_if_enabled(ENABLE_LOGGING,nesting_logger,LoggingLevel.WARNING, "⚠️  PLANE FULL: Cannot place more workpieces")
-                # === FUNCTIONALITY ===
-                plane.isFull = True
-                break
+            drop_off_result = calculate_planned_drop_off_position(placement, plane, pickup_height, gripper)
 
             drop_off_position1,drop_off_position2, width, height, plane, placed_contour = drop_off_result
-            # apply gripper offsets to drop-off position
-
-            if gripper == Gripper.DOUBLE:
-                # rotate the offsets by -90 degrees and apply them
-                orientation_radians = math.radians(-90)
-                rotated_x, rotated_y = __rotate_offsets(GRIPPER_X_OFFSET, GRIPPER_Y_OFFSET, orientation_radians)
-                drop_off_position1[0] += rotated_x
-                drop_off_position1[1] += rotated_y
-                drop_off_position2[0] += rotated_x
-                drop_off_position2[1] += rotated_y
-            else:
-                # apply standard gripper offsets
-                drop_off_position1[0] += GRIPPER_X_OFFSET
-                drop_off_position1[1] += GRIPPER_Y_OFFSET
-                drop_off_position2[0] += GRIPPER_X_OFFSET
-                drop_off_position2[1] += GRIPPER_Y_OFFSET
+            # apply gripper offsets to drop-off position, rotated with the drop-off rz
+            # (-90 degrees for the double gripper, unrotated for the single one without extra rotation)
+            orientation_radians = math.radians(drop_off_position1[5])
+            rotated_x, rotated_y = __rotate_offsets(GRIPPER_X_OFFSET, GRIPPER_Y_OFFSET, orientation_radians)
+            drop_off_position1[0] += rotated_x
+            drop_off_position1[1] += rotated_y
+            drop_off_position2[0] += rotated_x
+            drop_off_position2[1] += rotated_y
 
             count += 1
 
@@ -0,0 +1,248 @@
+"""
+Raster nesting engine for the pick-and-place drop-off plane.
+
+The plane is an occupancy grid with ``resolution`` mm cells. Each part is rasterized
+for every rotation candidate and grown by the plane spacing. cv2.matchTemplate then
+correlates it with the occupancy grid, which gives the overlap at every offset in one
+call. Among the collision-free offsets the one with the highest bottom edge is taken,
+then the leftmost. This is a bottom-left fill that anchors at the top left corner of the
+plane, where the previous shelf-row placement started as well. Parts
+nest into each other's concavities instead of being packed by bounding box.
+
+The whole batch of detected parts is planned before picking starts, largest part
+first. The plan keeps the order in which parts were placed, and that is the pickup
+order. The grid persists between batches, so later capture cycles keep filling the gaps.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+
+import cv2
+import numpy as np
+
+DEFAULT_RESOLUTION_MM = 2.0
+DEFAULT_ROTATIONS = (0, 90, 180, 270)
+DEFAULT_TIME_BUDGET_S = 0.5
+
+
+@dataclass
+class PlannedPlacement:
+    """Where one part goes on the plane.
+
+    Attributes:
+        index (int): Index of the part in the list passed to ``RasterNester.plan``.
+        rotation (float): Extra rotation in degrees applied about the pivot, on top of the
+            part's aligned pose.
+        drop_point (tuple): Plane coordinates (mm) that the pivot (the pickup point) lands on.
+        contour (np.ndarray): (N, 2) placed contour in plane coordinates.
+        width (float): Width of the placed contour's axis-aligned bounding box.
+        height (float): Height of the placed contour's axis-aligned bounding box.
+    """
+    index: int
+    rotation: float
+    drop_point: tuple
+    contour: np.ndarray
+    width: float
+    height: float
+
+
+@dataclass
+class NestingPlan:
+    """Result of planning one batch.
+
+    Attributes:
+        placements (list[PlannedPlacement]): Placements in pickup order.
+        unplaced (list[int]): Parts that do not fit anywhere on the plane.
+        deferred (list[int]): Parts skipped because the time budget ran out. They stay on
+            the pickup area and are planned with the next capture.
+        planning_time (float): Seconds spent in ``plan``.
+    """
+    placements: list = field(default_factory=list)
+    unplaced: list = field(default_factory=list)
+    deferred: list = field(default_factory=list)
+    planning_time: float = 0.0
+
+    @property
+    def timed_out(self):
+        return bool(self.deferred)
+
+
+def _polygon_area(points):
+    x, y = points[:, 0], points[:, 1]
+    return 0.5 * abs(float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))))
+
+
+def _rotate(points, angle_deg, pivot):
+    angle = math.radians(angle_deg)
+    cos_a, sin_a = math.cos(angle), math.sin(angle)
+    rotation = np.array([[cos_a, -sin_a], [sin_a, cos_a]])
+    pivot = np.asarray(pivot, dtype=np.float64)
+    return (points - pivot) @ rotation.T + pivot
+
+
+class RasterNester:
+    """
+    Plans drop-off positions on a ``Plane`` with raster bottom-left placement.
+
+    Attributes:
+        plane (Plane): Placement area; its bounds and spacing are used.
+        resolution (float): Grid cell size in mm.
+        rotations (tuple): Rotation candidates in degrees.
+        time_budget (float): Maximum seconds one ``plan`` call may spend.
+        placed_area (float): Total contour area placed so far (mm²).
+    """
+
+    def __init__(self, plane, resolution=DEFAULT_RESOLUTION_MM, rotations=DEFAULT_ROTATIONS,
+                 time_budget=DEFAULT_TIME_BUDGET_S, spacing=None):
+        """
+        Args:
+            plane (Plane): Placement area.
+            resolution (float): Grid cell size in mm; smaller is tighter but slower.
+            rotations (iterable): Rotation candidates in degrees.
+            time_budget (float): Seconds per ``plan`` call; None disables the budget.
+            spacing (float): Minimum gap between parts, defaults to ``plane.spacing``.
+        """
+        self.plane = plane
+        self.resolution = float(resolution)
+        self.rotations = tuple(rotations)
+        self.time_budget = time_budget
+        self.spacing = plane.spacing if spacing is None else spacing
+
+        # Spacing halo in cells, plus one cell for rasterization round-off. Both the grid and
+        # the part masks get a border wide enough to hold the halo of a part at the edge.
+        halo = int(math.ceil(self.spacing / self.resolution)) + 1
+        self._pad = halo + 2
+        cols = int(math.floor((plane.xMax - plane.xMin) / self.resolution))
+        rows = int(math.floor((plane.yMax - plane.yMin) / self.resolution))
+        self._occupancy = np.zeros((rows + 2 * self._pad, cols + 2 * self._pad), dtype=np.float32)
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * halo + 1, 2 * halo + 1))
+        self.placed_area = 0.0
+
+    @property
+    def plane_area(self):
+        return (self.plane.xMax - self.plane.xMin) * (self.plane.yMax - self.plane.yMin)
+
+    @property
+    def fill_ratio(self):
+        """Placed contour area over plane area."""
+        return self.placed_area / self.plane_area
+
+    def _rasterize(self, points):
+        """
+        Rasterize a contour with its top-left at the mask origin.
+
+        Returns:
+            tuple: (part mask, grown mask, (x, y) plane coordinates of the grown mask's top-left corner).
+        """
+        res = self.resolution
+        x_min, y_max = points[:, 0].min(), points[:, 1].max()
+        cells = np.column_stack([(points[:, 0] - x_min) / res, (y_max - points[:, 1]) / res]) + self._pad
+        width = int(math.ceil(cells[:, 0].max())) + self._pad + 1
+        height = int(math.ceil(cells[:, 1].max())) + self._pad + 1
+        mask = np.zeros((height, width), dtype=np.uint8)
+        cv2.fillPoly(mask, [np.round(cells).astype(np.int32)], 1)
+        # Cover rasterization round-off with one extra cell on the stored footprint
+        mask = cv2.dilate(mask, np.ones((3, 3), np.uint8))
+        grown = cv2.dilate(mask, self._kernel)
+        origin = (x_min - self._pad * res, y_max + self._pad * res)
+        return mask, grown, origin
+
+    def _best_offset(self, mask, grown):
+        """
+        Find the free offset with the highest bottom edge, then the leftmost one.
+
+        The grown mask must not overlap placed parts; the part footprint itself must stay
+        inside the plane, while its spacing halo may overhang the edge.
+
+        Returns:
+            tuple: ((bottom row, column), row, column) or None when the part does not fit.
+        """
+        grid_h, grid_w = self._occupancy.shape
+        h, w = grown.shape
+        if h > grid_h or w > grid_w:
+            return None
+        overlap = cv2.matchTemplate(self._occupancy, grown.astype(np.float32), cv2.TM_CCORR)
+
+        # The plane is a rectangle, so the offsets keeping the footprint inside it are one too
+        filled_rows = np.flatnonzero(mask.any(axis=1))
+        filled_cols = np.flatnonzero(mask.any(axis=0))
+        row_lo = max(0, self._pad - filled_rows[0])
+        row_hi = min(overlap.shape[0], grid_h - self._pad - filled_rows[-1])
+        col_lo = max(0, self._pad - filled_cols[0])
+        col_hi = min(overlap.shape[1], grid_w - self._pad - filled_cols[-1])
+        if row_lo >= row_hi or col_lo >= col_hi:
+            return None
+
+        free = overlap[row_lo:row_hi, col_lo:col_hi] < 0.5
+        rows = np.flatnonzero(free.any(axis=1))
+        if len(rows) == 0:
+            return None
+        row = int(rows[0])
+        col = int(np.argmax(free[row]))
+        return (row + row_lo + h, col + col_lo), row + row_lo, col + col_lo
+
+    def plan(self, contours, pivots):
+        """
+        Plan placements for a batch of parts.
+
+        Args:
+            contours (list): Part contours (N, 2) or (N, 1, 2), already aligned to the pose
+                they are dropped in with no extra rotation.
+            pivots (list): Pickup point of every part; the part is rotated about it.
+
+        Returns:
+            NestingPlan: Placements in pickup order plus the parts that were not planned.
+        """
+        start = time.perf_counter()
+        plan = NestingPlan()
+        parts = [np.asarray(c, dtype=np.float64).reshape(-1, 2) for c in contours]
+        areas = [_polygon_area(p) if len(p) >= 3 else 0.0 for p in parts]
+        order = sorted(range(len(parts)), key=lambda i: areas[i], reverse=True)
+
+        for position, index in enumerate(order):
+            if self.time_budget is not None and time.perf_counter() - start > self.time_budget:
+                plan.deferred.extend(order[position:])
+                break
+            points = parts[index]
+            if len(points) < 3:
+                plan.unplaced.append(index)
+                continue
+
+            best = None
+            for rotation in self.rotations:
+                rotated = _rotate(points, rotation, pivots[index])
+                mask, grown, origin = self._rasterize(rotated)
+                found = self._best_offset(mask, grown)
+                if found is None:
+                    continue
+                score, row, col = found
+                if best is None or score < best[0]:
+                    best = (score, row, col, rotation, rotated, mask, origin)
+
+            if best is None:
+                plan.unplaced.append(index)
+                continue
+
+            _, row, col, rotation, rotated, mask, origin = best
+            h, w = mask.shape
+            self._occupancy[row:row + h, col:col + w] = np.maximum(self._occupancy[row:row + h, col:col + w], mask)
+
+            res = self.resolution
+            target = (self.plane.xMin + (col - self._pad) * res, self.plane.yMax - (row - self._pad) * res)
+            shift = np.array([target[0] - origin[0], target[1] - origin[1]])
+            placed = rotated + shift
+            pivot = np.asarray(pivots[index], dtype=np.float64) + shift
+            extent = placed.max(axis=0) - placed.min(axis=0)
+            self.placed_area += areas[index]
+            plan.placements.append(PlannedPlacement(
+                index=index,
+                rotation=rotation,
+                drop_point=(float(pivot[0]), float(pivot[1])),
+                contour=placed.astype(np.float32),
+                width=float(extent[0]),
+                height=float(extent[1]),
+            ))
+
+        plan.planning_time = time.perf_counter() - start
+        return plan
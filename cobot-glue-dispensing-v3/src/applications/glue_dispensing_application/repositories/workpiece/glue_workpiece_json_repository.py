@@ -6,6 +6,15 @@ Description:
 
     It expects workpieces classes to inherit from JsonSerializable to enable proper
     (de)serialization.
+
+    Each saved workpiece also gets a PNG thumbnail and preview next to its JSON file,
+    and the repository keeps an index (index.json in the base directory) with the
+    metadata the gallery lists - id, name, description, material, area, file and image
+    paths - so listing the workpieces needs neither the contours nor a walk over every
+    file. The index is checked against the workpiece files when the repository loads;
+    entries that are missing or older than their file (e.g. workpieces saved before
+    thumbnails existed) are rebuilt then. Only those files are read at load time; any
+    other workpiece is deserialized when it is first requested.
 """
 
 import copy
@@ -15,6 +24,8 @@ import os
 import shutil
 from typing import Type
 
+from applications.glue_dispensing_application.repositories.workpiece.workpiece_thumbnails import \
+    write_workpiece_thumbnail
 from modules.shared.core.interfaces.JsonSerializable import JsonSerializable
 
 
@@ -27,11 +38,18 @@ class GlueWorkpieceJsonRepository:
           TIMESTAMP_FORMAT (str): Format for unique timestamped folders.
           FOLDER_NAME (str): Subdirectory name where workpieces are stored.
           WORKPIECE_FILE_SUFFIX (str): Suffix used in JSON workpieces file names.
+          THUMBNAIL_FILE_SUFFIX (str): Suffix of the thumbnail saved next to each workpiece file.
+          PREVIEW_FILE_SUFFIX (str): Suffix of the preview image saved next to each workpiece file.
+          INDEX_FILE_NAME (str): Name of the metadata index in the base directory.
       """
     DATE_FORMAT = "%Y-%m-%d"
     TIMESTAMP_FORMAT = "%Y-%m-%d_%H-%M-%S-%f"
     FOLDER_NAME = "workpieces"
     WORKPIECE_FILE_SUFFIX = "_workpiece.json"  # Ensure the files have this suffix
+    THUMBNAIL_FILE_SUFFIX = "_thumbnail.png"
+    PREVIEW_FILE_SUFFIX = "_preview.png"
+    INDEX_FILE_NAME = "index.json"
+    INDEX_VERSION = 1
 
     def __init__(self, directory, fields, dataClass):
         """
@@ -54,46 +72,43 @@ class GlueWorkpieceJsonRepository:
         self.fields = fields
         # check if dataClass is JsonSerializable
 
-        self.data = self.loadData()
-        self.visited_dirs = set()  # Track visited directories to avoid repetition
         if not os.path.exists(self.directory):
             print(f"Directory {self.directory} does not exist.")
             raise FileNotFoundError(f"Directory {self.directory} not found.")
+        self.files = {}  # workpieceId -> path of its JSON file
+        self.loaded = {}  # workpieceId -> workpiece, deserialized on request
+        self.index = self.loadIndex()
+
+    @property
+    def data(self):
+        """Every workpiece, in index order; see loadData."""
+        return self.loadData()
 
     def loadData(self):
         """
-        Recursively iterates over all directories inside the base directory, deserializes all JSON files,
-        and returns a list of objects of the provided class type (e.g., Workpiece).
+        Deserializes every workpiece not loaded yet and returns all of them in index order.
+
+        Listing the workpieces does not need this; use get_index, or get_workpiece_by_id
+        for a single one.
         """
-        objects = []
+        return [workpiece for workpiece in map(self._load, list(self.index)) if workpiece is not None]
 
-        # Check if the base directory exists
-        if not os.path.exists(self.directory):
-            print(f"Directory {self.directory} does not exist.")
-            return objects
-        else:
-            # print(f"Directory exists: {self.directory}")
-            pass
-        # print(f"Directory: {self.directory}")
-        # Walk through all subdirectories and files
-        for root, _, files in os.walk(self.directory):
-            # print(f"Root: {root}")
-            for file in files:
-                # print(f"File: {file}")
-                file_path = os.path.join(root, file)
-                # print(f"File Path: {file_path}")  # Debugging: check the full file path
-                try:
-                    with open(file_path, 'r') as f:
-                        data = json.load(f)  # Load JSON data
-                        print(f"Loaded Data: {data}")  # Debugging: Show the loaded data
-                        obj = self.dataClass.deserialize(data)  # Deserialize into the appropriate object
-                        # print(f"Deserialized Object: {obj}")  # Debugging: Show the deserialized object
-                        objects.append(obj)
-                except Exception as e:
-                    print(f"Error loading object from {file_path}: {e}")
-                    raise Exception(f"Error loading object: {e}")
-
-        return objects
+    def _read(self, file_path):
+        """Deserializes one workpiece file."""
+        try:
+            with open(file_path, 'r') as f:
+                return self.dataClass.deserialize(json.load(f))
+        except Exception as e:
+            print(f"Error loading object from {file_path}: {e}")
+            raise Exception(f"Error loading object: {e}")
+
+    def _load(self, workpieceId):
+        workpiece_id = str(workpieceId)
+        workpiece = self.loaded.get(workpiece_id)
+        if workpiece is None and workpiece_id in self.files:
+            workpiece = self._read(self.files[workpiece_id])
+            self.loaded[workpiece_id] = workpiece
+        return workpiece
 
     def save_workpiece(self, workpiece):
         """
@@ -109,49 +124,23 @@ class GlueWorkpieceJsonRepository:
 
         print(f"WorkpieceJsonRepository.saveWorkpiece called with ID: {workpiece.workpieceId}")
 
-        # Ensure data list exists
-        if self.data is None:
-            self.data = []
-
         workpiece_id = str(workpiece.workpieceId)
 
         # Prepare serialized data
         serialized_data = json.dumps(self.dataClass.serialize(copy.deepcopy(workpiece)), indent=4)
 
-        # Try to find existing workpiece in memory and on disk
-        existing_index = None
-        for i, wp in enumerate(self.data):
-            if hasattr(wp, "workpieceId") and str(wp.workpieceId) == workpiece_id:
-                existing_index = i
-                break
-
-        # If exists on disk, find its file and overwrite
+        # If exists on disk, overwrite its file
         existing_file_path = None
-        if existing_index is not None:
-            for root, _, files in os.walk(self.directory):
-                for file in files:
-                    if file.endswith(self.WORKPIECE_FILE_SUFFIX):
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, "r") as f:
-                                data = json.load(f)
-                            file_workpiece_id = data.get("workpieceId") or data.get("id")
-                            if str(file_workpiece_id) == workpiece_id:
-                                existing_file_path = file_path
-                                break
-                        except Exception:
-                            continue
-                if existing_file_path:
-                    break
+        if os.path.exists(self.files.get(workpiece_id, "")):
+            existing_file_path = self.files[workpiece_id]
 
         try:
             if existing_file_path:
                 # Overwrite existing file
                 with open(existing_file_path, "w") as f:
                     f.write(serialized_data)
-                # Update in-memory object
-                if existing_index is not None:
-                    self.data[existing_index] = workpiece
+                self.loaded[workpiece_id] = workpiece
+                self._update_index(workpiece, existing_file_path)
                 return True, "Workpiece updated successfully"
             else:
                 # Create new timestamped directory and save as new file
@@ -163,11 +152,9 @@ class GlueWorkpieceJsonRepository:
                 file_path = os.path.join(timestamp_dir, f"{timestamp}{self.WORKPIECE_FILE_SUFFIX}")
                 with open(file_path, "w") as file:
                     file.write(serialized_data)
-                # Append or replace in-memory list
-                if existing_index is not None:
-                    self.data[existing_index] = workpiece
-                else:
-                    self.data.append(workpiece)
+                self.loaded[workpiece_id] = workpiece
+                self.files[workpiece_id] = file_path
+                self._update_index(workpiece, file_path)
                 return True, "Workpiece saved successfully"
         except Exception as e:
             return False, f"Error saving workpiece: {e}"
@@ -186,64 +173,35 @@ class GlueWorkpieceJsonRepository:
             Exception: If workpiece not found or deletion fails.
         """
         print(f"WorkpieceJsonRepository.deleteWorkpiece called with ID: {workpieceId}")
-        print(f"Repository data length: {len(self.data) if self.data else 'None'}")
         try:
-            # Find the workpiece in the data list
-            workpiece_to_delete = None
-            workpiece_index = None
-
-            for i, workpiece in enumerate(self.data):
-                if hasattr(workpiece, 'workpieceId') and str(workpiece.workpieceId) == str(workpieceId):
-                    workpiece_to_delete = workpiece
-                    workpiece_index = i
-                    print(f"Workpiece found in memory: {workpiece}")
-                    break
-
-            if workpiece_to_delete is None:
+            workpiece_id = str(workpieceId)
+            if workpiece_id not in self.files:
                 return False, f"Workpiece with ID '{workpieceId}' not found."
 
-            # Find and delete the corresponding file/directory on filesystem
-            file_deleted = False
-            for root, dirs, files in os.walk(self.directory):
-                for file in files:
-                    if file.endswith(self.WORKPIECE_FILE_SUFFIX):
-                        file_path = os.path.join(root, file)
-                        try:
-                            # Load the file to check if it contains our workpiece
-                            with open(file_path, 'r') as f:
-                                data = json.load(f)
-                                # Check if this file contains the workpiece we want to delete
-                                file_workpiece_id = data.get('workpieceId') or data.get('id')
-                                if str(file_workpiece_id) == str(workpieceId):
-                                    # Delete the entire timestamp directory (contains the workpiece file)
-                                    parent_dir = os.path.dirname(file_path)
-                                    shutil.rmtree(parent_dir)
-                                    print(f"Deleted workpiece directory: {parent_dir}")
-
-                                    # Check if the date directory is also empty and delete it
-                                    try:
-                                        date_dir = os.path.dirname(parent_dir)
-                                        if not os.listdir(date_dir):
-                                            os.rmdir(date_dir)
-                                            print(f"Deleted empty date directory: {date_dir}")
-                                    except OSError:
-                                        # Directory not empty or other issues, that's fine
-                                        pass
-
-                                    file_deleted = True
-                                    break
-                        except Exception as e:
-                            print(f"Error checking file {file_path}: {e}")
-                            continue
-
-                if file_deleted:
-                    break
-
-            if not file_deleted:
+            file_path = self.files[workpiece_id]
+            if not os.path.exists(file_path):
                 return False, f"Workpiece file for ID '{workpieceId}' not found on filesystem."
 
-            # Remove from in-memory data
-            self.data.pop(workpiece_index)
+            # Delete the entire timestamp directory (contains the workpiece file and its images)
+            parent_dir = os.path.dirname(file_path)
+            shutil.rmtree(parent_dir)
+            print(f"Deleted workpiece directory: {parent_dir}")
+
+            # Check if the date directory is also empty and delete it
+            try:
+                date_dir = os.path.dirname(parent_dir)
+                if not os.listdir(date_dir):
+                    os.rmdir(date_dir)
+                    print(f"Deleted empty date directory: {date_dir}")
+            except OSError:
+                # Directory not empty or other issues, that's fine
+                pass
+
+            # Remove from memory
+            self.loaded.pop(workpiece_id, None)
+            self.files.pop(workpiece_id, None)
+            if self.index.pop(workpiece_id, None) is not None:
+                self._write_index()
 
             return True, f"Workpiece '{workpieceId}' deleted successfully."
 
@@ -261,7 +219,139 @@ class GlueWorkpieceJsonRepository:
         Returns:
             JsonSerializable: The workpiece object if found, else None.
         """
-        for workpiece in self.data:
-            if hasattr(workpiece, 'workpieceId') and str(workpiece.workpieceId) == str(workpieceId):
-                return workpiece
-        return None
+        return self._load(workpieceId)
+
+    def get_index(self):
+        """
+        Metadata of every workpiece, without loading any contour.
+
+        Returns:
+            list: One dict per workpiece, in load/save order, with the keys workpieceId, name,
+            description, material, contourArea, modified, file, thumbnail and preview
+            (absolute paths; thumbnail and preview are None if they could not be rendered).
+        """
+        entries = []
+        for entry in self.index.values():
+            entry = dict(entry)
+            entry["file"] = os.path.join(self.directory, entry["file"])
+            for key in ("thumbnail", "preview"):
+                if entry.get(key):
+                    entry[key] = os.path.join(self.directory, entry[key])
+            entries.append(entry)
+        return entries
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, self.INDEX_FILE_NAME)
+
+    def loadIndex(self):
+        """
+        Reads the metadata index and brings it up to date with the workpiece files on disk.
+
+        Entries of workpieces that are no longer on disk are dropped; entries that are
+        missing, older than their file, or whose images are gone are rebuilt from the file
+        (rendering the images if they are also older than the file). Only the files of those
+        entries are deserialized. The index is written back only if something changed.
+
+        Returns:
+            dict: workpieceId -> index entry, with paths relative to the base directory.
+        """
+        stored = {}
+        try:
+            with open(self.index_path, "r") as f:
+                content = json.load(f)
+            if content.get("version") == self.INDEX_VERSION:
+                stored = {entry["workpieceId"]: entry for entry in content.get("workpieces", [])}
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Workpiece index {self.index_path} is unreadable, rebuilding it: {e}")
+
+        stored_by_file = {entry.get("file"): entry for entry in stored.values()}
+        index = {}
+        changed = False
+        for file_path in self._workpiece_files():
+            entry = stored_by_file.get(os.path.relpath(file_path, self.directory))
+            if self._is_current(entry, file_path):
+                workpiece_id = entry["workpieceId"]
+            else:
+                workpiece = self._read(file_path)
+                if not hasattr(workpiece, "workpieceId"):
+                    continue
+                workpiece_id = str(workpiece.workpieceId)
+                render = any(not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(file_path)
+                             for path in self._image_paths(file_path))
+                entry = self._index_entry(workpiece, file_path, render=render)
+                self.loaded[workpiece_id] = workpiece
+                changed = True
+            self.files[workpiece_id] = file_path
+            index[workpiece_id] = entry
+        # Save order: the timestamped folder names sort chronologically
+        index = dict(sorted(index.items(), key=lambda item: item[1]["file"]))
+
+        if changed or list(index) != list(stored):
+            self.index = index
+            self._write_index()
+        return index
+
+    def _workpiece_files(self):
+        """Paths of the workpiece JSON files under the base directory, skipping thumbnails and the index."""
+        paths = []
+        for root, _, files in os.walk(self.directory):
+            paths.extend(os.path.join(root, file) for file in files if file.endswith(self.WORKPIECE_FILE_SUFFIX))
+        return sorted(paths)
+
+    def _is_current(self, entry, file_path):
+        if entry is None or entry.get("file") != os.path.relpath(file_path, self.directory):
+            return False
+        if entry.get("mtime") != os.path.getmtime(file_path):
+            return False
+        images = (entry.get("thumbnail"), entry.get("preview"))
+        return all(image is not None and os.path.exists(os.path.join(self.directory, image)) for image in images)
+
+    def _image_paths(self, file_path):
+        """(thumbnail, preview) paths of a workpiece file."""
+        base = file_path[:-len(self.WORKPIECE_FILE_SUFFIX)]
+        return base + self.THUMBNAIL_FILE_SUFFIX, base + self.PREVIEW_FILE_SUFFIX
+
+    def _index_entry(self, workpiece, file_path, render=True):
+        """Renders the images next to ``file_path`` (unless told they are up to date) and returns the index entry."""
+        thumbnail_path, preview_path = self._image_paths(file_path)
+        try:
+            if render and not write_workpiece_thumbnail(workpiece, thumbnail_path, preview_path):
+                thumbnail_path = preview_path = None
+        except Exception as e:
+            print(f"Error rendering thumbnail for workpiece {getattr(workpiece, 'workpieceId', None)}: {e}")
+            thumbnail_path = preview_path = None
+
+        def text(value):
+            return "" if value is None else str(value)
+
+        mtime = os.path.getmtime(file_path)
+        return {
+            "workpieceId": str(workpiece.workpieceId),
+            "name": text(getattr(workpiece, "name", None)),
+            "description": text(getattr(workpiece, "description", None)),
+            "material": text(getattr(workpiece, "material", None)),
+            "contourArea": text(getattr(workpiece, "contourArea", None)),
+            "modified": datetime.datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M"),
+            "mtime": mtime,
+            "file": os.path.relpath(file_path, self.directory),
+            "thumbnail": os.path.relpath(thumbnail_path, self.directory) if thumbnail_path else None,
+            "preview": os.path.relpath(preview_path, self.directory) if preview_path else None,
+        }
+
+    def _update_index(self, workpiece, file_path):
+        try:
+            self.index[str(workpiece.workpieceId)] = self._index_entry(workpiece, file_path)
+            self._write_index()
+        except Exception as e:
+            # The workpiece itself is saved; the entry is rebuilt when the repository next loads
+            print(f"Error updating workpiece index: {e}")
+
+    def _write_index(self):
+        """Writes the index atomically, so a crash cannot leave a truncated file behind."""
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"version": self.INDEX_VERSION, "workpieces": list(self.index.values())}, f, indent=4)
+        os.replace(temp_path, self.index_path)
@@ -0,0 +1,174 @@
+"""
+Description:
+    Renders the gallery images of a workpiece with OpenCV, so the repository can write
+    them next to the workpiece file when the workpiece is saved instead of the gallery
+    drawing every contour each time it opens: a thumbnail at the exact size of the
+    gallery tiles, cheap to decode while scrolling, and a larger preview read only when
+    a workpiece is selected.
+
+    The drawing follows the gallery's own preview: white background, main contour in
+    black, spray "Contour" paths in red, "Fill" paths in blue and the pickup point as a
+    yellow circle with a crosshair, fitted to the image with the Y axis flipped.
+
+    workpiece_content_hash() identifies what a thumbnail shows, so images rendered for
+    workpieces without saved thumbnails can be cached on disk and reused until the
+    workpiece changes.
+"""
+import hashlib
+
+import cv2
+import numpy as np
+
+THUMBNAIL_SIZE = (120, 120)  # ThumbnailWidget image size: shown without rescaling
+PREVIEW_SIZE = (400, 400)  # Gallery preview pane
+
+# BGR
+MAIN_CONTOUR_COLOR = (0, 0, 0)
+SPRAY_COLORS = {"Contour": (0, 0, 255), "Fill": (255, 0, 0)}
+DEFAULT_SPRAY_COLOR = (128, 128, 128)
+PICKUP_FILL_COLOR = (0, 255, 255)
+PICKUP_EDGE_COLOR = (0, 128, 128)
+
+
+def _points(contour):
+    """(N, 2) float array from a (N, 1, 2)/(N, 2) array or a list of points; None if unusable."""
+    if contour is None:
+        return None
+    try:
+        points = np.asarray(contour, dtype=np.float64).reshape(-1, 2)
+    except (TypeError, ValueError):
+        return None
+    return points if len(points) else None
+
+
+def _main_contour(workpiece):
+    if hasattr(workpiece, 'get_main_contour'):
+        try:
+            return _points(workpiece.get_main_contour())
+        except Exception as e:
+            print(f"Error getting main contour: {e}")
+            return None
+    contour = getattr(workpiece, 'contour', None)
+    if isinstance(contour, dict):
+        contour = contour.get("contour")
+    return _points(contour)
+
+
+def _spray_paths(workpiece):
+    """[(pattern key, (N, 2) points)] of the workpiece's spray pattern."""
+    spray_pattern = getattr(workpiece, 'sprayPattern', None)
+    if not spray_pattern:
+        return []
+    if not isinstance(spray_pattern, dict):
+        spray_pattern = {"Contour": spray_pattern}  # Legacy format
+    paths = []
+    for key, segments in spray_pattern.items():
+        for segment in segments or []:
+            if isinstance(segment, dict):
+                points = _points(segment.get("contour"))
+                if points is not None:
+                    paths.append((key, points))
+    return paths
+
+
+def _pickup_point(workpiece):
+    pickup_point = getattr(workpiece, 'pickupPoint', None)
+    try:
+        if isinstance(pickup_point, str) and ',' in pickup_point:
+            x, y = pickup_point.split(',')[:2]
+            return float(x), float(y)
+        if isinstance(pickup_point, (list, tuple)) and len(pickup_point) >= 2:
+            return float(pickup_point[0]), float(pickup_point[1])
+    except ValueError:
+        pass
+    return None
+
+
+def render_workpiece_thumbnail(workpiece, size=THUMBNAIL_SIZE, margin=None):
+    """
+    Draws the workpiece's contour, spray pattern and pickup point.
+
+    Line widths and the pickup marker are those of the gallery's 800 px rendering scaled
+    to ``size``, but at least one pixel.
+
+    Args:
+        workpiece: Workpiece with get_main_contour() (or a contour), sprayPattern and pickupPoint.
+        size (tuple): (width, height) of the image.
+        margin (int): Blank border around the drawing, in pixels; 2.5% of the size by default.
+
+    Returns:
+        np.ndarray: BGR image; blank if the workpiece has no points to draw.
+    """
+    width, height = size
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    line_scale = min(width, height) / 800
+
+    def px(value):
+        return max(1, int(round(value * line_scale)))
+
+    if margin is None:
+        margin = px(20)
+
+    main_contour = _main_contour(workpiece)
+    spray_paths = _spray_paths(workpiece)
+    shapes = ([main_contour] if main_contour is not None else []) + [points for _, points in spray_paths]
+    if not shapes:
+        return image
+
+    # Fit the main contour and spray paths together, so their relative positions are kept
+    all_points = np.vstack(shapes)
+    lower, upper = all_points.min(axis=0), all_points.max(axis=0)
+    extent = upper - lower
+    scales = [(available / span) if span > 0 else 1.0
+              for available, span in zip((width - 2 * margin, height - 2 * margin), extent)]
+    scale = min(scales)
+    center = lower + extent / 2
+
+    def transform(points):
+        x = (points[:, 0] - center[0]) * scale + width / 2
+        y = (center[1] - points[:, 1]) * scale + height / 2  # flipped Y
+        return np.round(np.stack([x, y], axis=1)).astype(np.int32).reshape(-1, 1, 2)
+
+    if main_contour is not None and len(main_contour) > 1:
+        cv2.polylines(image, [transform(main_contour)], True, MAIN_CONTOUR_COLOR, px(3), cv2.LINE_AA)
+
+    for key, points in spray_paths:
+        if len(points) > 1:
+            cv2.polylines(image, [transform(points)], False, SPRAY_COLORS.get(key, DEFAULT_SPRAY_COLOR),
+                          px(2) if key == "Contour" else 1, cv2.LINE_AA)
+
+    pickup_point = _pickup_point(workpiece)
+    if pickup_point is not None:
+        x, y = (int(v) for v in transform(np.array([pickup_point]))[0, 0])
+        radius, arm = max(2, px(8)), px(6)
+        cv2.circle(image, (x, y), radius, PICKUP_FILL_COLOR, -1, cv2.LINE_AA)
+        cv2.circle(image, (x, y), radius, PICKUP_EDGE_COLOR, px(3), cv2.LINE_AA)
+        cv2.line(image, (x - arm, y), (x + arm, y), PICKUP_EDGE_COLOR, 1)
+        cv2.line(image, (x, y - arm), (x, y + arm), PICKUP_EDGE_COLOR, 1)
+
+    return image
+
+
+def workpiece_content_hash(workpiece):
+    """
+    Hash of what the thumbnail of ``workpiece`` shows: main contour, spray paths and pickup point.
+
+    Returns:
+        str: 16 hexadecimal digits; equal for workpieces that render to the same image.
+    """
+    digest = hashlib.sha1()
+    main_contour = _main_contour(workpiece)
+    if main_contour is not None:
+        digest.update(b"main")
+        digest.update(main_contour.tobytes())
+    for key, points in _spray_paths(workpiece):
+        digest.update(str(key).encode())
+        digest.update(points.tobytes())
+    digest.update(repr(_pickup_point(workpiece)).encode())
+    return digest.hexdigest()[:16]
+
+
+def write_workpiece_thumbnail(workpiece, thumbnail_path, preview_path):
+    """Renders the thumbnail and the preview and writes them as PNGs. Returns True on success."""
+    return (bool(cv2.imwrite(thumbnail_path, render_workpiece_thumbnail(workpiece, THUMBNAIL_SIZE))) and
+            bool(cv2.imwrite(preview_path, render_workpiece_thumbnail(workpiece, PREVIEW_SIZE))))
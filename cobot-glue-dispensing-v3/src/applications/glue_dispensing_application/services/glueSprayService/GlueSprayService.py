@@ -3,7 +3,8 @@ from applications.glue_dispensing_application.services.glueSprayService.fanContr
 from applications.glue_dispensing_application.services.glueSprayService.generatorControl.GeneratorControl import GeneratorControl, GeneratorState
 from applications.glue_dispensing_application.services.glueSprayService.generatorControl.timer import Timer
 from applications.glue_dispensing_application.services.glueSprayService.motorControl.MotorControl import MotorControl
-import time
+from applications.glue_dispensing_application.services.glueSprayService.spray_timeline import SprayTimeline, TimelineStep
+import threading
 
 from backend.system.SystemStatePublisherThread import SystemStatePublisherThread
 from src.backend.system.utils.custom_logging import setup_logger,log_if_enabled, LoggingLevel
@@ -30,6 +31,8 @@ class GlueSprayService:
         self.glueD_addresses = 6  # MOTOR
 
         self.generatorCurrentState = False  # Initial generator state
+        self._timeline = None  # The last start or stop sequence, possibly still running
+        self._timeline_lock = threading.Lock()
 
         self.glueMapping = {
             1: self.glueA_addresses,
@@ -154,72 +157,208 @@ class GlueSprayService:
 
     """ GLUE SPRAY CONTROL"""
 
-    def startGlueDispensing(self,
-                            glueType_addresses,
-                            speed,
-                            reverse_time,
-                            speedReverse,
-                            gen_pump_delay=0.5,
-                            fanSpeed=0,
-                            ramp_steps=3):
-        result = False
+    def scheduleGlueDispensingStart(self,
+                                    glueType_addresses,
+                                    speed,
+                                    reverse_time,
+                                    speedReverse,
+                                    gen_pump_delay=0.5,
+                                    fanSpeed=0,
+                                    ramp_steps=3,
+                                    motion_offset=None,
+                                    on_complete=None,
+                                    on_failure=None) -> SprayTimeline:
+        """
+        Start the fan, the generator and, ``gen_pump_delay`` seconds after them, the pump.
+
+        The commands run on a SprayTimeline: the pump starts ``gen_pump_delay`` after the
+        sequence started, however long the fan and generator transactions took. The robot
+        may move once the timeline is released, ``motion_offset`` seconds after the start
+        (default: the pump start plus the Time Before Motion setting) and not before the
+        pump has confirmed its start. If a step fails, everything is turned off again.
+        """
         motorAddress = glueType_addresses
-        try:
-            self.fanOn(fanSpeed)
-            self.generatorOn()
-            time.sleep(gen_pump_delay)
-            self.motorOn(motorAddress=motorAddress,
-                         speed=speed,
-                         ramp_steps=ramp_steps,
-                         initial_ramp_speed=self.settings.get_initial_ramp_speed(),
-                         initial_ramp_speed_duration=self.settings.get_initial_ramp_speed_duration())
-
+        if motion_offset is None:
+            motion_offset = gen_pump_delay + float(self.settings.get_time_before_motion())
+
+        def pump_on():
+            if not self.motorOn(motorAddress=motorAddress,
+                                speed=speed,
+                                ramp_steps=ramp_steps,
+                                initial_ramp_speed=self.settings.get_initial_ramp_speed(),
+                                initial_ramp_speed_duration=self.settings.get_initial_ramp_speed_duration()):
+                raise RuntimeError(f"Pump {motorAddress} did not start")
             log_if_enabled(enabled=ENABLE_LOGGING,
                            logger=glue_spray_service_logger,
                            message=f"Glue dispensing started for {glueType_addresses} at speed {speed}, stepsReverse {reverse_time}, speedReverse {speedReverse}",
                            level=LoggingLevel.INFO,
                            broadcast_to_ui=False)
 
-            result = True
-        except Exception as e:
-            import traceback
+        def rollback():
             self.generatorOff()
             self.fanOff()
             self.motorOff(motorAddress=motorAddress,
                           speedReverse=speedReverse,
                           reverse_time=0)
+
+        def start_failed(timeline, e):
             log_if_enabled(enabled=ENABLE_LOGGING,
                            logger=glue_spray_service_logger,
                            message=f"Error starting glue dispensing for {glueType_addresses}: {e}",
                            level=LoggingLevel.ERROR,
                            broadcast_to_ui=False)
-            traceback.print_exc()
-        return result
+            if on_failure is not None:
+                on_failure(timeline, e)
+
+        return self._start_timeline(SprayTimeline(
+            "start",
+            [TimelineStep(0.0, "fan on", lambda: self.fanOn(fanSpeed)),
+             TimelineStep(0.0, "generator on", self.generatorOn),
+             TimelineStep(gen_pump_delay, "pump on", pump_on)],
+            release_offset=motion_offset,
+            rollback=rollback,
+            on_complete=on_complete,
+            on_failure=start_failed))
 
-    def stopGlueDispensing(self, glueType_addresses, speed_reverse, pump_reverse_time,ramp_steps, pump_gen_delay=0.5):
-        result = False
+    def startGlueDispensing(self,
+                            glueType_addresses,
+                            speed,
+                            reverse_time,
+                            speedReverse,
+                            gen_pump_delay=0.5,
+                            fanSpeed=0,
+                            ramp_steps=3,
+                            motion_offset=None,
+                            on_complete=None,
+                            on_failure=None):
+        """
+        Start the glue sequence (see scheduleGlueDispensingStart) and return once the robot may move.
+
+        Returns:
+            bool: True if the fan, generator and pump started and the motion offset was
+            reached, False if one of them failed. Later failures are reported to ``on_failure``.
+        """
+        timeline = self.scheduleGlueDispensingStart(glueType_addresses, speed, reverse_time, speedReverse,
+                                                    gen_pump_delay=gen_pump_delay,
+                                                    fanSpeed=fanSpeed,
+                                                    ramp_steps=ramp_steps,
+                                                    motion_offset=motion_offset,
+                                                    on_complete=on_complete,
+                                                    on_failure=on_failure)
+        return timeline.wait_released()
+
+    def scheduleGlueDispensingStop(self, glueType_addresses, speed_reverse, pump_reverse_time, ramp_steps,
+                                   pump_gen_delay=0.5, motion_offset=0.0, on_complete=None,
+                                   on_failure=None) -> SprayTimeline:
+        """
+        Stop the pump (reverse ramp and reverse time), then the generator ``pump_gen_delay`` later.
+
+        The generator is turned off ``pump_reverse_time + pump_gen_delay`` seconds after the
+        sequence started, and never before the pump has stopped. The robot may move
+        ``motion_offset`` seconds after the start, once the pump has stopped.
+        """
         motorAddress = glueType_addresses
-        try:
-            self.motorOff(motorAddress=motorAddress,
-                          speedReverse=speed_reverse,
-                          reverse_time=pump_reverse_time,
-                          ramp_steps=ramp_steps)
 
-            time.sleep(pump_gen_delay)
+        def pump_off():
+            if not self.motorOff(motorAddress=motorAddress,
+                                 speedReverse=speed_reverse,
+                                 reverse_time=pump_reverse_time,
+                                 ramp_steps=ramp_steps):
+                raise RuntimeError(f"Pump {motorAddress} did not stop")
 
+        def generator_off():
             self.generatorOff()
             log_if_enabled(enabled=ENABLE_LOGGING,
                            logger=glue_spray_service_logger,
                            message=f"Glue dispensing stopped for {glueType_addresses}",
                            level=LoggingLevel.INFO,
                            broadcast_to_ui=False)
-            result = True
-        except Exception as e:
+
+        def stop_failed(timeline, e):
             log_if_enabled(enabled=ENABLE_LOGGING,
                            logger=glue_spray_service_logger,
                            message=f"Error stopping glue dispensing for {glueType_addresses}: {e}",
                            level=LoggingLevel.ERROR,
                            broadcast_to_ui=False)
-        return result
-
-
+            if on_failure is not None:
+                on_failure(timeline, e)
+
+        return self._start_timeline(SprayTimeline(
+            "stop",
+            [TimelineStep(0.0, "pump off", pump_off),
+             TimelineStep(float(pump_reverse_time) + pump_gen_delay, "generator off", generator_off)],
+            release_offset=motion_offset,
+            on_complete=on_complete,
+            on_failure=stop_failed))
+
+    def stopGlueDispensing(self, glueType_addresses, speed_reverse, pump_reverse_time,ramp_steps, pump_gen_delay=0.5,
+                           motion_offset=0.0, on_complete=None, on_failure=None):
+        """
+        Stop the glue sequence (see scheduleGlueDispensingStop) and return once the robot may move.
+
+        Returns:
+            bool: True if the pump stopped, False if it did not. A failure to turn the
+            generator off afterwards is reported to ``on_failure``.
+        """
+        timeline = self.scheduleGlueDispensingStop(glueType_addresses, speed_reverse, pump_reverse_time, ramp_steps,
+                                                   pump_gen_delay=pump_gen_delay,
+                                                   motion_offset=motion_offset,
+                                                   on_complete=on_complete,
+                                                   on_failure=on_failure)
+        return timeline.wait_released()
+
+    def startPump(self, motorAddress, speed, ramp_steps, initial_ramp_speed, initial_ramp_speed_duration,
+                  on_failure=None):
+        """
+        Start the pump alone, as the glue cycle does at the start of each path.
+
+        Runs as a sequence of its own, so a pump stop still running in the background
+        (see schedulePumpStop) finishes before the pump starts again.
+
+        Returns:
+            bool: True if the pump started.
+        """
+        def pump_on():
+            if not self.motorOn(motorAddress=motorAddress,
+                                speed=speed,
+                                ramp_steps=ramp_steps,
+                                initial_ramp_speed=initial_ramp_speed,
+                                initial_ramp_speed_duration=initial_ramp_speed_duration):
+                raise RuntimeError(f"Pump {motorAddress} did not start")
+
+        return self._start_timeline(SprayTimeline(
+            "pump start",
+            [TimelineStep(0.0, "pump on", pump_on)],
+            on_failure=on_failure)).wait()
+
+    def schedulePumpStop(self, motorAddress, speedReverse, reverse_time, ramp_steps=None, on_complete=None,
+                         on_failure=None) -> SprayTimeline:
+        """
+        Stop the pump alone (reverse ramp and reverse time), as the glue cycle does between paths.
+
+        The stop runs in the background: the robot travels to the next path while the pump
+        reverses, and the next sequence started waits for the stop to finish. Wait on the
+        returned timeline where the pump must be off before going on.
+        """
+        def pump_off():
+            if not self.motorOff(motorAddress=motorAddress,
+                                 speedReverse=speedReverse,
+                                 reverse_time=reverse_time,
+                                 ramp_steps=ramp_steps):
+                raise RuntimeError(f"Pump {motorAddress} did not stop")
+
+        return self._start_timeline(SprayTimeline(
+            "pump stop",
+            [TimelineStep(0.0, "pump off", pump_off)],
+            on_complete=on_complete,
+            on_failure=on_failure))
+
+    def _start_timeline(self, timeline: SprayTimeline) -> SprayTimeline:
+        # One sequence at a time: the steps of the previous one that have not been issued
+        # are dropped (a pending pump start when stopping, a pending generator off when
+        # starting again), and its running step is waited for.
+        with self._timeline_lock:
+            if self._timeline is not None:
+                self._timeline.cancel()
+            self._timeline = timeline.start()
+        return timeline
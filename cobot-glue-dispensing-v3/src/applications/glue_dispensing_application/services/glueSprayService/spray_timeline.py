@@ -0,0 +1,154 @@
+"""
+Device command sequences (fan, generator, pump) issued at offsets from a reference time.
+
+A SprayTimeline runs its steps in order on a background thread, each one when the
+timeline reaches its offset. Offsets count from the reference time, not from the end of
+the previous step, so the time a Modbus transaction takes is absorbed by the wait that
+follows it instead of adding to it. A step that overruns delays the next ones; steps
+never overlap or change order.
+
+The caller blocks only until the release offset (e.g. when the robot may start moving):
+wait_released() returns once the timeline has reached that offset and every step
+scheduled up to it has returned, so a caller released has the outcome of those steps:
+a device that refused its command fails the release. The remaining steps finish in the
+background and
+end with on_complete, or with the rollback and on_failure when a step raises. Both
+callbacks run on the timeline thread.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+
+@dataclass
+class TimelineStep:
+    offset: float  # seconds from the timeline's reference time
+    name: str
+    action: Callable[[], Any]
+
+
+class SprayTimeline:
+    """
+    Runs device commands at fixed offsets from a reference time, on a thread of its own.
+
+    Attributes:
+        name (str): Used in the thread name and in messages.
+        reference_time (float): time.perf_counter() the offsets count from, set by start().
+        issued (list): (step name, seconds after the reference time it returned) of the steps
+            that have run successfully so far.
+        error (Exception): Why the timeline failed, None otherwise.
+    """
+
+    def __init__(self, name: str, steps: List[TimelineStep], release_offset: Optional[float] = None,
+                 rollback: Optional[Callable[[], Any]] = None,
+                 on_complete: Optional[Callable[["SprayTimeline"], Any]] = None,
+                 on_failure: Optional[Callable[["SprayTimeline", Exception], Any]] = None):
+        """
+        Args:
+            steps: The commands; run in offset order.
+            release_offset (float): Seconds after which wait_released() returns; None releases
+                when the last step has finished.
+            rollback: Called after a step has failed, before on_failure.
+            on_complete: Called with the timeline when every step has run.
+            on_failure: Called with the timeline and the exception of the failed step.
+        """
+        self.name = name
+        self.steps = sorted(steps, key=lambda step: step.offset)
+        self.release_offset = release_offset
+        self.rollback = rollback
+        self.on_complete = on_complete
+        self.on_failure = on_failure
+        self.reference_time = None
+        self.issued = []
+        self.error = None
+        self._condition = threading.Condition()
+        self._cancelled = threading.Event()
+        self._done = False
+        self._thread = None
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def start(self, reference_time: Optional[float] = None) -> "SprayTimeline":
+        """Start issuing the steps; the offsets count from ``reference_time`` (default: now)."""
+        self.reference_time = time.perf_counter() if reference_time is None else reference_time
+        self._thread = threading.Thread(target=self._run, name=f"spray-timeline-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self, wait: bool = True):
+        """Issue no further steps; with ``wait``, also wait for the running step to return."""
+        self._cancelled.set()
+        with self._condition:
+            self._condition.notify_all()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def wait_released(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the timeline reaches its release offset.
+
+        Returns:
+            bool: True once the release offset is reached with every step up to it returned,
+            False if one of them failed, the timeline was cancelled first, or on timeout.
+        """
+        if self.release_offset is None:
+            return self.wait(timeout)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        steps_before_release = sum(1 for step in self.steps if step.offset <= self.release_offset)
+        release_time = self.reference_time + self.release_offset
+        with self._condition:
+            while self.error is None and not self.cancelled:
+                now = time.perf_counter()
+                all_issued = len(self.issued) >= steps_before_release
+                if all_issued and now >= release_time:
+                    return True
+                if deadline is not None and now >= deadline:
+                    return False
+                # Until the release time once the steps returned, otherwise until the next one does
+                wake_time = release_time if all_issued else deadline
+                if deadline is not None:
+                    wake_time = min(wake_time, deadline)
+                self._condition.wait(None if wake_time is None else wake_time - now)
+            return False
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every step has run; True if none failed and the timeline was not cancelled."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self._done and self.error is None and not self.cancelled
+
+    def _run(self):
+        try:
+            for step in self.steps:
+                delay = self.reference_time + step.offset - time.perf_counter()
+                if self._cancelled.wait(max(delay, 0.0)):
+                    return
+                step.action()
+                with self._condition:
+                    self.issued.append((step.name, time.perf_counter() - self.reference_time))
+                    self._condition.notify_all()
+        except Exception as e:
+            with self._condition:
+                self.error = e
+                self._condition.notify_all()
+            if self.rollback is not None:
+                try:
+                    self.rollback()
+                except Exception as rollback_error:
+                    print(f"SprayTimeline {self.name}: rollback failed: {rollback_error}")
+            if self.on_failure is not None:
+                self.on_failure(self, e)
+            return
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+        if self.on_complete is not None:
+            self.on_complete(self)
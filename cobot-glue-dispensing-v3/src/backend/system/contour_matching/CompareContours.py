@@ -1,4 +1,5 @@
 import copy
+import threading
 from pathlib import Path
 from typing import Any, Tuple
 
@@ -9,11 +10,16 @@ from backend.system.contour_matching.matching.strategies.geometric_matching_stra
     GeometricMatchingStrategy
 from backend.system.contour_matching.matching.strategies.matching_strategy_interface import MatchingStrategy
 from backend.system.contour_matching.matching.strategies.ml_matching_strategy import MLMatchingStrategy
-from modules.shapeMatchinModelTraining.modelManager import load_latest_model
 
 from modules.shared.core.ContourStandartized import Contour
 from backend.system.contour_matching.alignment.contour_aligner import _alignContours
 from backend.system.contour_matching.matching_config import *
+from modules.shared.utils import metrics
+
+_MATCHING_TIME = metrics.histogram("matching.match")
+_ALIGNMENT_TIME = metrics.histogram("matching.alignment")
+_MATCHED = metrics.counter("matching.matched")
+_UNMATCHED = metrics.counter("matching.unmatched")
 
 
 def get_contour_objects(entries):
@@ -26,22 +32,38 @@ def get_contour_objects(entries):
     return objects
 
 
+_model_lock = threading.Lock()
+_cached_model = None
+
+
 def load_model_with_fallback() -> Any:
     """
     Load the most recent trained ML model with a safe fallback mechanism.
+
+    The model is loaded once and reused; joblib and sklearn are only imported here,
+    so the geometric strategy never pays for them. Startup calls this on a worker
+    thread so the first match does not wait for the load.
     """
-    model_dir = (
-        Path(__file__).resolve().parent
-        / "contourMatching"
-        / "shapeMatchinModelTraining"
-        / "saved_models"
-    )
+    global _cached_model
+    with _model_lock:
+        if _cached_model is not None:
+            return _cached_model
+
+        from modules.shapeMatchinModelTraining.modelManager import load_latest_model
+
+        model_dir = (
+            Path(__file__).resolve().parent
+            / "contourMatching"
+            / "shapeMatchinModelTraining"
+            / "saved_models"
+        )
 
-    if not model_dir.exists():
-        print(f"⚠️ Model directory not found at {model_dir}. Trying fallback path.")
-        model_dir = Path.cwd() / "system" / "contourMatching" / "shapeMatchinModelTraining" / "saved_models"
+        if not model_dir.exists():
+            print(f"⚠️ Model directory not found at {model_dir}. Trying fallback path.")
+            model_dir = Path.cwd() / "system" / "contourMatching" / "shapeMatchinModelTraining" / "saved_models"
 
-    return load_latest_model(save_dir=str(model_dir))
+        _cached_model = load_latest_model(save_dir=str(model_dir))
+        return _cached_model
 
 def prepare_data_for_alignment(matched: list[MatchInfo]):
     """
@@ -93,13 +115,17 @@ def findMatchingWorkpieces(workpieces, newContours):
         # Geometric-based
         strategy = GeometricMatchingStrategy(similarity_threshold=0.8)
 
-    matched, noMatches, newContoursWithMatches = match_workpieces(workpieces, newContours, strategy)
+    with _MATCHING_TIME.time():
+        matched, noMatches, newContoursWithMatches = match_workpieces(workpieces, newContours, strategy)
+    _MATCHED.inc(len(matched))
+    _UNMATCHED.inc(len(noMatches))
 
-    # --- PREPARE FOR ALIGNMENT ---
-    new_matched = prepare_data_for_alignment(matched)
+    with _ALIGNMENT_TIME.time():
+        # --- PREPARE FOR ALIGNMENT ---
+        new_matched = prepare_data_for_alignment(matched)
 
-    # --- ALIGN ---
-    finalMatches = _alignContours(new_matched, debug=DEBUG_ALIGN_CONTOURS)
+        # --- ALIGN ---
+        finalMatches = _alignContours(new_matched, debug=DEBUG_ALIGN_CONTOURS)
 
     return finalMatches, noMatches, newContoursWithMatches
 
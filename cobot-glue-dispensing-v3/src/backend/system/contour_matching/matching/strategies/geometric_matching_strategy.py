@@ -37,7 +37,7 @@ class GeometricMatchingStrategy:
 
         return best
 
-    def _getSimilarity(self,contour1, contour2, debug=True):
+    def _getSimilarity(self,contour1, contour2, debug=False):
         """
         Simplified contour similarity test using only area difference.
         Returns a percentage similarity score based on area ratio.
@@ -3,7 +3,6 @@ from typing import Any
 from backend.system.contour_matching.alignment.difference_calculator import _calculateDifferences
 from backend.system.contour_matching.matching.best_match_result import BestMatchResult
 from backend.system.contour_matching.matching_config import DEBUG_CALCULATE_DIFFERENCES
-from modules.shapeMatchinModelTraining.modelManager import predict_similarity
 from modules.shared.core.ContourStandartized import Contour
 
 
@@ -14,7 +13,8 @@ class MLMatchingStrategy:
     def find_best_match(
         self, workpieces: list[Any], contour: Contour
     ) -> BestMatchResult:
-
+        # modelManager pulls in joblib and sklearn; the geometric strategy never needs them
+        from modules.shapeMatchinModelTraining.modelManager import predict_similarity
 
         best = BestMatchResult(workpiece=None, confidence=0.0, result="DIFFERENT")
 
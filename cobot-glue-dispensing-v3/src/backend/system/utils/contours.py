@@ -1,3 +1,5 @@
+import threading
+
 import cv2
 import numpy as np
 
@@ -39,37 +41,138 @@ def standardize_point(point, dtype=np.float32):
     return point.reshape(-1, 2)
 
 
-def is_contour_inside_polygon(contour, top_left, top_right, bottom_right, bottom_left):
+# Polygon masks are cached by their vertices, so one is rasterized per area definition
+_MASK_CACHE_SIZE = 8
+_mask_cache = {}
+_mask_cache_lock = threading.Lock()
+
+OUTSIDE, BORDER, INSIDE = 0, 1, 2
+
+
+class PolygonMask:
+    """
+    Rasterized polygon for testing many points at once.
+
+    Every pixel of the polygon's bounding box is labelled INSIDE, OUTSIDE or BORDER.
+    BORDER is a band a few pixels wide around the edges, where the pixel a point falls in
+    says little about the side of the edge the point is on. Points are classified by
+    indexing the mask with their rounded coordinates. In exact mode only the points in
+    the band are then tested against the polygon with cv2.pointPolygonTest, so the
+    result is the same as testing every point, with points on the edge counting as inside.
+
+    Attributes:
+        polygon (np.ndarray): (N, 2) float32 polygon vertices.
+        origin (np.ndarray): Image coordinates of mask pixel (0, 0).
+        labels (np.ndarray): uint8 mask of OUTSIDE / BORDER / INSIDE labels.
     """
-    Fixed version using a different approach - checking if contour bounding rect is inside polygon
+
+    BORDER_WIDTH = 5  # pixels; keeps rounded points of the band away from rasterization error
+
+    def __init__(self, polygon):
+        self.polygon = standardize_contour(polygon)
+        if len(self.polygon) < 3:
+            raise ValueError("A polygon needs at least three points")
+        pad = self.BORDER_WIDTH
+        self.origin = np.floor(self.polygon.min(axis=0)).astype(np.int64) - pad
+        size = np.ceil(self.polygon.max(axis=0)).astype(np.int64) - self.origin + pad + 1
+
+        # Sub-pixel vertices (4 fractional bits) so the fill matches the float polygon
+        shift = 4
+        vertices = np.round((self.polygon - self.origin) * (1 << shift)).astype(np.int32)
+        labels = np.zeros((int(size[1]), int(size[0])), dtype=np.uint8)
+        cv2.fillPoly(labels, [vertices], INSIDE, shift=shift)
+        cv2.polylines(labels, [vertices], True, BORDER, thickness=self.BORDER_WIDTH, shift=shift)
+        self.labels = labels
+
+    def classify(self, points):
+        """Label points as INSIDE, OUTSIDE or BORDER; BORDER still needs an exact test."""
+        points = standardize_contour(points)
+        cells = np.rint(points).astype(np.int64) - self.origin
+        height, width = self.labels.shape
+        in_box = (cells[:, 0] >= 0) & (cells[:, 0] < width) & (cells[:, 1] >= 0) & (cells[:, 1] < height)
+        labels = np.full(len(points), OUTSIDE, dtype=np.uint8)
+        labels[in_box] = self.labels[cells[in_box, 1], cells[in_box, 0]]
+        return labels
+
+    def contains(self, points, exact=True):
+        """
+        Test which points lie inside the polygon.
+
+        Args:
+            points: Points as (N, 2), (N, 1, 2) or a list of (x, y).
+            exact (bool): Resolve points in the border band against the polygon itself.
+                Without it they count as inside, which errs by at most BORDER_WIDTH / 2
+                pixels in favour of the point.
+
+        Returns:
+            np.ndarray: Boolean array, True for points inside or on the polygon.
+        """
+        points = standardize_contour(points)
+        labels = self.classify(points)
+        inside = labels == INSIDE
+        border = np.flatnonzero(labels == BORDER)
+        if not exact:
+            inside[border] = True
+            return inside
+        for i in border:
+            inside[i] = cv2.pointPolygonTest(self.polygon, (float(points[i, 0]), float(points[i, 1])), False) >= 0
+        return inside
+
+    def contains_all(self, points, exact=True):
+        """True when every point lies inside or on the polygon."""
+        points = standardize_contour(points)
+        labels = self.classify(points)
+        if (labels == OUTSIDE).any():
+            return False
+        border = np.flatnonzero(labels == BORDER)
+        if not exact:
+            return True
+        return all(cv2.pointPolygonTest(self.polygon, (float(points[i, 0]), float(points[i, 1])), False) >= 0
+                   for i in border)
+
+
+def get_polygon_mask(polygon):
+    """
+    Cached PolygonMask for a polygon.
+
+    The cache key is the vertex data, so a mask is only rasterized again when the area
+    points change (e.g. after the pickup or spray area is saved).
+    """
+    polygon = standardize_contour(polygon)
+    key = polygon.tobytes()
+    with _mask_cache_lock:
+        mask = _mask_cache.get(key)
+        if mask is not None:
+            return mask
+    mask = PolygonMask(polygon)
+    with _mask_cache_lock:
+        if len(_mask_cache) >= _MASK_CACHE_SIZE:
+            _mask_cache.pop(next(iter(_mask_cache)))
+        _mask_cache[key] = mask
+    return mask
+
+
+def is_contour_inside_polygon(contour, top_left, top_right, bottom_right, bottom_left, exact=True):
+    """
+    Check that a contour and the corners of its bounding rect all lie inside the polygon.
+
+    The points are tested together against a cached mask of the polygon, see PolygonMask.
     """
     # Get the bounding rectangle of the contour
     x, y, w, h = cv2.boundingRect(contour)
 
-    # Check if all 4 corners of the contour's bounding rect are inside the polygon
-    bbox_points = [top_left, top_right, bottom_right, bottom_left]
-    polygon = np.array(bbox_points, dtype=np.int32)
+    polygon = np.array([top_left, top_right, bottom_right, bottom_left], dtype=np.int32)
 
-    contour_corners = [
+    contour_corners = np.array([
         (x, y),  # top-left
         (x + w, y),  # top-right
         (x + w, y + h),  # bottom-right
         (x, y + h)  # bottom-left
-    ]
-
-    # Check if all corners of contour bounding rect are inside the polygon
-
-    for corner in contour_corners:
-        if cv2.pointPolygonTest(polygon, (float(corner[0]), float(corner[1])), False) < 0:
-            return False
-
-    # Additional check: verify all actual contour points are inside
-    for point in contour:
-        px, py = point[0]
-        if cv2.pointPolygonTest(polygon, (float(px), float(py)), False) < 0:
-            return False
+    ], dtype=np.float32)
 
-    return True
+    # Corners of the contour bounding rect and all actual contour points in one test
+    points = np.vstack([contour_corners, standardize_contour(contour)])
+    return get_polygon_mask(polygon).contains_all(points, exact=exact)
 
 def flatten_and_convert_to_list(contour_array):
     """Ensure contour array is Nx2 list of floats."""
@@ -18,6 +18,8 @@ import numpy as np
 from ezdxf import bbox
 from ezdxf.addons.drawing import matplotlib
 
+from .DxfVectorConverter import DxfVectorConverter
+
 
 class ServerSender:
     """
@@ -96,6 +98,8 @@ class DxfConverter:
         target_size_mm (tuple): Target size in millimeters.
         target_size_px (tuple): Target size in pixels.
         mode (str): Operation mode ('png' or 'json').
+        vector (bool): In 'json' mode, build contours directly from the DXF entities instead of the raster.
+        tolerance (float): Chord error in millimetres used by the vector path.
         resized_cropped (numpy.ndarray): Processed, resized, and cropped image.
         scaleX (float): Scaling factor along the X axis.
         scaleY (float): Scaling factor along the Y axis.
@@ -103,7 +107,7 @@ class DxfConverter:
     """
 
     def __init__(self, dxf_file, dpi=146, target_size_mm=(748, 498), target_size_px=(1280, 720),
-                 mode='png'):
+                 mode='png', vector=True, tolerance=0.05):
         """
         Initializes the ImageProcessor with necessary configurations and loads the DXF file.
 
@@ -113,6 +117,8 @@ class DxfConverter:
             target_size_mm (tuple): Target dimensions in millimeters.
             target_size_px (tuple): Target dimensions in pixels.
             mode (str): Processing mode ('png' or 'json').
+            vector (bool): Use the vector conversion path for 'json' mode.
+            tolerance (float): Chord error in millimetres for the vector conversion path.
         """
 
         self.dxf_file = dxf_file
@@ -121,6 +127,8 @@ class DxfConverter:
         self.target_size_mm = target_size_mm
         self.target_size_px = target_size_px
         self.mode = mode
+        self.vector = vector
+        self.tolerance = tolerance
         self.resized_cropped = None
         self.scaleX = None
         self.scaleY = None
@@ -281,6 +289,26 @@ class DxfConverter:
         self.contours_to_json_file(formatted_contours, 'contours.json')
         return 'contours.json', formatted_contours
 
+    def handle_contours_vector(self):
+        """
+        Builds contours directly from the DXF entities, maps them into the same pixel frame as
+        the raster path and writes them to a JSON file.
+
+        Returns:
+            str: Name of the output JSON file with contour data.
+        """
+        if not self.first_bbox:
+            raise Exception("DXF file processing failed.")
+
+        center = ((self.first_bbox.extmin.x + self.first_bbox.extmax.x) / 2,
+                  (self.first_bbox.extmin.y + self.first_bbox.extmax.y) / 2)
+        converter = DxfVectorConverter(doc=self.doc, tolerance=self.tolerance)
+        contours = converter.to_image_contours(self.target_size_mm, self.target_size_px, center=center)
+
+        formatted_contours = [contour.tolist() for contour in contours]
+        self.contours_to_json_file(formatted_contours, 'contours.json')
+        return 'contours.json', formatted_contours
+
     def handle_png(self):
         """
         Resizes the processed image based on scale factors and returns it.
@@ -308,6 +336,9 @@ class DxfConverter:
             Exception: If DXF processing fails.
             ValueError: If mode is invalid.
         """
+        if self.mode == 'json' and self.vector:
+            return self.handle_contours_vector()
+
         img = self.process_dxf()
         if img is None:
             raise Exception("DXF file processing failed.")
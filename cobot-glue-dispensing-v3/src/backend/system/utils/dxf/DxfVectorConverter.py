@@ -0,0 +1,299 @@
+"""
+Direct vector DXF-to-contour conversion.
+
+Builds closed contours straight from the DXF entities instead of rendering the drawing
+to a PNG and tracing the raster (see DxfConverter). Curves are flattened by chord error,
+open pieces are chained end to end within a tolerance and nested contours are classified
+as outer boundaries or holes.
+"""
+
+import math
+from dataclasses import dataclass
+
+import ezdxf
+import numpy as np
+from ezdxf import bbox
+
+from modules.shared.core.dxf.curve_sampling import arc_points, bulge_polyline_points
+
+SUPPORTED_ENTITIES = {"LINE", "LWPOLYLINE", "POLYLINE", "ARC", "CIRCLE", "ELLIPSE", "SPLINE"}
+
+
+@dataclass
+class VectorContour:
+    """A flattened DXF contour in drawing units (y axis up)."""
+    points: np.ndarray  # (N, 2) float64, closing vertex not repeated
+    closed: bool
+    is_hole: bool = False
+    layer: str = "0"
+
+    def area(self):
+        """Signed shoelace area (positive for counter-clockwise contours)."""
+        x, y = self.points[:, 0], self.points[:, 1]
+        return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def _entity_points(entity, tolerance):
+    """Return ((N, 2) points, closed) for one supported entity, or None."""
+    dxftype = entity.dxftype()
+    if dxftype == "LINE":
+        start, end = entity.dxf.start, entity.dxf.end
+        return np.array([(start.x, start.y), (end.x, end.y)]), False
+
+    if dxftype == "LWPOLYLINE":
+        return bulge_polyline_points(entity.get_points("xyb"), entity.closed, tolerance), entity.closed
+
+    if dxftype == "POLYLINE":
+        if not (entity.is_2d_polyline or entity.is_3d_polyline):
+            return None
+        vertices = [(v.dxf.location.x, v.dxf.location.y, v.dxf.get("bulge", 0)) for v in entity.vertices]
+        return bulge_polyline_points(vertices, entity.is_closed, tolerance), entity.is_closed
+
+    if dxftype == "CIRCLE":
+        center = entity.dxf.center
+        points = arc_points((center.x, center.y), entity.dxf.radius, 0.0, 2 * math.pi, tolerance)
+        return points, True
+
+    if dxftype == "ARC":
+        center = entity.dxf.center
+        start = math.radians(entity.dxf.start_angle)
+        sweep = math.radians(entity.dxf.end_angle - entity.dxf.start_angle) % (2 * math.pi) or 2 * math.pi
+        return arc_points((center.x, center.y), entity.dxf.radius, start, sweep, tolerance), False
+
+    if dxftype in ("ELLIPSE", "SPLINE"):
+        # Exact curve evaluation with adaptive subdivision by chord distance
+        points = np.array([(v.x, v.y) for v in entity.construction_tool().flattening(tolerance)])
+        return points, False
+
+    return None
+
+
+def entity_to_polylines(entity, tolerance):
+    """
+    Flatten one DXF entity into polylines whose chord error is at most ``tolerance``.
+
+    Returns:
+        list[tuple[np.ndarray, bool]]: (points (N, 2), closed) per polyline.
+    """
+    if entity.dxftype() == "INSERT":
+        result = []
+        for virtual in entity.virtual_entities():
+            result.extend(entity_to_polylines(virtual, tolerance))
+        return result
+
+    if entity.dxftype() not in SUPPORTED_ENTITIES:
+        return []
+
+    flattened = _entity_points(entity, tolerance)
+    if flattened is None:
+        return []
+    points, closed = flattened
+    if len(points) < 2:
+        return []
+
+    # Drop consecutive duplicates produced by zero-length segments
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(np.abs(np.diff(points, axis=0)) > 1e-12, axis=1)
+    points = points[keep]
+    if len(points) > 2 and np.hypot(*(points[0] - points[-1])) <= tolerance:
+        closed = True
+        points = points[:-1]
+    return [(points, closed and len(points) > 2)]
+
+
+def chain_polylines(polylines, tolerance):
+    """
+    Join open polylines whose end points coincide within ``tolerance``.
+
+    End points are bucketed in a grid of ``tolerance``-sized cells, so chaining is close to
+    linear in the number of pieces. Pieces are reversed as needed; a chain whose ends meet
+    is closed.
+
+    Args:
+        polylines (list[tuple[np.ndarray, bool]]): (points, closed) pairs.
+        tolerance (float): Maximum gap between joined end points.
+
+    Returns:
+        list[tuple[np.ndarray, bool]]: Closed inputs unchanged plus the chained open pieces.
+    """
+    result = [(pts, True) for pts, closed in polylines if closed]
+    pieces = [pts for pts, closed in polylines if not closed]
+    if not pieces:
+        return result
+
+    cell = max(tolerance, 1e-9)
+    grid = {}
+
+    def key(pt):
+        return math.floor(pt[0] / cell), math.floor(pt[1] / cell)
+
+    for i, pts in enumerate(pieces):
+        for end in (0, -1):
+            grid.setdefault(key(pts[end]), []).append((i, end))
+
+    used = [False] * len(pieces)
+
+    def take_match(pt):
+        kx, ky = key(pt)
+        best = None
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for i, end in grid.get((kx + dx, ky + dy), ()):
+                    if used[i]:
+                        continue
+                    dist = math.hypot(pieces[i][end][0] - pt[0], pieces[i][end][1] - pt[1])
+                    if dist <= tolerance and (best is None or dist < best[0]):
+                        best = (dist, i, end)
+        if best is None:
+            return None
+        used[best[1]] = True
+        return best[1], best[2]
+
+    for seed in range(len(pieces)):
+        if used[seed]:
+            continue
+        used[seed] = True
+        chain = [pieces[seed]]
+
+        # Grow forward from the tail, then backward from the head
+        tail = pieces[seed][-1]
+        head = pieces[seed][0]
+        while np.hypot(*(tail - head)) > tolerance:
+            match = take_match(tail)
+            if match is None:
+                break
+            i, end = match
+            nxt = pieces[i] if end == 0 else pieces[i][::-1]
+            chain.append(nxt[1:])
+            tail = nxt[-1]
+
+        points = np.concatenate(chain)
+        if np.hypot(*(points[-1] - points[0])) > tolerance:
+            front = []
+            while True:
+                match = take_match(head)
+                if match is None:
+                    break
+                i, end = match
+                prv = pieces[i] if end == -1 else pieces[i][::-1]
+                front.insert(0, prv[:-1])
+                head = prv[0]
+                if np.hypot(*(head - points[-1])) <= tolerance:
+                    break
+            if front:
+                points = np.concatenate(front + [points])
+
+        closed = len(points) > 2 and np.hypot(*(points[-1] - points[0])) <= tolerance
+        if closed:
+            points = points[:-1]
+        result.append((points, closed))
+    return result
+
+
+def _point_in_polygon(pt, polygon):
+    """Even-odd ray casting test of one point against an (N, 2) polygon."""
+    x, y = pt
+    xi, yi = polygon[:, 0], polygon[:, 1]
+    xj, yj = np.roll(xi, 1), np.roll(yi, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crosses = ((yi > y) != (yj > y)) & (x < (xj - xi) * (y - yi) / (yj - yi) + xi)
+    return np.count_nonzero(crosses) % 2 == 1
+
+
+def classify_holes(contours):
+    """
+    Mark closed contours nested an odd number of times as holes and orient them.
+
+    Outer boundaries end up counter-clockwise and holes clockwise (in DXF y-up
+    coordinates). Open contours are left untouched.
+    """
+    closed = [c for c in contours if c.closed and len(c.points) >= 3]
+    areas = [abs(c.area()) for c in closed]
+    order = np.argsort(areas)[::-1]
+    boxes = [(c.points.min(axis=0), c.points.max(axis=0)) for c in closed]
+
+    for rank, idx in enumerate(order):
+        contour = closed[idx]
+        lo, hi = boxes[idx]
+        depth = 0
+        for outer_idx in order[:rank]:
+            outer_lo, outer_hi = boxes[outer_idx]
+            if np.any(lo < outer_lo) or np.any(hi > outer_hi):
+                continue
+            if _point_in_polygon(contour.points[0], closed[outer_idx].points):
+                depth += 1
+        contour.is_hole = depth % 2 == 1
+        counter_clockwise = contour.area() > 0
+        if counter_clockwise == contour.is_hole:
+            contour.points = contour.points[::-1].copy()
+    return contours
+
+
+class DxfVectorConverter:
+    """
+    Converts DXF geometry to closed contours without a raster round trip.
+
+    Attributes:
+        tolerance (float): Maximum chord error (drawing units, mm) when flattening curves.
+        chain_tolerance (float): Maximum gap when joining open pieces end to end.
+        layers (set or None): Layers to convert; None converts every layer.
+    """
+
+    def __init__(self, dxf_file=None, tolerance=0.05, chain_tolerance=None, layers=None, doc=None):
+        """
+        Args:
+            dxf_file (str): Path to the DXF file. Ignored when ``doc`` is given.
+            tolerance (float): Chord error tolerance in drawing units.
+            chain_tolerance (float): Gap tolerance for chaining, defaults to 10 * tolerance.
+            layers (iterable): Optional layer names to convert.
+            doc (ezdxf.document.Drawing): Already loaded document.
+        """
+        self.doc = doc if doc is not None else ezdxf.readfile(dxf_file)
+        self.msp = self.doc.modelspace()
+        self.tolerance = tolerance
+        self.chain_tolerance = chain_tolerance if chain_tolerance is not None else tolerance * 10
+        self.layers = set(layers) if layers is not None else None
+
+    def convert(self):
+        """
+        Returns:
+            list[VectorContour]: Contours grouped per layer, holes classified per layer.
+        """
+        by_layer = {}
+        for entity in self.msp:
+            layer = entity.dxf.layer
+            if self.layers is not None and layer not in self.layers:
+                continue
+            by_layer.setdefault(layer, []).extend(entity_to_polylines(entity, self.tolerance))
+
+        contours = []
+        for layer, polylines in by_layer.items():
+            layer_contours = [VectorContour(points=pts, closed=closed, layer=layer)
+                              for pts, closed in chain_polylines(polylines, self.chain_tolerance)]
+            contours.extend(classify_holes(layer_contours))
+        return contours
+
+    def to_image_contours(self, target_size_mm=(748, 498), target_size_px=(1280, 720), center=None,
+                          closed_only=True):
+        """
+        Map the contours into the pixel frame produced by DxfConverter: a ``target_size_mm``
+        window centred on the drawing extents, scaled to ``target_size_px`` with y pointing down.
+
+        Returns:
+            list[np.ndarray]: OpenCV-style float32 contours (N, 1, 2).
+        """
+        if center is None:
+            extents = bbox.extents(self.msp)
+            center = ((extents.extmin.x + extents.extmax.x) / 2, (extents.extmin.y + extents.extmax.y) / 2)
+
+        scale = np.array([target_size_px[0] / target_size_mm[0], target_size_px[1] / target_size_mm[1]])
+        origin = np.array([center[0] - target_size_mm[0] / 2, center[1] + target_size_mm[1] / 2])
+
+        result = []
+        for contour in self.convert():
+            if closed_only and not contour.closed:
+                continue
+            px = (contour.points - origin) * scale
+            px[:, 1] = -px[:, 1]
+            result.append(px.astype(np.float32).reshape(-1, 1, 2))
+        return result
@@ -0,0 +1,355 @@
+"""
+Ordering of glue paths (or detected contours) to shorten robot travel between them.
+
+Every path has an entry point and an exit point: its first and last points, or its
+centroid for both when it is treated as a point. A path whose entry and exit coincide
+(a closed contour) is symmetric; any other path may be driven backwards when reversal
+is allowed, which swaps its entry and exit.
+
+The order is built in two steps:
+
+1. Greedy nearest neighbour from the start point. The candidate entry points are kept
+   in a KD-tree whose nodes count their remaining points, so each step is a tree
+   query instead of a scan over all remaining paths, and visited paths are removed
+   by decrementing the counts.
+2. Local search within a time budget. A 2-opt move reverses a run of paths, which
+   also flips each path in it. A relocate move moves one path elsewhere, flipped if
+   that is shorter. Travel is measured between the exit of each path and the entry of
+   the next, from the start point, without a return leg. Distances come from a
+   matrix computed once, so a move is evaluated in constant time, and moves only
+   connect a path to one of its nearest neighbours.
+"""
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import cv2
+import numpy as np
+
+DEFAULT_TIME_BUDGET_S = 0.1
+_NEIGHBOURS = 8
+
+
+@dataclass
+class PathSequence:
+    """Result of sequencing.
+
+    Attributes:
+        order (list[int]): Path indices in travel order.
+        reversed (list[bool]): For each entry of ``order``, whether the path is driven
+            from its end point to its start point.
+        travel_distance (float): Travel between paths after the local search.
+        greedy_distance (float): Travel of the nearest-neighbour order.
+        sequencing_time (float): Seconds spent in ``sequence_paths``.
+        improvements (int): Local search moves applied.
+        timed_out (bool): Whether the time budget ran out before the local search
+            converged.
+    """
+    order: list = field(default_factory=list)
+    reversed: list = field(default_factory=list)
+    travel_distance: float = 0.0
+    greedy_distance: float = 0.0
+    sequencing_time: float = 0.0
+    improvements: int = 0
+    timed_out: bool = False
+
+
+class _KDTree:
+    """
+    Static 2-D KD-tree with point removal.
+
+    Every node keeps the number of points still present in its subtree; empty
+    subtrees are skipped by the search, so removal is a walk up to the root.
+    """
+
+    def __init__(self, points, ids):
+        self._points = []   # node -> (x, y)
+        self._ids = []      # node -> caller id
+        self._axis = []
+        self._left = []
+        self._right = []
+        self._parent = []
+        self._count = []
+        self._present = []
+        self._node_of = {}
+        items = [(float(x), float(y), point_id) for (x, y), point_id in zip(points, ids)]
+        self._root = self._build(items, 0, -1)
+
+    def _build(self, items, depth, parent):
+        if not items:
+            return -1
+        axis = depth % 2
+        items.sort(key=lambda item: item[axis])
+        median = len(items) // 2
+        x, y, point_id = items[median]
+        node = len(self._points)
+        self._points.append((x, y))
+        self._ids.append(point_id)
+        self._axis.append(axis)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._parent.append(parent)
+        self._count.append(len(items))
+        self._present.append(True)
+        self._node_of[point_id] = node
+        self._left[node] = self._build(items[:median], depth + 1, node)
+        self._right[node] = self._build(items[median + 1:], depth + 1, node)
+        return node
+
+    def __len__(self):
+        return self._count[self._root] if self._root >= 0 else 0
+
+    def remove(self, point_id):
+        node = self._node_of.pop(point_id, None)
+        if node is None:
+            return
+        self._present[node] = False
+        while node >= 0:
+            self._count[node] -= 1
+            node = self._parent[node]
+
+    def nearest(self, x, y):
+        """Id of the nearest remaining point, or None when the tree is empty."""
+        best_id, best_dist = None, math.inf
+        # (node, squared distance from the query to the node's side of the split)
+        stack = [(self._root, 0.0)] if self._root >= 0 else []
+        while stack:
+            node, bound = stack.pop()
+            if node < 0 or self._count[node] == 0 or bound >= best_dist:
+                continue
+            px, py = self._points[node]
+            if self._present[node]:
+                dist = (px - x) ** 2 + (py - y) ** 2
+                if dist < best_dist:
+                    best_id, best_dist = self._ids[node], dist
+            diff = (x - px) if self._axis[node] == 0 else (y - py)
+            near, far = (self._left[node], self._right[node]) if diff < 0 else (self._right[node], self._left[node])
+            # The near side is pushed last so it is searched first
+            stack.append((far, diff * diff))
+            stack.append((near, bound))
+        return best_id
+
+
+def _travel(order, reversed_flags, dist, depot):
+    previous_exit = depot
+    total = 0.0
+    for path, flipped in zip(order, reversed_flags):
+        total += dist[previous_exit][2 * path + flipped]
+        previous_exit = 2 * path + 1 - flipped
+    return total
+
+
+def sequence_paths(starts, ends=None, start_point=(0.0, 0.0), allow_reverse=True,
+                   time_budget=DEFAULT_TIME_BUDGET_S):
+    """
+    Order paths to minimize the travel between them.
+
+    Args:
+        starts: (N, 2) first point of every path.
+        ends: (N, 2) last point of every path; None when each path is a single point
+            (e.g. a contour represented by its centroid).
+        start_point: Where the robot is before the first path.
+        allow_reverse (bool): Whether paths may be driven from end to start.
+        time_budget (float): Seconds for the local search; 0 keeps the greedy order.
+
+    Returns:
+        PathSequence: The order, orientations and travel distances.
+    """
+    started = time.perf_counter()
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+    ends = starts if ends is None else np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+    n = len(starts)
+    if n == 0:
+        return PathSequence(sequencing_time=time.perf_counter() - started)
+
+    # Point 2k is the start of path k, 2k + 1 its end; 2n is the start point
+    points = np.empty((2 * n + 1, 2))
+    points[0:2 * n:2] = starts
+    points[1:2 * n:2] = ends
+    points[2 * n] = start_point
+    distances = np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+    dist = distances.tolist()
+    depot = 2 * n
+    symmetric = np.all(starts == ends, axis=1).tolist()
+    can_flip = [allow_reverse and not symmetric[k] for k in range(n)]
+
+    # --- Greedy nearest neighbour on the KD-tree of entry points ---
+    entry_ids = [2 * k for k in range(n)] + [2 * k + 1 for k in range(n) if can_flip[k]]
+    tree = _KDTree(points[entry_ids], entry_ids)
+    order, flipped = [], [0] * n
+    coordinates = points.tolist()
+    x, y = coordinates[depot]
+    while len(tree):
+        point_id = tree.nearest(x, y)
+        path = point_id // 2
+        flipped[path] = point_id % 2
+        order.append(path)
+        tree.remove(2 * path)
+        tree.remove(2 * path + 1)
+        x, y = coordinates[2 * path + 1 - flipped[path]]
+    greedy_distance = _travel(order, [flipped[k] for k in order], dist, depot)
+
+    # --- Local search: 2-opt and relocate within the neighbour lists, until converged or out of time ---
+    # Candidate moves only create edges to one of the _NEIGHBOURS paths nearest to a point,
+    # so a pass over all positions costs O(N * _NEIGHBOURS) instead of O(N^2)
+    search = time_budget > 0 and n > 1
+    ranked = np.argsort(distances, axis=1)[:, :2 * _NEIGHBOURS + 3] // 2 if search else np.zeros((0, 0), int)
+    near_paths = []
+    for point_id, row in enumerate(ranked.tolist()):
+        paths = []
+        for path in row:
+            if path != point_id // 2 and path < n and path not in paths:
+                paths.append(path)
+        near_paths.append(paths[:_NEIGHBOURS])
+
+    def entry(k):
+        return 2 * k + flipped[k]
+
+    def exit_(k):
+        return depot if k < 0 else 2 * k + 1 - flipped[k]
+
+    def gap(u, v):
+        return dist[exit_(u)][entry(v)] if v is not None else 0.0
+
+    seq = [-1] + order  # -1 is the start point
+    pos = [0] * n
+    blocked = [0] * (n + 2)  # blocked[i]: paths in seq[1:i] that cannot be driven backwards
+
+    def reindex():
+        for index in range(1, n + 1):
+            k = seq[index]
+            pos[k] = index
+            blocked[index + 1] = blocked[index] + (not (can_flip[k] or symmetric[k]))
+
+    def reverse(i, j):
+        """Reverse seq[i..j] if that shortens the travel; every path in it is flipped."""
+        if not 1 <= i <= j <= n or blocked[j + 1] - blocked[i]:
+            return None
+        p, a, b = seq[i - 1], seq[i], seq[j]
+        q = seq[j + 1] if j < n else None
+        old = gap(p, a) + gap(b, q)
+        new = dist[exit_(p)][exit_(b)] + (dist[entry(a)][entry(q)] if q is not None else 0.0)
+        if new >= old - 1e-9:
+            return None
+        seq[i:j + 1] = seq[i:j + 1][::-1]
+        for k in seq[i:j + 1]:
+            if can_flip[k]:
+                flipped[k] ^= 1
+        return [p, a, b, q]
+
+    def two_opt(i):
+        # New edge from the exit before position i to a path near it (the run i..j starts at i),
+        # or from a path near the entry at position i into it (the run ends at i - 1)
+        p, q = seq[i - 1], seq[i]
+        for b in near_paths[exit_(p)] + [seq[n]]:
+            touched = reverse(i, pos[b])
+            if touched:
+                return touched
+        for a in near_paths[entry(q)]:
+            touched = reverse(pos[a], i - 1)
+            if touched:
+                return touched
+        return None
+
+    def relocate(i):
+        """Move seq[i] next to a path near it, as is or flipped, if that shortens the travel."""
+        p, a = seq[i - 1], seq[i]
+        q = seq[i + 1] if i < n else None
+        saved = gap(p, a) + gap(a, q) - gap(p, q)
+        gaps = {0}
+        for c in near_paths[2 * a] + near_paths[2 * a + 1]:
+            gaps.add(pos[c] - 1)
+            gaps.add(pos[c])
+        for k in sorted(gaps - {i, i - 1}):
+            u, v = seq[k], (seq[k + 1] if k < n else None)
+            for flip in ((0, 1) if can_flip[a] else (0,)):
+                a_entry = 2 * a + (flipped[a] ^ flip)
+                a_exit = 2 * a + 1 - (flipped[a] ^ flip)
+                added = dist[exit_(u)][a_entry] - gap(u, v) + (dist[a_exit][entry(v)] if v is not None else 0.0)
+                if added < saved - 1e-9:
+                    del seq[i]
+                    seq.insert(k + 1 if k < i else k, a)
+                    flipped[a] ^= flip
+                    return [p, a, q, u, v]
+        return None
+
+    # Paths whose surroundings changed since they were last examined; a move queues the
+    # paths at the ends of the edges it changed
+    reindex()
+    queue = deque(seq[1:] if search else ())
+    queued = set(queue)
+    improvements = 0
+    timed_out = False
+    deadline = started + time_budget
+    while queue:
+        if time.perf_counter() > deadline:
+            timed_out = True
+            break
+        path = queue.popleft()
+        queued.discard(path)
+        touched = two_opt(pos[path]) or relocate(pos[path])
+        if touched:
+            reindex()
+            improvements += 1
+            for k in touched:
+                if k is not None and k >= 0 and k not in queued:
+                    queue.append(k)
+                    queued.add(k)
+
+    order = seq[1:]
+    reversed_flags = [flipped[k] for k in order]
+    return PathSequence(
+        order=order,
+        reversed=[bool(f) for f in reversed_flags],
+        travel_distance=_travel(order, reversed_flags, dist, depot),
+        greedy_distance=greedy_distance,
+        sequencing_time=time.perf_counter() - started,
+        improvements=improvements,
+        timed_out=timed_out,
+    )
+
+
+def contour_centroids(contours):
+    """(N, 2) centroids of OpenCV contours, from their moments (mean point for degenerate ones)."""
+    centroids = np.empty((len(contours), 2))
+    for index, contour in enumerate(contours):
+        points = np.asarray(contour, dtype=np.float32).reshape(-1, 2)
+        moments = cv2.moments(points)
+        if moments["m00"] != 0:
+            centroids[index] = (moments["m10"] / moments["m00"], moments["m01"] / moments["m00"])
+        else:
+            centroids[index] = points.mean(axis=0) if len(points) else (0.0, 0.0)
+    return centroids
+
+
+def sequence_contours(contours, start_point=(0.0, 0.0), time_budget=DEFAULT_TIME_BUDGET_S):
+    """
+    Order closed contours by their centroids to minimize travel between them.
+
+    Returns:
+        tuple: (contours in travel order, PathSequence)
+    """
+    sequence = sequence_paths(contour_centroids(contours), start_point=start_point, allow_reverse=False,
+                              time_budget=time_budget)
+    return [contours[k] for k in sequence.order], sequence
+
+
+def sequence_polylines(paths, start_point=(0.0, 0.0), allow_reverse=True, time_budget=DEFAULT_TIME_BUDGET_S):
+    """
+    Order open or closed point paths by their end points, reversing paths when allowed.
+
+    Args:
+        paths: Point sequences; only the first two coordinates of each point are used,
+            so robot poses [x, y, z, rx, ry, rz] work as they are.
+
+    Returns:
+        tuple: (paths in travel order, reversed where chosen, PathSequence)
+    """
+    starts = [(float(path[0][0]), float(path[0][1])) for path in paths]
+    ends = [(float(path[-1][0]), float(path[-1][1])) for path in paths]
+    sequence = sequence_paths(starts, ends, start_point=start_point, allow_reverse=allow_reverse,
+                              time_budget=time_budget)
+    ordered = [paths[k][::-1] if flip else paths[k] for k, flip in zip(sequence.order, sequence.reversed)]
+    return ordered, sequence
@@ -8,13 +8,14 @@ from libs.plvision.PLVision import Contouring
 import numpy as np
 
 
-def transformSinglePointToCamera(robot_point, cameraToRobotMatrix):
+def transformSinglePointToCamera(robot_point, cameraToRobotMatrix, robotToCameraMatrix=None):
     """
     Transforms a single robot point to camera coordinates using a homography.
 
     Parameters:
         robot_point: tuple or list (x, y)
         cameraToRobotMatrix: 3x3 homography matrix mapping camera -> robot
+        robotToCameraMatrix: its inverse, if already computed (e.g. DataManager.robotToCameraMatrix)
 
     Returns:
         (x_cam, y_cam): transformed camera point
@@ -24,7 +25,8 @@ def transformSinglePointToCamera(robot_point, cameraToRobotMatrix):
     y_offset = 78.335
 
     # Invert the camera-to-robot homography
-    robotToCameraMatrix = np.linalg.inv(cameraToRobotMatrix)
+    if robotToCameraMatrix is None:
+        robotToCameraMatrix = np.linalg.inv(cameraToRobotMatrix)
 
     # Convert to homogeneous coordinates
     homogeneous_point = np.array([robot_point[0], robot_point[1], 1])
@@ -32,6 +32,7 @@ REQUEST_RESOURCE_ROBOT = "Robot"                  # Robot resource group
 REQUEST_RESOURCE_CAMERA = "Camera"
 REQUEST_RESOURCE_SETTINGS = "Settings"
 REQUEST_RESOURCE_WORKPIECE = "workpieces"
+REQUEST_RESOURCE_STATS = "stats"                  # Runtime metrics and profiling
 
 
 # LOGIN = "login"
@@ -0,0 +1,19 @@
+"""
+Stats Endpoints - API v1
+
+This module contains the runtime metrics and profiling endpoints for the internal API.
+All endpoints follow the RESTful pattern: /api/v1/stats/{action}
+"""
+
+# === METRICS ===
+
+# Snapshot of all counters, gauges and timing histograms (data: optional {"prefix": "vision."})
+STATS_METRICS = "/api/v1/stats/metrics"
+
+# Zero all metrics
+STATS_METRICS_RESET = "/api/v1/stats/metrics/reset"
+
+# === PROFILING ===
+
+# Sampling profiler snapshot of the running system (data: optional {"duration": s, "interval": s})
+STATS_PROFILE = "/api/v1/stats/profile"
@@ -13,6 +13,9 @@ WORKPIECE_SAVE = "/api/v1/workpieces"
 WORKPIECE_GET_BY_ID = "/api/v1/workpieces/by-id"
 WORKPIECE_DELETE = "/api/v1/workpieces/delete"
 
+# Gallery listing: metadata and thumbnail paths only, no contours
+WORKPIECE_GET_INDEX = "/api/v1/workpieces/index"
+
 # Import operations
 WORKPIECE_SAVE_DXF = "/api/v1/workpieces/import/dxf"
 
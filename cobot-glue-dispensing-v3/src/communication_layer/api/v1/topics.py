@@ -67,6 +67,7 @@ class VisionTopics(TopicCategory):
     
     # Vision service state
     SERVICE_STATE = "vision-service/state"
+    CAMERA_HEALTH = "vision-system/camera-health"
     LATEST_IMAGE = "vision-system/latest-image"
     CALIBRATION_IMAGE_CAPTURED = "vision-system/calibration-image-captured"
     # Camera and image processing
@@ -3,6 +3,7 @@ from communication_layer.api_gateway.dispatch.camera_dispatcher import CameraDis
 from communication_layer.api_gateway.dispatch.operations_dispatcher import OperationsDispatch
 from communication_layer.api_gateway.dispatch.robot_dispatcher import RobotDispatch
 from communication_layer.api_gateway.dispatch.settings_dispatcher import SettingsDispatch
+from communication_layer.api_gateway.dispatch.stats_dispatcher import StatsDispatch
 from communication_layer.api_gateway.dispatch.workpiece_dispatcher import WorkpieceDispatch
 from communication_layer.api_gateway.interfaces.request_handler_interface import IRequestHandler
 from core.application.interfaces.robot_application_interface import RobotApplicationInterface
@@ -52,12 +53,14 @@ class RequestHandler(IRequestHandler):
         self.workpiece_dispatcher = WorkpieceDispatch(self.application, self.workpieceController)
         self.settings_dispatcher = SettingsDispatch(self.settingsController)
         self.operations_dispatcher = OperationsDispatch(self.application, application_factory)
+        self.stats_dispatcher = StatsDispatch()
 
         self.resource_dispatch = {
             Constants.REQUEST_RESOURCE_ROBOT.lower(): self.robot_dispatcher.dispatch,
             Constants.REQUEST_RESOURCE_CAMERA.lower(): self.camera_dispatcher.dispatch,
             Constants.REQUEST_RESOURCE_SETTINGS.lower(): self.settings_dispatcher.dispatch,
             Constants.REQUEST_RESOURCE_WORKPIECE.lower(): self.workpiece_dispatcher.dispatch,
+            Constants.REQUEST_RESOURCE_STATS.lower(): self.stats_dispatcher.dispatch,
         }
 
     def handleRequest(self, request, data=None):
@@ -0,0 +1,81 @@
+"""
+Stats Handler - API Gateway
+
+Handles runtime diagnostics requests: metrics snapshots and sampling profiler snapshots.
+"""
+from communication_layer.api.v1 import Constants
+from communication_layer.api.v1.Response import Response
+from communication_layer.api.v1.endpoints import stats_endpoints
+from communication_layer.api_gateway.interfaces.dispatch import IDispatcher
+from modules.shared.utils import metrics, profiler
+
+
+class StatsDispatch(IDispatcher):
+    """
+    Handles metrics and profiling operations for the API gateway.
+
+    Metrics are read from the process-wide registry in modules.shared.utils.metrics, so
+    this dispatcher needs no controller.
+    """
+
+    def dispatch(self, parts: list, request: str, data: dict = None) -> dict:
+        """
+        Route stats requests to appropriate handlers.
+
+        Args:
+            parts (list): Parsed request parts
+            request (str): Full request string
+            data: Request data
+
+        Returns:
+            dict: Response dictionary with operation result
+        """
+        if request == stats_endpoints.STATS_METRICS:
+            return self.handle_metrics(data)
+        elif request == stats_endpoints.STATS_METRICS_RESET:
+            return self.handle_metrics_reset()
+        elif request == stats_endpoints.STATS_PROFILE:
+            return self.handle_profile(data)
+        else:
+            raise ValueError(f"Unknown request: {request}")
+
+    def handle_metrics(self, data=None):
+        """
+        Handle a metrics snapshot request.
+
+        Args:
+            data (dict): Optional {"prefix": str} to return only matching metrics
+
+        Returns:
+            dict: Response with {name: metric snapshot} as data
+        """
+        prefix = data.get("prefix") if isinstance(data, dict) else None
+        return Response(Constants.RESPONSE_STATUS_SUCCESS,
+                        message="Metrics snapshot",
+                        data=metrics.snapshot(prefix)).to_dict()
+
+    def handle_metrics_reset(self):
+        """Handle a request to zero all metrics."""
+        metrics.reset()
+        return Response(Constants.RESPONSE_STATUS_SUCCESS, message="Metrics reset").to_dict()
+
+    def handle_profile(self, data=None):
+        """
+        Handle a profiler snapshot request. Blocks for the sampling duration.
+
+        Args:
+            data (dict): Optional {"duration": seconds, "interval": seconds}
+
+        Returns:
+            dict: Response with the profiler report as data
+        """
+        data = data if isinstance(data, dict) else {}
+        try:
+            report = profiler.sample(duration=data.get("duration", 2.0), interval=data.get("interval", 0.005))
+        except profiler.ProfilerBusyError as e:
+            return Response(Constants.RESPONSE_STATUS_ERROR, message=str(e)).to_dict()
+        except (TypeError, ValueError) as e:
+            return Response(Constants.RESPONSE_STATUS_ERROR, message=f"Invalid profile request: {e}").to_dict()
+        return Response(Constants.RESPONSE_STATUS_SUCCESS,
+                        message=f"Profile of {report['duration']:.1f} s",
+                        data=report).to_dict()
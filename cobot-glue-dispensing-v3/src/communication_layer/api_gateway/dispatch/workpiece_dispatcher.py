@@ -50,6 +50,8 @@ class WorkpieceDispatch(IDispatcher):
             return self.handle_save_workpiece_from_dxf(data)
         elif request in [workpiece_endpoints.WORKPIECE_GET_ALL] or (len(parts) > 1 and parts[1] == "getall"):
             return self.handle_get_all_workpieces()
+        elif request in [workpiece_endpoints.WORKPIECE_GET_INDEX]:
+            return self.handle_get_workpiece_index()
         elif request in [workpiece_endpoints.WORKPIECE_DELETE] or (len(parts) > 1 and parts[1] == "delete"):
             return self.handle_delete_workpiece(data)
         elif request in [workpiece_endpoints.WORKPIECE_GET_BY_ID] or (len(parts) > 1 and parts[1] == "getbyid"):
@@ -148,6 +150,24 @@ class WorkpieceDispatch(IDispatcher):
                 message=f"Error getting all workpieces: {e}"
             ).to_dict()
     
+    def handle_get_workpiece_index(self):
+        """
+        Handle getting the workpiece index used by the gallery.
+        
+        Returns:
+            dict: Response with one metadata entry per workpiece
+        """
+        print("WorkpieceHandler: Handling get workpiece index")
+        
+        try:
+            return self.workpieceController._get_workpiece_index()
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                Constants.RESPONSE_STATUS_ERROR, 
+                message=f"Error getting workpiece index: {e}"
+            ).to_dict()
+    
     def handle_get_workpiece_by_id(self, data):
         """
         Handle getting workpiece by ID.
@@ -31,6 +31,7 @@ class BaseWorkpieceController(BaseController):
     # ============================================================
     def _initialize_handlers(self):
         self.register_handler(workpiece_endpoints.WORKPIECE_GET_ALL, lambda data=None: self._get_all_workpieces())
+        self.register_handler(workpiece_endpoints.WORKPIECE_GET_INDEX, lambda data=None: self._get_workpiece_index())
         self.register_handler(workpiece_endpoints.WORKPIECE_GET_BY_ID,
                               lambda data: self._get_workpiece_by_id(data.get("id") if data else None))
         self.register_handler(workpiece_endpoints.WORKPIECE_SAVE, lambda data: self._save_workpiece(data))
@@ -52,6 +53,14 @@ class BaseWorkpieceController(BaseController):
             "data": workpieces,
         }
 
+    def _get_workpiece_index(self):
+        entries = self.workpieceService.get_workpiece_index()
+        return {
+            "status": Constants.RESPONSE_STATUS_SUCCESS,
+            "message": f"Loaded index of {len(entries)} workpieces",
+            "data": entries,
+        }
+
     def _get_workpiece_by_id(self, workpieceId):
         if not workpieceId:
             return {
@@ -2,20 +2,31 @@ import platform
 import logging
 import time
 import threading
+from typing import TYPE_CHECKING
 
 from backend.system.utils.custom_logging import LoggingLevel, log_if_enabled, \
     setup_logger, LoggerContext, log_info_message, log_error_message, log_debug_message
 from core.model.robot.IRobot import IRobot
 from core.model.robot.enums.axis import Direction
-from frontend.core.services.domain.RobotService import RobotAxis
-
-if platform.system() == "Windows":
-    from libs.fairino.windows import Robot
-elif platform.system() == "Linux":
-    logging.info("Linux detected")
-    from libs.fairino.linux.fairino import Robot
-else:
-    raise Exception("Unsupported OS")
+from core.model.robot.rpc_client import RetryPolicy, ThreadLocalServerProxy
+from modules.shared.utils import metrics
+from modules.shared.utils.metrics import TimedProxy
+
+if TYPE_CHECKING:
+    # Only a type hint; importing it at runtime pulls in the whole Qt frontend
+    from frontend.core.services.domain.RobotService import RobotAxis
+
+
+def _load_sdk():
+    """Import the Fairino SDK for this OS. Deferred until a real robot is created, so the mock robot needs no SDK."""
+    if platform.system() == "Windows":
+        from libs.fairino.windows import Robot
+    elif platform.system() == "Linux":
+        logging.info("Linux detected")
+        from libs.fairino.linux.fairino import Robot
+    else:
+        raise Exception("Unsupported OS")
+    return Robot
 
 from enum import Enum
 ENABLE_LOGGING = True  # Enable or disable logging
@@ -43,7 +54,7 @@ class TestRobotWrapper(IRobot):
         print(f"[MOCK] MoveL -> pos={position}, tool={tool}, user={user}, vel={vel}, acc={acc}, blendR={blendR}")
         return 0
 
-    def start_jog(self,axis:RobotAxis,direction:Direction,step,vel,acc):
+    def start_jog(self,axis:'RobotAxis',direction:Direction,step,vel,acc):
         print(f"[MOCK] StartJOG -> axis={axis}, direction={direction}, step={step}, vel={vel}, acc={acc}")
         return 0
 
@@ -82,7 +93,14 @@ class FairinoRobot(IRobot):
                    ip (str): IP address of the robot controller.
                """
         self.ip = ip
-        self.robot = Robot.RPC(self.ip)
+        Robot = _load_sdk()
+        sdk = Robot.RPC(self.ip)
+        # The monitor, the glue process and the UI call the robot from their own threads:
+        # give each one its own XML-RPC connection, transport errors retried by the policy
+        sdk.robot = ThreadLocalServerProxy(f"http://{self.ip}:20003",
+                                           retry_policy=RetryPolicy(retries=metrics.counter("robot.rpc.retries")))
+        # Every SDK call is an XML-RPC round trip; time them as robot.rpc.<method>
+        self.robot = TimedProxy(sdk, "robot.rpc")
         # self.robot = TestRobotWrapper()  # For testing purposes, replace with real robot in production
         self.logger_context = LoggerContext(logger=robot_logger, enabled=ENABLE_LOGGING)
         if self.robot is not None:
@@ -0,0 +1,143 @@
+"""
+XML-RPC transport to the robot controller: one connection per thread and one retry policy.
+
+The Fairino SDK sends every command through the single xmlrpc.client.ServerProxy it
+keeps in ``RPC.robot``, i.e. one HTTP connection. The robot monitor, the glue process
+and the UI jog commands call it from their own threads; when two calls overlap,
+http.client refuses the second with CannotSendRequest("Request-sent"), and callers used
+to sleep and try again. ThreadLocalServerProxy takes the place of that ServerProxy and
+gives each thread a connection of its own, so concurrent calls no longer collide.
+
+What remains are real transport failures (the controller dropping a connection, a
+timeout). RetryPolicy retries those with jittered exponential backoff until a deadline,
+only where that is safe: an error raised before the request was sent is retried for
+every method, other errors only for idempotent methods, since a MoveL the controller did
+receive must not be sent twice. The backoff sleeps on the calling thread, holding no lock.
+"""
+import http.client
+import random
+import threading
+import time
+import weakref
+import xmlrpc.client
+
+DEFAULT_DEADLINE = 2.0  # s from the first attempt after which a call is not retried
+DEFAULT_INITIAL_BACKOFF = 0.01  # s
+DEFAULT_MAX_BACKOFF = 0.2  # s
+
+# Methods the controller may receive twice with the same effect. Queries (Get*, Is*) are
+# idempotent as well, see RetryPolicy.is_idempotent
+IDEMPOTENT_METHODS = frozenset({
+    "StopMotion", "StopJOG", "ResetAllError", "RobotEnable", "Mode", "SetDO", "SetToolDO", "SetSpeed",
+})
+IDEMPOTENT_PREFIXES = ("Get", "Is")
+
+# Raised before any byte of the request left: safe to retry for every method
+UNSENT_ERRORS = (http.client.CannotSendRequest, ConnectionRefusedError)
+# Raised while sending or waiting for the response: the controller may have acted on it
+TRANSPORT_ERRORS = (OSError, http.client.HTTPException)
+
+
+class RetryPolicy:
+    """
+    Retries robot calls that failed in transport, with jittered exponential backoff.
+
+    Attributes:
+        deadline (float): Seconds from the first attempt after which no retry is started.
+        deadlines (dict): Per-method deadline overrides.
+        idempotent (frozenset): Methods, besides queries, retried after any transport error.
+        retries: Optional metrics counter incremented per retry.
+    """
+
+    def __init__(self, deadline=DEFAULT_DEADLINE, deadlines=None, idempotent=IDEMPOTENT_METHODS,
+                 initial_backoff=DEFAULT_INITIAL_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF, retries=None, rng=None):
+        self.deadline = deadline
+        self.deadlines = dict(deadlines or {})
+        self.idempotent = frozenset(idempotent)
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.retries = retries
+        self._rng = rng or random.Random()
+
+    def is_idempotent(self, method):
+        return method in self.idempotent or method.startswith(IDEMPOTENT_PREFIXES)
+
+    def should_retry(self, method, error):
+        if isinstance(error, UNSENT_ERRORS):
+            return True
+        return isinstance(error, TRANSPORT_ERRORS) and self.is_idempotent(method)
+
+    def backoff(self, attempt):
+        """Delay before retry ``attempt`` (0-based): uniform up to the exponential bound ("full jitter")."""
+        return self._rng.uniform(0, min(self.max_backoff, self.initial_backoff * 2 ** attempt))
+
+    def call(self, method, function, *args, **kwargs):
+        """Call ``function``, retrying per the policy; the last error is raised once the deadline is near."""
+        deadline = time.perf_counter() + self.deadlines.get(method, self.deadline)
+        attempt = 0
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except Exception as e:
+                if not self.should_retry(method, e):
+                    raise
+                delay = self.backoff(attempt)
+                if time.perf_counter() + delay >= deadline:
+                    raise
+            if self.retries is not None:
+                self.retries.inc()
+            time.sleep(delay)
+            attempt += 1
+
+
+class ThreadLocalServerProxy:
+    """
+    Drop-in for xmlrpc.client.ServerProxy that opens one connection per calling thread.
+
+    Attributes:
+        uri (str): The controller's XML-RPC endpoint.
+        retry_policy (RetryPolicy): Applied to every call; None calls once.
+    """
+
+    def __init__(self, uri, retry_policy=None, **proxy_kwargs):
+        self.uri = uri
+        self.retry_policy = retry_policy
+        self._proxy_kwargs = proxy_kwargs
+        self._local = threading.local()
+        # The proxies of live threads, to close them; a thread's proxy goes with the thread
+        self._proxies = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    @property
+    def connections(self):
+        """Number of per-thread proxies alive."""
+        with self._lock:
+            return len(self._proxies)
+
+    def _proxy(self):
+        proxy = getattr(self._local, "proxy", None)
+        if proxy is None:
+            proxy = xmlrpc.client.ServerProxy(self.uri, **self._proxy_kwargs)
+            self._local.proxy = proxy
+            with self._lock:
+                self._proxies.add(proxy)
+        return proxy
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def call(*args):
+            # Looked up per attempt: a retry goes out on this thread's connection as it is then
+            if self.retry_policy is None:
+                return getattr(self._proxy(), name)(*args)
+            return self.retry_policy.call(name, lambda: getattr(self._proxy(), name)(*args))
+
+        return call
+
+    def close(self):
+        with self._lock:
+            proxies = list(self._proxies)
+            self._proxies.clear()
+        for proxy in proxies:
+            proxy("close")()
@@ -0,0 +1,200 @@
+"""
+Service Startup Graph
+
+This module starts the core services as a dependency graph instead of one after
+another. Every service is a named factory with the names of the services it needs.
+A factory runs on a worker thread as soon as all of its dependencies are built, so
+independent devices (robot connection, camera open, Modbus probe, model load) wait
+on their timeouts in parallel.
+
+Each factory's start and finish time is recorded for a per-phase timing breakdown.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceStartupError(Exception):
+    """Raised when a required service fails to start"""
+
+    def __init__(self, name: str, cause: BaseException):
+        super().__init__(f"Service '{name}' failed to start: {cause}")
+        self.name = name
+        self.cause = cause
+
+
+@dataclass
+class ServiceNode:
+    """A service factory and the services it depends on."""
+    name: str
+    factory: Callable[..., Any]
+    depends_on: Tuple[str, ...] = ()
+    required: bool = True
+
+
+@dataclass
+class PhaseTiming:
+    """Timing of one service factory, in seconds since the graph started."""
+    name: str
+    started: float
+    finished: float
+    error: Optional[str] = None
+    thread: str = ""
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+@dataclass
+class StartupReport:
+    """Outcome of ServiceGraph.start."""
+    timings: List[PhaseTiming] = field(default_factory=list)
+    marks: Dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+
+    def format(self) -> str:
+        """Per-phase breakdown, in start order, with a bar showing when each phase ran."""
+        width = 40
+        scale = width / self.total if self.total > 0 else 0
+        lines = [f"{'phase':<20} {'start ms':>9} {'took ms':>9}  timeline"]
+        for timing in sorted(self.timings, key=lambda t: t.started):
+            offset = int(timing.started * scale)
+            length = max(1, int(timing.duration * scale))
+            bar = " " * offset + "#" * length
+            status = f"  FAILED: {timing.error}" if timing.error else ""
+            lines.append(f"{timing.name:<20} {timing.started * 1000:>9.1f} {timing.duration * 1000:>9.1f}  "
+                         f"|{bar:<{width}}|{status}")
+        for name, at in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"{name:<20} {at * 1000:>9.1f}")
+        lines.append(f"{'total':<20} {self.total * 1000:>9.1f}")
+        return "\n".join(lines)
+
+
+class ServiceGraph:
+    """
+    Builds services in dependency order, running independent factories in parallel.
+
+    A factory receives the services it depends on as keyword arguments, named after
+    them. Optional services that fail are stored as None and only logged. A failed
+    required service raises ServiceStartupError once the running factories finish.
+
+    Example:
+        graph = ServiceGraph()
+        graph.add("settings", load_settings)
+        graph.add("robot", lambda settings: connect(settings.robot_ip), depends_on=("settings",))
+        graph.add("camera", open_camera)
+        services = graph.start()
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self.nodes: Dict[str, ServiceNode] = {}
+        self.services: Dict[str, Any] = {}
+        self.report = StartupReport()
+        self._t0 = None
+        self._lock = threading.Lock()
+
+    def add(self, name: str, factory: Callable[..., Any], depends_on=(), required: bool = True) -> "ServiceGraph":
+        if name in self.nodes:
+            raise ValueError(f"Service '{name}' is already registered")
+        self.nodes[name] = ServiceNode(name, factory, tuple(depends_on), required)
+        return self
+
+    def mark(self, name: str):
+        """Record a milestone (e.g. the first camera frame) relative to the graph start."""
+        with self._lock:
+            if self._t0 is not None and name not in self.report.marks:
+                self.report.marks[name] = time.perf_counter() - self._t0
+
+    def _check(self):
+        for node in self.nodes.values():
+            for dependency in node.depends_on:
+                if dependency not in self.nodes:
+                    raise ValueError(f"Service '{node.name}' depends on unknown service '{dependency}'")
+        # Kahn's algorithm, only to reject cycles before anything is started
+        remaining = {name: set(node.depends_on) for name, node in self.nodes.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between services: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def _run(self, node: ServiceNode):
+        started = time.perf_counter() - self._t0
+        kwargs = {dependency: self.services[dependency] for dependency in node.depends_on}
+        try:
+            return node.factory(**kwargs)
+        finally:
+            timing = PhaseTiming(node.name, started, time.perf_counter() - self._t0,
+                                 thread=threading.current_thread().name)
+            with self._lock:
+                self.report.timings.append(timing)
+
+    def start(self, sequential: bool = False) -> Dict[str, Any]:
+        """
+        Build every service.
+
+        Args:
+            sequential: Run the factories one at a time in dependency order (for comparison).
+
+        Returns:
+            dict: Service name to the built service.
+        """
+        self._check()
+        self._t0 = time.perf_counter()
+        pending = dict(self.nodes)
+        failure = None
+        workers = 1 if sequential else self.max_workers
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="startup") as executor:
+            running = {}
+            while pending or running:
+                if failure is None:
+                    ready = [node for node in pending.values()
+                             if all(dependency in self.services for dependency in node.depends_on)]
+                    if sequential:
+                        # One factory at a time, in registration order
+                        ready = ready[:1] if not running else []
+                    for node in ready:
+                        del pending[node.name]
+                        running[executor.submit(self._run, node)] = node
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        self.services[node.name] = future.result()
+                    except Exception as e:
+                        self._record_error(node.name, e)
+                        if node.required:
+                            logger.error(f"Required service '{node.name}' failed: {e}")
+                            failure = failure or ServiceStartupError(node.name, e)
+                        else:
+                            logger.warning(f"Optional service '{node.name}' failed, continuing without it: {e}")
+                            self.services[node.name] = None
+
+        self.report.total = time.perf_counter() - self._t0
+        if failure is not None:
+            raise failure
+        if pending:
+            # Only reachable when a failed dependency left services unbuilt
+            raise ServiceStartupError(next(iter(pending)), RuntimeError("dependencies did not start"))
+        return self.services
+
+    def _record_error(self, name: str, error: BaseException):
+        with self._lock:
+            for timing in self.report.timings:
+                if timing.name == name:
+                    timing.error = str(error)
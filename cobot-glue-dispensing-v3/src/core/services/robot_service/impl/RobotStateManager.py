@@ -1,5 +1,6 @@
 from modules.shared.MessageBroker import MessageBroker
 from core.services.robot_service.impl.robot_monitor.base_robot_monitor import BaseRobotMonitor
+from core.services.robot_service.impl.robot_monitor.motion_waiter import MotionWaiter, MotionSample
 from core.services.robot_service.enums.RobotState import RobotState
 from communication_layer.api.v1.topics import RobotTopics
 
@@ -22,6 +23,8 @@ class RobotStateManager:
         self.robotStateTopic = RobotTopics.ROBOT_STATE
         self.monitor = robot_monitor
         self.monitor.set_data_callback(self.on_motion_data)
+        # Threads waiting for a pose, the end of a motion or a path point, woken per sample
+        self.motion_waiter = MotionWaiter()
 
     # ----------------------------
     # Callbacks and State Logic
@@ -32,6 +35,7 @@ class RobotStateManager:
         if error:
             self.robotState = RobotState.ERROR
             self.publish_state()
+            self.motion_waiter.on_sample(MotionSample(None, None, None, self.robotState, timestamp))
             return
 
         self.position = pos
@@ -39,6 +43,7 @@ class RobotStateManager:
         self.acceleration = acceleration
         self.update_state()
         self.publish_state()
+        self.motion_waiter.on_sample(MotionSample(pos, velocity, acceleration, self.robotState, timestamp))
 
         if self.robotState != RobotState.STATIONARY and self.trajectory_update:
             self.send_trajectory_point(pos)
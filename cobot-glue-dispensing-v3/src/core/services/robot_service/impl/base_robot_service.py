@@ -83,7 +83,6 @@ class RobotService(IRobotService):
         self.service_id = "robot_service"
         self.settings_service = settings_service
         self.robot_config = self.settings_service.robot_config
-        self._operation_lock = threading.Lock()
         self.enable_logging = ENABLE_ROBOT_SERVICE_LOGGING
         self.robot_state_manager = robot_state_manager
         self.broker = MessageBroker()
@@ -209,22 +208,10 @@ class RobotService(IRobotService):
 
     def stop_motion(self)-> bool:
         """Stop robot motion safely"""
-        result = False
-        with self._operation_lock:
-            max_attempts = 5
-            for attempt in range(max_attempts):
-                try:
-                    result = self.robot.stop_motion()
-                    log_info_message(self.logger_context, message=f"Robot motion stopped, result: {result}")
-                    result = True
-                    break
-                except Exception as e:
-                    if "Request-sent" in str(e) and attempt < max_attempts - 1:
-                        time.sleep(0.1)  # Wait and retry
-                        continue
-                    else:
-                        raise
-        return result
+        # Transport errors are retried by the robot's RetryPolicy; StopMotion is safe to resend
+        result = self.robot.stop_motion()
+        log_info_message(self.logger_context, message=f"Robot motion stopped, result: {result}")
+        return True
 
     def start_jog(self, axis, direction, step):
         step = float(step)
@@ -300,38 +287,42 @@ class RobotService(IRobotService):
 
     def _waitForRobotToReachPosition(self, endPoint, threshold, delay, timeout=1, cancellation_token=None):
         """Wait for robot to reach target position with state awareness"""
-        start_time = time.time()
         log_info_message(self.logger_context,
                          message=f"_waitForRobotToReachPosition CALLED WITH  endPoint={endPoint},threshold={threshold},delay = {delay},timeout = {timeout}")
 
-        while True:
-            print(f"RobotService: Waiting for robot to reach position {endPoint} with threshold {threshold}mm")
-            # Check cancellation token (replaces state machine dependency)
-            if cancellation_token is not None and cancellation_token.is_cancelled():
-                log_debug_message(self.logger_context,
-                                  message=f"Operation cancelled via cancellation token: {cancellation_token.get_cancellation_reason()}")
-                return False
-
-            # Check timeout
-            if time.time() - start_time > timeout:
-                log_debug_message(self.logger_context,
-                                  message=f"Timeout reached while waiting for robot position {endPoint}")
-                return False
-
-            # Check position
-            current_position = self.get_current_position()
-            if current_position is None:
-                time.sleep(0.1)
-                continue
-
-            distance = robot_utils.calculate_distance_between_points(current_position, endPoint)
-
-            if distance < threshold:
-                log_debug_message(self.logger_context,
-                                  message=f"Robot reached target position {endPoint} within threshold {threshold}mm")
-                return True
-
-            time.sleep(0.01)
+        reached = self.wait_for_position(endPoint, threshold, timeout=timeout, cancellation_token=cancellation_token)
+        if reached:
+            log_debug_message(self.logger_context,
+                              message=f"Robot reached target position {endPoint} within threshold {threshold}mm")
+        elif cancellation_token is not None and cancellation_token.is_cancelled():
+            log_debug_message(self.logger_context,
+                              message=f"Operation cancelled via cancellation token: {cancellation_token.get_cancellation_reason()}")
+        else:
+            log_debug_message(self.logger_context,
+                              message=f"Timeout reached while waiting for robot position {endPoint}")
+        return reached
+
+    # ------------------ Waiting on the robot monitor ------------------
+    # These block on the samples the robot monitor already fetches: no RPC calls of
+    # their own, woken by the first sample that satisfies them.
+
+    def wait_for_position(self, position, threshold, timeout=None, cancellation_token=None) -> bool:
+        """Wait until the robot is within threshold mm of position. False on timeout or cancellation."""
+        return self.robot_state_manager.motion_waiter.wait_for_position(
+            position, threshold, timeout, cancellation_token) is not None
+
+    def wait_for_motion_done(self, timeout=None, cancellation_token=None) -> bool:
+        """Wait until the robot has come to rest. False on timeout or cancellation."""
+        return self.robot_state_manager.motion_waiter.wait_for_motion_done(timeout, cancellation_token) is not None
+
+    def wait_for_path_index(self, path, index, threshold, timeout=None, cancellation_token=None) -> bool:
+        """Wait until the robot reaches path[index] (or a later point). False on timeout or cancellation."""
+        return self.robot_state_manager.motion_waiter.wait_for_path_index(
+            path, index, threshold, timeout, cancellation_token) is not None
+
+    def wait_for_next_sample(self, timeout=None) -> bool:
+        """Wait until the robot monitor has fetched a new position. False on timeout."""
+        return self.robot_state_manager.motion_waiter.wait_for_next_sample(timeout) is not None
 
     def add_subscription_module(self, module: "ISubscriptionModule"):
         """
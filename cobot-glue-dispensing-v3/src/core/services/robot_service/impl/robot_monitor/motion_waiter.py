@@ -0,0 +1,137 @@
+"""
+Waiting on the robot monitor's samples: "within X mm of a pose", "motion done" and
+"path point reached", for any number of threads at once.
+
+The robot monitor already fetches the pose every cycle; waiters register a condition
+here and RobotStateManager hands every sample to on_sample(), which evaluates the
+conditions in the monitor thread and wakes the waiters whose condition holds. A waiter
+therefore makes no RPC calls of its own, is woken by the sample that satisfies it
+rather than by its next poll, and never misses a sample between two of its wake-ups.
+
+Cancellation tokens and timeouts are checked on every sample as well, so a cancelled
+wait returns within one sample period; a timeout returns on time even when no samples
+arrive.
+"""
+import threading
+from collections import namedtuple
+from typing import Callable, Optional
+
+from backend.system.utils import robot_utils
+from core.services.robot_service.enums.RobotState import RobotState
+
+DEFAULT_SETTLE_SAMPLES = 3  # consecutive stationary samples that count as motion done
+
+MotionSample = namedtuple("MotionSample", ["position", "velocity", "acceleration", "state", "timestamp"])
+
+
+class _Waiter:
+    """One blocked caller: its condition, its cancellation token and the sample that woke it."""
+
+    def __init__(self, condition, cancellation_token):
+        self.condition = condition
+        self.cancellation_token = cancellation_token
+        self.event = threading.Event()
+        self.sample = None
+
+    def check(self, sample):
+        if self.event.is_set():
+            return
+        if self.cancellation_token is not None and self.cancellation_token.is_cancelled():
+            self.event.set()
+            return
+        try:
+            satisfied = self.condition(sample)
+        except Exception as e:
+            print(f"MotionWaiter: error evaluating wait condition: {e}")
+            satisfied = False
+        if satisfied:
+            self.sample = sample
+            self.event.set()
+
+
+class MotionWaiter:
+    """
+    Dispatches robot monitor samples to the threads waiting on them.
+
+    Attributes:
+        last_sample (MotionSample): The most recent sample, None before the first one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = []
+        self.last_sample = None
+
+    def on_sample(self, sample: MotionSample):
+        """Called by the monitor thread for every sample; wakes the waiters it satisfies."""
+        with self._lock:
+            self.last_sample = sample
+            waiters = list(self._waiters)
+        for waiter in waiters:
+            waiter.check(sample)
+
+    def wait_until(self, condition: Callable[[MotionSample], bool], timeout: Optional[float] = None,
+                   cancellation_token=None, include_last: bool = True) -> Optional[MotionSample]:
+        """
+        Block until a sample satisfies ``condition``.
+
+        Args:
+            condition: Called with each sample, in the monitor thread; must be quick.
+            timeout (float): Seconds to wait at most; None waits indefinitely.
+            cancellation_token: Object with is_cancelled(); checked on every sample.
+            include_last (bool): Also test the most recent sample, so a condition that
+                already holds returns at once. False waits for samples after the call.
+
+        Returns:
+            MotionSample: The sample that satisfied the condition; None on timeout or
+            cancellation.
+        """
+        waiter = _Waiter(condition, cancellation_token)
+        with self._lock:
+            last_sample = self.last_sample
+            self._waiters.append(waiter)
+        try:
+            if include_last and last_sample is not None:
+                waiter.check(last_sample)
+            waiter.event.wait(timeout)
+            return waiter.sample
+        finally:
+            with self._lock:
+                self._waiters.remove(waiter)
+
+    def wait_for_position(self, target, threshold, timeout=None, cancellation_token=None) -> Optional[MotionSample]:
+        """Wait until the robot is within ``threshold`` mm (XYZ) of ``target``."""
+        return self.wait_until(
+            lambda sample: sample.position is not None and
+            robot_utils.calculate_distance_between_points(sample.position, target) < threshold,
+            timeout, cancellation_token)
+
+    def wait_for_motion_done(self, timeout=None, cancellation_token=None,
+                             settle_samples=DEFAULT_SETTLE_SAMPLES) -> Optional[MotionSample]:
+        """
+        Wait until the robot has been stationary for ``settle_samples`` samples in a row.
+
+        Only samples after the call count, so call it once the motion has started (or
+        combine it with wait_for_position); a robot that has not started moving yet is
+        stationary too.
+        """
+        stationary = [0]
+
+        def done(sample):
+            stationary[0] = stationary[0] + 1 if sample.state == RobotState.STATIONARY else 0
+            return stationary[0] >= settle_samples
+
+        return self.wait_until(done, timeout, cancellation_token, include_last=False)
+
+    def wait_for_path_index(self, path, index, threshold, timeout=None, cancellation_token=None) -> Optional[MotionSample]:
+        """Wait until the robot is within ``threshold`` mm of ``path[index]`` or of a later point of ``path``."""
+        remaining = path[index:]
+        return self.wait_until(
+            lambda sample: sample.position is not None and any(
+                robot_utils.calculate_distance_between_points(sample.position, point) < threshold
+                for point in remaining),
+            timeout, cancellation_token)
+
+    def wait_for_next_sample(self, timeout=None, cancellation_token=None) -> Optional[MotionSample]:
+        """Wait for the next sample from the monitor."""
+        return self.wait_until(lambda sample: True, timeout, cancellation_token, include_last=False)
@@ -54,6 +54,7 @@ class _VisionService(VisionSystem):
         self.frameQueue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
         self.superRun = super().run
         self.latest_frame = None
+        self._latest_rgb = None  # RGB conversion of latest_frame, made on first request
         self.frame_lock = threading.Lock()
 
         self.contours = None
@@ -112,24 +113,32 @@ class _VisionService(VisionSystem):
 
             with self.frame_lock:
                 self.latest_frame = frame
+                self._latest_rgb = None
 
 
 
-    def getLatestFrame(self):
+    def getLatestFrame(self, copy=True):
         """
-            Retrieves the latest frame from the queue.
+            Retrieves the latest frame, converted to RGB.
+
+            The conversion runs once per camera frame, however many callers ask for it.
+
+            Args:
+                copy (bool): Return a private copy the caller may draw on. With False a
+                    shared read-only array is returned, for callers that only look at it.
 
             Returns:
-                numpy.ndarray or None: The most recent frame, or None if the queue is empty.
+                numpy.ndarray or None: The most recent frame, or None if no frame was captured yet.
             """
 
         with self.frame_lock:
             if self.latest_frame is None:
                 return None
-            # convert to RGB before returning
-            return cv2.cvtColor(self.latest_frame, cv2.COLOR_BGR2RGB)
-
-        return frame
+            if self._latest_rgb is None:
+                self._latest_rgb = cv2.cvtColor(self.latest_frame, cv2.COLOR_BGR2RGB)
+                self._latest_rgb.flags.writeable = False
+            rgb = self._latest_rgb
+        return rgb.copy() if copy else rgb
 
     def getContours(self):
         """
@@ -259,7 +268,8 @@ class _VisionService(VisionSystem):
         x = message.get("x")
         y = message.get("y")
         point = (x, y)
-        return utils.transformSinglePointToCamera(point,self.cameraToRobotMatrix)
+        return utils.transformSinglePointToCamera(point,self.cameraToRobotMatrix,
+                                                  self.data_manager.robotToCameraMatrix)
 
 class VisionServiceSingleton:
     """
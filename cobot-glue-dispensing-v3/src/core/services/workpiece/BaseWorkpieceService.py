@@ -54,6 +54,16 @@ class BaseWorkpieceService:
         data = self.repository.data
         return data
 
+    def get_workpiece_index(self):
+        """
+            Lists the saved workpieces without their contours.
+
+            Returns:
+                list: One metadata dict per workpiece (id, name, description, material,
+                contour area, modification time, file and thumbnail paths).
+            """
+        return self.repository.get_index()
+
     def delete_workpiece_by_id(self, workpieceId):
         """
             Deletes a workpiece by its ID using the repository.
@@ -74,6 +74,7 @@ class UIController:
             workpiece_endpoints.WORKPIECE_SAVE_DXF: self.saveWorkpieceFromDXF,
             operations_endpoints.CREATE_WORKPIECE: self.handle_create_workpiece,
             workpiece_endpoints.WORKPIECE_GET_ALL: self.handleGetAllWorpieces,
+            workpiece_endpoints.WORKPIECE_GET_INDEX: self.handleGetWorkpieceIndex,
 
             # Legacy special endpoints
             "executeFromGallery": self.handleExecuteFromGallery,
@@ -185,6 +186,15 @@ class UIController:
         print(f"Received workpieces: {workpieces}")
         return workpieces
 
+    def handleGetWorkpieceIndex(self):
+        request = workpiece_endpoints.WORKPIECE_GET_INDEX
+        res = self.requestSender.send_request(request)
+        response = Response.from_dict(res)
+        if response.status == Constants.RESPONSE_STATUS_ERROR:
+            print("Error fetching workpiece index:", response.message)
+            return None
+        return response.data
+
     def handleHelp(self):
         self.logger.debug(f"{self.logTag}] [Method: handleHelp] HELP BUTTON PRESSED'")
 
@@ -1,45 +1,13 @@
+import argparse
 import logging
 import os
+import threading
+import time
 
-from applications.glue_dispensing_application.controllers.glue_robot_controller import GlueRobotController
-from applications.glue_dispensing_application.controllers.glue_workpiece_controller import GlueWorkpieceController
-from applications.glue_dispensing_application.repositories.workpiece.GlueWorkPieceRepositorySingleton import \
-    GlueWorkPieceRepositorySingleton
-from applications.glue_dispensing_application.services.workpiece.glue_workpiece_service import GlueWorkpieceService
-from applications.glue_dispensing_application.settings.GlueSettings import GlueSettings
-from applications.glue_dispensing_application.settings.GlueSettingsHandler import GlueSettingsHandler
-from communication_layer.api_gateway.dispatch.main_router import RequestHandler
-from core.application.interfaces.application_settings_interface import ApplicationSettingsRegistry
-from core.application.ApplicationContext import set_current_application, get_core_settings_path
-from core.controllers.vision.camera_system_controller import CameraSystemController
-from core.services.robot_service.impl.RobotStateManager import RobotStateManager
-from core.services.robot_service.impl.base_robot_service import RobotService
-
-from core.services.robot_service.impl.robot_monitor.fairino_monitor import FairinoRobotMonitor
-from frontend.core.utils.localization import setup_localization
-
-# Import SystemStateManager and related components
-from core.system_state_management import SystemStateManager, SYSTEM_STATE_PRIORITY, ServiceState, SystemState, ServiceRegistry
-from communication_layer.api.v1.topics import RobotTopics, VisionTopics
-
-
-from modules.shared.MessageBroker import MessageBroker
-from communication_layer.api_gateway.DomesticRequestSender import DomesticRequestSender
-from core.application_factory import create_application_factory
-from core.base_robot_application import ApplicationType
-
-# IMPORT CONTROLLERS
-from backend.system.settings.SettingsController import SettingsController
-
-# IMPORT SERVICES
-from backend.system.settings.SettingsService import SettingsService
-from core.services.vision.VisionService import VisionServiceSingleton
-from backend.system.utils import PathResolver
-
-setup_localization()
-
-if os.environ.get("WAYLAND_DISPLAY"):
-    os.environ["QT_QPA_PLATFORM"] = "xcb"
+# Heavy modules (Qt frontend, OpenCV, the Fairino SDK, sklearn/joblib, ezdxf and the
+# applications) are imported inside the service factories below, on the startup
+# worker threads, and never in headless mode when only the GUI needs them.
+from core.service_startup import ServiceGraph
 
 logging.basicConfig(
     level=logging.CRITICAL,
@@ -49,56 +17,96 @@ logging.basicConfig(
 # sensorPublisher = SensorPublisher()
 
 API_VERSION = 1
-newGui = True
 testRobot = False
-if newGui:
-    from frontend.core.runPlUi import PlGui
-else:
-    pass
+HEADLESS_ENV_VAR = "COBOT_HEADLESS"
+FIRST_FRAME_TIMEOUT = 30  # seconds to wait for the first camera frame before giving up on the mark
+MODBUS_PROBE_SLAVE_ID = 1
+MODBUS_PROBE_REGISTER = 20  # motor error count, read-only
 
-if __name__ == "__main__":
-    # Set the current application context (this determines which app's storage to use for core settings)
-    set_current_application("glue_dispensing_application")
 
-    # Global registry instance
-    settings_registry = ApplicationSettingsRegistry()
+def create_settings_service(settings_registry):
+    from core.application.ApplicationContext import get_core_settings_path
+    from backend.system.settings.SettingsService import SettingsService
+    from backend.system.utils import PathResolver
 
     # Use application-specific core settings paths
     settings_file_paths = {
         "camera": get_core_settings_path("camera_settings.json") or PathResolver.get_settings_file_path("camera_settings.json"),
         "robot_config": get_core_settings_path("robot_config.json") or PathResolver.get_settings_file_path("robot_config.json"),
     }
+    return SettingsService(settings_file_paths=settings_file_paths, settings_registry=settings_registry)
 
-    settings_service = SettingsService(settings_file_paths=settings_file_paths,settings_registry=settings_registry)
 
-    # INIT ROBOT
+def create_robot(settings_service, test_robot=False):
     robot_config = settings_service.get_robot_config()
-    if testRobot:
-        from core.model.robot import TestRobotWrapper
-        robot = TestRobotWrapper()
-    else:
-        from core.model.robot import fairino_robot
-        robot = fairino_robot.FairinoRobot(robot_config.robot_ip)
+    if test_robot:
+        from core.model.robot.fairino_robot import TestRobotWrapper
+        return TestRobotWrapper()
+    from core.model.robot import fairino_robot
+    return fairino_robot.FairinoRobot(robot_config.robot_ip)
 
-    # INIT CAMERA SERVICE
-    cameraService = VisionServiceSingleton().get_instance()
 
-    # INIT GLUE WORKPIECE REPOSITORY AND SERVICE
-    repository = GlueWorkPieceRepositorySingleton().get_instance()
-    workpieceService = GlueWorkpieceService(repository=repository)
+def create_robot_service(robot, settings_service):
+    from core.services.robot_service.impl.RobotStateManager import RobotStateManager
+    from core.services.robot_service.impl.base_robot_service import RobotService
+    from core.services.robot_service.impl.robot_monitor.fairino_monitor import FairinoRobotMonitor
 
-    # INIT ROBOT SERVICE
+    robot_config = settings_service.get_robot_config()
     robot_state_manager_cycle_time = 0.03  # 30ms cycle time
-    robot_monitor = FairinoRobotMonitor(robot_config.robot_ip, cycle_time=0.03)
+    robot_monitor = FairinoRobotMonitor(robot_config.robot_ip, cycle_time=robot_state_manager_cycle_time)
     robot_state_manager = RobotStateManager(robot_monitor=robot_monitor)
-    robotService = RobotService(robot, settings_service, robot_state_manager)
+    return RobotService(robot, settings_service, robot_state_manager)
+
+
+def create_camera_service():
+    from core.services.vision.VisionService import VisionServiceSingleton
+    return VisionServiceSingleton().get_instance()
+
+
+def create_workpiece_service():
+    from applications.glue_dispensing_application.repositories.workpiece.GlueWorkPieceRepositorySingleton import \
+        GlueWorkPieceRepositorySingleton
+    from applications.glue_dispensing_application.services.workpiece.glue_workpiece_service import GlueWorkpieceService
+
+    repository = GlueWorkPieceRepositorySingleton().get_instance()
+    return GlueWorkpieceService(repository=repository)
+
+
+def probe_modbus():
+    """
+    Read one register so a missing adapter or silent slave is reported at startup, not mid-cycle.
+
+    minimalmodbus shares one serial port between every Instrument on /dev/ttyUSB0, so the
+    port is left open for the glue services; the read holds modbus_lock like any other
+    transaction, so it cannot interleave with theirs.
+    """
+    from modules.modbusCommunication.ModbusController import ModbusController
+    client = ModbusController.getModbusClient(MODBUS_PROBE_SLAVE_ID)
+    _, modbus_error = client.read(MODBUS_PROBE_REGISTER)
+    if modbus_error is not None:
+        raise RuntimeError(f"Modbus slave {MODBUS_PROBE_SLAVE_ID} did not answer: {modbus_error.name}")
+    return True
+
+
+def load_matching_model():
+    from backend.system.contour_matching.matching_config import USE_COMPARISON_MODEL
+    if not USE_COMPARISON_MODEL:
+        return None
+    from backend.system.contour_matching.CompareContours import load_model_with_fallback
+    return load_model_with_fallback()
+
+
+def create_system_state_manager(robot_service, camera_service):
+    from communication_layer.api.v1.topics import RobotTopics, VisionTopics
+    from core.system_state_management import SystemStateManager, SYSTEM_STATE_PRIORITY, ServiceState, SystemState, \
+        ServiceRegistry
+    from modules.shared.MessageBroker import MessageBroker
 
-    # INIT SYSTEM STATE MANAGER
     # Create and configure the system-wide state manager
     service_registry = ServiceRegistry()
-    service_registry.register_service(robotService.service_id,RobotTopics.SERVICE_STATE,ServiceState.UNKNOWN)
-    service_registry.register_service(cameraService.service_id,VisionTopics.SERVICE_STATE,ServiceState.UNKNOWN)
-    system_state_manager = SystemStateManager(SYSTEM_STATE_PRIORITY, MessageBroker(),service_registry)
+    service_registry.register_service(robot_service.service_id, RobotTopics.SERVICE_STATE, ServiceState.UNKNOWN)
+    service_registry.register_service(camera_service.service_id, VisionTopics.SERVICE_STATE, ServiceState.UNKNOWN)
+    system_state_manager = SystemStateManager(SYSTEM_STATE_PRIORITY, MessageBroker(), service_registry)
 
     # Subscribe to system state updates (optional - for logging/debugging)
     def on_system_state_change(state: SystemState):
@@ -106,21 +114,32 @@ if __name__ == "__main__":
 
     system_state_manager.subscribers.append(on_system_state_change)
     system_state_manager.start_state_publisher_thread()
+    return service_registry
+
+
+def create_request_handler(settings_registry, settings, camera, workpieces, robot_service, service_registry):
+    from applications.glue_dispensing_application.controllers.glue_robot_controller import GlueRobotController
+    from applications.glue_dispensing_application.controllers.glue_workpiece_controller import GlueWorkpieceController
+    from backend.system.settings.SettingsController import SettingsController
+    from communication_layer.api_gateway.dispatch.main_router import RequestHandler
+    from core.application_factory import create_application_factory
+    from core.base_robot_application import ApplicationType
+    from core.controllers.vision.camera_system_controller import CameraSystemController
 
     # INIT CONTROLLERS
-    settingsController = SettingsController(settings_service,settings_registry)
-    cameraSystemController = CameraSystemController(cameraService)
-    workpieceController = GlueWorkpieceController(workpieceService)
-    robotController = GlueRobotController(robotService)
+    settingsController = SettingsController(settings, settings_registry)
+    cameraSystemController = CameraSystemController(camera)
+    workpieceController = GlueWorkpieceController(workpieces)
+    robotController = GlueRobotController(robot_service)
 
     # INIT APPLICATION FACTORY
     application_factory = create_application_factory(
-        vision_service=cameraService,
-        settings_service=settings_service,
-        workpiece_service=workpieceService,
-        robot_service=robotService,
+        vision_service=camera,
+        settings_service=settings,
+        workpiece_service=workpieces,
+        robot_service=robot_service,
         settings_registry=settings_registry,
-        service_registry= service_registry,
+        service_registry=service_registry,
         auto_register=True
     )
 
@@ -132,25 +151,106 @@ if __name__ == "__main__":
     if API_VERSION == 1:
         requestHandler = RequestHandler(current_application, settingsController, cameraSystemController,
                                         workpieceController, robotController, application_factory)
-
     else:
         raise ValueError("Unsupported API_VERSION. Please set to 1 or 2.")
-
     logging.info("Request Handler initialized")
+    return requestHandler
+
+
+def build_service_graph(settings_registry, test_robot=False):
+    """
+    Startup dependency graph. The robot connection, camera open, Modbus probe and model
+    load only depend on settings (or nothing), so they start in parallel.
+    """
+    graph = ServiceGraph()
+    graph.add("settings", lambda: create_settings_service(settings_registry))
+    graph.add("camera", create_camera_service)
+    graph.add("workpieces", create_workpiece_service)
+    graph.add("modbus_probe", probe_modbus, required=False)
+    graph.add("matching_model", load_matching_model, required=False)
+    graph.add("robot", lambda settings: create_robot(settings, test_robot), depends_on=("settings",))
+    graph.add("robot_service", lambda robot, settings: create_robot_service(robot, settings),
+              depends_on=("robot", "settings"))
+    graph.add("service_registry", lambda robot_service, camera: create_system_state_manager(robot_service, camera),
+              depends_on=("robot_service", "camera"))
+    graph.add("request_handler",
+              lambda settings, camera, workpieces, robot_service, service_registry: create_request_handler(
+                  settings_registry, settings, camera, workpieces, robot_service, service_registry),
+              depends_on=("settings", "camera", "workpieces", "robot_service", "service_registry"))
+    return graph
+
+
+def watch_first_frame(graph, camera_service, timeout=FIRST_FRAME_TIMEOUT):
+    """Mark time-to-first-frame once the camera thread publishes its first frame."""
+    def watch():
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if camera_service.latest_frame is not None:
+                graph.mark("first_frame")
+                print(f"[Main] First camera frame {graph.report.marks['first_frame'] * 1000:.0f} ms after startup")
+                return
+            time.sleep(0.01)
+    threading.Thread(target=watch, daemon=True, name="first-frame-watch").start()
+
+
+def run_gui(requestHandler):
     """GUI RELATED INITIALIZATIONS"""
+    from frontend.core.utils.localization import setup_localization
+    from communication_layer.api_gateway.DomesticRequestSender import DomesticRequestSender
+
+    setup_localization()
+    if os.environ.get("WAYLAND_DISPLAY"):
+        os.environ["QT_QPA_PLATFORM"] = "xcb"
 
     # INIT DOMESTIC REQUEST SENDER
     domesticRequestSender = DomesticRequestSender(requestHandler)
     logging.info("Domestic Request Sender initialized")
-    # INIT MAIN WINDOW
 
+    # INIT MAIN WINDOW
     if API_VERSION == 1:
         from frontend.core.ui_controller.UIController import UIController
         controller = UIController(domesticRequestSender)
     else:
         raise ValueError("Unsupported API_VERSION. Please set to 1")
 
-
     from frontend.core.runPlUi import PlGui
     gui = PlGui(controller=controller)
     gui.start()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Cobot glue dispensing system")
+    parser.add_argument("--headless", action="store_true",
+                        default=os.environ.get(HEADLESS_ENV_VAR, "") not in ("", "0"),
+                        help=f"Run the backend without the Qt GUI (also set by {HEADLESS_ENV_VAR}=1)")
+    parser.add_argument("--test-robot", action="store_true", default=testRobot,
+                        help="Use the mock robot instead of connecting to the controller")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    from core.application.ApplicationContext import set_current_application
+    from core.application.interfaces.application_settings_interface import ApplicationSettingsRegistry
+
+    # Set the current application context (this determines which app's storage to use for core settings)
+    set_current_application("glue_dispensing_application")
+
+    # Global registry instance
+    settings_registry = ApplicationSettingsRegistry()
+
+    graph = build_service_graph(settings_registry, test_robot=args.test_robot)
+    services = graph.start()
+    graph.mark("ready")
+    watch_first_frame(graph, services["camera"])
+    print(graph.report.format())
+
+    if args.headless:
+        print("[Main] Running headless; press Ctrl+C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    else:
+        run_gui(services["request_handler"])
@@ -0,0 +1,76 @@
+"""
+Spray / pickup area containment for contours with 10,000 points.
+
+Compares the previous per-point cv2.pointPolygonTest loop with the cached PolygonMask
+of backend.system.utils.contours, in exact mode (border points resolved against the
+polygon) and in raster-only mode. Also reports the one-off cost of rasterizing an area,
+which is paid again only when the area points change.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_area_containment.py
+"""
+import time
+
+import cv2
+import numpy as np
+
+from backend.system.utils.contours import BORDER, PolygonMask, get_polygon_mask
+
+POINTS = 10_000
+REPEATS = 20
+SPRAY_AREA = np.array([[102.3, 81.7], [1198.9, 60.2], [1221.4, 652.6], [85.5, 690.1]], dtype=np.float32)
+
+
+def _contour(center, radius, points):
+    angle = np.linspace(0, 2 * np.pi, points, endpoint=False)
+    wobble = 1 + 0.1 * np.sin(7 * angle)
+    xy = np.column_stack([center[0] + radius * wobble * np.cos(angle), center[1] + radius * wobble * np.sin(angle)])
+    return np.round(xy).astype(np.int32).reshape(-1, 1, 2)
+
+
+def all_inside_per_point(polygon, contour):
+    """The previous implementation: one pointPolygonTest call per contour point."""
+    for pt in contour:
+        if cv2.pointPolygonTest(polygon, (float(pt[0][0]), float(pt[0][1])), False) < 0:
+            return False
+    return True
+
+
+def _time(fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn()
+    return (time.perf_counter() - start) / REPEATS * 1000, result
+
+
+def main():
+    cases = {
+        "well inside": _contour((640, 370), 200, POINTS),
+        "touching the edge": _contour((640, 370), 285, POINTS),
+        "crossing at the end": np.vstack([_contour((640, 370), 200, POINTS - 1),
+                                          np.array([[[1250, 370]]], dtype=np.int32)]),
+    }
+
+    start = time.perf_counter()
+    mask = PolygonMask(SPRAY_AREA)
+    build = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        get_polygon_mask(SPRAY_AREA)
+    lookup = (time.perf_counter() - start) / REPEATS * 1000
+    print(f"area mask {mask.labels.shape[1]}x{mask.labels.shape[0]}: build {build:.2f} ms (once per area change), "
+          f"cached lookup {lookup:.3f} ms")
+    print(f"{'contour (' + str(POINTS) + ' pts)':<24} {'per-point':>10} {'mask exact':>11} {'mask fast':>10}  speedup")
+
+    for label, contour in cases.items():
+        loop_ms, expected = _time(lambda: all_inside_per_point(SPRAY_AREA, contour))
+        exact_ms, exact = _time(lambda: get_polygon_mask(SPRAY_AREA).contains_all(contour))
+        fast_ms, _ = _time(lambda: get_polygon_mask(SPRAY_AREA).contains_all(contour, exact=False))
+        border = int((mask.classify(contour) == BORDER).sum())
+        assert exact == expected
+        print(f"{label:<24} {loop_ms:>8.2f}ms {exact_ms:>9.2f}ms {fast_ms:>8.2f}ms  {loop_ms / exact_ms:6.1f}x"
+              f"   ({border} border points)")
+
+
+if __name__ == "__main__":
+    main()
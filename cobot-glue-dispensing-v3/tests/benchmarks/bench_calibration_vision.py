@@ -0,0 +1,158 @@
+"""
+Robot calibration vision: per-frame processing time on replayed recorded frames.
+
+The recorded frames are the 1280x720 views of the 17x11 stereo calibration board. Three
+calibration markers are pasted onto each, and the alignment of each marker is replayed:
+the scene shifts as the camera moves, halving the distance of the marker's top-left corner
+to the image center at every iteration, as ITERATE_ALIGNMENT does. Before the first
+iteration, all the markers are found once in the frame (LOOKING_FOR_ARUCO_MARKERS).
+
+  - previous: CalibrationVision as it was, detecting in the full frame and scanning the
+    detected ids for the marker, then once more to update its corner; pixels per mm from
+    the chessboard corners one pair of neighbours at a time
+  - current: CalibrationVision, detecting in the region predicted from where the marker
+    was last seen, an id -> index map built once per detection, and pixels per mm from
+    numpy differences of the corner grid
+
+Reports the time per iteration frame (detection and marker bookkeeping), the time of the
+pixels-per-mm computation, and the largest difference of the marker corners and the
+pixels per mm between the two.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_calibration_vision.py
+"""
+import glob
+import os
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from backend.system.utils.custom_logging import LoggerContext
+from libs.plvision.PLVision.arucoModule import ArucoDetector, ArucoDictionary
+from modules.robot_calibration.CalibrationVision import CalibrationVision
+
+RECORDED_FRAMES = sorted(glob.glob(os.path.join(
+    os.path.dirname(__file__), "..", "..", "modules", "VisionSystem", "calibration", "stereo_calibration",
+    "calibration_images", "left", "*.png")))
+BOARD = (17, 11)
+SQUARE_MM = 15
+MARKER_PX = 60
+MARKERS = {0: (60, 40), 1: (1140, 40), 2: (60, 600)}  # id -> top-left corner (px) in the first frame
+STEPS = 6  # alignment iterations per marker
+
+
+class DetectionSystem:
+    def __init__(self):
+        self.detector = ArucoDetector(arucoDict=ArucoDictionary.DICT_4X4_1000)
+
+    def detectArucoMarkers(self, flip=False, image=None):
+        corners, ids = self.detector.detectAll(image)
+        return corners, ids, image
+
+
+def with_markers(frame):
+    frame = frame.copy()
+    dictionary = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_4X4_1000)
+    for marker_id, (x, y) in MARKERS.items():
+        marker = cv2.aruco.generateImageMarker(dictionary, marker_id, MARKER_PX)
+        quiet = MARKER_PX // 5
+        frame[y - quiet:y + MARKER_PX + quiet, x - quiet:x + MARKER_PX + quiet] = 255
+        frame[y:y + MARKER_PX, x:x + MARKER_PX] = cv2.cvtColor(marker, cv2.COLOR_GRAY2BGR)
+    return frame
+
+
+def replay(frame, marker_id):
+    height, width = frame.shape[:2]
+    offset = np.array([width // 2, height // 2]) - MARKERS[marker_id]
+    for step in range(1, STEPS + 1):
+        dx, dy = offset * (1 - 0.5 ** step)
+        yield cv2.warpAffine(frame, np.float32([[1, 0, dx], [0, 1, dy]]), (width, height),
+                             borderMode=cv2.BORDER_REPLICATE)
+
+
+def previous_ppm(corners_refined):
+    """CalibrationVision.__compute_ppm_from_corners before it used numpy differences."""
+    cols, rows = BOARD
+    horiz, vert = [], []
+    for r in range(rows):
+        base = r * cols
+        for c in range(cols - 1):
+            pt1 = corners_refined[base + c, 0]
+            pt2 = corners_refined[base + c + 1, 0]
+            horiz.append(np.linalg.norm(pt2 - pt1))
+    for r in range(rows - 1):
+        for c in range(cols):
+            pt1 = corners_refined[r * cols + c, 0]
+            pt2 = corners_refined[(r + 1) * cols + c, 0]
+            vert.append(np.linalg.norm(pt2 - pt1))
+    all_d = np.array(horiz + vert, dtype=np.float32)
+    return float(np.mean(all_d)) / float(SQUARE_MM)
+
+
+def previous_iteration(system, frame, marker_id):
+    """detect_specific_marker and update_marker_top_left_corners before the predicted regions."""
+    arucoCorners, arucoIds, image = system.detectArucoMarkers(image=frame)
+    if arucoIds is None or marker_id not in arucoIds:
+        return None
+    for i, iter_marker_id in enumerate(arucoIds.flatten()):
+        if iter_marker_id != marker_id:
+            continue
+        return arucoCorners[i][0]
+
+
+def current_iteration(vision, frame, marker_id):
+    result = vision.detect_specific_marker(frame, marker_id)
+    if not result.found:
+        return None
+    vision.update_marker_top_left_corners(marker_id, result.aruco_corners, result.aruco_ids)
+    return vision.marker_corners_px[marker_id]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    logger_context = LoggerContext(enabled=False, logger=None)
+    system = DetectionSystem()
+    previous_ms, current_ms, corner_diffs = [], [], []
+    previous_ppm_ms, current_ppm_ms, ppm_diffs = [], [], []
+    for path in RECORDED_FRAMES:
+        recorded = cv2.imread(path)
+        vision = CalibrationVision(system, BOARD, SQUARE_MM, set(MARKERS), logger_context, None, False)
+        chessboard = vision.find_chessboard_and_compute_ppm(recorded.copy())
+        corners = vision.original_chessboard_corners
+        ppm, ms = timed(previous_ppm, corners)
+        previous_ppm_ms.append(ms)
+        vision.PPM, ms = timed(vision._CalibrationVision__compute_ppm_from_corners, corners)
+        current_ppm_ms.append(ms)
+        ppm_diffs.append(abs(ppm - chessboard.ppm))
+
+        frame = with_markers(recorded)
+        assert vision.find_required_aruco_markers(frame.copy()).found
+        for marker_id in MARKERS:
+            for iteration in replay(frame, marker_id):
+                previous, ms = timed(previous_iteration, system, iteration, marker_id)
+                previous_ms.append(ms)
+                current, ms = timed(current_iteration, vision, iteration, marker_id)
+                current_ms.append(ms)
+                corner_diffs.append(np.abs(previous - current).max())
+
+    print(f"{len(RECORDED_FRAMES)} recorded 1280x720 frames, {len(MARKERS)} markers, {STEPS} iterations each "
+          f"({len(previous_ms)} iteration frames)")
+    print(f"{'':<28} {'previous':>10} {'current':>10} {'speed-up':>9} {'max diff':>10}")
+    for name, average, previous, current, diff, unit in (
+            ("iteration frame, median", statistics.median, previous_ms, current_ms, corner_diffs, "px"),
+            ("iteration frame, mean", statistics.mean, previous_ms, current_ms, corner_diffs, "px"),
+            ("pixels per mm, median", statistics.median, previous_ppm_ms, current_ppm_ms, ppm_diffs, "px/mm")):
+        previous_average, current_average = average(previous), average(current)
+        print(f"{name:<28} {previous_average:>8.3f}ms {current_average:>8.3f}ms "
+              f"{previous_average / current_average:>8.1f}x {max(diff):>7.1e} {unit}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Camera calibration: time for 20 to 60 chessboard images, and whether the intrinsics match.
+
+Compares the previous CameraCalibrationService.run loop (cv2.findChessboardCorners on
+every full-resolution image in turn, cornerSubPix, then drawing and writing the annotated
+debug image before the next one) with the current one (images without a board rejected
+by cv2.checkChessboard, corners found on a downscaled copy where the board allows it and
+refined at full resolution, images spread over a process pool, debug images written by
+a background thread). Both end with the same
+cv2.calibrateCamera and save the results.
+
+The images are views of the default calibration board (32x20 inner corners, 20 mm
+squares) lying on a cluttered work table, from random poses, through a pinhole camera at
+the default 1280x720 and at 1920x1080, with vignetting, uneven lighting, blur and sensor
+noise; every tenth image shows no board (e.g. the board was moved away). Reports
+the calibration time and the largest difference of fx, fy, cx, cy and the distortion
+coefficients between the two.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_camera_calibration.py
+"""
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from modules.VisionSystem.calibration.cameraCalibration.CameraCalibrationService import CameraCalibrationService
+from modules.VisionSystem.calibration.cameraCalibration.chessboard_detection import MAX_WORKERS, \
+    detection_width
+
+BOARD = (32, 20)
+SQUARE_MM = 20
+SQUARE_PX = 24  # in the flat board image
+CAMERAS = ((1280, 720), (1920, 1080))  # the default resolution and a Full HD camera
+IMAGE_COUNTS = (20, 40, 60)
+EMPTY_EVERY = 10  # every tenth image shows no board
+
+
+def board_image():
+    columns, rows = BOARD[0] + 1, BOARD[1] + 1
+    squares = (np.indices((rows, columns)).sum(axis=0) % 2) * 255
+    board = np.kron(squares, np.ones((SQUARE_PX, SQUARE_PX))).astype(np.uint8)
+    return cv2.copyMakeBorder(board, SQUARE_PX, SQUARE_PX, SQUARE_PX, SQUARE_PX, cv2.BORDER_CONSTANT, value=255)
+
+
+def camera_matrix(size):
+    """Same field of view for every resolution."""
+    width, height = size
+    return np.array([[0.78 * width, 0, width / 2 + 5], [0, 0.78 * width, height / 2 - 5], [0, 0, 1]])
+
+
+def work_table(rng, size):
+    """Grey table with parts and tools lying around."""
+    width, height = size
+    table = np.full((height, width), 120, dtype=np.float32)
+    for _ in range(25):
+        x, y = rng.integers(0, width), rng.integers(0, height)
+        w, h = rng.integers(20, 160, 2) * width // 1280
+        cv2.rectangle(table, (int(x), int(y)), (int(x + w), int(y + h)), float(rng.integers(30, 220)), -1)
+    return table
+
+
+def render_view(rng, board, table):
+    """The board at a random pose 1-1.15 m in front of the camera, on the work table."""
+    rotation, _ = cv2.Rodrigues(rng.uniform([-0.3, -0.3, -0.15], [0.3, 0.3, 0.15]))
+    center = (np.array([*BOARD, 1]) - 1) / 2 * [SQUARE_MM, SQUARE_MM, 0]  # mm, from the first inner corner
+    translation = np.array([0, 0, rng.uniform(1000, 1150)]) + rng.uniform(-30, 30, 3) - rotation @ center
+    # Board image pixel -> board plane mm (the first inner corner is the origin) -> image
+    pixels_to_mm = np.array([[SQUARE_MM / SQUARE_PX, 0, -2 * SQUARE_MM], [0, SQUARE_MM / SQUARE_PX, -2 * SQUARE_MM],
+                             [0, 0, 1]])
+    size = table.shape[::-1]
+    homography = camera_matrix(size) @ np.column_stack([rotation[:, 0], rotation[:, 1], translation]) @ pixels_to_mm
+    return camera_image(rng, cv2.warpPerspective(board.astype(np.float32), homography, size,
+                                                 dst=table.copy(), flags=cv2.INTER_LINEAR,
+                                                 borderMode=cv2.BORDER_TRANSPARENT))
+
+
+def camera_image(rng, scene):
+    """Vignetting, a lighting gradient, lens blur and sensor noise."""
+    height, width = scene.shape
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    radius = np.hypot(x - width / 2, y - height / 2) / np.hypot(width / 2, height / 2)
+    light = (1 - 0.35 * radius ** 2) * (0.75 + 0.25 * x / width)
+    image = cv2.GaussianBlur(scene * 0.8 + 25, (0, 0), 1.2) * light + rng.normal(0, 4, scene.shape)
+    return cv2.cvtColor(np.clip(image, 0, 255).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+
+
+def render_images(rng, size, count):
+    board, table = board_image(), work_table(rng, size)
+    return [camera_image(rng, table) if index % EMPTY_EVERY == EMPTY_EVERY - 1 else render_view(rng, board, table)
+            for index in range(count)]
+
+
+def run_previous(images, directory):
+    """CameraCalibrationService.run before the downscaled, pooled detection (several images, no ArUco step)."""
+    chessboard_size = BOARD
+    objp = np.zeros((np.prod(chessboard_size), 3), np.float32)
+    objp[:, :2] = np.mgrid[0:chessboard_size[0], 0:chessboard_size[1]].T.reshape(-1, 2)
+    objp *= SQUARE_MM
+    objpoints, imgpoints = [], []
+    for idx, img in enumerate(images):
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        ret, corners = cv2.findChessboardCorners(gray, chessboard_size, None)
+        if ret:
+            objpoints.append(objp)
+            corners2 = cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1),
+                                        criteria=(cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001))
+            imgpoints.append(corners2)
+            cv2.drawChessboardCorners(img, chessboard_size, corners2, ret)
+            cv2.imwrite(os.path.join(directory, f'calib_result_{idx:03d}.png'), img)
+    ret, camera_matrix, dist_coeffs, rvecs, tvecs = cv2.calibrateCamera(objpoints, imgpoints, gray.shape[::-1],
+                                                                       None, None)
+    np.savez(os.path.join(directory, 'calibration_data.npz'), camera_matrix=camera_matrix, dist_coeffs=dist_coeffs,
+             rvecs=rvecs, tvecs=tvecs)
+    np.savez(os.path.join(directory, 'camera_calibration.npz'), mtx=camera_matrix, dist=dist_coeffs)
+    return camera_matrix, dist_coeffs, len(objpoints)
+
+
+def run_current(images, directory):
+    service = CameraCalibrationService(BOARD[0], BOARD[1], SQUARE_MM, 0, None, storagePath=directory)
+    service.calibrationImages = images
+    success, (dist_coeffs, camera_matrix), _, message = service.run(None)
+    assert success, message
+    return camera_matrix, dist_coeffs, int(message.split()[-2])
+
+
+def intrinsics(camera_matrix):
+    return np.array([camera_matrix[0, 0], camera_matrix[1, 1], camera_matrix[0, 2], camera_matrix[1, 2]])
+
+
+def main():
+    workers = min(os.cpu_count() or 1, MAX_WORKERS)
+    print(f"{BOARD[0]}x{BOARD[1]} board, every {EMPTY_EVERY}th image without it; "
+          f"{workers} detection worker(s) on {os.cpu_count()} CPU(s)")
+    print(f"{'camera':>9} {'detection':>9} {'images':>6} {'found':>6} {'previous':>10} {'current':>10} "
+          f"{'speed-up':>9} {'max |d fx,fy,cx,cy|':>20} {'max |d dist|':>13}")
+    for size in CAMERAS:
+        rng = np.random.default_rng(0)
+        all_images = render_images(rng, size, max(IMAGE_COUNTS))
+        detection = detection_width(size[0], BOARD) or size[0]
+        for count in IMAGE_COUNTS:
+            with tempfile.TemporaryDirectory() as previous_dir, tempfile.TemporaryDirectory() as current_dir, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                previous_matrix, previous_dist, found = run_previous([image.copy() for image in all_images[:count]],
+                                                                     previous_dir)
+                previous_s = time.perf_counter() - start
+                start = time.perf_counter()
+                current_matrix, current_dist, current_found = run_current(
+                    [image.copy() for image in all_images[:count]], current_dir)
+                current_s = time.perf_counter() - start
+            assert found == current_found
+            intrinsics_diff = np.abs(intrinsics(previous_matrix) - intrinsics(current_matrix)).max()
+            dist_diff = np.abs(previous_dist - current_dist).max()
+            print(f"{size[0]:>4}x{size[1]:<4} {detection:>7}px {count:>6} {found:>6} {previous_s:>9.2f}s "
+                  f"{current_s:>9.2f}s {previous_s / current_s:>8.1f}x {intrinsics_diff:>17.4f} px {dist_diff:>13.2e}")
+        print(f"{'':>9} true fx, fy, cx, cy {intrinsics(camera_matrix(size))}, "
+              f"estimated {np.round(intrinsics(current_matrix), 2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Camera recovery: how long the vision loop goes without fresh frames when the USB camera drops.
+
+A scripted camera delivers 30 fps and is unplugged for OUTAGES seconds. As with V4L2, a
+capture that lost its device fails every read at once and stays dead when the device
+comes back; only a new open recovers it. The vision loop captures frames in a loop, as
+VisionSystem.run does.
+
+  - previous: the Camera capture on the vision thread. The loop as wired never reopens
+    the device, so it spins on None for good; shown here is the best case of the old
+    code, the vision thread calling initializeCameraWithRetry (open and test read, fixed
+    retry_delay of 1 s between attempts) on the first failed read
+  - current: CameraSupervisor, reopening the device on its grab thread with an
+    exponential backoff (0.05 s doubling up to 0.5 s) while capture() serves the last
+    good frame as stale
+
+Each outage is run with the lengths in PHASES added, since when the device comes back
+relative to the retry attempts decides the recovery time. Reports per outage the median
+and worst recovery time (device back to the first fresh frame in the vision loop), the
+longest time the vision loop was blocked in a capture, and what the loop got during the
+outage: None (it spins), stale frames, or nothing at all (it is stalled).
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_camera_recovery.py
+"""
+import statistics
+import time
+
+import numpy as np
+
+from modules.VisionSystem.camera_supervisor import CameraSupervisor
+
+FRAME_INTERVAL = 1 / 30
+OUTAGES = [0.3, 1.0, 3.0]  # s
+PHASES = [0.0, 0.2, 0.4, 0.6, 0.8]  # s added to each outage, the retry loops are periodic
+UNPLUG_AT = 0.5  # s
+RUN_AFTER = 1.2  # s of running after the device is back
+RETRY_DELAY = 1.0
+MAX_RETRIES = 10
+
+
+class ScriptedCamera:
+    def __init__(self, outage):
+        self.outage = (UNPLUG_AT, UNPLUG_AT + outage)
+        self.created = time.perf_counter()
+
+    def now(self):
+        return time.perf_counter() - self.created
+
+    def unplugged(self):
+        return self.outage[0] <= self.now() < self.outage[1]
+
+    def open(self, camera_index=0, width=1280, height=720, fps=30):
+        return None if self.unplugged() else ScriptedCapture(self)
+
+
+class ScriptedCapture:
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    def __init__(self, camera):
+        self.camera = camera
+        self.lost = False
+
+    def read(self):
+        self.lost = self.lost or self.camera.unplugged()
+        if self.lost:
+            return False, None  # the read fails at once
+        time.sleep(FRAME_INTERVAL)
+        return True, self.frame
+
+    def release(self):
+        self.lost = True
+
+
+def previous_open(camera):
+    """CameraInitializer.initializeCameraWithRetry, on the vision thread."""
+    for attempt in range(MAX_RETRIES):
+        if attempt > 0:
+            time.sleep(RETRY_DELAY)
+        capture = camera.open()
+        if capture is not None:
+            ret, frame = capture.read()
+            if ret and frame is not None:
+                return capture
+            capture.release()
+    return None
+
+
+def previous_loop(camera, until):
+    """(seconds since start, frame, stale) per capture."""
+    captured = []
+    capture = previous_open(camera)
+    while camera.now() < until:
+        ret, frame = capture.read() if capture is not None else (False, None)
+        captured.append((camera.now(), frame if ret else None, False))
+        if not ret:
+            if capture is not None:
+                capture.release()
+            capture = previous_open(camera)
+    return captured
+
+
+def current_loop(camera, until):
+    captured = []
+    supervisor = CameraSupervisor(0, 1280, 720, open_capture=camera.open).start()
+    while camera.now() < until:
+        frame = supervisor.capture()
+        captured.append((camera.now(), frame, supervisor.frame_stale))
+    supervisor.stopCapture()
+    return captured
+
+
+def measure(loop, outage):
+    camera = ScriptedCamera(outage)
+    back = UNPLUG_AT + outage
+    captured = loop(camera, back + RUN_AFTER)
+    recovered = next(t for t, frame, stale in captured if t >= back and frame is not None and not stale)
+    times = [0.0] + [t for t, _, _ in captured]
+    blocked = max(np.diff(times))
+    during = [(frame, stale) for t, frame, stale in captured if UNPLUG_AT <= t < back]
+    nones = sum(1 for frame, _ in during if frame is None)
+    stale = sum(1 for frame, is_stale in during if frame is not None and is_stale)
+    return recovered - back, blocked, nones, stale
+
+
+def summarize(loop, outage):
+    runs = [measure(loop, outage + phase) for phase in PHASES]
+    recoveries = [run[0] for run in runs]
+    return (statistics.median(recoveries), max(recoveries), max(run[1] for run in runs),
+            statistics.median(run[2] for run in runs), statistics.median(run[3] for run in runs))
+
+
+def main():
+    print(f"30 fps camera unplugged at {UNPLUG_AT} s, outages + {PHASES} s; previous retry_delay {RETRY_DELAY} s")
+    print(f"{'':>7} | {'previous':^40} | {'current':^40}")
+    print(f"{'outage':>7} | " + " | ".join(
+        [f"{'recovery':>8} {'worst':>7} {'blocked':>8} {'None':>6} {'stale':>6}"] * 2))
+    for outage in OUTAGES:
+        results = (summarize(previous_loop, outage), summarize(current_loop, outage))
+        print(f"{outage:>6.1f}s | " + " | ".join(
+            f"{recovery * 1000:>6.0f}ms {worst * 1000:>5.0f}ms {blocked * 1000:>6.0f}ms {nones:>6.0f} {stale:>6.0f}"
+            for recovery, worst, blocked, nones, stale in results))
+
+
+if __name__ == "__main__":
+    main()
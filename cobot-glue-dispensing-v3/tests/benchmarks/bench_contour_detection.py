@@ -0,0 +1,134 @@
+"""
+Contour detection on a static and on a moving scene, at 1280x720.
+
+Compares the previous handle_contour_detection (threshold, morphology, RETR_TREE
+findContours, an unused np.unique over the threshold image and a threshold image
+published on every frame) with the current one: RETR_EXTERNAL, no dead computations, and
+a FrameChangeDetector that reuses the last contours while the scene is unchanged. Both
+run the full per-frame path of a calibrated system, image correction and publishing of
+the corrected image included.
+
+Reports the achievable frames per second (wall time per frame) and the CPU use at the
+camera's 25 fps (process CPU time per frame over the 40 ms frame interval). Static:
+the same parts in every frame, with fresh sensor noise. Moving: the parts shift by a
+few pixels every frame.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_contour_detection.py
+"""
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from backend.system.settings.CameraSettings import CameraSettings
+from modules.VisionSystem.calibration_store import CalibrationStore, FILE_NAMES
+from modules.VisionSystem.data_loading import DataManager
+from modules.VisionSystem.frame_change_detector import FrameChangeDetector
+from modules.VisionSystem.handlers import contour_detection_handler as handler
+from modules.VisionSystem.handlers.image_correction_handler import correct_image
+
+WIDTH, HEIGHT = 1280, 720
+FRAMES = 200
+CAMERA_FPS = 25
+PARTS = [(150, 120), (480, 160), (820, 110), (260, 430), (640, 460), (960, 420)]
+MTX = np.array([[1210.0, 0.0, 641.3], [0.0, 1205.0, 357.9], [0.0, 0.0, 1.0]])
+DIST = np.array([[-0.23, 0.11, 0.0008, -0.0011, -0.03]])
+PERSPECTIVE = np.array([[1.004, 0.012, -6.0], [-0.008, 0.998, 4.0], [0.0, 0.0, 1.0]])
+SPRAY_AREA = np.array([[40, 40], [1240, 40], [1240, 680], [40, 680]], dtype=np.float32)
+
+
+def find_contours_previous(vision_system, image):
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    settings = vision_system.camera_settings
+    if settings.get_gaussian_blur():
+        size = settings.get_blur_kernel_size() | 1
+        gray = cv2.GaussianBlur(gray, (size, size), 0)
+    threshold = vision_system.get_thresh_by_area(vision_system.threshold_by_area)
+    _, thresh = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY_INV)
+    unique_vals = np.unique(thresh)
+    vision_system.message_publisher.publish_thresh_image(thresh)
+    if settings.get_dilate_enabled():
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (settings.get_dilate_kernel_size(),) * 2)
+        thresh = cv2.dilate(thresh, kernel, iterations=settings.get_dilate_iterations())
+    if settings.get_erode_enabled():
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (settings.get_erode_kernel_size(),) * 2)
+        thresh = cv2.erode(thresh, kernel, iterations=settings.get_erode_iterations())
+    contours, hierarchy = cv2.findContours(thresh, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    return contours
+
+
+def handle_contour_detection_previous(vision_system):
+    vision_system.correctedImage = vision_system.correctImage(vision_system.image.copy())
+    contours = find_contours_previous(vision_system, vision_system.correctedImage)
+    approx = handler.approxContours(vision_system, contours)
+    filtered = handler.filter_contours_by_area(vision_system, approx)
+    inside = [cnt for cnt in filtered if handler.all_inside_spray_area(vision_system, cnt)]
+    if not inside:
+        return None, vision_system.correctedImage, None
+    vision_system.message_publisher.publish_latest_image(vision_system.correctedImage)
+    return inside, vision_system.correctedImage, None
+
+
+def make_vision(directory, detector):
+    settings = CameraSettings()
+    settings.set_resolution(WIDTH, HEIGHT)
+    publisher = SimpleNamespace(publish_thresh_image=lambda image: None, publish_latest_image=lambda image: None)
+    vision = SimpleNamespace(camera_settings=settings, threshold_by_area="spray", isSystemCalibrated=True,
+                             image=None, correctedImage=None, message_publisher=publisher)
+    vision.data_manager = DataManager(vision, False, None, store=CalibrationStore(directory))
+    vision.data_manager.sprayAreaPoints = SPRAY_AREA
+    vision.get_thresh_by_area = lambda area: settings.get_threshold()
+    vision.correctImage = lambda image: correct_image(vision, image)
+    if detector:
+        vision.change_detector = FrameChangeDetector()
+    return vision
+
+
+def render(parts, noise):
+    frame = np.full((HEIGHT, WIDTH, 3), 225, dtype=np.int16)
+    for x, y in parts:
+        cv2.rectangle(frame, (int(x), int(y)), (int(x) + 180, int(y) + 120), (25, 25, 25), -1)
+        cv2.circle(frame, (int(x) + 90, int(y) + 60), 25, (225, 225, 225), -1)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+
+def run(vision, detect, frames):
+    wall, cpu = time.perf_counter(), time.process_time()
+    for frame in frames:
+        vision.image = frame
+        detect(vision)
+    return ((time.perf_counter() - wall) * 1000 / len(frames), (time.process_time() - cpu) * 1000 / len(frames))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    noise = [np.round(rng.normal(0, 4, (HEIGHT, WIDTH, 1))).astype(np.int16) for _ in range(4)]
+    static = [render(PARTS, noise[i % 4]) for i in range(FRAMES)]
+    moving = [render([(x + 3 * (i % 40), y + 2 * (i % 40)) for x, y in PARTS], noise[i % 4]) for i in range(FRAMES)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        np.savez(os.path.join(directory, FILE_NAMES["camera_calibration"]), mtx=MTX, dist=DIST)
+        np.save(os.path.join(directory, FILE_NAMES["perspective_matrix"]), PERSPECTIVE)
+        results = {}
+        for scene, frames in (("static", static), ("moving", moving)):
+            previous = make_vision(directory, detector=False)
+            current = make_vision(directory, detector=True)
+            run(previous, handle_contour_detection_previous, frames[:5])  # Build the correction maps
+            run(current, handler.handle_contour_detection, frames[:5])
+            results[scene] = (run(previous, handle_contour_detection_previous, frames),
+                              run(current, handler.handle_contour_detection, frames))
+
+    interval = 1000 / CAMERA_FPS
+    print(f"{WIDTH}x{HEIGHT}, {len(PARTS)} parts, {FRAMES} frames per scene; CPU use at {CAMERA_FPS} fps")
+    print(f"{'':<8} {'previous':>22} {'current':>22}")
+    for scene, ((wall_0, cpu_0), (wall_1, cpu_1)) in results.items():
+        print(f"{scene:<8} {1000 / wall_0:>7.0f} fps {cpu_0 / interval:>7.0%} CPU "
+              f"{1000 / wall_1:>7.0f} fps {cpu_1 / interval:>7.0%} CPU")
+
+
+if __name__ == "__main__":
+    main()
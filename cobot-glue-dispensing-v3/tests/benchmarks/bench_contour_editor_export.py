@@ -0,0 +1,103 @@
+"""
+Point count and export time of BezierSegmentManager.to_wp_data: adaptive chord-error
+flattening versus the previous fixed sampling (5 samples per curved segment).
+
+The maximum chord error of the fixed sampling is reported alongside, since on tight
+curves it exceeds the adaptive tolerance.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_contour_editor_export.py
+"""
+import time
+
+import numpy as np
+from PyQt6.QtCore import QPointF
+
+from modules.shared.core.contour_editor.BezierSegmentManager import BezierSegmentManager
+from frontend.contour_editor.constants import PIXELS_PER_MM
+
+REPEATS = 20
+
+
+def circle(radius, n, center=(400, 300)):
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return np.stack([center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)], axis=1)
+
+
+def rounded_rectangle(width, height, radius, n_corner):
+    corners = [(width - radius, height - radius), (radius, height - radius), (radius, radius), (width - radius, radius)]
+    pts = []
+    for k, (cx, cy) in enumerate(corners):
+        angles = np.linspace(k * np.pi / 2, (k + 1) * np.pi / 2, n_corner)
+        pts.extend(zip(cx + radius * np.cos(angles), cy + radius * np.sin(angles)))
+    return np.array(pts)
+
+
+def star(n_tips, r_outer, r_inner):
+    angles = np.linspace(0, 2 * np.pi, 2 * n_tips, endpoint=False)
+    radii = np.where(np.arange(2 * n_tips) % 2 == 0, r_outer, r_inner)
+    return np.stack([400 + radii * np.cos(angles), 300 + radii * np.sin(angles)], axis=1)
+
+
+WORKPIECES = {
+    "circle_r200_24": circle(200, 24),
+    "circle_r20_12": circle(20, 12),
+    "rounded_rect": rounded_rectangle(600, 300, 40, 6),
+    "star_12": star(12, 250, 120),
+    "polygon_straight": circle(250, 8),
+}
+
+
+def build_manager(points):
+    manager = BezierSegmentManager()
+    manager.segments.clear()
+    contour = points.astype(np.float32).reshape(-1, 1, 2)
+    manager.segments.extend(manager.contour_to_bezier(contour, control_point_ratio=0.5))
+    # Pull every control outward so each span is a real curve
+    segment = manager.segments[0]
+    centre = points.mean(axis=0)
+    for i, ctrl in enumerate(segment.controls):
+        p0, p1 = segment.points[i], segment.points[i + 1]
+        mid = (p0 + p1) / 2
+        outward = np.array([mid.x(), mid.y()]) - centre
+        outward /= max(np.linalg.norm(outward), 1e-9)
+        bulge = 0.25 * np.hypot(p1.x() - p0.x(), p1.y() - p0.y())
+        segment.controls[i] = QPointF(mid.x() + outward[0] * bulge, mid.y() + outward[1] * bulge)
+    return manager
+
+
+def fixed_sampling_error(manager, samples=5):
+    worst = 0.0
+    segment = manager.segments[0]
+    for i, ctrl in enumerate(segment.controls):
+        if ctrl is None:
+            continue
+        p0 = np.array([segment.points[i].x(), segment.points[i].y()])
+        p1 = np.array([segment.points[i + 1].x(), segment.points[i + 1].y()])
+        c = np.array([ctrl.x(), ctrl.y()])
+        worst = max(worst, np.linalg.norm(p0 - 2 * c + p1) / (4 * samples ** 2))
+    return worst / PIXELS_PER_MM
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn()
+    return result, (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    print(f"{'workpiece':<18} | {'fixed pts':>9} {'fixed ms':>9} {'fixed err mm':>12} | "
+          f"{'adaptive pts':>12} {'adaptive ms':>11}")
+    for name, points in WORKPIECES.items():
+        manager = build_manager(points)
+        fixed, fixed_ms = timed(lambda: manager.to_wp_data(samples_per_segment=5))
+        adaptive, adaptive_ms = timed(lambda: manager.to_wp_data(chord_tolerance_mm=0.1))
+        n_fixed = sum(len(entry["contour"]) for entries in fixed.values() for entry in entries)
+        n_adaptive = sum(len(entry["contour"]) for entries in adaptive.values() for entry in entries)
+        print(f"{name:<18} | {n_fixed:>9} {fixed_ms:>9.2f} {fixed_sampling_error(manager):>12.3f} | "
+              f"{n_adaptive:>12} {adaptive_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
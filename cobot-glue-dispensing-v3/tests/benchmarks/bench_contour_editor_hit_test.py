@@ -0,0 +1,61 @@
+"""
+Hit-test rate of the contour editor on workpieces with 100, 1,000 and 10,000 points.
+
+Compares the grid-indexed BezierSegmentManager lookups with the previous full scan.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_contour_editor_hit_test.py
+"""
+import random
+import time
+
+from PyQt6.QtCore import QPointF
+
+from contour_editor.test_bezier_hit_testing import linear_drag_targets, linear_segment_at
+from modules.shared.core.contour_editor.BezierSegmentManager import BezierSegmentManager
+
+POINT_COUNTS = (100, 1_000, 10_000)
+POINTS_PER_SEGMENT = 100
+QUERIES = 2_000
+
+
+def build_manager(total_points, seed=3):
+    rng = random.Random(seed)
+    manager = BezierSegmentManager()
+    manager.segments.clear()
+    extent = max(400.0, (total_points ** 0.5) * 20)
+    for _ in range(max(1, total_points // POINTS_PER_SEGMENT)):
+        x, y = rng.uniform(0, extent), rng.uniform(0, extent)
+        points = []
+        for _ in range(min(POINTS_PER_SEGMENT, total_points)):
+            x += rng.uniform(-8, 8)
+            y += rng.uniform(-8, 8)
+            points.append(QPointF(x, y))
+        manager.segments.append(manager.create_segment(points, "Contour"))
+    return manager, extent
+
+
+def rate(fn, probes):
+    start = time.perf_counter()
+    for pos in probes:
+        fn(pos)
+    return len(probes) / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'points':>8} | {'drag idx/s':>12} {'drag scan/s':>12} | {'seg idx/s':>12} {'seg scan/s':>12}")
+    for count in POINT_COUNTS:
+        manager, extent = build_manager(count)
+        rng = random.Random(count)
+        probes = [QPointF(rng.uniform(0, extent), rng.uniform(0, extent)) for _ in range(QUERIES)]
+        manager.find_all_drag_targets(probes[0])  # build the index outside the timed loop
+
+        drag_indexed = rate(lambda p: manager.find_all_drag_targets(p, threshold=8), probes)
+        drag_linear = rate(lambda p: linear_drag_targets(manager, p, 8), probes)
+        seg_indexed = rate(lambda p: manager.find_segment_at(p, threshold=10), probes)
+        seg_linear = rate(lambda p: linear_segment_at(manager, p, 10), probes)
+        print(f"{count:>8} | {drag_indexed:>12.0f} {drag_linear:>12.0f} | {seg_indexed:>12.0f} {seg_linear:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Contour / glue path sequencing on 10 to 200 parts.
+
+Compares the previous sort_contours_by_proximity (greedy nearest centroid, recomputed
+on every pass) with backend.system.utils.path_sequencing: the KD-tree greedy order
+alone, then refined by the local search within its time budget. Contours are ordered
+by centroid. Open glue paths are ordered by their end points, with and without path
+reversal. Reports the travel distance between paths in pixels and the sequencing time.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_contour_sequencing.py
+"""
+import time
+
+import numpy as np
+
+from backend.system.utils.path_sequencing import DEFAULT_TIME_BUDGET_S, contour_centroids, sequence_paths
+from libs.plvision.PLVision import Contouring
+
+COUNTS = (10, 25, 50, 100, 200)
+AREA = (1280, 720)
+START = (0.0, 0.0)
+
+
+def _contours(count, rng):
+    centers = rng.uniform((40, 40), (AREA[0] - 40, AREA[1] - 40), size=(count, 2))
+    angle = np.linspace(0, 2 * np.pi, 24, endpoint=False)
+    return [np.column_stack([cx + 15 * np.cos(angle), cy + 10 * np.sin(angle)]).astype(np.int32).reshape(-1, 1, 2)
+            for cx, cy in centers]
+
+
+def sort_by_proximity_previous(contours, start_point):
+    """The previous implementation, with list.remove replaced by an index (it fails on arrays)."""
+    sorted_contours = []
+    current_point = start_point
+    remaining = list(range(len(contours)))
+    while remaining:
+        best = min(remaining, key=lambda k: (Contouring.calculateCentroid(contours[k])[0] - current_point[0]) ** 2
+                   + (Contouring.calculateCentroid(contours[k])[1] - current_point[1]) ** 2)
+        sorted_contours.append(contours[best])
+        current_point = Contouring.calculateCentroid(contours[best])
+        remaining.remove(best)
+    return sorted_contours
+
+
+def _travel(points):
+    points = np.vstack([START, points])
+    return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"\nTravel between parts in px (sequencing time), local search budget {DEFAULT_TIME_BUDGET_S * 1000:.0f} ms")
+    print(f"{'parts':>5}  {'previous greedy':>22}  {'KD-tree greedy':>22}  {'+ 2-opt / relocate':>22}  "
+          f"{'open paths, forward':>22}  {'open, reversible':>22}")
+    for count in COUNTS:
+        contours = _contours(count, rng)
+
+        start = time.perf_counter()
+        previous = sort_by_proximity_previous(contours, START)
+        previous_time = time.perf_counter() - start
+        previous_travel = _travel(contour_centroids(previous))
+
+        start = time.perf_counter()
+        centroids = contour_centroids(contours)
+        greedy = sequence_paths(centroids, start_point=START, time_budget=0)
+        greedy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        centroids = contour_centroids(contours)
+        improved = sequence_paths(centroids, start_point=START)
+        improved_time = time.perf_counter() - start
+
+        # Open glue paths: a 40-120 px stroke through each part, in a random direction
+        direction = rng.uniform(0, 2 * np.pi, size=count)
+        half = rng.uniform(20, 60, size=(count, 1)) * np.column_stack([np.cos(direction), np.sin(direction)])
+        forward = sequence_paths(centroids - half, centroids + half, start_point=START, allow_reverse=False)
+        reversible = sequence_paths(centroids - half, centroids + half, start_point=START)
+
+        def cell(travel, seconds):
+            return f"{travel:>9,.0f} ({seconds * 1000:>7.2f} ms)"
+
+        print(f"{count:>5}  {cell(previous_travel, previous_time):>22}  {cell(greedy.travel_distance, greedy_time):>22}  "
+              f"{cell(improved.travel_distance, improved_time):>22}  "
+              f"{cell(forward.travel_distance, forward.sequencing_time):>22}  "
+              f"{cell(reversible.travel_distance, reversible.sequencing_time):>22}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+End-to-end glue cell cycle with simulated hardware: capture, contour detection, matching,
+alignment, path generation, robot upload, dispensing and pick-and-place.
+
+Every stage runs the application's own code against the repo's mocks:
+  - a synthetic camera renders known workpieces at random, non-overlapping poses
+  - contour detection is handle_contour_detection with the default CameraSettings
+  - matching and alignment are CompareContours with the geometric strategy
+  - paths come from WorkpieceToSprayPathsGenerator, and are uploaded point by point with
+    the SENDING_PATH_POINTS state handler to TestRobotWrapper
+  - dispensing checks the glue level through GlueDataFetcher against mock_glue_server
+    (served on a free local port) and drives the generator and pump of GlueSprayService
+    over MockInstrument Modbus clients
+  - pick-and-place plans the drop-off with RasterNester and sends the pick and drop moves
+
+The robot and Modbus mocks answer immediately, so the stage times are the software cost
+plus the dwell times the code itself waits for (pump ramp and reverse, Modbus write pacing).
+Those dwell times are shortened in SPRAY_SETTINGS to keep a cycle short.
+
+Writes p50/p90/p99 latency per stage and for the whole cycle to a JSON file, tagged with
+the git commit, so two commits can be compared with --baseline.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_cycle.py [--cycles N] [--output cycle.json] [--baseline old.json]
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import cv2
+import minimalmodbus
+import numpy as np
+from werkzeug.serving import make_server
+
+from applications.glue_dispensing_application.glue_process.ExecutionContext import ExecutionContext
+from applications.glue_dispensing_application.glue_process.PumpController import PumpController
+from applications.glue_dispensing_application.glue_process.glue_dispensing_operation import \
+    glue_dispensing_logger_context
+from applications.glue_dispensing_application.glue_process.state_handlers.sending_path_to_robot_state_handler import \
+    handle_send_path_to_robot
+from applications.glue_dispensing_application.glue_process.state_machine.GlueProcessState import GlueProcessState
+from applications.glue_dispensing_application.handlers.workpieces_to_spray_paths_handler import \
+    WorkpieceToSprayPathsGenerator
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from applications.glue_dispensing_application.pick_and_place_process.Plane import Plane
+from applications.glue_dispensing_application.pick_and_place_process.nesting_engine import RasterNester
+from applications.glue_dispensing_application.services.glueSprayService.GlueSprayService import GlueSprayService
+from applications.glue_dispensing_application.settings.GlueSettings import GlueSettings
+from backend import mock_glue_server
+from backend.system.contour_matching.CompareContours import match_workpieces, prepare_data_for_alignment
+from backend.system.contour_matching.alignment.contour_aligner import _alignContours
+from backend.system.contour_matching.matching.strategies.geometric_matching_strategy import \
+    GeometricMatchingStrategy
+from backend.system.settings.CameraSettings import CameraSettings
+from backend.system.settings.robotConfig.robotConfigModel import get_default_config
+from backend.system.utils.contours import close_contours_if_open
+from core.model.robot.fairino_robot import TestRobotWrapper
+from modules.VisionSystem.calibration_store import CalibrationStore
+from modules.VisionSystem.data_loading import DataManager
+from modules.VisionSystem.handlers.contour_detection_handler import handle_contour_detection
+from modules.modbusCommunication.MockClient import MockInstrument
+from modules.shared.tools.GlueCell import GlueDataFetcher, GlueType
+from modules.shared.tools.enums.Gripper import Gripper
+from modules.shared.tools.enums.Program import Program
+from modules.shared.tools.enums.ToolID import ToolID
+from modules.shared.utils import metrics
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+STAGES = ("capture", "contour_detection", "matching", "alignment", "path_generation",
+          "robot_upload", "dispensing", "pick_and_place")
+FRAME_SIZE = (1280, 720)
+BACKGROUND, PART = 215, 45
+SPRAY_AREA = np.array([[40, 40], [1240, 40], [1240, 680], [40, 680]], dtype=np.float32)
+PARTS_PER_FRAME = 3
+# Pixels to robot millimetres: 0.5 mm/px, camera centre over robot (0, 450)
+CAMERA_TO_ROBOT = np.array([[0.5, 0.0, -320.0], [0.0, -0.5, 630.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+SAFE_Z, PICK_Z = 300.0, 180.0
+
+# Segment settings of a stored workpiece, with the pump ramp and reverse dwell shortened
+SPRAY_SETTINGS = {
+    "Spray Width": "10", "Spraying Height": "0", "Fan Speed": "100", "Generator-Glue Delay": "0",
+    "Pump Speed": "500", "Pump Reverse Time": "0.05", "Pump Speed Reverse": "3000", "RZ Angle": "0",
+    "Glue Type": "Type A", "Generator Timeout": "5", "Time Before Motion": "0.1", "Time Before Stop": "1.0",
+    "Reach Start Threshold": "1.0", "Reach End Threshold": "30.0", "Glue Speed Coefficient": "5",
+    "Glue Acceleration Coefficient": "0", "Initial Ramp Speed Duration": "0.05", "Initial Ramp Speed": "5000",
+    "Reverse Ramp Steps": "1", "Forward Ramp Steps": "3", "Velocity": "60", "Acceleration": "30",
+}
+
+
+def _arc(center, radius, start, stop, points):
+    angle = np.radians(np.linspace(start, stop, points))
+    return np.column_stack([center[0] + radius * np.cos(angle), center[1] + radius * np.sin(angle)])
+
+
+def template_shapes():
+    """Workpiece outlines at their taught pose, around the origin, with clearly different areas."""
+    bracket = np.array([[-140, -90], [140, -90], [140, -20], [-60, -20], [-60, 90], [-140, 90]], dtype=np.float64)
+    rounded = np.vstack([_arc((60, -40), 40, -90, 0, 12), _arc((60, 40), 40, 0, 90, 12),
+                         _arc((-60, 40), 40, 90, 180, 12), _arc((-60, -40), 40, 180, 270, 12)])
+    hexagon = _arc((0, 0), 70, 0, 300, 6)
+    return {"bracket": bracket, "rounded": rounded, "hexagon": hexagon}
+
+
+def _inset(points, distance):
+    """Spray path: the outline pulled towards its centroid."""
+    centroid = points.mean(axis=0)
+    direction = points - centroid
+    return centroid + direction * (1 - distance / np.linalg.norm(direction, axis=1, keepdims=True))
+
+
+def build_workpieces(shapes):
+    """GlueWorkpieces taught at the frame centre, each with one spray contour."""
+    center = np.array(FRAME_SIZE, dtype=np.float64) / 2
+    workpieces = []
+    for workpiece_id, (name, outline) in enumerate(shapes.items(), 1):
+        taught = (outline + center).astype(np.float32)
+        spray = _inset(outline, 12) + center
+        workpieces.append(GlueWorkpiece(
+            workpieceId=str(workpiece_id), name=name, description="", toolID=ToolID.Tool0, gripperID=Gripper.SINGLE,
+            glueType=GlueType.TypeA, program=Program.TRACE, material="Material1",
+            contour={"contour": taught.reshape(-1, 1, 2), "settings": {}}, offset="0", height="4", nozzles=[],
+            contourArea=str(cv2.contourArea(taught)), glueQty="", sprayWidth="10",
+            pickupPoint=f"{center[0]:.2f},{center[1]:.2f}",
+            sprayPattern={"Contour": [{"contour": spray.reshape(-1, 1, 2).astype(np.float32),
+                                       "settings": dict(SPRAY_SETTINGS)}],
+                          "Fill": []}))
+    return workpieces
+
+
+class SyntheticCamera:
+    """Renders the workpiece outlines at random poses on a bright table, with sensor noise."""
+
+    def __init__(self, shapes, rng, parts=PARTS_PER_FRAME):
+        self.shapes = shapes
+        self.rng = rng
+        self.parts = parts
+        self.last_poses = []
+        # Drawing fresh noise costs more than the rest of the capture, so cycle through a few frames of it
+        self.noise = [np.round(rng.normal(0, 4, (FRAME_SIZE[1], FRAME_SIZE[0], 1))).astype(np.int16)
+                      for _ in range(4)]
+        self.frames = 0
+
+    def _random_poses(self):
+        names = list(self.rng.choice(list(self.shapes), size=self.parts, replace=False))
+        poses = []
+        while len(poses) < len(names):
+            name = names[len(poses)]
+            radius = np.linalg.norm(self.shapes[name], axis=1).max() + 15
+            center = self.rng.uniform([SPRAY_AREA[0, 0] + radius, SPRAY_AREA[0, 1] + radius],
+                                      [SPRAY_AREA[2, 0] - radius, SPRAY_AREA[2, 1] - radius])
+            if all(np.hypot(*(center - c)) > radius + r for _, c, _, r in poses):
+                poses.append((name, center, self.rng.uniform(0, 360), radius))
+        return poses
+
+    def capture(self):
+        frame = np.full((FRAME_SIZE[1], FRAME_SIZE[0], 3), BACKGROUND, dtype=np.uint8)
+        self.last_poses = self._random_poses()
+        for name, center, angle, _ in self.last_poses:
+            a = math.radians(angle)
+            rotation = np.array([[math.cos(a), -math.sin(a)], [math.sin(a), math.cos(a)]])
+            points = self.shapes[name] @ rotation.T + center
+            cv2.fillPoly(frame, [np.round(points * 16).astype(np.int32)], (PART, PART, PART),
+                         lineType=cv2.LINE_AA, shift=4)
+        noise = self.noise[self.frames % len(self.noise)]
+        self.frames += 1
+        return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+
+class NullPublisher:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class SimulatedCell:
+    """The mocks and application objects one cycle runs against."""
+
+    def __init__(self, seed):
+        self.rng = np.random.default_rng(seed)
+        self.shapes = template_shapes()
+        self.workpieces = build_workpieces(self.shapes)
+        self.camera = SyntheticCamera(self.shapes, self.rng)
+        self.robot_config = get_default_config()
+        self.robot = TestRobotWrapper()
+
+        # Calibration items are only held in memory; the directory is never written
+        data_manager = DataManager(None, False, None, store=CalibrationStore(
+            os.path.join(tempfile.gettempdir(), "bench_cycle_calibration")))
+        data_manager.sprayAreaPoints = SPRAY_AREA
+        self.vision = SimpleNamespace(
+            camera_settings=CameraSettings(), threshold_by_area="spray", isSystemCalibrated=False,
+            image=None, correctedImage=None, message_publisher=NullPublisher(), data_manager=data_manager)
+        self.vision.get_thresh_by_area = lambda area: self.vision.camera_settings.get_threshold()
+
+        application = SimpleNamespace(
+            robotService=SimpleNamespace(robot_config=self.robot_config),
+            visionService=SimpleNamespace(cameraToRobotMatrix=CAMERA_TO_ROBOT),
+            get_transducer_offsets=lambda: [self.robot_config.tcp_x_offset, self.robot_config.tcp_y_offset],
+            get_dynamic_offsets_config=lambda: None)
+        self.path_generator = WorkpieceToSprayPathsGenerator(application)
+
+        # The Modbus services open a minimalmodbus.Instrument per call
+        minimalmodbus.Instrument = MockInstrument
+        self.spray_service = GlueSprayService(GlueSettings())
+        self.pump_controller = PumpController(True, glue_dispensing_logger_context, self.spray_service.settings)
+
+        self.glue_server = make_server("127.0.0.1", 0, mock_glue_server.app, threaded=True)
+        threading.Thread(target=self.glue_server.serve_forever, daemon=True).start()
+        self.glue_fetcher = GlueDataFetcher()
+        self.glue_fetcher.url = f"http://127.0.0.1:{self.glue_server.server_port}/weights"
+
+    def close(self):
+        self.glue_server.shutdown()
+
+    # --- Stages ---
+
+    def detect(self, frame):
+        self.vision.image = frame
+        contours, _, _ = handle_contour_detection(self.vision)
+        return contours or []
+
+    def match(self, contours):
+        matched, _, _ = match_workpieces(self.workpieces, close_contours_if_open(list(contours)),
+                                         GeometricMatchingStrategy(similarity_threshold=0.8))
+        return matched
+
+    def align(self, matched):
+        return _alignContours(prepare_data_for_alignment(matched))["workpieces"]
+
+    def upload(self, paths):
+        context = ExecutionContext()
+        context.robot_service = SimpleNamespace(robot=self.robot, robot_config=self.robot_config)
+        context.state_machine = SimpleNamespace(state=GlueProcessState.SENDING_PATH_POINTS)
+        for path_index, (path, settings) in enumerate(paths):
+            context.current_path_index, context.current_point_index = path_index, 0
+            context.current_path, context.current_settings = path, settings
+            if handle_send_path_to_robot(context) != GlueProcessState.WAIT_FOR_PATH_COMPLETION:
+                raise RuntimeError(f"Upload of path {path_index} failed")
+
+    def dispense(self, paths):
+        self.glue_fetcher.fetch()
+        if self.glue_fetcher.weight1 <= 0:
+            raise RuntimeError("Glue level unavailable from the mock glue server")
+        glue_type = self.spray_service.glueA_addresses
+        self.spray_service.generatorOn()
+        for _, settings in paths:
+            self.pump_controller.pump_on(self.spray_service, None, glue_type, settings)
+            self.pump_controller.pump_off(self.spray_service, None, glue_type, settings)
+        self.spray_service.generatorOff()
+
+    def pick_and_place(self, workpieces):
+        contours, pivots = [], []
+        for workpiece in workpieces:
+            contour = np.asarray(workpiece.get_main_contour(), dtype=np.float32).reshape(-1, 1, 2)
+            contours.append(cv2.perspectiveTransform(contour, CAMERA_TO_ROBOT).reshape(-1, 2))
+            pickup = np.array([[[float(v) for v in workpiece.pickupPoint.split(",")]]], dtype=np.float32)
+            pivots.append(tuple(cv2.perspectiveTransform(pickup, CAMERA_TO_ROBOT)[0, 0]))
+        plan = RasterNester(Plane()).plan(contours, pivots)
+        for placement in plan.placements:
+            x, y = pivots[placement.index]
+            drop_x, drop_y = placement.drop_point
+            for position in ([x, y, SAFE_Z], [x, y, PICK_Z], [x, y, SAFE_Z],
+                             [drop_x, drop_y, SAFE_Z], [drop_x, drop_y, PICK_Z], [drop_x, drop_y, SAFE_Z]):
+                self.robot.move_cartesian(position + [180.0, 0.0, placement.rotation])
+        return plan
+
+    def run_cycle(self):
+        """Run one cycle, returning the stage durations in seconds and the part counts."""
+        times = {}
+
+        def timed(stage, fn, *args):
+            start = time.perf_counter()
+            result = fn(*args)
+            times[stage] = time.perf_counter() - start
+            return result
+
+        frame = timed("capture", self.camera.capture)
+        contours = timed("contour_detection", self.detect, frame)
+        matched = timed("matching", self.match, contours)
+        aligned = timed("alignment", self.align, matched)
+        paths = timed("path_generation", self.path_generator.generate_robot_paths, aligned)
+        timed("robot_upload", self.upload, paths)
+        timed("dispensing", self.dispense, paths)
+        plan = timed("pick_and_place", self.pick_and_place, aligned)
+        counts = {"rendered": len(self.camera.last_poses), "detected": len(contours), "matched": len(matched),
+                  "paths": len(paths), "placed": len(plan.placements)}
+        return times, counts
+
+
+def percentiles(samples):
+    ms = np.asarray(samples) * 1000
+    return {"p50_ms": round(float(np.percentile(ms, 50)), 3), "p90_ms": round(float(np.percentile(ms, 90)), 3),
+            "p99_ms": round(float(np.percentile(ms, 99)), 3), "mean_ms": round(float(ms.mean()), 3),
+            "max_ms": round(float(ms.max()), 3)}
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(cycles, seed=0, warmup=2, quiet=True):
+    """Run warm-up plus ``cycles`` measured cycles and return the JSON-ready report."""
+    samples = {stage: [] for stage in STAGES + ("cycle",)}
+    totals = {}
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            # The mocks print every command they receive and the services log every Modbus write
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+            stack.enter_context(contextlib.redirect_stderr(devnull))
+        cell = SimulatedCell(seed)
+        try:
+            for index in range(warmup + cycles):
+                if index == warmup:
+                    metrics.reset()
+                times, counts = cell.run_cycle()
+                if index < warmup:
+                    continue
+                for stage in STAGES:
+                    samples[stage].append(times[stage])
+                samples["cycle"].append(sum(times.values()))
+                for key, value in counts.items():
+                    totals[key] = totals.get(key, 0) + value
+        finally:
+            cell.close()
+    return {
+        "commit": _commit(),
+        "cycles": cycles,
+        "seed": seed,
+        "parts_per_frame": PARTS_PER_FRAME,
+        "counts": totals,
+        "stages": {stage: percentiles(samples[stage]) for stage in STAGES + ("cycle",)},
+        # What the in-process instrumentation recorded over the measured cycles
+        "metrics": metrics.snapshot(),
+    }
+
+
+def print_report(report, baseline=None):
+    print(f"\n{report['cycles']} cycles at commit {report['commit']}, {report['parts_per_frame']} parts per frame: "
+          + ", ".join(f"{key} {value}" for key, value in report["counts"].items()))
+    header = f"{'stage':<18} {'p50':>9} {'p90':>9} {'p99':>9}"
+    print(header + (f"  {'p50 vs ' + str(baseline.get('commit')):>16}" if baseline else ""))
+    for stage, stats in report["stages"].items():
+        line = f"{stage:<18} {stats['p50_ms']:>7.2f}ms {stats['p90_ms']:>7.2f}ms {stats['p99_ms']:>7.2f}ms"
+        if baseline and stage in baseline["stages"]:
+            before = baseline["stages"][stage]["p50_ms"]
+            line += f"  {(stats['p50_ms'] - before) / before * 100 if before else 0.0:>+15.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="cycle_benchmark.json")
+    parser.add_argument("--baseline", help="report of another commit to compare against")
+    args = parser.parse_args()
+
+    report = run(args.cycles, seed=args.seed)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Training dataset build: 100,000 contour pairs with the sharded build_feature_dataset
+job on 1, 4 and 8 worker processes, against the previous per-pair
+compute_enhanced_features path (timed on a sample of pairs).
+
+The contours come from generate_synthetic_dataset with the training script's settings
+(22 shapes x 6 scales x 6 rotations x 6 noise variants). Reports pairs per second and
+peak resident memory of the parent and of the largest worker.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_dataset_build.py [n_pairs]
+"""
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+# The training scripts import their siblings by module name
+sys.path.insert(0, os.path.join(ROOT, "modules", "shapeMatchinModelTraining"))
+
+from datasetGeneration import generate_synthetic_dataset  # noqa: E402
+from modules.shapeMatchinModelTraining.datasetBuilder import build_feature_dataset, \
+    generate_balanced_pair_indices, load_feature_dataset  # noqa: E402
+from modules.shapeMatchinModelTraining.featuresExtraction import compute_enhanced_features  # noqa: E402
+
+N_PAIRS = 100_000
+WORKER_COUNTS = (1, 4, 8)
+BASELINE_SAMPLE = 2_000
+
+
+def _peak_mb(who):
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def main():
+    n_pairs = int(sys.argv[1]) if len(sys.argv) > 1 else N_PAIRS
+    random.seed(0)
+    np.random.seed(0)
+    dataset = generate_synthetic_dataset(n_shapes=22, n_scales=6, n_variants=6, n_noisy=6)
+    print(f"\n{len(dataset):,} contours, {n_pairs:,} pairs, {os.cpu_count()} CPU(s) available")
+
+    pairs = generate_balanced_pair_indices([s.object_id for s in dataset], n_pairs)[:BASELINE_SAMPLE]
+    start = time.perf_counter()
+    for i, j, _ in pairs:
+        compute_enhanced_features(dataset[i].contour, dataset[j].contour)
+    baseline = len(pairs) / (time.perf_counter() - start)
+    print(f"{'per-pair features':<24} {baseline:>10,.0f} pairs/s  (1 process, {len(pairs):,}-pair sample, "
+          f"~{n_pairs / baseline:.0f} s for {n_pairs:,})")
+
+    for workers in WORKER_COUNTS:
+        output_dir = tempfile.mkdtemp(prefix="bench_dataset_")
+        try:
+            start = time.perf_counter()
+            stats = build_feature_dataset(dataset, output_dir, n_pairs=n_pairs, shard_size=2000, workers=workers)
+            elapsed = time.perf_counter() - start
+            X, y = load_feature_dataset(output_dir)
+            print(f"{'sharded, ' + str(workers) + ' worker(s)':<24} {n_pairs / elapsed:>10,.0f} pairs/s  "
+                  f"({elapsed:.1f} s: descriptors {stats['descriptor_seconds']:.1f} s, "
+                  f"pairs {stats['feature_seconds']:.1f} s)  X {X.shape} {X.dtype} {X.nbytes / 1e6:.0f} MB  "
+                  f"peak RSS parent {_peak_mb(resource.RUSAGE_SELF):.0f} MB, "
+                  f"worker {_peak_mb(resource.RUSAGE_CHILDREN):.0f} MB")
+        finally:
+            shutil.rmtree(output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+DXF-to-contour conversion: raster round trip (matplotlib PNG + findContours) versus the
+direct vector path.
+
+For each sample DXF reports the conversion time of both paths and the distance of the
+raster contour points to the vector contours in millimetres (the raster error, since
+the vector contours are within the chord tolerance of the true geometry).
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_dxf_conversion.py [file.dxf ...]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from backend.system.utils.dxf.DxfConverter import DxfConverter
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SAMPLE_DXFS = [
+    os.path.join(ROOT, "modules", "shared", "core", "dxf", "CustomPart.dxf"),
+    os.path.join(ROOT, "modules", "shared", "core", "dxf", "CustomPartSplines.dxf"),
+    os.path.join(ROOT, "src", "frontend", "contour_editor", "dxf", "test.dxf"),
+    os.path.join(ROOT, "src", "frontend", "contour_editor", "dxf", "dxf1.dxf"),
+]
+TARGET_SIZE_MM = (748, 498)
+TARGET_SIZE_PX = (1280, 720)
+
+
+def convert(path, vector):
+    converter = DxfConverter(path, mode="json", vector=vector, target_size_mm=TARGET_SIZE_MM,
+                             target_size_px=TARGET_SIZE_PX)
+    start = time.perf_counter()
+    _, contours = converter.process()
+    return [np.array(c, dtype=np.float32).reshape(-1, 1, 2) for c in contours], time.perf_counter() - start
+
+
+def raster_error_mm(raster, vector):
+    mm_per_px = TARGET_SIZE_MM[0] / TARGET_SIZE_PX[0]
+    distances = []
+    for contour in raster:
+        for x, y in contour.reshape(-1, 2):
+            distances.append(min(abs(cv2.pointPolygonTest(v, (float(x), float(y)), True)) for v in vector))
+    distances = np.array(distances) * mm_per_px
+    return np.median(distances), distances.max()
+
+
+def main(paths):
+    print(f"{'file':<28} | {'raster ms':>9} {'vector ms':>9} | {'raster n':>8} {'vector n':>8} | "
+          f"{'median err mm':>13} {'max err mm':>10}")
+    for path in paths:
+        with tempfile.TemporaryDirectory() as tmp:
+            local = shutil.copy(path, tmp)
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                vector, vector_s = convert(local, vector=True)
+                try:
+                    raster, raster_s = convert(local, vector=False)
+                except Exception as e:
+                    print(f"{os.path.basename(path)}: raster path failed ({e})")
+                    raster, raster_s = [], float("nan")
+            finally:
+                os.chdir(cwd)
+        median_err, max_err = raster_error_mm(raster, vector) if raster and vector else (float("nan"),) * 2
+        print(f"{os.path.basename(path):<28} | {raster_s * 1000:>9.1f} {vector_s * 1000:>9.1f} | "
+              f"{len(raster):>8} {len(vector):>8} | {median_err:>13.3f} {max_err:>10.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or SAMPLE_DXFS)
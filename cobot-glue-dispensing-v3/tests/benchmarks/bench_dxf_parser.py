@@ -0,0 +1,55 @@
+"""
+DXFPathExtractor import time on generated DXFs: cold parse, cached re-import and the
+number of points produced for arcs, circles and control-point splines at several tolerances.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_dxf_parser.py
+"""
+import os
+import random
+import tempfile
+import time
+
+import ezdxf
+
+from modules.shared.core.dxf.DxfParser import DXFPathExtractor, clear_parse_cache
+
+TOLERANCES = (0.5, 0.05, 0.005)
+
+
+def generate_dxf(path, n_splines=200, n_circles=200, seed=5):
+    rng = random.Random(seed)
+    doc = ezdxf.new()
+    for layer in ("External", "Contour", "Fill"):
+        doc.layers.add(layer)
+    msp = doc.modelspace()
+    for _ in range(n_splines):
+        x, y = rng.uniform(0, 800), rng.uniform(0, 500)
+        ctrl = [(x + i * 15, y + rng.uniform(-30, 30)) for i in range(8)]
+        msp.add_open_spline(ctrl, degree=3, dxfattribs={"layer": "Contour"})
+    for _ in range(n_circles):
+        msp.add_circle((rng.uniform(0, 800), rng.uniform(0, 500)), rng.choice([1, 5, 50, 200]),
+                       dxfattribs={"layer": "Fill"})
+    msp.add_arc((400, 250), 300, 10, 170, dxfattribs={"layer": "External"})
+    doc.saveas(path)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "generated.dxf")
+        generate_dxf(path)
+        print(f"{'tolerance':>9} | {'cold ms':>8} {'cached ms':>9} | {'points':>7}")
+        for tolerance in TOLERANCES:
+            clear_parse_cache()
+            start = time.perf_counter()
+            extractor = DXFPathExtractor(path, tolerance=tolerance)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            DXFPathExtractor(path, tolerance=tolerance)
+            cached = time.perf_counter() - start
+            points = sum(len(p) for paths in extractor.get_paths() for p in paths)
+            print(f"{tolerance:>9} | {cold * 1000:>8.1f} {cached * 1000:>9.2f} | {points:>7}")
+
+
+if __name__ == "__main__":
+    main()
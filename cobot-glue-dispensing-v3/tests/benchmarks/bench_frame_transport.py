@@ -0,0 +1,126 @@
+"""
+Frame transport from the vision process to a UI consumer at 30 fps.
+
+Compares sending every frame through a multiprocessing queue (the frame is pickled,
+pushed through a pipe and unpickled) with the SharedFrameChannel of
+modules.VisionSystem.frame_channel, where the frame is written once into shared memory
+and only a {"channel", "seq"} notification crosses the queue. The consumer does what
+the dashboard does with a frame: resize it to the preview size.
+
+Reports frame copies per frame, the memory bandwidth they cost and the latency from
+the producer having a frame to the consumer's preview being ready.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_frame_transport.py
+"""
+import multiprocessing
+import time
+import uuid
+
+import cv2
+import numpy as np
+
+from modules.VisionSystem.frame_channel import SharedFrameChannel, frame_from_message, register_channel
+
+FPS = 30
+FRAMES = 150
+FRAME_SHAPE = (720, 1280, 3)
+PREVIEW_SIZE = (640, 360)
+# User-space copies of the full frame between producer and consumer
+QUEUE_COPIES = 3  # pickle into a bytes object, pipe read buffer, unpickle into an array
+CHANNEL_COPIES = 2  # write into the shared slot, checked copy out of it
+
+
+def _frames():
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, FRAME_SHAPE, dtype=np.uint8)
+    return [np.roll(base, i, axis=1) for i in range(8)]
+
+
+def _produce_queue(queue):
+    frames = _frames()
+    for i in range(FRAMES):
+        started = time.perf_counter()
+        queue.put((started, frames[i % len(frames)]))
+        time.sleep(max(0.0, 1.0 / FPS - (time.perf_counter() - started)))
+    queue.put(None)
+
+
+def _produce_channel(queue, done, name):
+    frames = _frames()
+    channel = SharedFrameChannel.create(name=name, capacity=frames[0].nbytes)
+    queue.put("ready")
+    for i in range(FRAMES):
+        started = time.perf_counter()
+        seq = channel.write(frames[i % len(frames)])
+        queue.put((started, channel.notification(seq)))
+        time.sleep(max(0.0, 1.0 / FPS - (time.perf_counter() - started)))
+    queue.put(None)
+    done.get()  # keep the block alive until the consumer is done
+    channel.close()
+
+
+def _consume(queue, resolve, done=None):
+    latencies = []
+    dropped = 0
+    while True:
+        item = queue.get()
+        if item is None:
+            break
+        started, payload = item
+        frame = resolve(payload)
+        if frame is None:
+            dropped += 1
+            continue
+        cv2.resize(frame, PREVIEW_SIZE)
+        latencies.append(time.perf_counter() - started)
+    if done is not None:
+        done.put("done")
+    return np.array(latencies) * 1000, dropped
+
+
+def _report(label, latencies, dropped, copies):
+    frame_bytes = int(np.prod(FRAME_SHAPE))
+    bandwidth = copies * frame_bytes * FPS / 1e6
+    print(f"{label:<22} copies/frame {copies}   bandwidth {bandwidth:7.1f} MB/s   "
+          f"latency p50 {np.percentile(latencies, 50):6.2f} ms  p95 {np.percentile(latencies, 95):6.2f} ms  "
+          f"max {latencies.max():6.2f} ms   dropped {dropped}")
+
+
+def main():
+    context = multiprocessing.get_context("spawn")
+    print(f"{FRAMES} frames of {FRAME_SHAPE[1]}x{FRAME_SHAPE[0]}x{FRAME_SHAPE[2]} at {FPS} fps, "
+          f"consumer in a separate process")
+
+    queue = context.Queue(maxsize=4)
+    producer = context.Process(target=_produce_queue, args=(queue,))
+    producer.start()
+    latencies, dropped = _consume(queue, lambda frame: frame)
+    producer.join()
+    _report("pickled queue", latencies, dropped, QUEUE_COPIES)
+
+    queue = context.Queue(maxsize=4)
+    done = context.Queue()
+    name = f"bench_{uuid.uuid4().hex[:12]}"
+    producer = context.Process(target=_produce_channel, args=(queue, done, name))
+    producer.start()
+    queue.get()
+    latencies, dropped = _consume(queue, frame_from_message, done)
+    producer.join()
+    _report("shared frame channel", latencies, dropped, CHANNEL_COPIES)
+
+    # In-process subscriber, as the dashboard is today
+    channel = SharedFrameChannel.create(name=f"bench_{uuid.uuid4().hex[:12]}", capacity=int(np.prod(FRAME_SHAPE)))
+    register_channel(channel)
+    frames = _frames()
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        frame = frame_from_message(channel.notification(channel.write(frames[i % len(frames)])))
+        cv2.resize(frame, PREVIEW_SIZE)
+    per_frame = (time.perf_counter() - start) / FRAMES * 1000
+    print(f"{'in-process channel':<22} copies/frame {CHANNEL_COPIES}   write+resolve+resize {per_frame:.2f} ms")
+    channel.close()
+
+
+if __name__ == "__main__":
+    main()
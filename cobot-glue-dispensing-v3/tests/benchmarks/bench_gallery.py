@@ -0,0 +1,155 @@
+"""
+Opening and scrolling the workpiece gallery with 1,000 saved workpieces.
+
+Compares the previous gallery, built from WORKPIECE_GET_ALL (every workpiece
+deserialized with its contours, then an 800x800 QPainter rendering of each contour and
+spray pattern before the first paint), with the gallery built from the workpiece index
+(metadata only; the tile widgets are created in batches as the grid scrolls, and the
+thumbnails rendered at save time are decoded by worker threads as their tiles scroll
+into view).
+
+Reports the time to first paint (constructing the gallery, showing it and processing
+events until it is drawn), the scroll frame time (one viewport of scrolling, processed
+to the next paint, over the whole list), the listing cost (opening the repository and
+loading every workpiece file vs opening it and reading the index) and the cost the two images add to each save. Console output of
+the gallery is discarded while timing.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_gallery.py
+"""
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from applications.glue_dispensing_application.repositories.workpiece.glue_workpiece_json_repository import \
+    GlueWorkpieceJsonRepository
+from applications.glue_dispensing_application.repositories.workpiece.workpiece_thumbnails import \
+    PREVIEW_SIZE, THUMBNAIL_SIZE, render_workpiece_thumbnail
+from modules.shared.tools.GlueCell import GlueType
+from modules.shared.tools.enums.Gripper import Gripper
+from modules.shared.tools.enums.Program import Program
+from modules.shared.tools.enums.ToolID import ToolID
+
+WORKPIECES = 1000
+CONTOUR_POINTS = 240
+GALLERY_SIZE = (1280, 800)
+
+
+def _outline(rng, center, points=CONTOUR_POINTS):
+    """Irregular closed outline, like a traced part."""
+    angles = np.linspace(0, 2 * np.pi, points, endpoint=False)
+    radius = rng.uniform(60, 180) * (1 + 0.15 * np.sin(angles * rng.integers(2, 7)) + rng.normal(0, 0.01, points))
+    return np.stack([center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles) * rng.uniform(0.5, 1)],
+                    axis=1).astype(np.float32)
+
+
+def build_workpieces(rng, count=WORKPIECES):
+    workpieces = []
+    for index in range(count):
+        center = rng.uniform(200, 600, 2)
+        outline = _outline(rng, center)
+        spray = center + (outline - center) * 0.9
+        fill = [np.array([[center[0] - 80, y], [center[0] + 80, y]], dtype=np.float32)
+                for y in np.arange(center[1] - 40, center[1] + 40, 10)]
+        workpieces.append(GlueWorkpiece(
+            workpieceId=str(index), name=f"part {index}", description="", toolID=ToolID.Tool0,
+            gripperID=Gripper.SINGLE, glueType=GlueType.TypeA, program=Program.TRACE, material="Material1",
+            contour={"contour": outline.reshape(-1, 1, 2), "settings": {}}, offset="0", height="4", nozzles=[],
+            contourArea="0", glueQty="", sprayWidth="10", pickupPoint=f"{center[0]:.2f},{center[1]:.2f}",
+            sprayPattern={"Contour": [{"contour": spray.reshape(-1, 1, 2), "settings": {}}],
+                          "Fill": [{"contour": line.reshape(-1, 1, 2), "settings": {}} for line in fill]}))
+    return workpieces
+
+
+def previous_thumbnails(workpieces):
+    """The thumbnail widgets of the previous gallery: every workpiece drawn with QPainter at 800x800."""
+    from plugins.core.gallery.ui.gallery import utils
+    from plugins.core.gallery.ui.gallery.ThumbnailWidget import ThumbnailWidget
+    return [ThumbnailWidget(filename=wp.workpieceId, timestamp="default", workpieceId=wp.workpieceId,
+                            pixmap=utils.generate_pixmap_from_contour_and_spray(
+                                contour=wp.get_main_contour(), spray_pattern=wp.sprayPattern,
+                                pickup_point=wp.pickupPoint, size=(800, 800)))
+            for wp in workpieces]
+
+
+def open_gallery(app, **kwargs):
+    """(gallery, ms until the first paint has been processed); a callable ``thumbnails`` is timed too."""
+    from plugins.core.gallery.ui.gallery.GalleryContent import GalleryContent
+    start = time.perf_counter()
+    if callable(kwargs.get("thumbnails")):
+        kwargs["thumbnails"] = kwargs["thumbnails"]()
+    gallery = GalleryContent(**kwargs)
+    gallery.resize(*GALLERY_SIZE)
+    gallery.show()
+    app.processEvents()
+    return gallery, (time.perf_counter() - start) * 1000
+
+
+def scroll_frames(app, gallery):
+    """ms per one-viewport scroll step, from the top to the bottom of the gallery (which grows as tiles are created)."""
+    scroll_bar = gallery.scroll_area.verticalScrollBar()
+    step = max(scroll_bar.pageStep(), 1)
+    frames = []
+    while scroll_bar.value() < scroll_bar.maximum():
+        start = time.perf_counter()
+        scroll_bar.setValue(min(scroll_bar.value() + step, scroll_bar.maximum()))
+        app.processEvents()
+        frames.append((time.perf_counter() - start) * 1000)
+    return np.array(frames)
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    workpieces = build_workpieces(np.random.default_rng(0))
+
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        repository = GlueWorkpieceJsonRepository(directory, [], GlueWorkpiece)
+        start = time.perf_counter()
+        for workpiece in workpieces:
+            repository.save_workpiece(workpiece)
+        save_ms = (time.perf_counter() - start) * 1000 / len(workpieces)
+        start = time.perf_counter()
+        for workpiece in workpieces[:100]:
+            render_workpiece_thumbnail(workpiece, THUMBNAIL_SIZE)
+            render_workpiece_thumbnail(workpiece, PREVIEW_SIZE)
+        render_ms = (time.perf_counter() - start) * 1000 / 100
+
+        # Opened afresh, as at startup: the previous repository deserialized every file then
+        start = time.perf_counter()
+        loaded = GlueWorkpieceJsonRepository(directory, [], GlueWorkpiece).loadData()
+        load_all_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        entries = GlueWorkpieceJsonRepository(directory, [], GlueWorkpiece).get_index()
+        index_ms = (time.perf_counter() - start) * 1000
+
+        previous, previous_open = open_gallery(app, thumbnails=lambda: previous_thumbnails(loaded))
+        previous_frames = scroll_frames(app, previous)
+        previous.close()
+        previous.deleteLater()
+        app.processEvents()
+
+        indexed, indexed_open = open_gallery(app, entries=entries)
+        indexed_frames = scroll_frames(app, indexed)
+        indexed.close()
+
+    print(f"{WORKPIECES} workpieces ({CONTOUR_POINTS}-point contours), gallery {GALLERY_SIZE[0]}x{GALLERY_SIZE[1]}")
+    print(f"save: {save_ms:.2f} ms per workpiece, of which rendering thumbnail and preview ~{render_ms:.2f} ms")
+    print(f"{'':<22} {'previous':>10} {'indexed':>10}  speedup")
+    print(f"{'listing':<22} {load_all_ms:>8.1f}ms {index_ms:>8.1f}ms  {load_all_ms / index_ms:6.1f}x")
+    print(f"{'time to first paint':<22} {previous_open:>8.0f}ms {indexed_open:>8.0f}ms  "
+          f"{previous_open / indexed_open:6.1f}x")
+    for label, stat in (("mean", np.mean), ("p95", lambda a: np.percentile(a, 95)), ("max", np.max)):
+        print(f"{'scroll frame ' + label:<22} {stat(previous_frames):>8.1f}ms {stat(indexed_frames):>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Opening the workpiece gallery with 500 workpieces: time and peak memory.
+
+Each variant runs in its own process, so its peak resident memory is its own:
+
+  - previous, workpieces: every workpiece drawn with QPainter at 800x800 and a thumbnail
+    widget created for each before the first paint;
+  - previous, index: a widget for every index entry, each decoding its saved thumbnail
+    when first painted;
+  - current, index: widgets created in batches as the grid scrolls, thumbnails decoded by
+    the loader's workers;
+  - current, workpieces: workpieces without saved thumbnails, rendered by the loader's
+    workers at the tile size, with an empty ("cold") and a filled ("warm") disk cache.
+
+Reports the time to first paint, the time until the tiles in view show their images,
+and the peak memory the gallery adds (peak RSS minus RSS before it was opened).
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_gallery_open.py
+"""
+import contextlib
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from applications.glue_dispensing_application.repositories.workpiece.glue_workpiece_json_repository import \
+    GlueWorkpieceJsonRepository
+from bench_gallery import GALLERY_SIZE, build_workpieces, previous_thumbnails
+
+WORKPIECES = 500
+VARIANTS = ("previous workpieces", "previous index", "current index", "current workpieces cold",
+            "current workpieces warm")
+
+
+def rss_kb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def visible_tiles_loaded(app, gallery):
+    """Processes events until every thumbnail in view has its image."""
+    viewport = gallery.scroll_area.viewport()
+    while True:
+        app.processEvents()
+        in_view = [t for t in gallery.all_thumbnails if t.isVisible() and not t.visibleRegion().isEmpty()]
+        if in_view and all(t.original_pixmap is not None for t in in_view) and viewport.isVisible():
+            return
+        if gallery.thumbnail_loader is not None:
+            gallery.thumbnail_loader.wait_idle(0.005)
+
+
+def run_variant(variant, directory):
+    """(ms to first paint, ms until the tiles in view show images, peak MB added) of one variant."""
+    from plugins.core.gallery.ui.gallery.GalleryContent import GalleryContent
+    app = QApplication.instance() or QApplication([])
+    with contextlib.redirect_stdout(io.StringIO()):
+        repository = GlueWorkpieceJsonRepository(directory, [], GlueWorkpiece)
+        if "index" in variant:
+            entries = repository.get_index()
+        else:
+            workpieces = repository.loadData()
+        app.processEvents()
+        baseline = rss_kb()
+
+        start = time.perf_counter()
+        if variant == "previous workpieces":
+            gallery = GalleryContent(thumbnails=previous_thumbnails(workpieces))
+        elif variant == "previous index":
+            from plugins.core.gallery.ui.gallery import utils
+            gallery = GalleryContent(thumbnails=[utils.create_thumbnail_widget_from_entry(entry) for entry in entries])
+        elif variant == "current index":
+            gallery = GalleryContent(entries=entries)
+        else:
+            gallery = GalleryContent(workpieces=workpieces)
+            gallery.thumbnail_loader.cache_directory = os.path.join(directory, "cache")
+        gallery.resize(*GALLERY_SIZE)
+        gallery.show()
+        app.processEvents()
+        first_paint = (time.perf_counter() - start) * 1000
+        visible_tiles_loaded(app, gallery)
+        loaded = (time.perf_counter() - start) * 1000
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    gallery.close()
+    return first_paint, loaded, max(peak_kb - baseline, 0) / 1024
+
+
+def main():
+    if len(sys.argv) == 3:  # One variant, in a process of its own
+        print(*run_variant(sys.argv[1], sys.argv[2]))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        with contextlib.redirect_stdout(io.StringIO()):
+            repository = GlueWorkpieceJsonRepository(directory, [], GlueWorkpiece)
+            for workpiece in build_workpieces(np.random.default_rng(0), WORKPIECES):
+                repository.save_workpiece(workpiece)
+        print(f"{WORKPIECES} workpieces, gallery {GALLERY_SIZE[0]}x{GALLERY_SIZE[1]}")
+        print(f"{'':<26} {'first paint':>12} {'images in view':>15} {'peak memory':>12}")
+        for variant in VARIANTS:
+            output = subprocess.run([sys.executable, __file__, variant, directory], capture_output=True, text=True,
+                                    check=True).stdout.split()
+            first_paint, loaded, peak = (float(value) for value in output[-3:])
+            print(f"{variant:<26} {first_paint:>10.0f}ms {loaded:>13.0f}ms {peak:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
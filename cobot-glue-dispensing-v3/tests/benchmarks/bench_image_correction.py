@@ -0,0 +1,81 @@
+"""
+Per-frame image correction at the camera resolution.
+
+Compares the previous VisionSystem.correctImage (ImageProcessing.undistortImage, which
+computes the new camera matrix and the undistortion maps inside cv2.undistort on every
+frame, then cv2.warpPerspective) with image_correction_handler.correct_image, one remap
+with undistortion and perspective folded into tables cached in the calibration store.
+The two differ only by interpolation rounding (the new path interpolates once); the
+mean absolute difference is reported on a smooth test image. Also reports the one-off
+cost of the first load of the calibration files and of building the tables.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_image_correction.py
+"""
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from backend.system.settings.CameraSettings import CameraSettings
+from libs.plvision.PLVision import ImageProcessing
+from modules.VisionSystem.calibration_store import CalibrationStore, FILE_NAMES
+from modules.VisionSystem.data_loading import DataManager
+from modules.VisionSystem.handlers.image_correction_handler import correct_image
+
+WIDTH, HEIGHT = 1280, 720
+FRAMES = 100
+MTX = np.array([[1210.0, 0.0, 641.3], [0.0, 1205.0, 357.9], [0.0, 0.0, 1.0]])
+DIST = np.array([[-0.23, 0.11, 0.0008, -0.0011, -0.03]])
+PERSPECTIVE = np.array([[1.004, 0.012, -6.0], [-0.008, 0.998, 4.0], [0.0, 0.0, 1.0]])
+
+
+def correct_image_previous(image, mtx, dist, perspective):
+    image = ImageProcessing.undistortImage(image, mtx, dist, WIDTH, HEIGHT, crop=False)
+    return cv2.warpPerspective(image, perspective, (WIDTH, HEIGHT))
+
+
+def _time(fn, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        result = fn(frame)
+    return (time.perf_counter() - start) / len(frames) * 1000, result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    frames = [cv2.GaussianBlur(rng.integers(0, 256, size=(HEIGHT, WIDTH, 3), dtype=np.uint8), (0, 0), 3)
+              for _ in range(4)] * (FRAMES // 4)
+    frames = [cv2.normalize(frame, None, 0, 255, cv2.NORM_MINMAX) for frame in frames]
+
+    with tempfile.TemporaryDirectory() as directory:
+        np.savez(os.path.join(directory, FILE_NAMES["camera_calibration"]), mtx=MTX, dist=DIST)
+        np.save(os.path.join(directory, FILE_NAMES["perspective_matrix"]), PERSPECTIVE)
+        settings = CameraSettings()
+        settings.set_resolution(WIDTH, HEIGHT)
+        vision = SimpleNamespace(camera_settings=settings)
+        vision.data_manager = DataManager(vision, False, None, store=CalibrationStore(directory))
+
+        start = time.perf_counter()
+        vision.data_manager.cameraData, vision.data_manager.perspectiveMatrix
+        load = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        vision.data_manager.get_correction_maps(WIDTH, HEIGHT)
+        build = (time.perf_counter() - start) * 1000
+
+        previous_ms, expected = _time(lambda f: correct_image_previous(f, MTX, DIST, PERSPECTIVE), frames)
+        cached_ms, result = _time(lambda f: correct_image(vision, f), frames)
+
+    difference = np.abs(result.astype(np.int16) - expected).mean()
+    print(f"{WIDTH}x{HEIGHT}, {FRAMES} frames; calibration load {load:.2f} ms and remap tables "
+          f"{build:.1f} ms, once per calibration")
+    print(f"{'per frame':<12} {'previous':>10} {'cached':>10}  speedup")
+    print(f"{'correction':<12} {previous_ms:>8.2f}ms {cached_ms:>8.2f}ms  {previous_ms / cached_ms:6.1f}x"
+          f"   (mean difference {difference:.2f} grey levels)")
+
+
+if __name__ == "__main__":
+    main()
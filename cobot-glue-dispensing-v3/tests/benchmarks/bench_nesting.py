@@ -0,0 +1,97 @@
+"""
+Drop-off nesting on the default Plane: shelf rows of bounding boxes (the placement
+nesting.py used before the nesting engine, replayed here) versus the raster nesting
+engine with rotation candidates.
+
+For each generated part set reports how many parts fit, the fill ratio (placed part
+area over plane area) and the planning time of the whole batch, with and without the
+per-cycle time budget.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_nesting.py
+"""
+import time
+
+import cv2
+import numpy as np
+
+from applications.glue_dispensing_application.pick_and_place_process.Plane import Plane
+from applications.glue_dispensing_application.pick_and_place_process.nesting_engine import (
+    DEFAULT_TIME_BUDGET_S, RasterNester)
+
+BATCH_SIZE = 40
+
+
+def rectangle(rng):
+    w, h = rng.uniform(40, 160), rng.uniform(20, 80)
+    return np.array([[0, 0], [w, 0], [w, h], [0, h]], dtype=np.float64)
+
+
+def l_shape(rng):
+    size, arm = rng.uniform(60, 140), rng.uniform(15, 35)
+    return np.array([[0, 0], [size, 0], [size, arm], [arm, arm], [arm, size], [0, size]], dtype=np.float64)
+
+
+def blob(rng, n=24):
+    angles = np.sort(rng.uniform(0, 2 * np.pi, n))
+    radii = rng.uniform(25, 70, n)
+    return np.column_stack([radii * np.cos(angles), radii * np.sin(angles)])
+
+
+def mixed(rng):
+    return [rectangle, l_shape, blob][rng.integers(3)](rng)
+
+
+PART_SETS = {"rectangles": rectangle, "l_shapes": l_shape, "blobs": blob, "mixed": mixed}
+
+
+def area(points):
+    x, y = points[:, 0], points[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def shelf_fill(parts):
+    """Replays the previous shelf-row placement until the plane is full."""
+    plane = Plane()
+    placed_area = 0.0
+    start = time.perf_counter()
+    for points in parts:
+        width, height = cv2.minAreaRect(points.astype(np.float32))[1]
+        if width < height:
+            width, height = height, width
+        plane.tallestContour = max(plane.tallestContour, height)
+        target_x = plane.xOffset + plane.xMin + width / 2
+        if target_x + width / 2 > plane.xMax:
+            plane.rowCount += 1
+            plane.xOffset = 0
+            plane.yOffset += plane.tallestContour + 50
+            plane.tallestContour = height
+            if plane.yMax - plane.yOffset - height / 2 < plane.yMin:
+                break
+        plane.xOffset += width + plane.spacing
+        placed_area += area(points)
+    plane_area = (plane.xMax - plane.xMin) * (plane.yMax - plane.yMin)
+    return placed_area / plane_area, time.perf_counter() - start
+
+
+def engine_fill(parts, time_budget):
+    nester = RasterNester(Plane(), time_budget=time_budget)
+    plan = nester.plan(parts, [points.mean(axis=0) for points in parts])
+    return len(plan.placements), nester.fill_ratio, plan.planning_time, len(plan.deferred)
+
+
+def main():
+    print(f"{'part set':<11} | {'shelf fill':>10} {'shelf ms':>8} | {'engine n':>8} {'fill':>6} {'plan ms':>8} | "
+          f"{'budget n':>8} {'fill':>6} {'plan ms':>8} {'deferred':>8}")
+    for name, make in PART_SETS.items():
+        rng = np.random.default_rng(7)
+        parts = [make(rng) for _ in range(BATCH_SIZE)]
+        shelf, shelf_s = shelf_fill(parts)
+        n, fill, plan_s, _ = engine_fill(parts, None)
+        bn, bfill, bplan_s, deferred = engine_fill(parts, DEFAULT_TIME_BUDGET_S)
+        print(f"{name:<11} | {shelf:>10.1%} {shelf_s * 1000:>8.2f} | {n:>8} {fill:>6.1%} {plan_s * 1000:>8.1f} | "
+              f"{bn:>8} {bfill:>6.1%} {bplan_s * 1000:>8.1f} {deferred:>8}")
+
+
+if __name__ == "__main__":
+    main()
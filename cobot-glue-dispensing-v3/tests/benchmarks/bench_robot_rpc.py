@@ -0,0 +1,134 @@
+"""
+Robot RPC under concurrent callers: call latency against a local XML-RPC stub controller.
+
+CALLERS threads (the robot monitor, the glue process, the UI jog commands) call a stub
+controller that keeps its connections open, as the Fairino controller does, and takes
+CALL_TIME per call. Each caller alternates a pose query and a move.
+
+  - previous: the SDK's single ServerProxy shared by every thread, each call retried as
+    BaseRobotService.stop_motion and the start state handler did: on "Request-sent",
+    sleep 0.1 s and try again, up to 5 attempts; any other error fails the call
+  - current: ThreadLocalServerProxy, a connection per calling thread, with the default
+    RetryPolicy (jittered backoff from 10 ms up to 200 ms, 2 s deadline)
+
+Reports the latency percentiles of the calls that succeeded, the calls that failed and
+the retries.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_robot_rpc.py
+"""
+import socketserver
+import threading
+import time
+import xmlrpc.client
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+import numpy as np
+
+from core.model.robot.rpc_client import RetryPolicy, ThreadLocalServerProxy
+from modules.shared.utils.metrics import MetricsRegistry
+
+CALLERS = 4
+CALLS = 200  # per caller
+CALL_TIME = 0.002  # s
+MAX_ATTEMPTS = 5
+RETRY_SLEEP = 0.1
+
+
+class KeepAliveHandler(SimpleXMLRPCRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+
+class StubServer(socketserver.ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class StubRobot:
+    def GetActualTCPPose(self, flag):
+        time.sleep(CALL_TIME)
+        return [0, [100.0, 200.0, 300.0, 180.0, 0.0, 0.0]]
+
+    def MoveCart(self, desc_pos, tool, user, vel, acc, ovl, blendT, config):
+        time.sleep(CALL_TIME)
+        return 0
+
+
+class PreviousRetry:
+    """The "Request-sent" retry loop of stop_motion / move_to_first_point around a shared proxy."""
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.retries = 0
+
+    def __getattr__(self, name):
+        def call(*args):
+            for attempt in range(MAX_ATTEMPTS):
+                try:
+                    return getattr(self.proxy, name)(*args)
+                except Exception as e:
+                    if "Request-sent" in str(e) and attempt < MAX_ATTEMPTS - 1:
+                        self.retries += 1
+                        time.sleep(RETRY_SLEEP)
+                        continue
+                    raise
+        return call
+
+
+def stress(proxy):
+    latencies, failures = [], []
+    lock = threading.Lock()
+    start = threading.Barrier(CALLERS)
+
+    def caller():
+        start.wait()
+        for i in range(CALLS):
+            began = time.perf_counter()
+            try:
+                if i % 2:
+                    proxy.MoveCart([0.0] * 6, 0, 0, 30.0, 30.0, 100.0, -1.0, -1)
+                else:
+                    proxy.GetActualTCPPose(1)
+            except Exception as e:
+                with lock:
+                    failures.append(type(e).__name__)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - began)
+
+    threads = [threading.Thread(target=caller) for _ in range(CALLERS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies), failures, time.perf_counter() - started
+
+
+def main():
+    server = StubServer(("127.0.0.1", 0), requestHandler=KeepAliveHandler, logRequests=False)
+    server.register_instance(StubRobot())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    uri = f"http://127.0.0.1:{server.server_address[1]}"
+
+    previous = PreviousRetry(xmlrpc.client.ServerProxy(uri))
+    retries = MetricsRegistry().counter("robot.rpc.retries")
+    current = ThreadLocalServerProxy(uri, retry_policy=RetryPolicy(retries=retries))
+    results = {"previous": (*stress(previous), lambda: previous.retries),
+               "current": (*stress(current), lambda: retries.value)}
+    server.shutdown()
+    server.server_close()
+
+    print(f"{CALLERS} callers x {CALLS} calls, stub controller {CALL_TIME * 1000:.0f} ms per call")
+    print(f"{'':<9} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'wall':>8} {'failed':>7} {'retries':>8}  errors")
+    for name, (latencies, failures, wall, retry_count) in results.items():
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+        kinds = ", ".join(f"{kind} x{failures.count(kind)}" for kind in sorted(set(failures))) or "-"
+        print(f"{name:<9} {p50:>6.1f}ms {p90:>6.1f}ms {p99:>6.1f}ms {latencies.max() * 1000:>6.1f}ms "
+              f"{wall:>7.2f}s {len(failures):>7} {retry_count():>8}  {kinds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Camera stabilisation before reading the contours: the fixed 2 s sleep of the contour
+matching and direct trace modes against waiting for a stable scene.
+
+A synthetic 25 fps camera shows three parts after the robot has arrived at the capture
+position. The first frames still shake (the parts move by a few pixels, damped), and the
+scene brightness depends on the lighting condition. Every frame goes through the steps
+of VisionSystem.run: auto-brightness (BrightnessManager with the default PID settings
+and target 200), contour detection, then SceneStabilityTracker.update().
+
+For each lighting condition, reports the time until the scene is stable (frames x 40 ms,
+including the frames spent processing), the time saved per cycle against the 2 s sleep,
+and whether the contours read at that moment are the three parts.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_scene_stability.py
+"""
+import os
+import tempfile
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from backend.system.settings.CameraSettings import CameraSettings
+from modules.VisionSystem.brightness_manager import BrightnessManager
+from modules.VisionSystem.calibration_store import CalibrationStore
+from modules.VisionSystem.data_loading import DataManager
+from modules.VisionSystem.handlers.contour_detection_handler import handle_contour_detection
+from modules.VisionSystem.scene_stability import SceneStabilityTracker
+
+WIDTH, HEIGHT = 1280, 720
+FRAME_INTERVAL = 0.04  # s, 25 fps
+FIXED_SLEEP = 2.0  # s
+SHAKE_FRAMES = 6
+PARTS = [(150, 150), (520, 260), (860, 140)]
+SPRAY_AREA = np.array([[20, 20], [1260, 20], [1260, 700], [20, 700]], dtype=np.float32)
+CYCLES = 5
+
+# name: (background grey level as seen by the camera, part grey level, sensor noise sigma)
+LIGHTING = {
+    "nominal": (200, 40, 3),
+    "dim": (150, 30, 3),
+    "bright": (240, 60, 3),
+    "dim, noisy": (140, 30, 8),
+}
+
+
+def make_vision(directory, auto_brightness):
+    settings = CameraSettings()
+    settings.set_resolution(WIDTH, HEIGHT)
+    settings.set_brightness_auto(auto_brightness)
+    publisher = SimpleNamespace(publish_thresh_image=lambda image: None, publish_latest_image=lambda image: None)
+    vision = SimpleNamespace(camera_settings=settings, threshold_by_area="spray", isSystemCalibrated=False,
+                             image=None, correctedImage=None, message_publisher=publisher)
+    vision.data_manager = DataManager(vision, False, None, store=CalibrationStore(directory))
+    vision.data_manager.sprayAreaPoints = SPRAY_AREA
+    vision.get_thresh_by_area = lambda area: settings.get_threshold()
+    vision.brightnessManager = BrightnessManager(vision)
+    vision.scene_stability = SceneStabilityTracker()
+    return vision
+
+
+def render(rng, frame_index, background, part, noise):
+    shake = 6 * 0.6 ** frame_index if frame_index < SHAKE_FRAMES else 0
+    dx, dy = (int(round(v)) for v in rng.uniform(-shake, shake, 2))
+    frame = np.full((HEIGHT, WIDTH, 3), background, dtype=np.int16)
+    for x, y in PARTS:
+        cv2.rectangle(frame, (x + dx, y + dy), (x + dx + 200, y + dy + 130), (part,) * 3, -1)
+    frame += np.round(rng.normal(0, noise, (HEIGHT, WIDTH, 1))).astype(np.int16)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def process(vision, frame):
+    """The per-frame steps of VisionSystem.run."""
+    vision.image = frame
+    brightness_error = None
+    if vision.camera_settings.get_brightness_auto():
+        vision.brightnessManager.adjust_brightness()
+        brightness_error = vision.brightnessManager.brightness_error
+    contours, _, _ = handle_contour_detection(vision)
+    vision.scene_stability.update(contours, brightness_error)
+    return contours or []
+
+
+def cycle(vision, rng, lighting):
+    """(seconds until the scene is stable, contour count then, contour count after 2 s)."""
+    vision.scene_stability.reset()
+    stable_after, stable_count, count = None, None, 0
+    for frame_index in range(int(FIXED_SLEEP / FRAME_INTERVAL)):
+        count = len(process(vision, render(rng, frame_index, *lighting)))
+        if stable_after is None and vision.scene_stability.is_stable():
+            stable_after, stable_count = (frame_index + 1) * FRAME_INTERVAL, count
+    return stable_after, stable_count, count
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{WIDTH}x{HEIGHT} at {1 / FRAME_INTERVAL:.0f} fps, {len(PARTS)} parts, "
+          f"stable after {SceneStabilityTracker().stable_frames} settled frames; {CYCLES} cycles per row")
+    print(f"{'lighting':<12} {'auto-brightness':<16} {'stable after':>13} {'saved/cycle':>12} "
+          f"{'contours when stable':>21} {'after 2 s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, lighting in LIGHTING.items():
+            for auto_brightness in (True, False):
+                vision = make_vision(directory, auto_brightness)
+                results = [cycle(vision, rng, lighting) for _ in range(CYCLES)]
+                times = [stable for stable, _, _ in results if stable is not None]
+                stable_counts = sorted({count for stable, count, _ in results if stable is not None})
+                if times:
+                    mean = np.mean(times)
+                    stable_text, saved_text = f"{mean * 1000:>10.0f} ms", f"{(FIXED_SLEEP - mean) * 1000:>9.0f} ms"
+                else:
+                    stable_text, saved_text = f"{'timeout':>13}", f"{0:>9.0f} ms"
+                if len(times) < len(results):
+                    stable_text += f" ({len(results) - len(times)} timeouts)"
+                print(f"{name:<12} {'on' if auto_brightness else 'off':<16} {stable_text:>13} {saved_text:>12} "
+                      f"{str(stable_counts):>21} {str(sorted({count for _, _, count in results})):>10}")
+
+
+if __name__ == "__main__":
+    main()
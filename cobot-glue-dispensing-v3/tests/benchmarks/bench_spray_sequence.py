@@ -0,0 +1,218 @@
+"""
+Glue start and stop sequences: how long the robot is held per path, over timed Modbus mocks.
+
+GlueSprayService drives the fan, generator and pump over MockInstrument clients that
+take TRANSACTION_S per read or write, as an RS-485 RTU transaction does (request and
+response frames at 115200 baud plus the slave's turnaround), on top of the pacing
+ModbusClient itself adds to multi-register writes.
+
+  - previous: startGlueDispensing / stopGlueDispensing as they were: fan, generator,
+    sleep(gen_pump_delay), pump ramp, all on the caller's thread; on stop, the pump
+    reverse, sleep(pump_gen_delay), generator off
+  - current: the same commands on a SprayTimeline; the call returns at the motion offset
+    once the steps before it have returned (pump start + Time Before Motion, at the
+    earliest once the pump ramp is done, on start; once the pump has stopped on stop)
+    and the sequence finishes in the background
+
+Reports per path the time the caller (the robot) is held at the start and at the stop,
+the dead time removed, and when the pump start and generator off were issued relative to
+the start of their sequence.
+
+The glue cycle itself drives the pump alone, through PumpController, with the robot
+travelling TRAVEL_S from the end of one path to the start of the next:
+
+  - previous: pump_on / pump_off calling motorOn / motorOff on the state machine's thread
+  - current: the same calls on pump timelines; the pump reverses in the background while
+    the robot travels, and the next pump_on waits for it
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_spray_sequence.py
+"""
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+
+import minimalmodbus
+
+import src.backend.system.Statistics as statistics_store
+from applications.glue_dispensing_application.glue_process.PumpController import PumpController
+from applications.glue_dispensing_application.glue_process.glue_dispensing_operation import \
+    glue_dispensing_logger_context
+from applications.glue_dispensing_application.services.glueSprayService.GlueSprayService import GlueSprayService
+from applications.glue_dispensing_application.settings.GlueSettings import GlueSettings
+from modules.modbusCommunication.MockClient import MockInstrument
+
+TRANSACTION_S = 0.008
+PATHS = 10
+GEN_PUMP_DELAY = 0.5
+PUMP_GEN_DELAY = 0.5
+PUMP_REVERSE_TIME = 0.2
+TRAVEL_S = 0.3  # robot travel between paths
+SETTINGS = {"Time Before Motion": 0.1, "Initial Ramp Speed Duration": 0.2, "Initial Ramp Speed": 5000,
+            "Forward Ramp Steps": 3, "Reverse Ramp Steps": 1}
+MOTOR_ADDRESS = 0
+GENERATOR_REGISTER = 9
+
+
+class TimedInstrument(MockInstrument):
+    """MockInstrument taking TRANSACTION_S per transaction, recording when each write was sent."""
+
+    writes = []  # (perf_counter, register, values)
+
+    def _transaction(self, register, values):
+        TimedInstrument.writes.append((time.perf_counter(), register, values))
+        time.sleep(TRANSACTION_S)
+
+    def write_register(self, register, value, signed=False):
+        self._transaction(register, [value])
+        super().write_register(register, value, signed)
+
+    def write_registers(self, start_register, values):
+        self._transaction(start_register, values)
+        super().write_registers(start_register, values)
+
+    def read_register(self, register, *args, **kwargs):
+        time.sleep(TRANSACTION_S)
+        return super().read_register(register)
+
+
+def previous_start(service):
+    """GlueSprayService.startGlueDispensing before the timeline."""
+    service.fanOn(100)
+    service.generatorOn()
+    time.sleep(GEN_PUMP_DELAY)
+    service.motorOn(motorAddress=MOTOR_ADDRESS, speed=10000, ramp_steps=3,
+                    initial_ramp_speed=service.settings.get_initial_ramp_speed(),
+                    initial_ramp_speed_duration=service.settings.get_initial_ramp_speed_duration())
+    return True
+
+
+def previous_stop(service):
+    """GlueSprayService.stopGlueDispensing before the timeline."""
+    service.motorOff(motorAddress=MOTOR_ADDRESS, speedReverse=1000, reverse_time=PUMP_REVERSE_TIME, ramp_steps=1)
+    time.sleep(PUMP_GEN_DELAY)
+    service.generatorOff()
+    return True
+
+
+def current_start(service):
+    return service.startGlueDispensing(MOTOR_ADDRESS, speed=10000, reverse_time=PUMP_REVERSE_TIME, speedReverse=1000,
+                                       gen_pump_delay=GEN_PUMP_DELAY, fanSpeed=100, ramp_steps=3)
+
+
+def current_stop(service):
+    return service.stopGlueDispensing(MOTOR_ADDRESS, speed_reverse=1000, pump_reverse_time=PUMP_REVERSE_TIME,
+                                      ramp_steps=1, pump_gen_delay=PUMP_GEN_DELAY)
+
+
+def previous_pump_on(service, pump):
+    """PumpController.pump_on before the timeline."""
+    settings = service.settings
+    return service.motorOn(motorAddress=MOTOR_ADDRESS, speed=settings.get_motor_speed(),
+                           ramp_steps=settings.get_forward_ramp_steps(),
+                           initial_ramp_speed=settings.get_initial_ramp_speed(),
+                           initial_ramp_speed_duration=settings.get_initial_ramp_speed_duration())
+
+
+def previous_pump_off(service, pump):
+    """PumpController.pump_off before the timeline."""
+    settings = service.settings
+    service.motorOff(motorAddress=MOTOR_ADDRESS, speedReverse=settings.get_speed_reverse(),
+                     reverse_time=settings.get_steps_reverse(), ramp_steps=settings.get_reverse_ramp_steps())
+
+
+def current_pump_on(service, pump):
+    return pump.pump_on(service, None, MOTOR_ADDRESS)
+
+
+def current_pump_off(service, pump):
+    # As the transition between paths does
+    pump.pump_off(service, None, MOTOR_ADDRESS, wait=False)
+
+
+def run_cycle(service, pump_on, pump_off):
+    """Per path of the glue cycle: (held at the pump start, held at the pump stop) in seconds."""
+    pump = PumpController(False, glue_dispensing_logger_context, service.settings)
+    results = []
+    for _ in range(PATHS):
+        started = time.perf_counter()
+        assert pump_on(service, pump)
+        start_hold = time.perf_counter() - started
+        stopped = time.perf_counter()
+        pump_off(service, pump)
+        results.append((start_hold, time.perf_counter() - stopped))
+        time.sleep(TRAVEL_S)  # to the next path
+    if service._timeline is not None:
+        service._timeline.wait()
+    return [statistics.median(column) for column in zip(*results)]
+
+
+def first_write_after(start, register):
+    return next(t for t, written, _ in TimedInstrument.writes if t >= start and written == register) - start
+
+
+def run(service, start, stop):
+    """Per path: (start hold, stop hold, pump start offset, generator off offset) in seconds."""
+    results = []
+    for _ in range(PATHS):
+        TimedInstrument.writes.clear()
+        started = time.perf_counter()
+        assert start(service)
+        start_hold = time.perf_counter() - started
+        if service._timeline is not None:
+            service._timeline.wait()  # The robot travels along the path meanwhile
+
+        stopped = time.perf_counter()
+        assert stop(service)
+        stop_hold = time.perf_counter() - stopped
+        if service._timeline is not None:
+            service._timeline.wait()  # and on to the next path
+        results.append((start_hold, stop_hold, first_write_after(started, MOTOR_ADDRESS),
+                        first_write_after(stopped, GENERATOR_REGISTER)))
+    return [statistics.median(column) for column in zip(*results)]
+
+
+def main():
+    minimalmodbus.Instrument = TimedInstrument
+    with tempfile.TemporaryDirectory() as directory:
+        statistics_store.STATISTICS_PATH = os.path.join(directory, "statistics.json")
+        service = GlueSprayService(GlueSettings())
+        for key, value in SETTINGS.items():
+            service.settings.set_value(key, value)
+        # The mocks print every command and the services log every Modbus write
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            previous = run(service, previous_start, previous_stop)
+            current = run(service, current_start, current_stop)
+            previous_cycle = run_cycle(service, previous_pump_on, previous_pump_off)
+            current_cycle = run_cycle(service, current_pump_on, current_pump_off)
+
+    print(f"{PATHS} paths, {TRANSACTION_S * 1000:.0f} ms per Modbus transaction, gen_pump_delay {GEN_PUMP_DELAY} s, "
+          f"pump reverse {PUMP_REVERSE_TIME} s, pump_gen_delay {PUMP_GEN_DELAY} s, "
+          f"Time Before Motion {SETTINGS['Time Before Motion']} s (medians)")
+    print(f"{'':<34} {'previous':>9} {'current':>9} {'removed':>9}")
+    for name, index in (("robot held at the start", 0), ("robot held at the stop", 1)):
+        print(f"{name:<34} {previous[index] * 1000:>7.0f}ms {current[index] * 1000:>7.0f}ms "
+              f"{(previous[index] - current[index]) * 1000:>7.0f}ms")
+    total_previous, total_current = previous[0] + previous[1], current[0] + current[1]
+    print(f"{'robot held per path':<34} {total_previous * 1000:>7.0f}ms {total_current * 1000:>7.0f}ms "
+          f"{(total_previous - total_current) * 1000:>7.0f}ms")
+    print(f"{'pump start after sequence start':<34} {previous[2] * 1000:>7.0f}ms {current[2] * 1000:>7.0f}ms "
+          f"(planned {GEN_PUMP_DELAY * 1000:.0f}ms)")
+    print(f"{'generator off after stop start':<34} {previous[3] * 1000:>7.0f}ms {current[3] * 1000:>7.0f}ms "
+          f"(planned {(PUMP_REVERSE_TIME + PUMP_GEN_DELAY) * 1000:.0f}ms)")
+    print()
+    print(f"glue cycle, robot travel {TRAVEL_S} s between paths, pump reverse "
+          f"{service.settings.get_steps_reverse()} s (the default setting)")
+    for name, index in (("robot held at the pump start", 0), ("robot held at the pump stop", 1)):
+        print(f"{name:<34} {previous_cycle[index] * 1000:>7.0f}ms {current_cycle[index] * 1000:>7.0f}ms "
+              f"{(previous_cycle[index] - current_cycle[index]) * 1000:>7.0f}ms")
+    total_previous, total_current = sum(previous_cycle), sum(current_cycle)
+    print(f"{'robot held per path':<34} {total_previous * 1000:>7.0f}ms {total_current * 1000:>7.0f}ms "
+          f"{(total_previous - total_current) * 1000:>7.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
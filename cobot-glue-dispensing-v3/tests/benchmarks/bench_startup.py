@@ -0,0 +1,102 @@
+"""
+Startup time with mock devices: services built one after another (the previous main.py)
+versus the dependency graph of core.service_startup, which opens independent devices
+in parallel.
+
+The devices are the repo's mocks: TestRobotWrapper for the robot and MockInstrument for
+Modbus, plus a synthetic camera. Each one sleeps for a typical open latency of the
+real hardware. Reports time-to-first-frame, time-to-ready and the per-phase breakdown.
+Also reports the cost of importing main.py, which now defers the heavy imports.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from core.model.robot.fairino_robot import TestRobotWrapper
+from core.service_startup import ServiceGraph
+from modules.modbusCommunication.MockClient import MockInstrument
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Typical open latencies of the real devices, in seconds
+SETTINGS_LOAD = 0.05
+ROBOT_CONNECT = 0.6
+CAMERA_OPEN = 0.8
+MODBUS_OPEN = 0.3
+MODEL_LOAD = 0.4
+WORKPIECE_LOAD = 0.15
+APPLICATION_BUILD = 0.2
+
+
+class SyntheticCamera:
+    def __init__(self, graph):
+        time.sleep(CAMERA_OPEN)
+        # CameraInitializer reads a frame to confirm the camera works
+        self.latest_frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        graph.mark("first_frame")
+
+
+def mock_robot(settings):
+    time.sleep(ROBOT_CONNECT)
+    return TestRobotWrapper()
+
+
+def mock_modbus():
+    time.sleep(MODBUS_OPEN)
+    return MockInstrument("/dev/ttyUSB0", 1)
+
+
+def delayed(seconds, value):
+    def factory(**_):
+        time.sleep(seconds)
+        return value
+    return factory
+
+
+def build_graph():
+    graph = ServiceGraph()
+    graph.add("settings", delayed(SETTINGS_LOAD, {"robot_ip": "127.0.0.1"}))
+    graph.add("camera", lambda: SyntheticCamera(graph))
+    graph.add("workpieces", delayed(WORKPIECE_LOAD, []))
+    graph.add("modbus_probe", mock_modbus, required=False)
+    graph.add("matching_model", delayed(MODEL_LOAD, object()), required=False)
+    graph.add("robot", mock_robot, depends_on=("settings",))
+    graph.add("robot_service", lambda robot, settings: robot, depends_on=("robot", "settings"))
+    graph.add("request_handler", delayed(APPLICATION_BUILD, "handler"),
+              depends_on=("settings", "camera", "workpieces", "robot_service"))
+    return graph
+
+
+def run(sequential):
+    graph = build_graph()
+    graph.start(sequential=sequential)
+    graph.mark("ready")
+    return graph.report
+
+
+def import_time(module):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.join(ROOT, "src"), ROOT]))
+    code = f"import time; s = time.perf_counter(); import {module}; print(time.perf_counter() - s)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1]) if out.returncode == 0 else None
+
+
+def main():
+    for label, sequential in (("sequential", True), ("dependency graph", False)):
+        report = run(sequential)
+        print(f"\n=== {label}: first frame {report.marks['first_frame'] * 1000:.0f} ms, "
+              f"ready {report.marks['ready'] * 1000:.0f} ms ===")
+        print(report.format())
+
+    seconds = import_time("main")
+    print(f"\nimport main: {seconds * 1000:.0f} ms" if seconds is not None else "\nimport main failed")
+
+
+if __name__ == "__main__":
+    main()
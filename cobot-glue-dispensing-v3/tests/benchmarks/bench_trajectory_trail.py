@@ -0,0 +1,183 @@
+"""
+Dashboard trajectory trail: display frame time as robot positions accumulate.
+
+Compares the previous RobotTrajectoryWidget.update_display (unbounded point deque; every
+tick copies the base frame and the whole trail, re-smooths and redraws every segment with
+draw_smooth_trail, converts the frame to RGB and builds a QPixmap) with the current one
+(bounded history; only the points received since the previous tick are smoothed and drawn
+onto the persistent RGB layer of the TrailRenderer, the base frame is converted once, and
+a tick without changes draws nothing).
+
+The robot traces glue paths over a 640x360 preview, one position per 30 ms display tick
+as the robot monitor publishes them, with a trajectory break every 200 positions (the
+move to the next path). Reports the frame time (one position, then update_display) after
+N positions, the points the widget keeps, and the time of a tick without a new position.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_trajectory_trail.py
+"""
+import contextlib
+import io
+import os
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from plugins.core.dashboard.ui.widgets.RobotTrajectoryWidget import RobotTrajectoryWidget
+
+WIDTH, HEIGHT = 640, 360
+POSITIONS = 10_000
+CHECKPOINTS = (100, 1_000, 2_500, 5_000, 10_000)
+PATH_LENGTH = 200
+SAMPLES = 5  # ticks timed per checkpoint
+
+
+def draw_smooth_trail_previous(image, trajectory_points_with_breaks):
+    """draw_smooth_trail before the TrailRenderer."""
+    if len(trajectory_points_with_breaks) < 2:
+        return
+    image_width = image.shape[1]
+    image_height = image.shape[0]
+    segments = []
+    current_segment = []
+    for point_data in trajectory_points_with_breaks:
+        x, y, timestamp, is_break = point_data[:4]
+        if is_break and current_segment:
+            if len(current_segment) > 1:
+                segments.append(current_segment)
+            current_segment = [(x, y)]
+        else:
+            current_segment.append((x, y))
+    if len(current_segment) > 1:
+        segments.append(current_segment)
+
+    for segment in segments:
+        segment_points = np.array(segment, dtype=np.float32)
+        smoothed_points = []
+        kernel_size = 3
+        for i in range(len(segment_points)):
+            start = max(0, i - kernel_size + 1)
+            avg_x = np.mean(segment_points[start:i + 1, 0])
+            avg_y = np.mean(segment_points[start:i + 1, 1])
+            smoothed_points.append((int(avg_x), int(avg_y)))
+        total = len(smoothed_points)
+        for i in range(total - 1):
+            progress = (i + 1) / total
+            if progress < 0.3:
+                fade_factor = progress / 0.3
+                color = (int(200 * fade_factor), int(100 * fade_factor), int(50 * fade_factor))
+            elif progress < 0.7:
+                fade_factor = (progress - 0.3) / 0.4
+                color = (int(156 + (100 * fade_factor)), int(39 + (50 * fade_factor)), int(176 + (79 * fade_factor)))
+            else:
+                fade_factor = (progress - 0.7) / 0.3
+                color = (int(255 * fade_factor), int(89 * fade_factor), int(255 * fade_factor))
+            thickness = max(1, int(2 + (progress * 4)))
+            p1 = smoothed_points[i]
+            p2 = smoothed_points[i + 1]
+            if (0 <= p1[0] < image_width and 0 <= p1[1] < image_height and
+                    0 <= p2[0] < image_width and 0 <= p2[1] < image_height):
+                cv2.line(image, p1, p2, color, thickness, lineType=cv2.LINE_AA)
+        if len(smoothed_points) > 5:
+            recent_points = smoothed_points[-5:]
+            for i in range(len(recent_points) - 1):
+                p1 = recent_points[i]
+                p2 = recent_points[i + 1]
+                if (0 <= p1[0] < image_width and 0 <= p1[1] < image_height and
+                        0 <= p2[0] < image_width and 0 <= p2[1] < image_height):
+                    cv2.line(image, p1, p2, (255, 200, 255), 6, lineType=cv2.LINE_AA)
+                    cv2.line(image, p1, p2, (255, 100, 255), 2, lineType=cv2.LINE_AA)
+
+
+def update_display_previous(widget):
+    """RobotTrajectoryWidget.update_display and _update_label_from_frame before the TrailRenderer."""
+    current_frame = widget.base_frame.copy()
+    trajectory_points_copy = widget.trajectory_manager.get_trajectory_copy()
+    if widget.drawing_enabled and trajectory_points_copy:
+        draw_smooth_trail_previous(current_frame, trajectory_points_copy)
+    rgb_image = cv2.cvtColor(current_frame, cv2.COLOR_BGR2RGB)
+    h, w, ch = rgb_image.shape
+    q_image = QImage(rgb_image.data, w, h, ch * w, QImage.Format.Format_RGB888)
+    widget.image_label.setPixmap(QPixmap.fromImage(q_image))
+    widget.estimated_metric.update_value(f"{widget.estimated_time_value:.2f} s")
+    widget.time_left_metric.update_value(f"{widget.time_left_value:.2f} s")
+
+
+def positions():
+    """Glue paths: offset rounded rectangles traced at the robot's speed, in preview pixels."""
+    rng = np.random.default_rng(0)
+    for index in range(POSITIONS):
+        path, step = divmod(index, PATH_LENGTH)
+        cx, cy = 160 + (path * 97) % 320, 100 + (path * 53) % 160
+        angle = 2 * np.pi * step / PATH_LENGTH
+        x = cx + 120 * np.clip(1.4 * np.cos(angle), -1, 1) + rng.normal(0, 0.3)
+        y = cy + 70 * np.clip(1.4 * np.sin(angle), -1, 1) + rng.normal(0, 0.3)
+        yield step == 0, {"x": int(x), "y": int(y)}
+
+
+def make_widget(previous):
+    with contextlib.redirect_stdout(io.StringIO()):
+        widget = RobotTrajectoryWidget(WIDTH, HEIGHT)
+    widget.timer.stop()
+    widget.set_image({"image": np.full((720, 1280, 3), 225, dtype=np.uint8)})
+    if previous:
+        widget.trajectory_manager.trajectory_points = deque()  # trail_length was not enforced
+    widget.enable_drawing("")
+    widget.update_display()
+    return widget
+
+
+def timed_tick(widget, update_display, message):
+    start = time.perf_counter()
+    if message is not None:
+        widget.update(message)
+    update_display(widget)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(previous):
+    """{checkpoint: (mean frame ms, kept points)}, idle tick ms. The previous one is only ticked at checkpoints."""
+    widget = make_widget(previous)
+    update_display = update_display_previous if previous else RobotTrajectoryWidget.update_display
+    results, times = {}, []
+    for index, (new_path, message) in enumerate(positions(), start=1):
+        if new_path:
+            widget.break_trajectory()
+        if any(0 <= checkpoint - index < SAMPLES for checkpoint in CHECKPOINTS):
+            times.append(timed_tick(widget, update_display, message))
+        elif previous:
+            widget.update(message)
+        else:
+            timed_tick(widget, update_display, message)
+        if index in CHECKPOINTS:
+            results[index] = (np.mean(times), len(widget.trajectory_manager.trajectory_points))
+            times = []
+    idle = np.mean([timed_tick(widget, update_display, None) for _ in range(SAMPLES)])
+    widget.close()
+    return results, idle
+
+
+def main():
+    app = QApplication.instance() or QApplication([])
+    previous, previous_idle = run(previous=True)
+    current, current_idle = run(previous=False)
+
+    print(f"{WIDTH}x{HEIGHT} preview, one robot position per display tick, a new path every {PATH_LENGTH} positions")
+    print(f"{'positions':>9} {'previous ms':>12} {'points':>7} {'current ms':>11} {'points':>7} {'speed-up':>9}")
+    for checkpoint in CHECKPOINTS:
+        (previous_ms, previous_points), (current_ms, current_points) = previous[checkpoint], current[checkpoint]
+        print(f"{checkpoint:>9} {previous_ms:>12.2f} {previous_points:>7} {current_ms:>11.3f} {current_points:>7} "
+              f"{previous_ms / current_ms:>8.0f}x")
+    print(f"{'idle tick':>9} {previous_idle:>12.2f} {'':>7} {current_idle:>11.3f}")
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
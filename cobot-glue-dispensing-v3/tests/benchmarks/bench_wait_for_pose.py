@@ -0,0 +1,177 @@
+"""
+Waiting for the robot to reach a pose: the previous polling loop against the MotionWaiter.
+
+A TestRobotWrapper that actually travels (250 mm/s, straight to each MoveCart target) is
+sampled by a robot monitor at the production cycle of 30 ms, feeding a RobotStateManager.
+The robot shuttles between two poses 200 mm apart; for every move, W threads wait for the
+target within 1 mm, as the glue process, the calibration and the nozzle cleaning do:
+
+  - previous: RobotService._waitForRobotToReachPosition as it was, reading the
+    monitor's cached pose every 10 ms and printing a line on every pass
+  - current: RobotService._waitForRobotToReachPosition on the MotionWaiter, woken by the
+    monitor sample that satisfies it
+
+Reports the wake-up latency (from the delivery of the first sample within 1 mm to the
+waiter returning), the waiter wake-ups and printed lines per second of waiting, the
+position RPC calls per second (made by the monitor in both cases) and the CPU time.
+
+Run with:
+    PYTHONPATH=src:tests:. python tests/benchmarks/bench_wait_for_pose.py
+"""
+import contextlib
+import io
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from backend.system.utils import robot_utils
+from backend.system.utils.custom_logging import LoggerContext
+from core.model.robot.fairino_robot import TestRobotWrapper
+from core.services.robot_service.impl.RobotStateManager import RobotStateManager
+from core.services.robot_service.impl.base_robot_service import RobotService
+from core.services.robot_service.impl.robot_monitor.fairino_monitor import FairinoRobotMonitor
+
+CYCLE_TIME = 0.03
+SPEED = 250.0  # mm/s
+THRESHOLD = 1.0  # mm
+POSES = ([-100.0, 350.0, 300.0, 180.0, 0.0, 0.0], [100.0, 350.0, 300.0, 180.0, 0.0, 0.0])
+MOVES = 12
+WAITERS = (1, 4)
+
+
+class TravellingRobot(TestRobotWrapper):
+    """TestRobotWrapper whose pose moves towards the last MoveCart target; counts pose requests."""
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.start, self.target, self.started_at = list(POSES[0]), list(POSES[0]), time.perf_counter()
+        self.pose_calls = 0
+
+    def move_cartesian(self, position, tool=0, user=0, vel=100, acc=30, blendR=0):
+        with self.lock:
+            self.start, self.target = self._pose(), list(position)
+            self.started_at = time.perf_counter()
+        return 0
+
+    def _pose(self):
+        start, target = np.array(self.start), np.array(self.target)
+        distance = np.linalg.norm(target[:3] - start[:3])
+        fraction = 1.0 if distance == 0 else min(1.0, SPEED * (time.perf_counter() - self.started_at) / distance)
+        return list(start + (target - start) * fraction)
+
+    def get_current_position(self):
+        with self.lock:
+            self.pose_calls += 1
+            return self._pose()
+
+
+class TravellingRobotMonitor(FairinoRobotMonitor):
+    def __init__(self, robot):
+        super(FairinoRobotMonitor, self).__init__(cycle_time=CYCLE_TIME)
+        self.robot = robot
+
+
+def wait_previous(service, endPoint, threshold, delay, timeout=1, cancellation_token=None):
+    """RobotService._waitForRobotToReachPosition before the MotionWaiter; counts its passes."""
+    start_time = time.time()
+    while True:
+        service.passes += 1
+        print(f"RobotService: Waiting for robot to reach position {endPoint} with threshold {threshold}mm")
+        if cancellation_token is not None and cancellation_token.is_cancelled():
+            return False
+        if time.time() - start_time > timeout:
+            return False
+        current_position = service.get_current_position()
+        if current_position is None:
+            time.sleep(0.1)
+            continue
+        distance = robot_utils.calculate_distance_between_points(current_position, endPoint)
+        if distance < threshold:
+            return True
+        time.sleep(0.01)
+
+
+def make_cell():
+    robot = TravellingRobot()
+    manager = RobotStateManager(TravellingRobotMonitor(robot))
+    deliveries = []
+
+    def on_motion_data(pos, velocity, acceleration, timestamp, error=False):
+        deliveries.append((time.perf_counter(), pos))
+        manager.on_motion_data(pos, velocity, acceleration, timestamp, error)
+
+    manager.monitor.start(on_motion_data)
+    service = SimpleNamespace(robot=robot, robot_state_manager=manager, logger_context=LoggerContext(enabled=False, logger=None), passes=0,
+                              get_current_position=lambda: manager.position)
+    service.wait_for_position = lambda *args, **kwargs: RobotService.wait_for_position(service, *args, **kwargs)
+
+    def wait_current(*args, **kwargs):
+        service.passes += 1  # Blocks once, woken once
+        return RobotService._waitForRobotToReachPosition(service, *args, **kwargs)
+
+    service.wait_current = wait_current
+    service.wait_previous = lambda *args, **kwargs: wait_previous(service, *args, **kwargs)
+    return service, deliveries
+
+
+def run(service, deliveries, wait, waiters):
+    latencies, waited = [], 0.0
+    output = io.StringIO()
+    rpc_before, passes_before, cpu = service.robot.pose_calls, service.passes, time.process_time()
+    for move in range(MOVES):
+        target = POSES[(move + 1) % 2]
+        returned = [None] * waiters
+
+        def waiter(index):
+            if not wait(target, THRESHOLD, 0, timeout=5):
+                raise RuntimeError("Target not reached")
+            returned[index] = time.perf_counter()
+
+        with contextlib.redirect_stdout(output):
+            threads = [threading.Thread(target=waiter, args=(index,)) for index in range(waiters)]
+            sent = time.perf_counter()
+            service.robot.move_cartesian(target)
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        waited += max(returned) - sent
+        reached_at = next(delivered for delivered, pos in list(deliveries)
+                          if delivered >= sent and pos is not None and
+                          robot_utils.calculate_distance_between_points(pos, target) < THRESHOLD)
+        latencies += [(at - reached_at) * 1000 for at in returned]
+    return {
+        "latency": np.array(latencies),
+        "passes": (service.passes - passes_before) / waited,
+        "lines": output.getvalue().count("\n") / waited,
+        "rpc": (service.robot.pose_calls - rpc_before) / waited,
+        "cpu": (time.process_time() - cpu) / waited,
+    }
+
+
+def main():
+    with contextlib.redirect_stdout(io.StringIO()):
+        service, deliveries = make_cell()
+    time.sleep(0.2)
+    results = {}
+    for waiters in WAITERS:
+        results[waiters] = (run(service, deliveries, service.wait_previous, waiters),
+                            run(service, deliveries, service.wait_current, waiters))
+    service.robot_state_manager.stop_monitoring()
+
+    print(f"Monitor cycle {CYCLE_TIME * 1000:.0f} ms, {MOVES} moves of 200 mm at {SPEED:.0f} mm/s per row")
+    print(f"{'waiters':<8} {'':<9} {'latency mean/p95/max ms':>24} {'wake-ups/s':>11} {'lines/s':>8} "
+          f"{'RPC/s':>6} {'CPU':>6}")
+    for waiters, pair in results.items():
+        for label, result in zip(("previous", "current"), pair):
+            latency = result["latency"]
+            print(f"{waiters:<8} {label:<9} {latency.mean():>8.2f} {np.percentile(latency, 95):>7.2f} "
+                  f"{latency.max():>7.2f} {result['passes']:>11.1f} "
+                  f"{result['lines']:>8.0f} {result['rpc']:>6.1f} {result['cpu']:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import numpy as np
+
+from applications.glue_dispensing_application.handlers.match_workpiece_handler import WorkpieceMatcher
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from compare_contours.testShapeGenerator import create_cross_contour, create_rectangle_contour
+from modules.shared.core.ContourStandartized import Contour
+from modules.shared.tools.GlueCell import GlueType
+from modules.shared.tools.enums.Gripper import Gripper
+from modules.shared.tools.enums.Program import Program
+from modules.shared.tools.enums.ToolID import ToolID
+
+
+def _workpiece(workpiece_id, contour, pickup_point):
+    return GlueWorkpiece(
+        workpieceId=workpiece_id, name="", description="", toolID=ToolID.Tool0, gripperID=Gripper.SINGLE,
+        glueType=GlueType.TypeA, program=Program.TRACE, material="Material1",
+        contour={"contour": contour, "settings": {}}, offset="0", height="4", nozzles=[], contourArea="0",
+        glueQty="", sprayWidth="10", pickupPoint=pickup_point, sprayPattern={"Contour": [], "Fill": []})
+
+
+def test_geometric_matching_aligns_contour_and_pickup_point():
+    workpieces = [_workpiece("1", create_rectangle_contour(center=(400, 300), width=300, height=120), "400.00,300.00"),
+                  _workpiece("2", create_cross_contour(center=(400, 300)), "400.00,300.00")]
+    seen = create_rectangle_contour(center=(650, 420), width=300, height=120)
+
+    found, matches = WorkpieceMatcher().perform_matching(workpieces, [seen])
+
+    assert found and len(matches) == 1
+    aligned = matches[0]
+    assert aligned.workpieceId == "1"
+    assert np.allclose(Contour(aligned.get_main_contour()).getCentroid(), (650, 420), atol=2)
+    pickup = [float(v) for v in aligned.pickupPoint.split(",")]
+    assert np.allclose(pickup, (650, 420), atol=2)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from PyQt6.QtCore import QPointF
+
+from modules.shared.core.contour_editor.BezierSegmentManager import BezierSegmentManager
+from modules.shared.core.contour_editor.bezier_flattening import flatten_quadratic_paths
+
+
+def dense_curve(p0, c, p1, samples=2000):
+    t = np.linspace(0, 1, samples)[:, None]
+    return (1 - t) ** 2 * p0 + 2 * (1 - t) * t * c + t ** 2 * p1
+
+
+def max_deviation(curve, polyline):
+    """Largest distance from a densely sampled curve to the nearest polyline edge."""
+    a, b = polyline[:-1], polyline[1:]
+    ab = b - a
+    ab_len_sq = np.maximum((ab ** 2).sum(axis=1), 1e-12)
+    ap = curve[:, None, :] - a[None, :, :]
+    t = np.clip((ap * ab[None]).sum(axis=2) / ab_len_sq[None], 0, 1)
+    closest = a[None] + t[..., None] * ab[None]
+    return np.sqrt(((curve[:, None, :] - closest) ** 2).sum(axis=2)).min(axis=1).max()
+
+
+@pytest.mark.parametrize("tolerance", [0.05, 0.5, 2.0])
+def test_chord_error_within_tolerance(tolerance):
+    p0, c, p1 = np.array([0.0, 0.0]), np.array([50.0, 120.0]), np.array([100.0, 0.0])
+    (polyline,) = flatten_quadratic_paths([(np.array([p0, p1]), np.array([c]))], tolerance)
+
+    assert np.allclose(polyline[0], p0) and np.allclose(polyline[-1], p1)
+    assert max_deviation(dense_curve(p0, c, p1), polyline) <= tolerance * 1.001
+
+
+def test_tighter_curves_get_more_points():
+    points = np.array([[0.0, 0.0], [100.0, 0.0]])
+    (gentle,) = flatten_quadratic_paths([(points, np.array([[50.0, 5.0]]))], 0.1)
+    (tight,) = flatten_quadratic_paths([(points, np.array([[50.0, 200.0]]))], 0.1)
+    assert len(tight) > len(gentle)
+
+
+def test_straight_runs_keep_only_anchors():
+    points = np.array([[0.0, 0.0], [10.0, 0.0], [10.0, 10.0], [0.0, 10.0]])
+    controls = np.array([[np.nan, np.nan], [10.2, 5.0], [np.nan, np.nan]])  # middle control is within 1 px
+    (polyline,) = flatten_quadratic_paths([(points, controls)], 0.1)
+    assert np.array_equal(polyline, points)
+
+
+def test_multiple_paths_are_split_correctly():
+    paths = [
+        (np.array([[0.0, 0.0], [10.0, 0.0]]), np.array([[5.0, 10.0]])),
+        (np.array([[3.0, 3.0]]), np.empty((0, 2))),
+        (np.empty((0, 2)), np.empty((0, 2))),
+        (np.array([[20.0, 0.0], [30.0, 0.0], [40.0, 0.0]]), np.full((2, 2), np.nan)),
+    ]
+    result = flatten_quadratic_paths(paths, 0.1)
+    assert len(result) == 4
+    assert np.allclose(result[0][[0, -1]], [[0, 0], [10, 0]])
+    assert np.array_equal(result[1], [[3.0, 3.0]])
+    assert result[2].shape == (0, 2)
+    assert np.array_equal(result[3], paths[3][0])
+
+
+def test_to_wp_data_uses_adaptive_flattening():
+    manager = BezierSegmentManager()
+    manager.segments.clear()
+    segment = manager.create_segment([QPointF(0, 0), QPointF(200, 0), QPointF(200, 200)], "Contour")
+    segment.controls[0] = QPointF(100, 150)
+    manager.segments.append(segment)
+
+    adaptive = manager.to_wp_data()["Contour"][0]["contour"]
+    fixed = manager.to_wp_data(samples_per_segment=5)["Contour"][0]["contour"]
+
+    assert adaptive.dtype == np.float32 and adaptive.shape[1:] == (1, 2)
+    assert len(adaptive) > len(fixed)
+    assert np.allclose(adaptive[-1, 0], [200, 200]) and np.allclose(adaptive[-2, 0], [200, 0])
+    assert manager.to_wp_data()["Fill"][0]["contour"].shape == (0, 1, 2)
@@ -0,0 +1,87 @@
+import math
+import random
+
+import pytest
+from PyQt6.QtCore import QPointF
+
+from modules.shared.core.contour_editor.BezierSegmentManager import BezierSegmentManager
+
+
+def linear_drag_targets(manager, pos, threshold):
+    """Reference full scan, identical to the pre-index implementation."""
+    targets = []
+    for seg_idx, segment in enumerate(manager.segments):
+        for idx, pt in enumerate(segment.points):
+            if math.hypot(pt.x() - pos.x(), pt.y() - pos.y()) <= threshold:
+                targets.append(("anchor", seg_idx, idx))
+        for idx, ctrl in enumerate(segment.controls):
+            if ctrl is not None and math.hypot(ctrl.x() - pos.x(), ctrl.y() - pos.y()) <= threshold:
+                targets.append(("control", seg_idx, idx))
+    return targets
+
+
+def linear_segment_at(manager, pos, threshold):
+    for seg_index, segment in enumerate(manager.segments):
+        for i in range(1, len(segment.points)):
+            if manager.is_on_segment(segment.points[i - 1], pos, segment.points[i], threshold):
+                return seg_index, i - 1
+    return None
+
+
+@pytest.fixture
+def dense_manager():
+    rng = random.Random(7)
+    manager = BezierSegmentManager()
+    manager.segments.clear()
+    for _ in range(5):
+        segment = manager.create_segment(
+            [QPointF(rng.uniform(0, 800), rng.uniform(0, 600)) for _ in range(60)], "Contour")
+        for i in range(0, len(segment.controls), 3):
+            p0, p1 = segment.points[i], segment.points[i + 1]
+            segment.controls[i] = (p0 + p1) / 2 + QPointF(5, -5)
+        manager.segments.append(segment)
+    return manager
+
+
+def random_probes(count, seed=11):
+    rng = random.Random(seed)
+    return [QPointF(rng.uniform(-20, 820), rng.uniform(-20, 620)) for _ in range(count)]
+
+
+def test_drag_targets_match_linear_scan(dense_manager):
+    for pos in random_probes(300):
+        assert dense_manager.find_all_drag_targets(pos, threshold=15) == linear_drag_targets(dense_manager, pos, 15)
+
+
+def test_segment_at_matches_linear_scan(dense_manager):
+    for pos in random_probes(300):
+        assert dense_manager.find_segment_at(pos, threshold=10) == linear_segment_at(dense_manager, pos, 10)
+
+
+def test_index_follows_moved_points(dense_manager):
+    segment = dense_manager.segments[2]
+    old_pos = QPointF(segment.points[4])
+    new_pos = QPointF(2000, 2000)
+
+    dense_manager.move_point("anchor", 2, 4, new_pos, suppress_save=True)
+
+    assert ("anchor", 2, 4) in dense_manager.find_all_drag_targets(new_pos, threshold=1)
+    assert ("anchor", 2, 4) not in dense_manager.find_all_drag_targets(old_pos, threshold=1)
+    # Lines attached to the moved anchor now reach the new position
+    assert dense_manager.find_segment_at(QPointF(1999, 1999), threshold=2) is not None
+
+
+def test_index_follows_structural_edits(dense_manager):
+    far_segment = dense_manager.create_segment([QPointF(5000, 5000), QPointF(5100, 5000)], "Fill")
+    dense_manager.segments.append(far_segment)
+    assert dense_manager.find_segment_at(QPointF(5050, 5002)) == (len(dense_manager.segments) - 1, 0)
+
+    dense_manager.delete_segment(0)
+    assert dense_manager.find_segment_at(QPointF(5050, 5002)) == (len(dense_manager.segments) - 1, 0)
+
+    dense_manager.save_state()
+    dense_manager.delete_segment(len(dense_manager.segments) - 1)
+    assert dense_manager.find_segment_at(QPointF(5050, 5002)) is None
+
+    dense_manager.undo()
+    assert dense_manager.find_segment_at(QPointF(5050, 5002)) == (len(dense_manager.segments) - 1, 0)
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from plugins.core.dashboard.ui.widgets.RobotTrajectoryWidget import TrailRenderer, TrajectoryManager
+
+WIDTH, HEIGHT = 640, 360
+
+
+def _positions(count, offset=0):
+    angles = np.linspace(0, 4 * np.pi, count) + offset
+    return [(int(320 + 140 * np.cos(a)), int(180 + 120 * np.sin(2 * a) / 2)) for a in angles]
+
+
+def _feed(manager, positions, break_every=None):
+    for index, position in enumerate(positions):
+        if break_every and index and index % break_every == 0:
+            manager.break_trajectory()
+        manager.update_position(position)
+
+
+def test_drawing_in_ticks_matches_drawing_everything_at_once():
+    base = np.full((HEIGHT, WIDTH, 3), 200, dtype=np.uint8)
+    positions = _positions(300)
+
+    incremental_manager, incremental = TrajectoryManager(), TrailRenderer()
+    incremental.set_base(base)
+    for start in range(0, len(positions), 7):
+        _feed(incremental_manager, positions[start:start + 7])
+        if start % 70 == 0:
+            incremental_manager.break_trajectory()
+        incremental.sync(incremental_manager)
+
+    batch_manager, batch = TrajectoryManager(), TrailRenderer()
+    batch.set_base(base)
+    for start in range(0, len(positions), 7):
+        _feed(batch_manager, positions[start:start + 7])
+        if start % 70 == 0:
+            batch_manager.break_trajectory()
+    batch.sync(batch_manager)
+
+    assert np.array_equal(incremental.render(), batch.render())
+    assert not np.array_equal(incremental.render(), incremental.render(drawing_enabled=False))
+
+
+def test_history_is_bounded_and_a_clear_starts_a_new_layer():
+    manager, renderer = TrajectoryManager(), TrailRenderer()
+    renderer.set_base(np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8))
+    _feed(manager, _positions(10_000))
+
+    assert len(manager.trajectory_points) == manager.trail_length
+    assert renderer.sync(manager)
+    assert not renderer.sync(manager)  # Nothing new to draw
+    assert renderer.render().any()
+
+    manager.clear_trail()
+    assert renderer.sync(manager)
+    assert not renderer.render().any()
+
+
+def test_the_widget_redraws_only_when_the_trail_or_the_image_changed(monkeypatch):
+    from PyQt6.QtWidgets import QApplication
+    from plugins.core.dashboard.ui.widgets.RobotTrajectoryWidget import RobotTrajectoryWidget
+    app = QApplication.instance() or QApplication([])
+
+    widget = RobotTrajectoryWidget(WIDTH, HEIGHT)
+    widget.timer.stop()
+    redraws = []
+    original = widget._update_label_from_frame
+    monkeypatch.setattr(widget, "_update_label_from_frame", lambda: (redraws.append(1), original()))
+    widget.enable_drawing("")
+
+    widget.update_display()
+    assert len(redraws) == 1
+    widget.update_display()
+    assert len(redraws) == 1
+
+    widget.update({"x": 100, "y": 100})
+    widget.update({"x": 200, "y": 150})
+    widget.update_display()
+    assert len(redraws) == 2
+    assert widget.current_frame.shape == (HEIGHT, WIDTH, 3)
+
+    widget.set_image({"image": np.zeros((720, 1280, 3), dtype=np.uint8)})
+    widget.update_display()
+    assert len(redraws) == 3
+    assert not widget.current_frame.any()
+    widget.close()
+    app.processEvents()
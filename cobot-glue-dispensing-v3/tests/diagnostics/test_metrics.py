@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from communication_layer.api.v1 import Constants
+from communication_layer.api.v1.endpoints import stats_endpoints
+from communication_layer.api_gateway.dispatch.stats_dispatcher import StatsDispatch
+from modules.shared.utils import metrics, profiler
+from modules.shared.utils.metrics import MetricsRegistry, TimedProxy
+
+
+def test_histogram_percentiles_are_within_a_bucket():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("stage")
+    for ms in range(1, 1001):
+        histogram.observe(ms / 1000)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 1000
+    assert snapshot["min"] == pytest.approx(0.001)
+    assert snapshot["max"] == pytest.approx(1.0)
+    assert snapshot["mean"] == pytest.approx(0.5005)
+    for q, expected in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        assert snapshot[q] == pytest.approx(expected, rel=0.1)
+
+
+def test_timed_records_blocks_and_functions_and_reset_keeps_metrics():
+    registry = MetricsRegistry()
+
+    with registry.timed("block"):
+        time.sleep(0.01)
+
+    @registry.timed("function")
+    def work():
+        return 42
+
+    assert work() == 42 and work() == 42
+    registry.counter("calls").inc(3)
+
+    snapshot = registry.snapshot()
+    assert snapshot["block"]["count"] == 1 and snapshot["block"]["min"] >= 0.01
+    assert snapshot["function"]["count"] == 2
+    assert snapshot["calls"] == {"type": "counter", "value": 3}
+    assert list(registry.snapshot(prefix="fun")) == ["function"]
+
+    registry.reset()
+    assert registry.snapshot()["function"]["count"] == 0
+    with pytest.raises(TypeError):
+        registry.gauge("calls")
+
+
+def test_timed_proxy_times_calls_and_counts_errors():
+    class Rpc:
+        def GetActualTCPPose(self):
+            return 0, [1, 2, 3]
+
+        def MoveCart(self):
+            raise ConnectionError("robot unreachable")
+
+    registry = MetricsRegistry()
+    rpc = TimedProxy(Rpc(), "robot.rpc", registry)
+
+    assert rpc.GetActualTCPPose() == (0, [1, 2, 3])
+    with pytest.raises(ConnectionError):
+        rpc.MoveCart()
+
+    snapshot = registry.snapshot()
+    assert snapshot["robot.rpc.GetActualTCPPose"]["count"] == 1
+    assert snapshot["robot.rpc.MoveCart"]["count"] == 1
+    assert snapshot["robot.rpc.errors"]["value"] == 1
+
+
+def test_profiler_sees_a_busy_thread():
+    stop = threading.Event()
+
+    def spin_in_the_vision_loop():
+        while not stop.is_set():
+            sum(range(1000))
+
+    thread = threading.Thread(target=spin_in_the_vision_loop, name="VisionLoop", daemon=True)
+    thread.start()
+    try:
+        report = profiler.sample(duration=0.3, interval=0.005)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert report["samples"] > 5
+    assert report["threads"]["VisionLoop"] > 0
+    assert any("spin_in_the_vision_loop" in row["function"] for row in report["cumulative"])
+    assert "spin_in_the_vision_loop" in profiler.format_report(report)
+
+
+def test_stats_dispatch_serves_metrics_and_profiles():
+    metrics.counter("test.stats_dispatch").inc()
+    dispatcher = StatsDispatch()
+
+    response = dispatcher.dispatch([], stats_endpoints.STATS_METRICS, {"prefix": "test."})
+    assert response["status"] == Constants.RESPONSE_STATUS_SUCCESS
+    assert response["data"]["test.stats_dispatch"]["value"] >= 1
+
+    response = dispatcher.dispatch([], stats_endpoints.STATS_PROFILE, {"duration": 0.05})
+    assert response["status"] == Constants.RESPONSE_STATUS_SUCCESS
+    assert response["data"]["samples"] >= 1
+
+    response = dispatcher.dispatch([], stats_endpoints.STATS_PROFILE, {"duration": "soon"})
+    assert response["status"] == Constants.RESPONSE_STATUS_ERROR
@@ -0,0 +1,110 @@
+import os
+import time
+from unittest.mock import patch
+
+import ezdxf
+import numpy as np
+import pytest
+from ezdxf.math import BSpline
+
+from modules.shared.core.dxf import DxfParser
+from modules.shared.core.dxf.DxfParser import DXFPathExtractor, clear_parse_cache
+from modules.shared.core.dxf.nurbs import evaluate_nurbs, flatten_nurbs
+
+CONTROL_POINTS = [(0, 0), (20, 60), (50, -40), (80, 70), (110, 0), (130, 30)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+def polyline_deviation(reference, polyline):
+    """Largest distance from reference points to the nearest polyline edge."""
+    a, b = polyline[:-1], polyline[1:]
+    ab = b - a
+    ab_len_sq = np.maximum((ab ** 2).sum(axis=1), 1e-12)
+    ap = reference[:, None, :] - a[None]
+    t = np.clip((ap * ab[None]).sum(axis=2) / ab_len_sq[None], 0, 1)
+    closest = a[None] + t[..., None] * ab[None]
+    return np.sqrt(((reference[:, None, :] - closest) ** 2).sum(axis=2)).min(axis=1).max()
+
+
+@pytest.fixture
+def generated_dxf(tmp_path):
+    doc = ezdxf.new()
+    for layer in ("External", "Contour", "Fill"):
+        doc.layers.add(layer)
+    msp = doc.modelspace()
+    # Control-point-only spline: has no fit points at all
+    msp.add_open_spline(CONTROL_POINTS, degree=3, dxfattribs={"layer": "Contour"})
+    msp.add_rational_spline(CONTROL_POINTS, weights=[1, 2, 0.5, 3, 1, 1], degree=3, dxfattribs={"layer": "Fill"})
+    msp.add_circle((0, 0), radius=200, dxfattribs={"layer": "External"})
+    msp.add_circle((0, 0), radius=2, dxfattribs={"layer": "Contour"})
+    path = tmp_path / "generated.dxf"
+    doc.saveas(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("weights", [None, [1, 2, 0.5, 3, 1, 1]])
+def test_evaluator_matches_ezdxf(weights):
+    reference = BSpline(CONTROL_POINTS, order=4, weights=weights)
+    knots = reference.knots()
+    u = np.linspace(knots[3], knots[-4], 257)
+
+    ours = evaluate_nurbs(CONTROL_POINTS, knots, 3, u, weights)
+    theirs = np.array([(p.x, p.y) for p in (reference.point(t) for t in u)])
+    assert np.allclose(ours, theirs, atol=1e-9)
+
+
+@pytest.mark.parametrize("tolerance", [1.0, 0.1, 0.01])
+def test_flattened_spline_within_tolerance(tolerance):
+    knots = BSpline(CONTROL_POINTS, order=4).knots()
+    points, _ = flatten_nurbs(CONTROL_POINTS, knots, 3, tolerance)
+    dense = evaluate_nurbs(CONTROL_POINTS, knots, 3, np.linspace(knots[3], knots[-4], 5000))
+    assert polyline_deviation(dense, points) <= tolerance * 1.01
+
+
+def test_control_point_spline_keeps_its_shape(generated_dxf):
+    extractor = DXFPathExtractor(generated_dxf, tolerance=0.05)
+    spline = max(extractor.contourCnt, key=len)
+
+    assert np.allclose(spline[0], CONTROL_POINTS[0]) and np.allclose(spline[-1], CONTROL_POINTS[-1])
+    knots = BSpline(CONTROL_POINTS, order=4).knots()
+    dense = evaluate_nurbs(CONTROL_POINTS, knots, 3, np.linspace(knots[3], knots[-4], 5000))
+    assert polyline_deviation(dense, np.array(spline)) <= 0.05 * 1.01
+
+
+def test_circle_sampling_adapts_to_radius(generated_dxf):
+    extractor = DXFPathExtractor(generated_dxf, tolerance=0.05)
+    big = extractor.wpCnt[0]
+    small = min(extractor.contourCnt, key=len)
+    assert len(small) < 20 < len(big)
+
+
+def test_reimport_uses_cache(generated_dxf):
+    start = time.perf_counter()
+    first = DXFPathExtractor(generated_dxf)
+    cold = time.perf_counter() - start
+
+    with patch.object(DxfParser.ezdxf, "readfile", side_effect=AssertionError("file re-parsed")):
+        start = time.perf_counter()
+        second = DXFPathExtractor(generated_dxf)
+        warm = time.perf_counter() - start
+
+    assert second.get_paths() == first.get_paths()
+    assert warm < cold
+
+
+def test_modified_file_is_parsed_again(generated_dxf):
+    DXFPathExtractor(generated_dxf)
+
+    doc = ezdxf.readfile(generated_dxf)
+    doc.modelspace().add_line((0, 0), (10, 0), dxfattribs={"layer": "Fill"})
+    doc.saveas(generated_dxf)
+    stat = os.stat(generated_dxf)
+    os.utime(generated_dxf, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert len(DXFPathExtractor(generated_dxf).fillCnt) == 2
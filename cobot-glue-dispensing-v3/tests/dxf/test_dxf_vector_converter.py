@@ -0,0 +1,74 @@
+import random
+
+import ezdxf
+import numpy as np
+import pytest
+
+from backend.system.utils.dxf.DxfVectorConverter import DxfVectorConverter, chain_polylines
+
+
+@pytest.fixture
+def plate_dxf(tmp_path):
+    """100 x 60 plate drawn as shuffled, partly reversed LINEs with a circular hole and a bulged slot."""
+    doc = ezdxf.new()
+    msp = doc.modelspace()
+    corners = [(0, 0), (100, 0), (100, 60), (0, 60)]
+    edges = [(corners[i], corners[(i + 1) % 4]) for i in range(4)]
+    random.Random(1).shuffle(edges)
+    for i, (a, b) in enumerate(edges):
+        msp.add_line(*((b, a) if i % 2 else (a, b)))
+
+    msp.add_circle((25, 30), radius=8)
+    # Slot: two straight runs joined by half-circle bulges (bulge 1 == 180 degrees)
+    msp.add_lwpolyline([(60, 25, 0), (80, 25, 1), (80, 35, 0), (60, 35, 1)], format="xyb", close=True)
+
+    path = tmp_path / "plate.dxf"
+    doc.saveas(path)
+    return str(path)
+
+
+def test_lines_are_chained_into_closed_outer_contour(plate_dxf):
+    contours = DxfVectorConverter(plate_dxf, tolerance=0.01).convert()
+    outers = [c for c in contours if not c.is_hole]
+
+    assert all(c.closed for c in contours)
+    assert len(outers) == 1
+    assert np.isclose(abs(outers[0].area()), 100 * 60)
+    assert outers[0].area() > 0  # counter-clockwise
+
+
+def test_nested_contours_are_holes(plate_dxf):
+    holes = [c for c in DxfVectorConverter(plate_dxf, tolerance=0.01).convert() if c.is_hole]
+
+    assert len(holes) == 2
+    assert all(c.area() < 0 for c in holes)  # clockwise
+    slot = max(holes, key=lambda c: c.points[:, 0].max())
+    assert slot.points[:, 0].max() == pytest.approx(85, abs=0.05)  # bulge arcs reach 5 mm past the anchors
+
+
+@pytest.mark.parametrize("tolerance", [0.5, 0.05, 0.005])
+def test_circle_chord_error_within_tolerance(plate_dxf, tolerance):
+    contours = DxfVectorConverter(plate_dxf, tolerance=tolerance).convert()
+    circle = min(contours, key=lambda c: abs(c.area()))
+    pts = circle.points
+    midpoints = (pts + np.roll(pts, -1, axis=0)) / 2
+
+    assert np.allclose(np.hypot(*(pts - (25, 30)).T), 8)
+    assert (8 - np.hypot(*(midpoints - (25, 30)).T)).max() <= tolerance + 1e-9
+
+
+def test_open_chains_stay_open():
+    pieces = [(np.array([[0.0, 0.0], [1.0, 0.0]]), False), (np.array([[2.0, 0.0], [1.0, 0.0]]), False)]
+    ((points, closed),) = chain_polylines(pieces, 0.01)
+    assert not closed
+    assert np.array_equal(points, [[0, 0], [1, 0], [2, 0]])
+
+
+def test_image_contours_match_converter_frame(plate_dxf):
+    converter = DxfVectorConverter(plate_dxf, tolerance=0.01)
+    contours = converter.to_image_contours(target_size_mm=(200, 100), target_size_px=(400, 200))
+    outer = max(contours, key=lambda c: np.ptp(c[:, 0, 0]))
+
+    # Drawing extents are centred in the window, y flipped
+    assert outer[:, 0, 0].min() == pytest.approx(100) and outer[:, 0, 0].max() == pytest.approx(300)
+    assert outer[:, 0, 1].min() == pytest.approx(40) and outer[:, 0, 1].max() == pytest.approx(160)
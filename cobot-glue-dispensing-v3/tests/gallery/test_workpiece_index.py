@@ -0,0 +1,193 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from applications.glue_dispensing_application.model.workpiece.GlueWorkpiece import GlueWorkpiece
+from applications.glue_dispensing_application.repositories.workpiece import glue_workpiece_json_repository
+from applications.glue_dispensing_application.repositories.workpiece.glue_workpiece_json_repository import \
+    GlueWorkpieceJsonRepository
+from compare_contours.testShapeGenerator import create_rectangle_contour
+from modules.shared.tools.GlueCell import GlueType
+from modules.shared.tools.enums.Gripper import Gripper
+from modules.shared.tools.enums.Program import Program
+from modules.shared.tools.enums.ToolID import ToolID
+
+
+def _workpiece(workpiece_id, name="", center=(400, 300)):
+    contour = create_rectangle_contour(center=center, width=300, height=120).astype(np.float32)
+    spray = create_rectangle_contour(center=center, width=260, height=80).astype(np.float32)
+    return GlueWorkpiece(
+        workpieceId=workpiece_id, name=name, description="test part", toolID=ToolID.Tool0, gripperID=Gripper.SINGLE,
+        glueType=GlueType.TypeA, program=Program.TRACE, material="Material1",
+        contour={"contour": contour, "settings": {}}, offset="0", height="4", nozzles=[], contourArea="36000",
+        glueQty="", sprayWidth="10", pickupPoint=f"{center[0]:.2f},{center[1]:.2f}",
+        sprayPattern={"Contour": [{"contour": spray, "settings": {}}], "Fill": []})
+
+
+def _repository(directory):
+    return GlueWorkpieceJsonRepository(str(directory), [], GlueWorkpiece)
+
+
+def _count_renders(monkeypatch):
+    rendered = []
+    real_write = glue_workpiece_json_repository.write_workpiece_thumbnail
+
+    def counting_write(workpiece, thumbnail_path, preview_path):
+        rendered.append(workpiece.workpieceId)
+        return real_write(workpiece, thumbnail_path, preview_path)
+
+    monkeypatch.setattr(glue_workpiece_json_repository, "write_workpiece_thumbnail", counting_write)
+    return rendered
+
+
+def test_saving_writes_a_thumbnail_next_to_the_workpiece_and_indexes_it(tmp_path):
+    repository = _repository(tmp_path)
+    assert repository.save_workpiece(_workpiece("1", "bracket"))[0]
+    assert repository.save_workpiece(_workpiece("2", "panel"))[0]
+
+    entries = repository.get_index()
+    assert [entry["workpieceId"] for entry in entries] == ["1", "2"]
+    for entry in entries:
+        assert entry["file"].endswith(GlueWorkpieceJsonRepository.WORKPIECE_FILE_SUFFIX)
+        assert os.path.dirname(entry["thumbnail"]) == os.path.dirname(entry["file"])
+        thumbnail, preview = cv2.imread(entry["thumbnail"]), cv2.imread(entry["preview"])
+        assert thumbnail.shape == (120, 120, 3) and preview.shape == (400, 400, 3)
+        assert (thumbnail < 255).any() and (preview < 255).any()
+        assert "contour" not in entry and "sprayPattern" not in entry
+    assert entries[0]["name"] == "bracket" and entries[0]["material"] == "Material1"
+
+    with open(repository.index_path) as f:
+        stored = json.load(f)["workpieces"]
+    assert [entry["workpieceId"] for entry in stored] == ["1", "2"]
+
+
+def test_reopening_reuses_the_index_and_rebuilds_only_stale_entries(tmp_path, monkeypatch):
+    repository = _repository(tmp_path)
+    for workpiece_id in ("1", "2", "3"):
+        repository.save_workpiece(_workpiece(workpiece_id))
+    entries = repository.get_index()
+
+    rendered = _count_renders(monkeypatch)
+    assert _repository(tmp_path).get_index() == entries
+    assert rendered == []
+
+    # A workpiece saved before thumbnails existed
+    os.remove(entries[1]["thumbnail"])
+    reopened = _repository(tmp_path)
+    assert rendered == ["2"]
+    assert reopened.get_index() == entries
+
+    os.remove(reopened.index_path)
+    _repository(tmp_path)
+    assert rendered == ["2"]  # A lost index is rebuilt from the files, reusing the thumbnails
+    assert _repository(tmp_path).get_index() == entries
+
+
+def test_updating_and_deleting_keep_the_index_in_step(tmp_path):
+    repository = _repository(tmp_path)
+    repository.save_workpiece(_workpiece("1", "old name"))
+    repository.save_workpiece(_workpiece("2"))
+
+    assert repository.save_workpiece(_workpiece("1", "new name", center=(500, 200)))[0]
+    assert [entry["name"] for entry in repository.get_index()] == ["new name", ""]
+
+    assert repository.deleteWorkpiece("2")[0]
+    assert [entry["workpieceId"] for entry in _repository(tmp_path).get_index()] == ["1"]
+
+
+def test_workpieces_are_deserialized_only_when_requested(tmp_path, monkeypatch):
+    repository = _repository(tmp_path)
+    for workpiece_id in ("1", "2", "3"):
+        repository.save_workpiece(_workpiece(workpiece_id, f"part {workpiece_id}"))
+
+    deserialized = []
+    real_deserialize = GlueWorkpiece.deserialize
+
+    def counting_deserialize(data):
+        workpiece = real_deserialize(data)
+        deserialized.append(workpiece.workpieceId)
+        return workpiece
+
+    monkeypatch.setattr(GlueWorkpiece, "deserialize", staticmethod(counting_deserialize))
+    reopened = _repository(tmp_path)
+    assert [entry["name"] for entry in reopened.get_index()] == ["part 1", "part 2", "part 3"]
+    assert deserialized == []
+
+    assert reopened.get_workpiece_by_id("2").name == "part 2"
+    assert reopened.get_workpiece_by_id("2") is reopened.get_workpiece_by_id(2)
+    assert reopened.get_workpiece_by_id("4") is None
+    assert deserialized == ["2"]
+
+    assert [workpiece.workpieceId for workpiece in reopened.data] == ["1", "2", "3"]
+    assert deserialized == ["2", "1", "3"]
+
+
+def test_gallery_loads_thumbnails_as_they_scroll_into_view(tmp_path):
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from plugins.core.gallery.ui.gallery.GalleryContent import GalleryContent
+
+    repository = _repository(tmp_path)
+    for workpiece_id in range(100):
+        repository.save_workpiece(_workpiece(str(workpiece_id)))
+
+    gallery = GalleryContent(entries=repository.get_index())
+    gallery.resize(1000, 500)
+    gallery.show()
+    app.processEvents()
+    assert 0 < len(gallery.all_thumbnails) < 100  # Widgets are created as the grid scrolls
+    assert all(thumbnail.image_label.pixmap() is not None for thumbnail in gallery.all_thumbnails)  # Placeholders
+
+    gallery.thumbnail_loader.wait_idle()
+    app.processEvents()
+    loaded = [thumbnail.original_pixmap is not None for thumbnail in gallery.all_thumbnails]
+    assert loaded[0] and 0 < sum(loaded) < len(loaded)
+    assert not loaded[-1]
+
+    scroll_bar = gallery.scroll_area.verticalScrollBar()
+    while scroll_bar.value() < scroll_bar.maximum() or gallery.pending_thumbnails:
+        scroll_bar.setValue(scroll_bar.maximum())
+        app.processEvents()
+        gallery.thumbnail_loader.wait_idle()
+        app.processEvents()
+    assert len(gallery.all_thumbnails) == 100
+    assert gallery.all_thumbnails[-1].original_pixmap is not None
+
+    thumbnail = gallery.all_thumbnails[1]
+    gallery.show_preview(1, thumbnail.timestamp, thumbnail.filename)
+    preview = gallery.preview_image_label.pixmap()
+    assert preview is not None and preview.width() > 120
+    gallery.close()
+
+
+def test_workpieces_without_thumbnails_are_rendered_once_and_cached(tmp_path):
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from plugins.core.gallery.ui.gallery.ThumbnailWidget import ThumbnailWidget
+    from plugins.core.gallery.ui.gallery.thumbnail_loader import ThumbnailLoader
+
+    def load(workpiece):
+        loader = ThumbnailLoader(cache_directory=str(tmp_path))
+        widget = ThumbnailWidget(workpiece.workpieceId, None, "default", workpieceId=workpiece.workpieceId,
+                                 workpiece=workpiece, loader=loader)
+        widget.show()
+        app.processEvents()
+        loader.wait_idle()
+        app.processEvents()
+        widget.close()
+        return widget.original_pixmap, loader.rendered
+
+    pixmap, rendered = load(_workpiece("7"))
+    assert rendered == 1 and pixmap.width() == 120
+    assert len(os.listdir(tmp_path)) == 1
+
+    pixmap, rendered = load(_workpiece("7"))
+    assert rendered == 0 and pixmap.width() == 120  # Read from the cache
+
+    pixmap, rendered = load(_workpiece("7", center=(500, 200)))  # Changed content
+    assert rendered == 1
+    assert len(os.listdir(tmp_path)) == 1  # The image of the old content is gone
@@ -0,0 +1,112 @@
+import threading
+import time
+
+from applications.glue_dispensing_application.glue_process.ExecutionContext import Context
+from applications.glue_dispensing_application.glue_process.state_machine.ExecutableStateMachine import \
+    ExecutableStateMachineBuilder, State, StateRegistry
+from applications.glue_dispensing_application.glue_process.state_machine.GlueProcessState import \
+    GlueProcessState, GlueProcessTransitionRules
+
+PATHS = 50
+# One glue path, as the glue dispensing operation runs it
+PATH_CYCLE = [
+    GlueProcessState.STARTING,
+    GlueProcessState.MOVING_TO_FIRST_POINT,
+    GlueProcessState.EXECUTING_PATH,
+    GlueProcessState.PUMP_INITIAL_BOOST,
+    GlueProcessState.STARTING_PUMP_ADJUSTMENT_THREAD,
+    GlueProcessState.SENDING_PATH_POINTS,
+    GlueProcessState.WAIT_FOR_PATH_COMPLETION,
+    GlueProcessState.TRANSITION_BETWEEN_PATHS,
+]
+
+
+def _machine(handlers, initial_state=GlueProcessState.IDLE):
+    registry = StateRegistry()
+    for state in GlueProcessState:
+        registry.register_state(State(state, handler=handlers.get(state, lambda ctx: None)))
+    return (ExecutableStateMachineBuilder()
+            .with_initial_state(initial_state)
+            .with_transition_rules(GlueProcessTransitionRules.get_glue_transition_rules())
+            .with_state_registry(registry)
+            .with_context(Context())
+            .with_on_transition_success(lambda state: None)
+            .build())
+
+
+def _run(machine):
+    thread = threading.Thread(target=machine.start_execution, daemon=True)
+    thread.start()
+    return thread
+
+
+def _wait_for(machine, state, timeout=2.0):
+    assert machine.wait_until(lambda: machine.state == state, timeout), f"{machine.state} != {state}"
+
+
+def test_transitions_run_the_next_state_without_idle_time():
+    ctx = {"paths": 0}
+
+    def transition_between_paths(_):
+        ctx["paths"] += 1
+        return GlueProcessState.STARTING if ctx["paths"] < PATHS else GlueProcessState.COMPLETED
+
+    handlers = {state: (lambda ctx, next_state=next_state: next_state)
+                for state, next_state in zip(PATH_CYCLE, PATH_CYCLE[1:])}
+    handlers[GlueProcessState.TRANSITION_BETWEEN_PATHS] = transition_between_paths
+    handlers[GlueProcessState.COMPLETED] = lambda ctx: machine.stop_execution()
+    machine = _machine(handlers, initial_state=GlueProcessState.STARTING)
+
+    start = time.perf_counter()
+    machine.start_execution()  # Returns once COMPLETED stops it
+    elapsed = time.perf_counter() - start
+
+    transitions = PATHS * len(PATH_CYCLE)
+    overhead_ms = elapsed * 1000 / transitions
+    print(f"{transitions} transitions with instant handlers: {overhead_ms:.3f} ms per transition")
+    assert machine.state == GlueProcessState.COMPLETED
+    # Was >= 100 ms (the sleep after every state); a few ms leaves room for slow CI machines
+    assert overhead_ms < 5
+
+
+def test_waiting_states_block_until_woken():
+    executions = {"paused": 0}
+
+    def paused(_):
+        executions["paused"] += 1
+        return GlueProcessState.PAUSED
+
+    machine = _machine({GlueProcessState.STARTING: lambda ctx: GlueProcessState.PAUSED,
+                        GlueProcessState.PAUSED: paused,
+                        GlueProcessState.STOPPED: lambda ctx: GlueProcessState.COMPLETED})
+    thread = _run(machine)
+
+    machine.transition(GlueProcessState.STARTING)
+    _wait_for(machine, GlueProcessState.PAUSED)
+    time.sleep(0.3)
+    assert executions["paused"] == 1  # Not re-run on a timer while nothing happens
+
+    start = time.perf_counter()
+    machine.transition(GlueProcessState.STOPPED)  # Stop from pause, from another thread
+    _wait_for(machine, GlueProcessState.COMPLETED)
+    assert time.perf_counter() - start < 0.05
+
+    machine.stop_execution()
+    thread.join(timeout=1.0)
+    assert not thread.is_alive()
+
+
+def test_wait_until_is_woken_by_notify():
+    machine = _machine({})
+    finished = threading.Event()
+    woken = []
+    waiter = threading.Thread(target=lambda: woken.append(machine.wait_until(finished.is_set, timeout=2.0)))
+    waiter.start()
+
+    time.sleep(0.05)
+    start = time.perf_counter()
+    finished.set()
+    machine.notify()
+    waiter.join()
+    assert woken == [True]
+    assert time.perf_counter() - start < 0.05
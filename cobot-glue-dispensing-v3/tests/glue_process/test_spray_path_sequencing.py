@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from applications.glue_dispensing_application.handlers.spraying_handler import sequence_spray_paths, \
+    start_path_execution
+
+CAPTURE_POSITION = [0.0, 0.0, 400.0, 180.0, 0.0, 0.0]
+
+
+def _line(x0, x1, label):
+    """Spray path along y = 0 from x0 to x1, with its settings."""
+    step = 10 if x1 > x0 else -10
+    return [[float(x), 0.0, 20.0, 180.0, 0.0, 0.0] for x in range(x0, x1 + step, step)], {"label": label}
+
+
+class _Operation:
+    def __init__(self):
+        self.started = []
+
+    def start(self, paths, spray_on=False):
+        self.started.append(paths)
+        return "started"
+
+
+def _application():
+    robot_config = SimpleNamespace(getCalibrationPositionParsed=lambda: list(CAPTURE_POSITION))
+    glue_settings = SimpleNamespace(get_spray_on=lambda: False)
+    return SimpleNamespace(robot_service=SimpleNamespace(robot_config=robot_config),
+                           get_glue_settings=lambda: glue_settings,
+                           glue_dispensing_operation=_Operation())
+
+
+def test_glue_paths_are_sequenced_from_the_capture_position_before_spraying():
+    far, reversed_fill, near = _line(300, 400, "far"), _line(200, 100, "fill"), _line(10, 50, "near")
+    application = _application()
+
+    assert start_path_execution(application, [far, reversed_fill, near]) == "started"
+
+    (sprayed,) = application.glue_dispensing_operation.started
+    assert [settings["label"] for _, settings in sprayed] == ["near", "fill", "far"]
+    # The fill is sprayed from its last point, its settings stay with it
+    assert sprayed[1][0] == reversed_fill[0][::-1]
+    assert sprayed[0][0] == near[0] and sprayed[2][0] == far[0]
+
+
+def test_empty_paths_are_kept_last():
+    empty = ([], {"label": "empty"})
+    paths = sequence_spray_paths([_line(300, 400, "far"), empty, _line(10, 50, "near")], start_point=(0, 0))
+
+    assert [settings["label"] for _, settings in paths] == ["near", "far", "empty"]
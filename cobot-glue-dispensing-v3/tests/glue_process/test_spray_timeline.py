@@ -0,0 +1,166 @@
+import threading
+import time
+
+from applications.glue_dispensing_application.glue_process.PumpController import PumpController
+from applications.glue_dispensing_application.glue_process.glue_dispensing_operation import \
+    glue_dispensing_logger_context
+from applications.glue_dispensing_application.services.glueSprayService.GlueSprayService import GlueSprayService
+from applications.glue_dispensing_application.services.glueSprayService.spray_timeline import SprayTimeline, \
+    TimelineStep
+from applications.glue_dispensing_application.settings.GlueSettings import GlueSettings
+
+TOLERANCE = 0.03  # s
+
+
+def _recording_service(failing=()):
+    """GlueSprayService with its device commands replaced by recorders (seconds since creation)."""
+    service = GlueSprayService(GlueSettings())
+    service.settings.set_value("Time Before Motion", 0.05)
+    service.settings.set_value("Initial Ramp Speed Duration", 0.0)
+    calls = []
+    created = time.perf_counter()
+
+    def recorder(name, duration=0.0):
+        def command(*args, **kwargs):
+            calls.append((name, time.perf_counter() - created))
+            time.sleep(duration)
+            return name not in failing
+        return command
+
+    service.fanOn = recorder("fanOn", 0.02)
+    service.generatorOn = recorder("generatorOn", 0.02)
+    service.motorOn = recorder("motorOn", 0.1)
+    service.motorOff = recorder("motorOff", 0.02)
+    service.generatorOff = recorder("generatorOff")
+    service.fanOff = recorder("fanOff")
+    return service, calls
+
+
+def test_steps_run_at_their_offsets_from_the_reference_time():
+    slow = TimelineStep(0.0, "slow", lambda: time.sleep(0.05))
+    on_time = TimelineStep(0.1, "on time", lambda: None)
+    late = TimelineStep(0.12, "late", lambda: time.sleep(0.05))
+    after_late = TimelineStep(0.13, "after late", lambda: None)
+    timeline = SprayTimeline("test", [after_late, late, slow, on_time]).start()
+    assert timeline.wait(timeout=2)
+
+    offsets = dict(timeline.issued)
+    assert [name for name, _ in timeline.issued] == ["slow", "on time", "late", "after late"]
+    # The slow first step is absorbed by the wait for the second one
+    assert 0.1 <= offsets["on time"] < 0.1 + TOLERANCE
+    # A step that overruns the next offset delays that step, without overlapping it
+    assert offsets["after late"] >= 0.12 + 0.05
+
+
+def test_release_before_the_end_and_completion_in_the_background():
+    completed = threading.Event()
+    steps = [TimelineStep(0.0, "first", lambda: None), TimelineStep(0.1, "long", lambda: time.sleep(0.2))]
+    timeline = SprayTimeline("test", steps, release_offset=0.08, on_complete=lambda t: completed.set()).start()
+
+    assert timeline.wait_released(timeout=2)
+    released = time.perf_counter() - timeline.reference_time
+    assert 0.08 <= released < 0.08 + TOLERANCE
+    assert not completed.is_set()
+    assert completed.wait(2) and timeline.wait()
+
+
+def test_a_failed_step_rolls_back_and_reports_the_failure():
+    events = []
+
+    def fail():
+        raise RuntimeError("no answer")
+
+    steps = [TimelineStep(0.0, "ok", lambda: events.append("ok")), TimelineStep(0.01, "fail", fail),
+             TimelineStep(0.02, "never", lambda: events.append("never"))]
+    timeline = SprayTimeline("test", steps, release_offset=0.05, rollback=lambda: events.append("rollback"),
+                             on_failure=lambda t, e: events.append(str(e))).start()
+    assert not timeline.wait_released(timeout=2)
+    assert not timeline.wait(timeout=2)
+    assert events == ["ok", "rollback", "no answer"]
+    assert isinstance(timeline.error, RuntimeError)
+
+
+def test_the_release_waits_for_the_steps_before_it_to_return():
+    returned = threading.Event()
+    steps = [TimelineStep(0.0, "slow", lambda: (time.sleep(0.1), returned.set()))]
+    timeline = SprayTimeline("test", steps, release_offset=0.02).start()
+
+    assert timeline.wait_released(timeout=2)
+    assert returned.is_set()
+    assert 0.1 <= time.perf_counter() - timeline.reference_time < 0.1 + TOLERANCE
+
+
+def test_start_releases_the_robot_once_the_pump_started():
+    service, calls = _recording_service()
+    completed = threading.Event()
+    started = time.perf_counter()
+    assert service.startGlueDispensing(0, speed=10000, reverse_time=0.1, speedReverse=1000, gen_pump_delay=0.1,
+                                       on_complete=lambda timeline: completed.set())
+    # The pump start plus the Time Before Motion setting (0.15 s) has passed, but the pump
+    # confirms its start only at 0.2 s
+    held = time.perf_counter() - started
+    assert 0.2 <= held < 0.2 + TOLERANCE
+    assert completed.wait(2)
+
+    times = dict(calls)
+    assert [name for name, _ in calls] == ["fanOn", "generatorOn", "motorOn"]
+    # The pump starts gen_pump_delay after the sequence, not after the fan and generator transactions
+    assert times["motorOn"] - times["fanOn"] < 0.1 + TOLERANCE
+
+
+def test_stop_drops_a_pending_pump_start_and_turns_the_generator_off_after_the_reverse():
+    service, calls = _recording_service()
+    service.scheduleGlueDispensingStart(0, speed=10000, reverse_time=0.1, speedReverse=1000, gen_pump_delay=0.2)
+    time.sleep(0.05)
+    assert service.stopGlueDispensing(0, speed_reverse=1000, pump_reverse_time=0.05, ramp_steps=1,
+                                      pump_gen_delay=0.05)
+    assert service._timeline.wait(timeout=2)
+
+    times = dict(calls)
+    assert [name for name, _ in calls] == ["fanOn", "generatorOn", "motorOff", "generatorOff"]
+    # At the planned reverse + delay from the sequence start (the pump stop's own start, within
+    # the thread start-up), and after the pump has stopped
+    assert 0.1 - 0.005 <= times["generatorOff"] - times["motorOff"] < 0.1 + TOLERANCE
+
+
+def test_a_pump_that_does_not_start_turns_everything_off():
+    service, calls = _recording_service(failing={"motorOn"})
+    failures = []
+    assert not service.startGlueDispensing(0, speed=10000, reverse_time=0.1, speedReverse=1000, gen_pump_delay=0.0,
+                                           motion_offset=0.5, on_failure=lambda timeline, e: failures.append(e))
+    assert not service._timeline.wait(timeout=2)
+    assert [name for name, _ in calls] == ["fanOn", "generatorOn", "motorOn", "generatorOff", "fanOff", "motorOff"]
+    assert len(failures) == 1 and "did not start" in str(failures[0])
+
+
+def test_stop_reports_a_pump_that_did_not_stop():
+    service, calls = _recording_service(failing={"motorOff"})
+    failures = []
+    assert not service.stopGlueDispensing(0, speed_reverse=1000, pump_reverse_time=0.05, ramp_steps=1,
+                                          pump_gen_delay=0.05, on_failure=lambda timeline, e: failures.append(e))
+    assert not service._timeline.wait(timeout=2)
+    assert [name for name, _ in calls] == ["motorOff"]
+    assert len(failures) == 1 and "did not stop" in str(failures[0])
+
+
+def test_the_glue_cycle_pump_reverses_while_the_robot_travels_to_the_next_path():
+    service, calls = _recording_service()
+    pump = PumpController(False, glue_dispensing_logger_context, service.settings)
+    assert pump.pump_on(service, None, 0)
+
+    # Between paths: the stop is left running, and the next path's pump start waits for it
+    pump.pump_off(service, None, 0, wait=False)
+    assert not service._timeline.done
+    assert pump.pump_on(service, None, 0)
+    assert [name for name, _ in calls] == ["motorOn", "motorOff", "motorOn"]
+    assert calls[2][1] - calls[1][1] >= 0.02
+
+    # Stopping the operation waits for the pump
+    pump.pump_off(service, None, 0)
+    assert service._timeline.done
+
+
+def test_the_glue_cycle_reports_a_pump_that_did_not_start():
+    service, calls = _recording_service(failing={"motorOn"})
+    pump = PumpController(False, glue_dispensing_logger_context, service.settings)
+    assert not pump.pump_on(service, None, 0)
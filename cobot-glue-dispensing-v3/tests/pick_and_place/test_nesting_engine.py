@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+from applications.glue_dispensing_application.pick_and_place_process.Plane import Plane
+from applications.glue_dispensing_application.pick_and_place_process.nesting_engine import RasterNester
+
+
+def rectangle(w, h, x=0.0, y=0.0):
+    return np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.float32)
+
+
+def l_shape(size, arm, x=500.0, y=100.0):
+    return np.array([[x, y], [x + size, y], [x + size, y + arm], [x + arm, y + arm],
+                     [x + arm, y + size], [x, y + size]], dtype=np.float32)
+
+
+def small_plane(width=300, height=200, spacing=10):
+    plane = Plane()
+    plane.xMin, plane.xMax, plane.yMin, plane.yMax = 0, width, 0, height
+    plane.spacing = spacing
+    return plane
+
+
+def centroid(points):
+    return tuple(np.asarray(points).mean(axis=0))
+
+
+def assert_valid_layout(plane, placements, resolution):
+    polygons = [Polygon(p.contour) for p in placements]
+    for placement in placements:
+        lo, hi = placement.contour.min(axis=0), placement.contour.max(axis=0)
+        assert lo[0] >= plane.xMin - 1e-3 and lo[1] >= plane.yMin - 1e-3
+        assert hi[0] <= plane.xMax + 1e-3 and hi[1] <= plane.yMax + 1e-3
+    for i in range(len(polygons)):
+        for j in range(i + 1, len(polygons)):
+            assert polygons[i].distance(polygons[j]) >= plane.spacing - resolution
+
+
+def test_placements_stay_inside_plane_and_keep_spacing():
+    plane = small_plane()
+    rng = np.random.default_rng(3)
+    parts = [rectangle(*rng.uniform(20, 80, 2), x=1000, y=1000) for _ in range(12)]
+    nester = RasterNester(plane, resolution=2.0, time_budget=None)
+    plan = nester.plan(parts, [centroid(p) for p in parts])
+
+    assert plan.placements
+    assert sorted([p.index for p in plan.placements] + plan.unplaced) == list(range(12))
+    assert_valid_layout(plane, plan.placements, nester.resolution)
+
+
+def test_placement_is_rotation_about_pivot_plus_translation():
+    plane = small_plane()
+    part = l_shape(80, 20)
+    pivot = (510.0, 110.0)
+    (placement,) = RasterNester(plane, time_budget=None).plan([part], [pivot]).placements
+
+    angle = np.radians(placement.rotation)
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+    expected = (part - pivot) @ rotation.T + placement.drop_point
+    assert np.allclose(placement.contour, expected, atol=1e-3)
+
+
+def test_rotation_is_used_when_part_only_fits_turned():
+    plane = small_plane(width=100, height=250)
+    part = rectangle(200, 40)
+    plan = RasterNester(plane, time_budget=None).plan([part], [centroid(part)])
+    assert plan.placements[0].rotation in (90, 270)
+    assert plan.placements[0].height == pytest.approx(200, abs=1e-3)
+
+
+def test_part_larger_than_plane_is_unplaced():
+    plan = RasterNester(small_plane(), time_budget=None).plan([rectangle(400, 400)], [(200, 200)])
+    assert plan.unplaced == [0] and not plan.placements
+
+
+def test_l_shapes_nest_into_each_other():
+    # Their 120 mm bounding boxes cannot share the plane; the shapes fit once one is turned
+    plane = small_plane(width=160, height=160, spacing=4)
+    parts = [l_shape(120, 20), l_shape(120, 20)]
+    plan = RasterNester(plane, resolution=1.0, time_budget=None).plan(parts, [centroid(p) for p in parts])
+    assert len(plan.placements) == 2
+    assert_valid_layout(plane, plan.placements, 1.0)
+
+
+def test_occupancy_persists_between_batches():
+    plane = small_plane()
+    nester = RasterNester(plane, time_budget=None)
+    first = nester.plan([rectangle(100, 80)], [(50, 40)]).placements
+    second = nester.plan([rectangle(100, 80)], [(50, 40)]).placements
+    assert_valid_layout(plane, first + second, nester.resolution)
+    assert nester.fill_ratio == pytest.approx(2 * 100 * 80 / (300 * 200))
+
+
+def test_time_budget_defers_remaining_parts():
+    parts = [rectangle(30, 30) for _ in range(5)]
+    plan = RasterNester(small_plane(), time_budget=0.0).plan(parts, [(15, 15)] * 5)
+    assert plan.timed_out
+    assert sorted([p.index for p in plan.placements] + plan.deferred) == list(range(5))
@@ -0,0 +1,118 @@
+import glob
+import os
+
+import cv2
+import numpy as np
+
+from backend.system.utils.custom_logging import LoggerContext
+from libs.plvision.PLVision.arucoModule import ArucoDetector, ArucoDictionary
+from modules.robot_calibration.CalibrationVision import CalibrationVision, marker_index
+
+RECORDED_FRAMES = sorted(glob.glob(os.path.join(
+    os.path.dirname(__file__), "..", "..", "modules", "VisionSystem", "calibration", "stereo_calibration",
+    "calibration_images", "left", "*.png")))
+BOARD = (17, 11)  # inner corners of the recorded board
+SQUARE_MM = 15
+MARKER_PX = 60
+MARKERS = {0: (60, 40), 1: (1140, 40), 2: (60, 600)}  # id -> top-left corner (px) in the first frame
+
+
+class _DetectionSystem:
+    """The vision system's detectArucoMarkers on the images it is given, recording their sizes."""
+
+    def __init__(self):
+        self.detector = ArucoDetector(arucoDict=ArucoDictionary.DICT_4X4_1000)
+        self.detected_shapes = []
+
+    def detectArucoMarkers(self, flip=False, image=None):
+        self.detected_shapes.append(image.shape[:2])
+        corners, ids = self.detector.detectAll(image)
+        return corners, ids, image
+
+
+def _vision(system):
+    return CalibrationVision(system, BOARD, SQUARE_MM, set(MARKERS), LoggerContext(enabled=False, logger=None), debug_draw=None,
+                             debug=False)
+
+
+def _with_markers(frame):
+    """A recorded frame with the calibration markers on it, each with a white quiet zone."""
+    frame = frame.copy()
+    dictionary = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_4X4_1000)
+    for marker_id, (x, y) in MARKERS.items():
+        marker = cv2.aruco.generateImageMarker(dictionary, marker_id, MARKER_PX)
+        quiet = MARKER_PX // 5
+        frame[y - quiet:y + MARKER_PX + quiet, x - quiet:x + MARKER_PX + quiet] = 255
+        frame[y:y + MARKER_PX, x:x + MARKER_PX] = cv2.cvtColor(marker, cv2.COLOR_GRAY2BGR)
+    return frame
+
+
+def _replay(frame, marker_id, steps):
+    """The scene as the camera moves to bring the marker's top-left corner to the image center."""
+    height, width = frame.shape[:2]
+    offset = np.array([width // 2, height // 2]) - MARKERS[marker_id]
+    for step in range(1, steps + 1):
+        dx, dy = offset * (1 - 0.5 ** step)
+        yield cv2.warpAffine(frame, np.float32([[1, 0, dx], [0, 1, dy]]), (width, height),
+                             borderMode=cv2.BORDER_REPLICATE)
+
+
+def _loop_ppm(corners, square_size_mm):
+    """Pixels per mm as computed before, one pair of neighbouring corners at a time."""
+    cols, rows = BOARD
+    distances = [np.linalg.norm(corners[r * cols + c + 1, 0] - corners[r * cols + c, 0])
+                 for r in range(rows) for c in range(cols - 1)]
+    distances += [np.linalg.norm(corners[(r + 1) * cols + c, 0] - corners[r * cols + c, 0])
+                  for r in range(rows - 1) for c in range(cols)]
+    return float(np.mean(np.array(distances, dtype=np.float32))) / square_size_mm
+
+
+def test_ppm_matches_the_neighbour_loop_on_recorded_frames():
+    for path in RECORDED_FRAMES[:3]:
+        vision = _vision(_DetectionSystem())
+        result = vision.find_chessboard_and_compute_ppm(cv2.imread(path))
+        assert result.found
+        assert np.isclose(result.ppm, _loop_ppm(vision.original_chessboard_corners, SQUARE_MM), rtol=1e-6)
+
+
+def test_marker_index_maps_ids_to_their_detection_index():
+    assert marker_index(np.array([[4], [0], [2]])) == {4: 0, 0: 1, 2: 2}
+    assert marker_index([]) == {}
+    assert marker_index(None) == {}
+
+
+def test_replay_detects_the_marker_in_its_predicted_region():
+    frame = _with_markers(cv2.imread(RECORDED_FRAMES[0]))
+    system = _DetectionSystem()
+    vision = _vision(system)
+    vision.PPM = vision.find_chessboard_and_compute_ppm(cv2.imread(RECORDED_FRAMES[0])).ppm
+    assert vision.find_required_aruco_markers(frame.copy()).found
+    reference = _DetectionSystem()
+
+    for iteration in _replay(frame, marker_id=0, steps=6):
+        system.detected_shapes.clear()
+        result = vision.detect_specific_marker(iteration, 0)
+        assert result.found
+        # Detected once, in a region smaller than the frame
+        assert len(system.detected_shapes) == 1
+        assert np.prod(system.detected_shapes[0]) <= 0.5 * np.prod(iteration.shape[:2])
+
+        vision.update_marker_top_left_corners(0, result.aruco_corners, result.aruco_ids)
+        corners, ids, _ = reference.detectArucoMarkers(image=iteration)
+        expected = corners[marker_index(ids)[0]][0][0]
+        assert np.abs(np.array(vision.marker_top_left_corners[0]) - expected.astype(int)).max() <= 1
+
+
+def test_marker_outside_its_predicted_region_is_found_in_the_full_frame():
+    frame = _with_markers(cv2.imread(RECORDED_FRAMES[0]))
+    system = _DetectionSystem()
+    vision = _vision(system)
+    # Last seen near the bottom-right corner, e.g. before the camera moved to another marker
+    vision.marker_corners_px[0] = np.float32([[1150, 620], [1210, 620], [1210, 680], [1150, 680]])
+
+    result = vision.detect_specific_marker(frame, 0)
+    assert result.found
+    assert system.detected_shapes[-1] == frame.shape[:2] and len(system.detected_shapes) == 2
+    corners = result.aruco_corners[marker_index(result.aruco_ids)[0]][0]
+    assert np.abs(corners[0] - MARKERS[0]).max() <= 1
+    assert np.abs(vision.marker_corners_px[0] - corners).max() == 0
@@ -0,0 +1,117 @@
+import threading
+import time
+
+from core.services.robot_service.enums.RobotState import RobotState
+from core.services.robot_service.impl.RobotStateManager import RobotStateManager
+from core.services.robot_service.impl.base_robot_service import CancellationToken
+from core.services.robot_service.impl.robot_monitor.base_robot_monitor import BaseRobotMonitor
+from core.services.robot_service.impl.robot_monitor.motion_waiter import MotionSample, MotionWaiter
+
+CYCLE_TIME = 0.01
+
+
+def _sample(x, state=RobotState.MOVING):
+    return MotionSample([x, 0.0, 300.0, 180.0, 0.0, 0.0], 100.0, 0.0, state, time.time())
+
+
+def _in_thread(function, *args, **kwargs):
+    result = {}
+
+    def run():
+        result["value"] = function(*args, **kwargs)
+        result["returned_at"] = time.perf_counter()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(0.02)  # Let the waiter register
+    return thread, result
+
+
+def test_waiters_wake_on_the_sample_that_satisfies_them():
+    waiter = MotionWaiter()
+    waits = {target: _in_thread(waiter.wait_for_position, [target, 0, 300, 180, 0, 0], 1.0, timeout=2.0)
+             for target in (10, 20, 30)}
+
+    delivered = {}
+    for x in range(0, 40, 2):
+        waiter.on_sample(_sample(float(x)))
+        delivered[x] = time.perf_counter()
+    for target, (thread, result) in waits.items():
+        thread.join()
+        assert result["value"].position[0] == target  # The first sample within 1 mm
+        assert result["returned_at"] - delivered[target] < 0.05
+
+
+def test_a_condition_that_already_holds_returns_at_once():
+    waiter = MotionWaiter()
+    waiter.on_sample(_sample(5.0, RobotState.STATIONARY))
+    start = time.perf_counter()
+    assert waiter.wait_for_position([5, 0, 300, 180, 0, 0], 1.0, timeout=1.0) is not None
+    assert time.perf_counter() - start < 0.01
+
+    # Motion done only counts samples after the call
+    thread, result = _in_thread(waiter.wait_for_motion_done, timeout=1.0, settle_samples=2)
+    waiter.on_sample(_sample(5.0, RobotState.STATIONARY))
+    waiter.on_sample(_sample(5.0, RobotState.MOVING))
+    waiter.on_sample(_sample(5.0, RobotState.STATIONARY))
+    assert "value" not in result
+    waiter.on_sample(_sample(5.0, RobotState.STATIONARY))
+    thread.join()
+    assert result["value"] is not None
+
+
+def test_path_index_timeout_and_cancellation():
+    waiter = MotionWaiter()
+    path = [[float(x), 0.0, 300.0, 180.0, 0.0, 0.0] for x in range(0, 100, 10)]
+    thread, result = _in_thread(waiter.wait_for_path_index, path, 5, 1.0, timeout=1.0)
+    waiter.on_sample(_sample(30.0))
+    waiter.on_sample(_sample(70.3))  # Past point 5, near point 7
+    thread.join()
+    assert result["value"].position[0] == 70.3
+
+    start = time.perf_counter()
+    assert waiter.wait_for_position([500, 0, 300, 180, 0, 0], 1.0, timeout=0.1) is None
+    assert 0.1 <= time.perf_counter() - start < 0.2  # No samples needed for a timeout
+
+    token = CancellationToken()
+    thread, result = _in_thread(waiter.wait_for_position, [500, 0, 300, 180, 0, 0], 1.0, timeout=2.0,
+                                cancellation_token=token)
+    token.cancel("stopped")
+    waiter.on_sample(_sample(40.0))
+    thread.join(timeout=0.5)
+    assert result["value"] is None
+
+
+class _CountingMonitor(BaseRobotMonitor):
+    """Monitor over a robot moving along X at 100 mm/s; counts the position requests (RPC calls)."""
+
+    def __init__(self):
+        super().__init__(cycle_time=CYCLE_TIME)
+        self.started = time.perf_counter()
+        self.calls = 0
+
+    def get_current_position(self):
+        self.calls += 1
+        return [min(100.0 * (time.perf_counter() - self.started), 50.0), 0.0, 300.0, 180.0, 0.0, 0.0]
+
+    def get_current_velocity(self):
+        return 100.0
+
+    def get_current_acceleration(self):
+        return 0.0
+
+
+def test_state_manager_feeds_the_waiter_without_extra_rpc_calls():
+    monitor = _CountingMonitor()
+    manager = RobotStateManager(monitor)
+    manager.start_monitoring()
+    try:
+        waits = [_in_thread(manager.motion_waiter.wait_for_position, [x, 0, 300, 180, 0, 0], 2.0, timeout=2.0)
+                 for x in (10, 20, 30, 40)]
+        for thread, result in waits:
+            thread.join()
+            assert result["value"] is not None
+        elapsed = time.perf_counter() - monitor.started
+        assert monitor.calls <= elapsed / CYCLE_TIME + 2  # Only the monitor's own cycle
+    finally:
+        manager.stop_monitoring()
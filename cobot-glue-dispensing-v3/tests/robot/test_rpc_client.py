@@ -0,0 +1,169 @@
+import http.client
+import random
+import socketserver
+import threading
+import time
+import xmlrpc.client
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+import numpy as np
+import pytest
+
+from core.model.robot.rpc_client import RetryPolicy, ThreadLocalServerProxy
+from modules.shared.utils.metrics import MetricsRegistry
+
+CALL_TIME = 0.002  # s the stub controller takes per call
+CALLERS = 4
+CALLS = 50
+
+
+class _KeepAliveHandler(SimpleXMLRPCRequestHandler):
+    # The controller keeps the connection open between calls
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+
+class _StubServer(socketserver.ThreadingMixIn, SimpleXMLRPCServer):
+    daemon_threads = True
+    connections = 0
+
+    def handle_error(self, request, client_address):
+        pass  # The interleaved requests of a shared proxy reset connections
+
+
+class _StubRobot:
+    def __init__(self):
+        self.moves = 0
+
+    def GetActualTCPPose(self, flag):
+        time.sleep(CALL_TIME)
+        return [0, [100.0, 200.0, 300.0, 180.0, 0.0, 0.0]]
+
+    def MoveCart(self, desc_pos, tool, user, vel, acc, ovl, blendT, config):
+        time.sleep(CALL_TIME)
+        self.moves += 1
+        return 0
+
+
+@pytest.fixture
+def stub_robot():
+    robot = _StubRobot()
+    server = _StubServer(("127.0.0.1", 0), requestHandler=_KeepAliveHandler, logRequests=False)
+    server.register_instance(robot)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield robot, server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _stress(proxy):
+    """CALLERS threads alternating a pose query and a move; (latencies in s, errors)."""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    start = threading.Barrier(CALLERS)
+
+    def caller():
+        start.wait()
+        for i in range(CALLS):
+            began = time.perf_counter()
+            try:
+                if i % 2:
+                    proxy.MoveCart([0.0] * 6, 0, 0, 30.0, 30.0, 100.0, -1.0, -1)
+                else:
+                    proxy.GetActualTCPPose(1)
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - began)
+
+    threads = [threading.Thread(target=caller) for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies), errors
+
+
+def test_a_shared_proxy_collides_under_concurrent_callers(stub_robot):
+    _, _, uri = stub_robot
+    _, errors = _stress(xmlrpc.client.ServerProxy(uri))
+    assert any(isinstance(e, http.client.CannotSendRequest) for e in errors)
+
+
+def test_per_thread_proxies_serve_four_callers_without_collisions(stub_robot):
+    robot, server, uri = stub_robot
+    retries = MetricsRegistry().counter("robot.rpc.retries")
+    proxy = ThreadLocalServerProxy(uri, retry_policy=RetryPolicy(retries=retries))
+
+    latencies, errors = _stress(proxy)
+
+    assert errors == [] and retries.value == 0
+    # One connection per caller, kept open between its calls, and dropped with its thread
+    assert server.connections == CALLERS and proxy.connections == 0
+    assert len(latencies) == CALLERS * CALLS and robot.moves == CALLERS * CALLS // 2
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    print(f"{CALLERS} callers, {CALLS} calls each: p50 {p50 * 1000:.1f} ms, p90 {p90 * 1000:.1f} ms, "
+          f"p99 {p99 * 1000:.1f} ms")
+    # Calls overlap instead of queueing behind each other or sleeping between retries
+    assert p50 < 5 * CALL_TIME
+    assert p99 < 0.1
+    proxy.close()
+
+
+def _failing(errors):
+    """A call raising the given errors in turn, then returning "ok"; the calls made are counted."""
+    calls = []
+
+    def call():
+        calls.append(time.perf_counter())
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    return call, calls
+
+
+def test_unsent_requests_are_retried_for_every_method():
+    policy = RetryPolicy(rng=random.Random(1))
+    call, calls = _failing([http.client.CannotSendRequest("Request-sent")] * 3)
+    assert policy.call("MoveCart", call) == "ok"
+    assert len(calls) == 4
+
+
+def test_other_transport_errors_are_retried_only_for_idempotent_methods():
+    policy = RetryPolicy(rng=random.Random(1))
+    call, calls = _failing([ConnectionResetError()])
+    with pytest.raises(ConnectionResetError):
+        policy.call("MoveCart", call)
+    assert len(calls) == 1
+
+    for method in ("GetActualTCPPose", "StopMotion"):
+        call, calls = _failing([ConnectionResetError(), TimeoutError()])
+        assert policy.call(method, call) == "ok" and len(calls) == 3
+
+    # The controller's answer, e.g. a fault, is not a transport error
+    call, calls = _failing([xmlrpc.client.Fault(1, "bad pose")])
+    with pytest.raises(xmlrpc.client.Fault):
+        policy.call("GetActualTCPPose", call)
+    assert len(calls) == 1
+
+
+def test_retries_stop_at_the_deadline_with_jittered_backoff():
+    policy = RetryPolicy(deadline=0.1, deadlines={"StopMotion": 0.3}, initial_backoff=0.005, max_backoff=0.02,
+                         rng=random.Random(1))
+    for method, deadline in (("GetActualTCPPose", 0.1), ("StopMotion", 0.3)):
+        call, calls = _failing([TimeoutError()] * 1000)
+        started = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            policy.call(method, call)
+        assert deadline - 0.02 <= time.perf_counter() - started < deadline + 0.01
+
+    delays = [policy.backoff(attempt) for attempt in range(20) for _ in range(20)]
+    assert all(0 <= delay <= 0.02 for delay in delays)
+    assert len(set(delays)) == len(delays)
+    assert max(policy.backoff(0) for _ in range(100)) <= 0.005
@@ -0,0 +1,80 @@
+import os
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+import pytest
+
+from modules.shapeMatchinModelTraining.datasetBuilder import build_feature_dataset, \
+    generate_balanced_pair_indices, load_feature_dataset
+from modules.shapeMatchinModelTraining.featuresExtraction import compute_contour_descriptor, \
+    compute_enhanced_features, compute_features_from_descriptors
+from modules.shapeMatchinModelTraining.shapeGenerator import generate_shape
+
+
+@dataclass
+class Sample:
+    contour: np.ndarray
+    object_id: str
+
+
+def _dataset(shapes=("circle", "triangle", "star", "l_shape"), copies=4, seed=0):
+    rng = np.random.default_rng(seed)
+    samples = []
+    for shape in shapes:
+        base = generate_shape(shape, 1.0).reshape(-1, 2).astype(np.float32)
+        for _ in range(copies):
+            noisy = base + rng.normal(0, 0.5, base.shape).astype(np.float32)
+            contour = cv2.approxPolyDP(noisy.reshape(-1, 1, 2), 0.01 * cv2.arcLength(noisy, True), True)
+            samples.append(Sample(contour, shape))
+    return samples
+
+
+def test_descriptor_features_match_pairwise_extraction():
+    samples = _dataset()
+    descriptors = [compute_contour_descriptor(s.contour) for s in samples]
+
+    for i, j in [(0, 1), (0, 5), (3, 9), (7, 14), (12, 12)]:
+        expected = compute_enhanced_features(samples[i].contour, samples[j].contour)
+        features = compute_features_from_descriptors(samples[i].contour, samples[j].contour,
+                                                     descriptors[i], descriptors[j])
+        # Harris responses are float32, so their statistics only agree to float32 precision
+        assert np.allclose(features, expected, rtol=1e-5, atol=1e-9)
+
+
+def test_pair_indices_are_balanced_unique_and_labelled():
+    object_ids = np.repeat(["a", "b", "c"], 5)
+
+    pairs = generate_balanced_pair_indices(object_ids, n_pairs=20, seed=3)
+
+    assert len(pairs) == 20 and pairs[:, 2].sum() == 10
+    same = object_ids[pairs[:, 0]] == object_ids[pairs[:, 1]]
+    assert np.array_equal(same, pairs[:, 2] == 1)
+    assert len({(i, j) for i, j, _ in pairs}) == 20
+    assert np.array_equal(pairs, generate_balanced_pair_indices(object_ids, n_pairs=20, seed=3))
+
+
+def test_interrupted_build_resumes_from_missing_chunks(tmp_path):
+    samples = _dataset()
+    output_dir = str(tmp_path / "features")
+    build_feature_dataset(samples, output_dir, n_pairs=40, shard_size=8, workers=1)
+    X, y = load_feature_dataset(output_dir)
+    os.remove(os.path.join(output_dir, "features", "chunk_00002.npy"))
+
+    stats = build_feature_dataset(samples, output_dir, n_pairs=40, shard_size=8, workers=1)
+
+    assert stats['computed_pairs'] == 8
+    X_resumed, y_resumed = load_feature_dataset(output_dir)
+    assert X.dtype == np.float32 and X.shape == (40, 51)
+    assert np.array_equal(X, X_resumed) and np.array_equal(y, y_resumed)
+    with pytest.raises(ValueError):
+        build_feature_dataset(samples, output_dir, n_pairs=40, shard_size=16, workers=1)
+
+
+def test_process_pool_gives_the_same_features(tmp_path):
+    samples = _dataset()
+    build_feature_dataset(samples, str(tmp_path / "serial"), n_pairs=24, shard_size=5, workers=1)
+    build_feature_dataset(samples, str(tmp_path / "pool"), n_pairs=24, shard_size=5, workers=2)
+
+    assert np.array_equal(load_feature_dataset(str(tmp_path / "serial"))[0],
+                          load_feature_dataset(str(tmp_path / "pool"))[0])
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import minimalmodbus
+import pytest
+
+import main
+from core.service_startup import ServiceGraph, ServiceStartupError
+from modules.modbusCommunication.MockClient import MockInstrument, MockSerial
+
+
+def test_dependencies_are_passed_by_name_and_built_first():
+    order = []
+    graph = ServiceGraph()
+    graph.add("service", lambda config, robot: order.append("service") or (config, robot),
+              depends_on=("config", "robot"))
+    graph.add("robot", lambda config: order.append("robot") or f"robot@{config}", depends_on=("config",))
+    graph.add("config", lambda: order.append("config") or "10.0.0.1")
+
+    services = graph.start()
+
+    assert order == ["config", "robot", "service"]
+    assert services["service"] == ("10.0.0.1", "robot@10.0.0.1")
+
+
+def test_independent_services_start_in_parallel():
+    barrier = threading.Barrier(3, timeout=2)
+    graph = ServiceGraph()
+    for name in ("robot", "camera", "modbus"):
+        graph.add(name, lambda: barrier.wait() is not None)
+
+    services = graph.start()  # would time out on the barrier if run one at a time
+
+    assert all(services.values())
+    threads = {timing.thread for timing in graph.report.timings}
+    assert len(threads) == 3
+
+
+def test_sequential_start_runs_one_factory_at_a_time():
+    graph = ServiceGraph()
+    for name in ("a", "b", "c"):
+        graph.add(name, lambda: time.sleep(0.02))
+
+    graph.start(sequential=True)
+
+    timings = sorted(graph.report.timings, key=lambda t: t.started)
+    for earlier, later in zip(timings, timings[1:]):
+        assert later.started >= earlier.finished
+    assert graph.report.total >= 0.06
+
+
+def test_optional_failure_yields_none():
+    graph = ServiceGraph()
+    graph.add("modbus", lambda: 1 / 0, required=False)
+    graph.add("app", lambda modbus: modbus, depends_on=("modbus",))
+
+    services = graph.start()
+
+    assert services["modbus"] is None and services["app"] is None
+    (failed,) = [t for t in graph.report.timings if t.name == "modbus"]
+    assert "division by zero" in failed.error
+
+
+def test_required_failure_stops_dependents():
+    built = []
+    graph = ServiceGraph()
+    graph.add("robot", lambda: (_ for _ in ()).throw(ConnectionError("no controller")))
+    graph.add("robot_service", lambda robot: built.append(robot), depends_on=("robot",))
+
+    with pytest.raises(ServiceStartupError) as error:
+        graph.start()
+
+    assert error.value.name == "robot"
+    assert isinstance(error.value.cause, ConnectionError)
+    assert built == []
+
+
+def test_invalid_graphs_are_rejected_before_starting():
+    started = []
+    graph = ServiceGraph()
+    graph.add("a", lambda b: started.append("a"), depends_on=("b",))
+    graph.add("b", lambda a: started.append("b"), depends_on=("a",))
+    with pytest.raises(ValueError, match="cycle"):
+        graph.start()
+
+    graph = ServiceGraph()
+    graph.add("a", lambda missing: None, depends_on=("missing",))
+    with pytest.raises(ValueError, match="unknown service"):
+        graph.start()
+    assert started == []
+
+
+def test_report_contains_phases_and_marks():
+    graph = ServiceGraph()
+    graph.add("camera", lambda: graph.mark("first_frame"))
+    graph.start()
+    graph.mark("ready")
+
+    text = graph.report.format()
+    assert "camera" in text and "first_frame" in text and "ready" in text
+    assert graph.report.marks["first_frame"] <= graph.report.marks["ready"]
+
+
+def test_modbus_probe_reads_without_closing_the_shared_port(monkeypatch):
+    # Like minimalmodbus, every instrument on a port shares its serial object
+    ports, reads = {}, []
+
+    class SharedPortInstrument(MockInstrument):
+        def __init__(self, port, slaveaddress, debug=False):
+            super().__init__(port, slaveaddress, debug)
+            self.serial = ports.setdefault(port, MockSerial(port))
+
+        def read_register(self, register):
+            reads.append(register)
+            return super().read_register(register)
+
+    monkeypatch.setattr(minimalmodbus, "Instrument", SharedPortInstrument)
+    from modules.modbusCommunication.ModbusController import ModbusController
+    glue_client = ModbusController.getModbusClient(main.MODBUS_PROBE_SLAVE_ID)
+
+    assert main.probe_modbus() is True
+    assert reads == [main.MODBUS_PROBE_REGISTER]
+    assert glue_client.client.serial.is_open
@@ -0,0 +1,142 @@
+import builtins
+import os
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from backend.system.settings.CameraSettings import CameraSettings
+from backend.system.utils import utils
+from libs.plvision.PLVision import ImageProcessing
+from modules.VisionSystem.calibration_store import (CalibrationStore, FILE_NAMES, CAMERA_TO_ROBOT_MATRIX,
+                                                    SPRAY_AREA_POINTS)
+from modules.VisionSystem.data_loading import DataManager
+from modules.VisionSystem.handlers.contour_detection_handler import handle_contour_detection
+from modules.VisionSystem.handlers.image_correction_handler import correct_image
+
+WIDTH, HEIGHT = 320, 240
+MTX = np.array([[300.0, 0.0, 161.5], [0.0, 298.0, 118.2], [0.0, 0.0, 1.0]])
+DIST = np.array([[-0.21, 0.07, 0.001, -0.002, 0.0]])
+PERSPECTIVE = np.array([[1.01, 0.02, -3.0], [-0.01, 0.99, 2.0], [0.0, 0.0, 1.0]])
+CAMERA_TO_ROBOT = np.array([[0.5, 0.0, -80.0], [0.0, -0.5, 300.0], [0.0, 0.0, 1.0]])
+AREA = np.array([[10, 10], [310, 10], [310, 230], [10, 230]], dtype=np.float32)
+
+
+def _write_calibration(directory):
+    np.savez(os.path.join(directory, FILE_NAMES["camera_calibration"]), mtx=MTX, dist=DIST)
+    np.save(os.path.join(directory, FILE_NAMES["perspective_matrix"]), PERSPECTIVE)
+    np.save(os.path.join(directory, FILE_NAMES["camera_to_robot_matrix"]), CAMERA_TO_ROBOT)
+    for name in ("work_area_points", "pickup_area_points", "spray_area_points"):
+        np.save(os.path.join(directory, FILE_NAMES[name]), AREA)
+
+
+def _vision(directory):
+    settings = CameraSettings()
+    settings.set_resolution(WIDTH, HEIGHT)
+    publisher = SimpleNamespace(publish_thresh_image=lambda image: None, publish_latest_image=lambda image: None)
+    vision = SimpleNamespace(camera_settings=settings, threshold_by_area="spray", isSystemCalibrated=True,
+                             image=None, correctedImage=None, message_publisher=publisher)
+    vision.data_manager = DataManager(vision, False, None, store=CalibrationStore(str(directory)))
+    vision.get_thresh_by_area = lambda area: settings.get_threshold()
+    vision.correctImage = lambda image: correct_image(vision, image)
+    return vision
+
+
+def _frame(rng):
+    frame = np.full((HEIGHT, WIDTH, 3), 230, dtype=np.uint8)
+    x, y = rng.integers(40, 200), rng.integers(40, 140)
+    cv2.rectangle(frame, (int(x), int(y)), (int(x) + 70, int(y) + 50), (20, 20, 20), -1)
+    return frame
+
+
+def test_vision_cycles_read_each_file_once(tmp_path, monkeypatch):
+    _write_calibration(tmp_path)
+    reads = []
+    real_open = builtins.open
+
+    def counting_open(file, *args, **kwargs):
+        if isinstance(file, (str, os.PathLike)) and os.fspath(file).startswith(str(tmp_path)):
+            reads.append(os.path.basename(os.fspath(file)))
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    vision = _vision(tmp_path)
+    data_manager = vision.data_manager
+    # Same start-up sequence as VisionSystem
+    data_manager.loadPerspectiveMatrix()
+    data_manager.loadCameraCalibrationData()
+    data_manager.loadCameraToRobotMatrix()
+    data_manager.loadWorkAreaPoints()
+
+    rng = np.random.default_rng(3)
+    frames = [_frame(rng) for _ in range(8)]
+    for cycle in range(1000):
+        vision.image = frames[cycle % len(frames)]
+        handle_contour_detection(vision)
+        utils.transformSinglePointToCamera((10.0, 250.0), data_manager.cameraToRobotMatrix,
+                                           data_manager.robotToCameraMatrix)
+        assert data_manager.work_area_polygon is not None
+
+    assert sorted(reads) == sorted(FILE_NAMES.values())
+
+
+def test_items_are_read_only_and_record_their_load_time(tmp_path):
+    _write_calibration(tmp_path)
+    data_manager = _vision(tmp_path).data_manager
+
+    matrix = data_manager.cameraToRobotMatrix
+    with pytest.raises(ValueError):
+        matrix[0, 0] = 1.0
+    with pytest.raises(ValueError):
+        data_manager.get_camera_matrix()[0, 0] = 1.0
+    with pytest.raises(TypeError):
+        data_manager.cameraData['mtx'] = MTX
+
+    info = data_manager.store.describe()
+    assert info[CAMERA_TO_ROBOT_MATRIX]["present"] and info[CAMERA_TO_ROBOT_MATRIX]["loaded_at"] is not None
+    assert not info[SPRAY_AREA_POINTS]["loaded"]
+
+
+def test_saving_an_area_notifies_subscribers_and_rebuilds_its_mask(tmp_path):
+    _write_calibration(tmp_path)
+    data_manager = _vision(tmp_path).data_manager
+    store = data_manager.store
+    notifications = []
+    store.subscribe(lambda names, version: notifications.append((names, version)))
+
+    mask = data_manager.get_spray_area_mask()
+    inverse = data_manager.robotToCameraMatrix
+    assert data_manager.get_spray_area_mask() is mask
+
+    smaller = AREA * 0.5 + 40
+    assert data_manager.saveWorkAreaPoints({'area_type': 'spray', 'corners': smaller.tolist()})[0]
+
+    assert notifications == [((SPRAY_AREA_POINTS,), store.version)]
+    assert np.allclose(np.load(store.path(SPRAY_AREA_POINTS)), smaller)
+    rebuilt = data_manager.get_spray_area_mask()
+    assert rebuilt is not mask and np.allclose(rebuilt.polygon, smaller)
+    # Only values derived from the changed item are rebuilt
+    assert data_manager.robotToCameraMatrix is inverse
+
+    store.save(CAMERA_TO_ROBOT_MATRIX, CAMERA_TO_ROBOT * 2)
+    assert np.allclose(data_manager.robotToCameraMatrix, np.linalg.inv(CAMERA_TO_ROBOT * 2))
+    assert store.describe()[CAMERA_TO_ROBOT_MATRIX]["version"] == store.version == 2
+
+
+def test_cached_remap_matches_undistortion_and_perspective_warp(tmp_path):
+    _write_calibration(tmp_path)
+    vision = _vision(tmp_path)
+    noise = np.random.default_rng(4).integers(0, 256, size=(HEIGHT, WIDTH, 3), dtype=np.uint8)
+    frame = cv2.normalize(cv2.GaussianBlur(noise, (0, 0), 3), None, 0, 255, cv2.NORM_MINMAX)
+
+    expected = ImageProcessing.undistortImage(frame, MTX, DIST, WIDTH, HEIGHT, crop=False)
+    expected = cv2.warpPerspective(expected, PERSPECTIVE, (WIDTH, HEIGHT))
+
+    # One interpolation instead of two: the images differ by rounding, and the black
+    # border left by the undistortion may be a pixel wider or narrower
+    result = correct_image(vision, frame)
+    valid, expected_valid = result.any(axis=2), expected.any(axis=2)
+    assert (valid != expected_valid).mean() < 0.01
+    both = valid & expected_valid
+    assert np.abs(result[both].astype(np.int16) - expected[both]).mean() < 1.0
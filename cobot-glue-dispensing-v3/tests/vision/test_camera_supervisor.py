@@ -0,0 +1,163 @@
+import time
+
+import numpy as np
+
+from modules.VisionSystem.camera_supervisor import CameraSupervisor, CameraHealth
+
+FRAME_INTERVAL = 0.01  # s, a 100 fps camera
+WIDTH, HEIGHT = 64, 48
+
+
+class _ScriptedCamera:
+    """Camera devices that are unplugged during scripted (start, end) windows, in seconds since creation."""
+
+    def __init__(self, outages=(), missing_indices=()):
+        self.outages = outages
+        self.missing_indices = set(missing_indices)
+        self.created = time.perf_counter()
+        self.opens = []  # (seconds since creation, index, width, height, fps, opened)
+        self.frames = 0
+
+    def now(self):
+        return time.perf_counter() - self.created
+
+    def unplugged(self, camera_index=None):
+        return camera_index in self.missing_indices or any(start <= self.now() < end for start, end in self.outages)
+
+    def open(self, camera_index, width, height, fps):
+        opened = not self.unplugged(camera_index)
+        self.opens.append((self.now(), camera_index, width, height, fps, opened))
+        return _ScriptedCapture(self, width, height) if opened else None
+
+
+class _ScriptedCapture:
+    def __init__(self, camera, width, height):
+        self.camera = camera
+        self.shape = (height, width, 3)
+        self.lost = False
+
+    def read(self):
+        time.sleep(FRAME_INTERVAL)
+        # Like a V4L2 capture, one that lost its device stays dead when the device comes back
+        self.lost = self.lost or self.camera.unplugged()
+        if self.lost:
+            return False, None
+        self.camera.frames += 1
+        return True, np.full(self.shape, self.camera.frames % 256, dtype=np.uint8)
+
+    def release(self):
+        self.lost = True
+
+
+def _supervisor(camera, **kwargs):
+    health = []
+    supervisor = CameraSupervisor(0, WIDTH, HEIGHT, fps=25, open_capture=camera.open,
+                                  on_health_change=lambda state: health.append((camera.now(), state)),
+                                  stale_after=0.05, max_read_failures=3, initial_backoff=0.02, max_backoff=0.16,
+                                  **kwargs)
+    return supervisor.start(), health
+
+
+def test_frames_are_fresh_while_the_camera_delivers():
+    camera = _ScriptedCamera()
+    supervisor, health = _supervisor(camera)
+    try:
+        assert supervisor.wait_until_healthy(timeout=1)
+        frames = [supervisor.capture() for _ in range(5)]
+        assert not supervisor.frame_stale
+        assert all(frame.shape == (HEIGHT, WIDTH, 3) for frame in frames)
+        assert len({int(frame[0, 0, 0]) for frame in frames}) == 5
+        # Resolution and frame rate are set once, when the device opens
+        assert [open_[1:] for open_ in camera.opens] == [(0, WIDTH, HEIGHT, 25, True)]
+        assert [state for _, state in health] == [CameraHealth.HEALTHY]
+    finally:
+        supervisor.stopCapture()
+    assert supervisor.health == CameraHealth.STOPPED
+
+
+def test_the_last_good_frame_is_served_as_stale_until_the_camera_is_back():
+    camera = _ScriptedCamera(outages=[(0.2, 0.6)])
+    supervisor, health = _supervisor(camera)
+    served = []  # (seconds since creation, frame value, stale)
+    try:
+        while camera.now() < 1.0:
+            frame = supervisor.capture()
+            if frame is not None:
+                served.append((camera.now(), int(frame[0, 0, 0]), supervisor.frame_stale))
+    finally:
+        supervisor.stopCapture()
+
+    during_outage = [(value, stale) for t, value, stale in served if 0.3 <= t < 0.6]
+    last_before = [value for t, value, stale in served if t < 0.2][-1]
+    # The vision loop keeps getting the last good frame, at the stale_after pace, not spinning
+    assert during_outage and all(stale for _, stale in during_outage)
+    assert {value for value, _ in during_outage} <= {last_before, last_before + 1}
+    assert len(during_outage) <= 0.3 / 0.05 + 1
+    states = [state for _, state in health]
+    assert states == [CameraHealth.HEALTHY, CameraHealth.RECONNECTING, CameraHealth.HEALTHY, CameraHealth.STOPPED]
+    # Back within the longest backoff (plus the first read) of the device returning
+    recovered = health[2][0]
+    assert 0.6 <= recovered < 0.6 + 0.16 + 0.05
+    assert not served[-1][2]
+
+
+def test_reopen_attempts_back_off_exponentially():
+    camera = _ScriptedCamera(outages=[(0.0, 1.0)])
+    supervisor, health = _supervisor(camera)
+    time.sleep(0.8)
+    supervisor.stopCapture()
+
+    attempts = [t for t, *_ in camera.opens]
+    gaps = np.diff(attempts)
+    assert np.allclose(gaps[:3], [0.02, 0.04, 0.08], atol=0.015)
+    assert np.all(gaps[3:] < 0.16 + 0.02)
+    # Never connected: CONNECTING from the start until stopped
+    assert [state for _, state in health] == [CameraHealth.STOPPED]
+    assert supervisor.capture() is None
+
+
+def test_a_camera_that_never_opens_is_replaced_by_one_found():
+    camera = _ScriptedCamera(missing_indices={0})
+    searches = []
+
+    def find_camera(exclude):
+        searches.append(exclude)
+        return 2
+
+    supervisor, health = _supervisor(camera, find_camera=find_camera, search_after=3)
+    try:
+        assert supervisor.wait_until_healthy(timeout=1)
+    finally:
+        supervisor.stopCapture()
+    assert searches == [0]
+    assert supervisor.camera_index == 2
+    assert [open_[1] for open_ in camera.opens] == [0, 0, 0, 2]
+
+
+def test_reconfigure_reopens_the_device_with_the_new_settings():
+    camera = _ScriptedCamera()
+    supervisor, _ = _supervisor(camera)
+    try:
+        assert supervisor.wait_until_healthy(timeout=1)
+        supervisor.reconfigure(width=32, height=24)
+        deadline = time.perf_counter() + 1
+        frame = supervisor.capture()
+        while frame.shape[:2] != (24, 32) and time.perf_counter() < deadline:
+            frame = supervisor.capture()
+    finally:
+        supervisor.stopCapture()
+    assert frame.shape[:2] == (24, 32)
+    assert [open_[2:4] for open_ in camera.opens] == [(WIDTH, HEIGHT), (32, 24)]
+
+
+def test_capture_does_not_wait_once_stopped():
+    camera = _ScriptedCamera()
+    supervisor, _ = _supervisor(camera)
+    assert supervisor.wait_until_healthy(timeout=1)
+    supervisor.stopCapture()
+    supervisor.capture()  # the last frame read, if not served yet
+
+    started = time.perf_counter()
+    assert supervisor.capture() is not None
+    assert time.perf_counter() - started < 0.02
+    assert supervisor.frame_stale
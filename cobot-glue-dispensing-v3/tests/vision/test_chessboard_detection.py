@@ -0,0 +1,97 @@
+import threading
+
+import cv2
+import numpy as np
+
+from modules.VisionSystem.calibration.cameraCalibration import chessboard_detection
+from modules.VisionSystem.calibration.cameraCalibration.chessboard_detection import detect_chessboards, \
+    detection_width, find_chessboard
+
+WIDTH, HEIGHT = 1280, 720
+BOARD = (9, 6)  # inner corners
+SQUARE = 60  # px in the flat board image
+
+
+def _board_image():
+    columns, rows = BOARD[0] + 1, BOARD[1] + 1
+    squares = (np.indices((rows, columns)).sum(axis=0) % 2) * 255
+    board = np.kron(squares, np.ones((SQUARE, SQUARE))).astype(np.uint8)
+    return cv2.copyMakeBorder(board, SQUARE, SQUARE, SQUARE, SQUARE, cv2.BORDER_CONSTANT, value=255)
+
+
+def _view(rng, scale=1.0):
+    """The board seen from a random pose, blurred a little, with sensor noise."""
+    board = _board_image()
+    h, w = board.shape
+    center = np.array([WIDTH / 2, HEIGHT / 2]) + rng.uniform(-150, 150, 2)
+    half = np.array([w, h]) / 2 * 0.8 * scale
+    corners = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]]) * half + center + rng.uniform(-40, 40, (4, 2))
+    homography = cv2.getPerspectiveTransform(np.float32([[0, 0], [w, 0], [w, h], [0, h]]), np.float32(corners))
+    image = cv2.warpPerspective(board, homography, (WIDTH, HEIGHT), flags=cv2.INTER_LINEAR, borderValue=128)
+    image = cv2.GaussianBlur(image, (3, 3), 0).astype(np.float32) + rng.normal(0, 2, image.shape)
+    return cv2.cvtColor(np.clip(image, 0, 255).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+
+
+def _full_resolution_corners(image):
+    """The detection before downscaling: full resolution, then cornerSubPix."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    found, corners = cv2.findChessboardCorners(gray, BOARD, None)
+    assert found
+    return cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1),
+                            (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001))
+
+
+def test_downscaled_detection_refines_to_the_full_resolution_corners():
+    assert detection_width(WIDTH, BOARD) == 640
+    rng = np.random.default_rng(0)
+    for _ in range(3):
+        image = _view(rng)
+        corners = find_chessboard(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), BOARD)
+        assert corners is not None and corners.shape == (BOARD[0] * BOARD[1], 1, 2)
+        assert np.abs(corners - _full_resolution_corners(image)).max() < 0.05
+
+
+def test_small_boards_are_found_at_full_resolution_and_empty_images_rejected():
+    rng = np.random.default_rng(3)
+    small_board = _view(rng, scale=0.25)  # Too small for the downscaled image and the quick check
+    gray = cv2.cvtColor(small_board, cv2.COLOR_BGR2GRAY)
+    assert find_chessboard(gray, BOARD) is not None
+    assert find_chessboard(np.full((HEIGHT, WIDTH), 128, dtype=np.uint8), BOARD) is None
+
+
+def test_fine_boards_are_not_downscaled_on_low_resolution_cameras():
+    assert detection_width(1280, (32, 20)) is None
+    assert detection_width(1920, (32, 20)) == 1056
+    assert detection_width(3840, (9, 6)) == 640
+
+
+def test_pool_results_keep_the_image_order():
+    rng = np.random.default_rng(2)
+    empty = np.full((HEIGHT, WIDTH, 3), 128, dtype=np.uint8)
+    images = [_view(rng), empty, None, _view(rng)]
+    results = list(detect_chessboards(images, BOARD, workers=2))
+    assert [corners is not None for corners in results] == [True, False, False, True]
+    assert np.allclose(results[3], list(detect_chessboards(images[3:], BOARD, workers=1))[0])
+
+
+def test_pool_workers_are_spawned(monkeypatch):
+    start_methods = []
+
+    class RecordingExecutor(chessboard_detection.ProcessPoolExecutor):
+        def __init__(self, max_workers=None, mp_context=None):
+            start_methods.append(mp_context.get_start_method())
+            super().__init__(max_workers=max_workers, mp_context=mp_context)
+
+    monkeypatch.setattr(chessboard_detection, "ProcessPoolExecutor", RecordingExecutor)
+    rng = np.random.default_rng(5)
+    images = [_view(rng), _view(rng)]
+    results = []
+    # Started from a thread other than the main one, as the calibration is, with a lock held
+    lock = threading.Lock()
+    with lock:
+        worker = threading.Thread(target=lambda: results.extend(detect_chessboards(images, BOARD, workers=2)))
+        worker.start()
+        worker.join(timeout=60)
+
+    assert start_methods == ["spawn"]
+    assert len(results) == 2 and all(corners is not None for corners in results)
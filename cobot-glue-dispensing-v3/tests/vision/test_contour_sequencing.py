@@ -0,0 +1,75 @@
+import numpy as np
+
+from backend.system.utils.path_sequencing import _KDTree, sequence_paths, sequence_polylines
+from modules.VisionSystem.handlers.contour_detection_handler import sort_contours_by_proximity
+
+
+def _travel(starts, ends, sequence, start_point=(0.0, 0.0)):
+    current, total = np.asarray(start_point, dtype=float), 0.0
+    for path, flipped in zip(sequence.order, sequence.reversed):
+        entry, exit_ = (ends[path], starts[path]) if flipped else (starts[path], ends[path])
+        total += np.linalg.norm(entry - current)
+        current = exit_
+    return total
+
+
+def test_kd_tree_returns_the_nearest_remaining_point():
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 100, size=(300, 2))
+    tree = _KDTree(points, list(range(300)))
+    remaining = set(range(300))
+    for removed in rng.permutation(300)[:299]:
+        query = rng.uniform(-20, 120, size=2)
+        nearest = tree.nearest(*query)
+        expected = min(np.sum((points[k] - query) ** 2) for k in remaining)
+        assert np.sum((points[nearest] - query) ** 2) == expected
+        tree.remove(removed)
+        remaining.discard(removed)
+    assert len(tree) == 1
+
+
+def test_paths_are_reversed_when_their_end_is_closer():
+    # Two segments along a line, the second one drawn towards the robot
+    starts = np.array([[10.0, 0.0], [60.0, 0.0]])
+    ends = np.array([[30.0, 0.0], [40.0, 0.0]])
+
+    sequence = sequence_paths(starts, ends)
+    assert sequence.order == [0, 1] and sequence.reversed == [False, True]
+    assert sequence.travel_distance == 20.0
+
+    forward_only = sequence_paths(starts, ends, allow_reverse=False)
+    assert forward_only.reversed == [False, False]
+    assert forward_only.travel_distance == 40.0
+
+
+def test_local_search_shortens_the_greedy_order():
+    rng = np.random.default_rng(3)
+    starts = rng.uniform(0, 1000, size=(80, 2))
+    ends = starts + rng.uniform(-60, 60, size=(80, 2))
+
+    sequence = sequence_paths(starts, ends, time_budget=1.0)
+
+    assert sorted(sequence.order) == list(range(80))
+    assert sequence.travel_distance < sequence.greedy_distance
+    assert np.isclose(sequence.travel_distance, _travel(starts, ends, sequence))
+    assert not sequence.timed_out
+
+
+def test_polylines_come_back_reversed_in_place():
+    paths = [[[10, 0, 5], [30, 0, 5]], [[60, 0, 5], [50, 0, 5], [40, 0, 5]]]
+
+    ordered, sequence = sequence_polylines(paths)
+
+    assert ordered == [paths[0], paths[1][::-1]]
+    assert sequence.reversed == [False, True]
+
+
+def test_sort_contours_by_proximity_keeps_every_contour():
+    rng = np.random.default_rng(4)
+    contours = [(center + rng.uniform(-15, 15, size=(12, 1, 2))).astype(np.int32)
+                for center in rng.uniform(50, 600, size=(25, 1, 2))]
+
+    ordered = sort_contours_by_proximity(contours, start_point=(0, 0))
+
+    assert len(ordered) == len(contours)
+    assert {id(c) for c in ordered} == {id(c) for c in contours}
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from backend.system.settings.CameraSettings import CameraSettings
+from modules.VisionSystem.calibration_store import CalibrationStore
+from modules.VisionSystem.data_loading import DataManager
+from modules.VisionSystem.frame_change_detector import FrameChangeDetector
+from modules.VisionSystem.handlers.contour_detection_handler import handle_contour_detection
+
+WIDTH, HEIGHT = 640, 360
+SPRAY_AREA = np.array([[10, 10], [630, 10], [630, 350], [10, 350]], dtype=np.float32)
+
+
+def _vision(tmp_path, detector=True):
+    settings = CameraSettings()
+    settings.set_resolution(WIDTH, HEIGHT)
+    published = []
+    publisher = SimpleNamespace(publish_thresh_image=lambda image: published.append(image),
+                                publish_latest_image=lambda image: None)
+    vision = SimpleNamespace(camera_settings=settings, threshold_by_area="spray", isSystemCalibrated=False,
+                             image=None, correctedImage=None, message_publisher=publisher, published=published)
+    vision.data_manager = DataManager(vision, False, None, store=CalibrationStore(str(tmp_path)))
+    vision.data_manager.sprayAreaPoints = SPRAY_AREA
+    vision.get_thresh_by_area = lambda area: settings.get_threshold()
+    if detector:
+        vision.change_detector = FrameChangeDetector()
+    return vision
+
+
+def _scene(rng, parts):
+    frame = np.full((HEIGHT, WIDTH, 3), 225, dtype=np.int16)
+    for x, y in parts:
+        cv2.rectangle(frame, (x, y), (x + 90, y + 60), (25, 25, 25), -1)
+        cv2.circle(frame, (x + 45, y + 30), 12, (225, 225, 225), -1)  # A hole
+    frame += np.round(rng.normal(0, 4, frame.shape)).astype(np.int16)
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+def _detect(vision, frame):
+    vision.image = frame
+    contours, _, _ = handle_contour_detection(vision)
+    return sorted((cv2.boundingRect(cnt) for cnt in contours or []))
+
+
+def test_unchanged_scene_reuses_the_contours_of_the_last_detection(tmp_path):
+    rng = np.random.default_rng(0)
+    vision, reference = _vision(tmp_path), _vision(tmp_path, detector=False)
+    parts = [(100, 80), (300, 200)]
+
+    first = _detect(vision, _scene(rng, parts))
+    assert len(first) == 2  # Outer contours only, not the holes
+    for _ in range(10):
+        frame = _scene(rng, parts)  # Same scene, new sensor noise
+        assert _detect(vision, frame) == _detect(reference, frame) == first
+    assert len(vision.published) == 1
+
+    moved = _scene(rng, [(100, 80), (330, 190)])
+    assert _detect(vision, moved) == _detect(reference, moved) != first
+    assert len(vision.published) == 2
+
+    # Same scene, different threshold: detected again
+    vision.camera_settings.set_threshold(10)
+    assert _detect(vision, moved) == []
+    assert len(vision.published) == 3
+
+
+def test_reused_contours_are_copies_and_reuse_is_bounded(tmp_path):
+    rng = np.random.default_rng(1)
+    vision = _vision(tmp_path)
+    vision.change_detector.max_reuse = 3
+    frame = _scene(rng, [(200, 150)])
+
+    vision.image = frame
+    contours, _, _ = handle_contour_detection(vision)
+    contours[0][:] = 0
+    vision.image = frame.copy()
+    again, _, _ = handle_contour_detection(vision)
+    assert again[0].any()
+
+    for _ in range(5):
+        vision.image = frame
+        handle_contour_detection(vision)
+    # 1 detection, then at most 3 reused frames between detections
+    assert len(vision.published) == 2
+
+
+def test_detector_ignores_noise_and_sees_a_small_part():
+    rng = np.random.default_rng(2)
+    detector = FrameChangeDetector()
+    detector.is_unchanged(_scene(rng, []))
+    detector.update([])
+
+    assert all(detector.is_unchanged(_scene(rng, [])) for _ in range(20))
+    small = _scene(rng, [])
+    cv2.rectangle(small, (400, 100), (412, 110), (25, 25, 25), -1)
+    assert not detector.is_unchanged(small)
@@ -0,0 +1,108 @@
+import multiprocessing
+import uuid
+
+import numpy as np
+import pytest
+
+from modules.VisionSystem.frame_channel import SharedFrameChannel, frame_from_message, register_channel
+
+
+@pytest.fixture
+def channel():
+    channel = SharedFrameChannel.create(name=f"test_{uuid.uuid4().hex[:12]}", capacity=64 * 48 * 3)
+    yield channel
+    channel.close()
+
+
+def _frame(value, shape=(48, 64, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+
+def test_latest_frame_is_a_read_only_view_of_the_slot(channel):
+    seq = channel.write(_frame(7))
+
+    read_seq, view = channel.read()
+
+    assert read_seq == seq
+    assert view.shape == (48, 64, 3) and (view == 7).all()
+    assert not view.flags.writeable
+    assert np.shares_memory(view, channel._data)
+
+
+def test_slots_rotate_and_overwritten_sequences_are_rejected(channel):
+    first = channel.write(_frame(1))
+    for value in range(2, 2 + channel.slots):
+        channel.write(_frame(value))
+
+    assert not channel.is_current(first)
+    assert channel.read(first) == (0, None)
+    _, latest = channel.read()
+    assert (latest == 1 + channel.slots).all()
+
+
+def test_grayscale_frames_keep_their_shape(channel):
+    channel.write(_frame(255, shape=(10, 20)))
+
+    _, view = channel.read()
+
+    assert view.shape == (10, 20)
+
+
+def test_oversized_frame_is_refused(channel):
+    with pytest.raises(ValueError):
+        channel.write(_frame(0, shape=(100, 100, 3)))
+
+
+def test_frame_from_message_accepts_notifications_and_legacy_payloads(channel):
+    register_channel(channel)
+    seq = channel.write(_frame(3))
+    legacy = _frame(9)
+
+    assert (frame_from_message(channel.notification(seq)) == 3).all()
+    assert frame_from_message({"image": legacy}) is legacy
+    assert frame_from_message(legacy) is legacy
+    assert frame_from_message({"image": None}) is None
+
+
+def test_frame_from_message_drops_a_frame_overwritten_while_it_is_copied(channel, monkeypatch):
+    register_channel(channel)
+    seq = channel.write(_frame(3))
+    read = channel.read
+
+    def read_then_overwrite(seq=None):
+        # The writer comes round to the slot between the reader mapping it and copying it
+        result = read(seq)
+        for value in range(4, 4 + channel.slots):
+            channel.write(_frame(value))
+        return result
+
+    monkeypatch.setattr(channel, "read", read_then_overwrite)
+    assert frame_from_message(channel.notification(seq)) is None
+
+    monkeypatch.setattr(channel, "read", read)
+    latest = channel.latest_seq
+    frame = frame_from_message(channel.notification(latest))
+    assert (frame == 3 + channel.slots).all()
+    assert not np.shares_memory(frame, channel._data)
+
+
+def _read_in_child(name, queue):
+    channel = SharedFrameChannel.attach(name)
+    seq, frame = channel.read_copy()
+    queue.put((seq, int(frame.sum())))
+    channel.close()
+
+
+def test_consumer_in_another_process_reads_the_frame(channel):
+    seq = channel.write(_frame(2))
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+
+    process = context.Process(target=_read_in_child, args=(channel.name, queue))
+    process.start()
+    result = queue.get(timeout=30)
+    process.join(timeout=30)
+
+    assert result == (seq, 2 * 48 * 64 * 3)
+    # Detaching the reader must not remove the writer's block
+    assert channel.read()[0] == seq
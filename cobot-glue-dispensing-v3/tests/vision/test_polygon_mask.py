@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+
+from backend.system.utils.contours import PolygonMask, get_polygon_mask, is_contour_inside_polygon
+
+# Rotated quadrilateral with fractional vertices, like a clicked spray area
+QUAD = np.array([[102.3, 81.7], [598.9, 120.2], [571.4, 452.6], [85.5, 401.1]], dtype=np.float32)
+
+
+def _reference(polygon, points):
+    return np.array([cv2.pointPolygonTest(polygon, (float(x), float(y)), False) >= 0 for x, y in points])
+
+
+def test_exact_mode_matches_point_polygon_test():
+    rng = np.random.default_rng(1)
+    scattered = rng.uniform(60, 620, size=(4000, 2))
+    # Points right around the edges, where the raster alone is ambiguous
+    t = rng.uniform(0, 1, size=(4000, 1))
+    start = rng.integers(0, 4, size=4000)
+    on_edges = QUAD[start] + t * (QUAD[(start + 1) % 4] - QUAD[start]) + rng.normal(0, 1.0, size=(4000, 2))
+    points = np.vstack([scattered, on_edges, np.round(on_edges)]).astype(np.float32)
+
+    inside = PolygonMask(QUAD).contains(points)
+
+    assert np.array_equal(inside, _reference(QUAD, points))
+
+
+def test_fast_mode_only_errs_inside_the_border_band():
+    rng = np.random.default_rng(2)
+    points = rng.uniform(60, 620, size=(5000, 2)).astype(np.float32)
+    mask = PolygonMask(QUAD)
+
+    fast = mask.contains(points, exact=False)
+    distance = np.array([cv2.pointPolygonTest(QUAD, (float(x), float(y)), True) for x, y in points])
+
+    differs = fast != _reference(QUAD, points)
+    assert (np.abs(distance[differs]) <= PolygonMask.BORDER_WIDTH).all()
+
+
+def test_masks_are_cached_until_the_area_changes():
+    first = get_polygon_mask(QUAD)
+
+    assert get_polygon_mask(QUAD.copy()) is first
+    assert get_polygon_mask(QUAD + 1) is not first
+
+
+def test_contour_inside_polygon_checks_points_and_bounding_rect():
+    area = [(0, 0), (200, 0), (200, 200), (0, 200)]
+    inside = np.array([[[20, 20]], [[180, 20]], [[100, 180]]], dtype=np.int32)
+    crossing = np.array([[[20, 20]], [[250, 20]], [[100, 180]]], dtype=np.int32)
+    # All points inside a triangle, but the bounding rect corner (0, 100) is not
+    triangle = [(0, 0), (200, 0), (200, 200), (100, 0)]
+    diagonal = np.array([[[150, 10]], [[190, 10]], [[190, 150]]], dtype=np.int32)
+
+    assert is_contour_inside_polygon(inside, *area)
+    assert not is_contour_inside_polygon(crossing, *area)
+    assert not is_contour_inside_polygon(diagonal, *triangle)
@@ -0,0 +1,58 @@
+import threading
+import time
+
+import numpy as np
+
+from modules.VisionSystem.scene_stability import SceneStabilityTracker
+
+
+def _contour(x, y, w=80, h=50):
+    return np.array([[[x, y]], [[x + w, y]], [[x + w, y + h]], [[x, y + h]]], dtype=np.int32)
+
+
+PARTS = [_contour(100, 80), _contour(300, 200)]
+
+
+def test_stable_after_k_settled_frames():
+    tracker = SceneStabilityTracker(stable_frames=3)
+    results = [tracker.update(PARTS, brightness_error=1.0) for _ in range(4)]
+    assert results == [False, False, False, True]  # The first frame is only the reference
+
+    # A contour that moves by more than the tolerance starts the count again
+    assert not tracker.update([_contour(100, 80), _contour(310, 200)], brightness_error=1.0)
+    # So does auto-brightness that has not converged, even with the same contours
+    assert not tracker.update([_contour(100, 80), _contour(310, 200)], brightness_error=12.0)
+    # Small jitter and auto-brightness off (None) are settled frames
+    assert [tracker.update([_contour(101, 79), _contour(309, 201)], None) for _ in range(3)] == [False, False, True]
+
+    tracker.reset()
+    assert not tracker.is_stable()
+    assert not tracker.update(PARTS, brightness_error=0.0)
+
+
+def test_wait_until_stable_counts_frames_after_the_call():
+    tracker = SceneStabilityTracker(stable_frames=3)
+    for _ in range(5):
+        tracker.update(PARTS)
+    assert tracker.is_stable()
+    assert tracker.wait_until_stable(timeout=0, reset=False)
+
+    result = {}
+
+    def wait():
+        result["stable"] = tracker.wait_until_stable(timeout=2.0)
+        result["at"] = time.perf_counter()
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.05)
+    assert "stable" not in result  # Reset by the call: the earlier frames do not count
+    for _ in range(4):
+        tracker.update(PARTS)
+    last_frame = time.perf_counter()
+    waiter.join()
+    assert result["stable"] and result["at"] - last_frame < 0.05
+
+    start = time.perf_counter()
+    assert not tracker.wait_until_stable(timeout=0.1)
+    assert time.perf_counter() - start >= 0.1